@@ -0,0 +1,104 @@
+"""
+Throughput benchmark for the Modbus gateway: one listener serving many
+unit IDs, each polled for its full input register block (14 registers).
+
+Runs the scan with static weights (every read is a slice of a cached image)
+and with every scale's weight changing before each scan (one image rebuild
+per unit per scan), in the handler alone and over Modbus TCP with all
+requests of a scan pipelined.
+
+Usage: python bench_modbus_gateway.py [--units 247] [--scans 200]
+"""
+import sys
+import os
+import time
+import socket
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.scales.cas_ci600a import CasCI600A
+from devices.gateway.modbus_gateway import ModbusGateway, FC_READ_INPUT_REGISTERS, INPUT_REGISTERS, build_tcp_request
+
+RESPONSE_SIZE = 7 + 2 + INPUT_REGISTERS * 2
+
+def make_simulator(units):
+    sim = Simulator(io_backend="thread")
+    gateway = ModbusGateway("GW", "GW_01")
+    sim.add_device(gateway)
+    scales = []
+    for unit in range(1, units + 1):
+        scale = CasCI600A(f"Scale {unit}", f"SCALE_{unit}")
+        scale.logger.disabled = True
+        sim.add_device(scale)
+        gateway.map_unit(unit, scale.name)
+        scales.append(scale)
+    return sim, gateway, scales
+
+def scan_requests(units):
+    return [build_tcp_request(unit, FC_READ_INPUT_REGISTERS, 0, INPUT_REGISTERS, transaction=unit)
+            for unit in range(1, units + 1)]
+
+def bench_handler(gateway, scales, requests, scans, changing):
+    start = time.perf_counter()
+    for scan in range(scans):
+        if changing:
+            for scale in scales:
+                scale.set_weight(scan * 0.1)
+        for request in requests:
+            gateway.handle_data(request)
+    return time.perf_counter() - start
+
+def bench_tcp(sim, scales, requests, scans, changing):
+    port = sim.comm_manager.tcp_servers[0].bound_port
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5.0)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    scan = b"".join(requests)
+    expected = RESPONSE_SIZE * len(requests)
+    try:
+        start = time.perf_counter()
+        for n in range(scans):
+            if changing:
+                for scale in scales:
+                    scale.set_weight(n * 0.1)
+            sock.sendall(scan)
+            received = 0
+            while received < expected:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("Gateway closed the connection")
+                received += len(chunk)
+        return time.perf_counter() - start
+    finally:
+        sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--units", type=int, default=247)
+    parser.add_argument("--scans", type=int, default=200)
+    args = parser.parse_args()
+
+    sim, gateway, scales = make_simulator(args.units)
+    if not sim.start_device_tcp("GW", 0, host="127.0.0.1"):
+        raise RuntimeError("Could not start the TCP listener")
+    requests = scan_requests(args.units)
+    try:
+        print(f"{args.units} units x {INPUT_REGISTERS} input registers, {args.scans} scans")
+        print(f"{'weights':<10}{'path':<10}{'ms/scan':>10}{'req/s':>12}{'builds':>10}")
+        for changing in (False, True):
+            for path in ("handler", "tcp"):
+                builds = gateway.image_builds
+                if path == "handler":
+                    elapsed = bench_handler(gateway, scales, requests, args.scans, changing)
+                else:
+                    elapsed = bench_tcp(sim, scales, requests, args.scans, changing)
+                rate = args.units * args.scans / elapsed
+                print(f"{'changing' if changing else 'static':<10}{path:<10}{elapsed / args.scans * 1000:>10.2f}"
+                      f"{rate:>12,.0f}{gateway.image_builds - builds:>10}")
+    finally:
+        sim.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Polling benchmark for the multi-drop RS-485 bus: a master polls every node
+of a 32-drop CAS NT-301A line in turn ("01 RW" ... "32 RW") over a pty,
+waiting for each answer like a real half-duplex master.
+
+Reports the poll rate and answer latency per baud rate and turnaround. The
+line timing is simulated, so the rate should follow the wire time of command
+plus answer plus turnaround rather than the host's speed. Also times the bus
+dispatch (address lookup and device handler) without any line timing.
+
+Usage: python bench_rs485_bus.py [--nodes 32] [--polls 320]
+"""
+import sys
+import os
+import pty
+import time
+import select
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.rs485_bus import RS485Bus
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+
+def make_scales(nodes):
+    scales = []
+    for n in range(1, nodes + 1):
+        scale = CasNT301AScale(f"Node {n}", f"NODE_{n}")
+        scale.logger.disabled = True
+        scale.set_device_id_str(f"{n:02d}")
+        scale.set_weight(float(n))
+        scales.append(scale)
+    return scales
+
+def poll_commands(nodes):
+    return [f"{n:02d} RW\r\n".encode() for n in range(1, nodes + 1)]
+
+def bench_dispatch(nodes, polls):
+    bus = RS485Bus("BENCH")
+    bus.configure_line(10 ** 9)  # No line time worth waiting for
+    for scale in make_scales(nodes):
+        bus.attach(scale)
+    commands = poll_commands(nodes)
+    start = time.perf_counter()
+    for i in range(polls):
+        bus.handle_data(commands[i % nodes])
+    elapsed = time.perf_counter() - start
+    bus.close()
+    return elapsed
+
+def bench_line(nodes, polls, baudrate, turnaround):
+    sim = Simulator(io_backend="reactor")
+    names = []
+    for scale in make_scales(nodes):
+        sim.add_device(scale)
+        names.append(scale.name)
+    master, slave = pty.openpty()
+    latencies = []
+    try:
+        if not sim.start_bus(os.ttyname(slave), names, baudrate=baudrate, turnaround=turnaround):
+            raise RuntimeError("Could not open the bus port")
+        commands = poll_commands(nodes)
+        start = time.perf_counter()
+        for i in range(polls):
+            t0 = time.perf_counter()
+            os.write(master, commands[i % nodes])
+            reply = b""
+            while not reply.endswith(b"\r\n"):
+                if not select.select([master], [], [], 2.0)[0]:
+                    raise TimeoutError(f"No answer to {commands[i % nodes]!r}")
+                reply += os.read(master, 256)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        stats = sim.buses[os.ttyname(slave)].stats()
+    finally:
+        sim.stop()
+        os.close(master)
+        os.close(slave)
+    return elapsed, sorted(latencies), stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=32)
+    parser.add_argument("--polls", type=int, default=320)
+    args = parser.parse_args()
+
+    elapsed = bench_dispatch(args.nodes, args.polls * 10)
+    print(f"Dispatch only: {elapsed / (args.polls * 10) * 1e6:.1f} us/poll over {args.nodes} nodes")
+    print(f"{'baud':>8}{'turn ms':>9}{'polls/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'collisions':>12}")
+    for baudrate in (9600, 38400, 115200):
+        for turnaround in (0.0, 0.005):
+            elapsed, latencies, stats = bench_line(args.nodes, args.polls, baudrate, turnaround)
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{baudrate:>8}{turnaround * 1000:>9.1f}{args.polls / elapsed:>10.0f}"
+                  f"{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}{stats['line_collisions']:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Throughput benchmark for the S7 PLC simulator: an HMI-style poll of many
+REAL variables scattered over a data block, split into as many Read Var
+requests as the negotiated PDU size needs.
+
+Measures the protocol handler alone (process_command) and a full poll over
+ISO-on-TCP through CommManager, where the requests of one poll are sent
+back to back and then all answers are read.
+
+Usage: python bench_s7_read.py [--vars 400] [--pdu 480] [--polls 500]
+"""
+import sys
+import os
+import time
+import socket
+import struct
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.plc.s7_plc import (
+    S7PLC, AREA_DB, RC_OK, build_connect_request, build_setup_request,
+    build_read_request, parse_read_response,
+)
+
+REAL = 0x08  # Transport size of the requested items
+REQUEST_OVERHEAD = 10 + 2   # S7 header + function/item count
+RESPONSE_OVERHEAD = 12 + 2
+ITEM_REQUEST = 12
+ITEM_RESPONSE = 4 + 4       # Item header + one REAL
+
+def build_poll(var_count, pdu_size):
+    """Read requests covering every 8th DWORD of DB1 (scattered, so every variable is its own item)."""
+    per_request = min((pdu_size - REQUEST_OVERHEAD) // ITEM_REQUEST, (pdu_size - RESPONSE_OVERHEAD) // ITEM_RESPONSE)
+    items = [(AREA_DB, 1, i * 8, 1) for i in range(var_count)]
+    return [build_read_request(items[i:i + per_request], pdu_ref=n + 1, ts=REAL)
+            for n, i in enumerate(range(0, var_count, per_request))]
+
+def make_plc(var_count, pdu_size):
+    plc = S7PLC("PLC", "PLC_01", pdu_size=pdu_size, data_blocks={1: var_count * 8})
+    for i in range(var_count):
+        plc.db(1).set_real(i * 8, i * 0.5)
+    return plc
+
+def bench_handler(plc, requests, polls):
+    start = time.perf_counter()
+    for _ in range(polls):
+        for request in requests:
+            plc.process_command(request)
+    return time.perf_counter() - start
+
+def recv_frames(sock, count):
+    buf = b""
+    frames = []
+    while len(frames) < count:
+        while len(buf) < 4 or len(buf) < struct.unpack_from(">H", buf, 2)[0]:
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("PLC closed the connection")
+            buf += chunk
+        size = struct.unpack_from(">H", buf, 2)[0]
+        frames.append(buf[:size])
+        buf = buf[size:]
+    return frames
+
+def bench_tcp(plc, requests, polls, pdu_size):
+    sim = Simulator(io_backend="thread")
+    sim.add_device(plc)
+    if not sim.start_device_tcp("PLC", 0, host="127.0.0.1"):
+        raise RuntimeError("Could not start the TCP listener")
+    port = sim.comm_manager.tcp_servers[0].bound_port
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5.0)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        sock.sendall(build_connect_request())
+        recv_frames(sock, 1)
+        sock.sendall(build_setup_request(pdu_size))
+        recv_frames(sock, 1)
+        poll = b"".join(requests)
+        # Check one poll before timing
+        sock.sendall(poll)
+        for frame in recv_frames(sock, len(requests)):
+            if any(rc != RC_OK for rc, _ in parse_read_response(frame)):
+                raise RuntimeError("PLC rejected an item")
+        start = time.perf_counter()
+        for _ in range(polls):
+            sock.sendall(poll)
+            recv_frames(sock, len(requests))
+        return time.perf_counter() - start
+    finally:
+        sock.close()
+        sim.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vars", type=int, default=400)
+    parser.add_argument("--pdu", type=int, default=480)
+    parser.add_argument("--polls", type=int, default=500)
+    args = parser.parse_args()
+
+    plc = make_plc(args.vars, args.pdu)
+    requests = build_poll(args.vars, args.pdu)
+    print(f"{args.vars} REAL variables, PDU {args.pdu}: {len(requests)} requests per poll, {args.polls} polls")
+    print(f"{'path':<10}{'polls/s':>12}{'vars/s':>14}{'us/poll':>10}")
+    for path, elapsed in (("handler", bench_handler(plc, requests, args.polls)),
+                          ("tcp", bench_tcp(plc, requests, args.polls, args.pdu))):
+        rate = args.polls / elapsed
+        print(f"{path:<10}{rate:>12,.0f}{rate * args.vars:>14,.0f}{elapsed / args.polls * 1e6:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Latency benchmark: per-port polling threads vs. the selector reactor.
+
+Uses pty pairs instead of real COM ports, so it only runs on POSIX.
+The simulator side opens the pty slave through CommManager; the benchmark acts
+as the host on the master side, sends a CAS CI-600A 'RW' poll and times the reply.
+
+Usage: python bench_serial_latency.py [--ports 30] [--polls 200]
+"""
+import sys
+import os
+import pty
+import time
+import select
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.comm_manager import CommManager
+from devices.scales.cas_ci600a import CasCI600A
+
+POLL = b"01RW\r\n"
+
+def open_pty_pairs(count):
+    pairs = []
+    for _ in range(count):
+        master, slave = pty.openpty()
+        pairs.append((master, slave, os.ttyname(slave)))
+    return pairs
+
+def read_reply(fd, terminator=b"\r\n", timeout=1.0):
+    buf = b""
+    deadline = time.perf_counter() + timeout
+    while terminator not in buf:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise TimeoutError("No reply from simulator")
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if ready:
+            buf += os.read(fd, 1024)
+    return buf
+
+def run_backend(backend, port_count, polls):
+    comm = CommManager(io_backend=backend)
+    pairs = open_pty_pairs(port_count)
+    for i, (_, _, path) in enumerate(pairs):
+        scale = CasCI600A(f"Scale {i}", f"SCALE_{i}")
+        scale.set_weight(123.4)
+        if not comm.start_serial(path, 9600, 8, 'N', 1, scale.process_command):
+            raise RuntimeError(f"Could not open {path}")
+
+    try:
+        # CPU burnt while every port is idle
+        cpu_start = time.process_time()
+        time.sleep(1.0)
+        idle_cpu = time.process_time() - cpu_start
+
+        latencies = []
+        for n in range(polls):
+            master = pairs[n % port_count][0]
+            start = time.perf_counter()
+            os.write(master, POLL)
+            read_reply(master)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        comm.stop_all()
+        for master, slave, _ in pairs:
+            os.close(master)
+            os.close(slave)
+
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "idle_cpu": idle_cpu * 100.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ports", type=int, default=30)
+    parser.add_argument("--polls", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.ports} ports, {args.polls} polls")
+    print(f"{'backend':<10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'idle CPU %':>12}")
+    for backend in ("thread", "reactor"):
+        r = run_backend(backend, args.ports, args.polls)
+        print(f"{backend:<10}{r['mean']:>10.3f}{r['p50']:>10.3f}{r['p99']:>10.3f}{r['idle_cpu']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
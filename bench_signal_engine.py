@@ -0,0 +1,69 @@
+"""
+Benchmark for the weight signal engine: hundreds of scales driven along mixed
+profiles (filling, bag drops, trucks, mixers) at 20 ticks per second.
+
+Reports the cost of one tick for all scales, split into block computation
+(amortized over the block) and publishing the readings, with the NumPy
+block math and with the per-channel Python math.
+
+Usage: python bench_signal_engine.py [--scales 300] [--ticks 2000] [--block 64]
+"""
+import sys
+import os
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.signal_engine import SignalEngine, filling, bag_drops, truck, mixer, np
+from devices.scales.cas_ci600a import CasCI600A
+
+PROFILES = (
+    lambda: filling(500.0, duration=8.0, division=0.5),
+    lambda: bag_drops(25.0, count=8, interval=4.0, division=0.1),
+    lambda: truck(30000.0, axles=3, division=10),
+    lambda: mixer(1200.0, amplitude=2.0, division=0.5),
+)
+
+def make_engine(scales, block, use_numpy):
+    engine = SignalEngine(rate=20.0, block=block, seed=1, use_numpy=use_numpy)
+    for n in range(scales):
+        scale = CasCI600A(f"Scale {n}", f"SCALE_{n}")
+        scale.logger.disabled = True
+        engine.add(scale, PROFILES[n % len(PROFILES)]())
+    return engine
+
+def bench(scales, ticks, block, use_numpy):
+    engine = make_engine(scales, block, use_numpy)
+    compute = 0.0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        blocks = engine.blocks
+        t0 = time.perf_counter()
+        engine.tick()
+        if engine.blocks != blocks:
+            compute += time.perf_counter() - t0
+    total = time.perf_counter() - start
+    return total, compute, engine.publishes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--block", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{args.scales} scales, {args.ticks} ticks, blocks of {args.block}")
+    print(f"{'math':<8}{'us/tick':>10}{'of which blocks':>17}{'publishes/tick':>16}{'budget at 20 Hz':>17}")
+    for use_numpy in (True, False):
+        if use_numpy and np is None:
+            print(f"{'numpy':<8}  (not installed)")
+            continue
+        total, compute, publishes = bench(args.scales, args.ticks, args.block, use_numpy)
+        per_tick = total / args.ticks
+        print(f"{'numpy' if use_numpy else 'python':<8}{per_tick * 1e6:>10.0f}{compute / args.ticks * 1e6:>17.0f}"
+              f"{publishes / args.ticks:>16.0f}{per_tick * 20 * 100:>16.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Cold-start import cost of the entry points, measured with `python -X importtime`.
+
+Each module is imported in a fresh interpreter several times; the median of the
+cumulative time of the top-level import is reported, plus the slowest imports
+of the last run.
+
+Usage: python bench_startup.py [--runs 15] [--top 10] [module ...]
+"""
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODULES = ["core.headless", "core.simulator", "devices.registry", "main"]
+
+def import_times(module):
+    """[(cumulative us, self us, name)] for one cold import of `module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), int(self_us), name.rstrip()))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        totals = []
+        for _ in range(args.runs):
+            rows = import_times(module)
+            totals.append(rows[-1][0])
+        print(f"{module}: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+        for cumulative, self_us, name in sorted(rows, reverse=True)[1:args.top + 1]:
+            print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+CPU benchmark: one thread per streaming scale vs. the shared StreamScheduler.
+
+Starts N CAS CI-600A scales in Stream mode at the given rate, lets them run,
+and reports process CPU time, frames delivered and the worst tick lateness.
+
+Usage: python bench_stream_scheduler.py [--scales 200] [--rate 10] [--seconds 5]
+"""
+import sys
+import os
+import time
+import logging
+import argparse
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.stream_scheduler import StreamScheduler
+from devices.scales.cas_ci600a import CasCI600A
+
+def run(mode, count, rate, seconds):
+    scheduler = StreamScheduler() if mode == "scheduler" else None
+    frames = [0]
+    lock = threading.Lock()
+
+    def on_output(data):
+        with lock:
+            frames[0] += 1
+
+    scales = []
+    for i in range(count):
+        scale = CasCI600A(f"Scale {i}", f"SCALE_{i}")
+        scale.set_weight(100.0 + i)
+        scale.stream_rate = rate
+        scale.stream_scheduler = scheduler
+        scale.on_output = on_output
+        scales.append(scale)
+
+    threads_before = threading.active_count()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for scale in scales:
+        scale.start_streaming()
+    threads = threading.active_count() - threads_before
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    delivered = frames[0]
+
+    lateness = 0.0
+    if scheduler:
+        lateness = max(scale._stream_handle.max_lateness for scale in scales)
+    for scale in scales:
+        scale.stop_streaming()
+    if scheduler:
+        scheduler.stop()
+
+    return {
+        "threads": threads,
+        "cpu": cpu / wall * 100.0,
+        "fps": delivered / wall,
+        "lateness": lateness * 1000.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    expected = args.scales * args.rate
+    print(f"{args.scales} scales at {args.rate} Hz (expect {expected:.0f} frames/s)")
+    print(f"{'mode':<11}{'threads':>8}{'CPU %':>8}{'frames/s':>10}{'max late ms':>13}")
+    for mode in ("thread", "scheduler"):
+        r = run(mode, args.scales, args.rate, args.seconds)
+        late = f"{r['lateness']:.2f}" if mode == "scheduler" else "-"
+        print(f"{mode:<11}{r['threads']:>8}{r['cpu']:>8.1f}{r['fps']:>10.0f}{late:>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import asyncio
+import inspect
+import threading
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+# A device callback may answer directly or, in asyncio mode, with a coroutine
+DeviceCallback = Callable[[bytes], Union[bytes, None, Awaitable[Optional[bytes]]]]
+
+async def resolve_response(result) -> Optional[bytes]:
+    """Await a device callback result if it is a coroutine, otherwise return it as is."""
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+class PeriodicHandle:
+    """Handle returned by AsyncTransport.add_periodic; cancel() stops further calls."""
+
+    def __init__(self, transport: "AsyncTransport", interval: float, fn: Callable[[], None]):
+        self.transport = transport
+        self.interval = interval
+        self.fn = fn
+        self.cancelled = False
+        self.missed = 0 # Ticks skipped because the loop fell a whole period behind
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def cancel(self):
+        self.cancelled = True
+        loop = self.transport.loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._cancel_timer)
+
+    def _cancel_timer(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+class AsyncTransport:
+    """
+    Runs one asyncio event loop on a background thread and hosts every serial
+    port, TCP listener and streaming timer on it.
+
+    Serial ports are watched with loop.add_reader() on their file descriptor,
+    TCP listeners use asyncio.start_server(). Device callbacks run on the loop
+    and may be plain functions or `async def` coroutines, so hundreds of
+    simulated devices share one thread instead of owning one each.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("AsyncTransport")
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()  # Ports may be added from several threads (bulk project load)
+        self._serial: Dict[str, int] = {}  # port name -> fd
+        self._port_locks: Dict[str, asyncio.Lock] = {}
+        self._servers = []
+
+    # --- Loop lifecycle ---
+
+    def start(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="AsyncTransport", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        self.logger.info("Async transport started")
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+            self.logger.info("Async transport stopped")
+
+    def stop(self):
+        if not self.loop or not self.loop.is_running():
+            return
+        for port in list(self._serial):
+            self.remove_serial(port)
+        if threading.current_thread() is not self._thread:
+            try:
+                self.run(self._shutdown(), timeout=2.0)
+            except Exception as e:
+                self.logger.error(f"Error during async shutdown: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    async def _shutdown(self):
+        """Close listeners and cancel remaining callback tasks so nothing is left dangling."""
+        for server in self._servers:
+            try:
+                await server.aclose()
+            except Exception as e:
+                self.logger.error(f"Error closing listener: {e}")
+        self._servers.clear()
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def running(self) -> bool:
+        return bool(self.loop and self.loop.is_running())
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop from another thread and wait for its result."""
+        self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncTransport.run() called from the loop thread")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def call_soon(self, fn: Callable, *args):
+        """Schedule a plain function on the loop (thread-safe)."""
+        self.start()
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    # --- Serial ---
+
+    def add_serial(self, port: str, ser, on_data: Callable[[bytes], None], on_response: Callable[[bytes], None], callback: DeviceCallback):
+        """
+        Watch a serial port on the loop.
+        :param on_data: Called with every received chunk (monitors)
+        :param on_response: Called with the device response to write it out
+        :param callback: Device callback; may return bytes or a coroutine
+        """
+        self.start()
+        fd = ser.fileno()
+
+        def _readable():
+            try:
+                waiting = ser.in_waiting
+                data = ser.read(waiting) if waiting > 0 else ser.read(1)
+            except Exception as e:
+                self.logger.error(f"Error reading {port}, removing from loop: {e}")
+                self._remove_reader(port)
+                return
+            if not data:
+                return
+            on_data(data)
+            try:
+                result = callback(data)
+            except Exception as e:
+                self.logger.error(f"Error in device callback for {port}: {e}")
+                return
+            if inspect.isawaitable(result):
+                # Keep responses in request order even when coroutines finish out of order
+                self.loop.create_task(self._answer_in_order(port, result, on_response))
+            elif result:
+                on_response(result)
+
+        def _add():
+            self._port_locks[port] = asyncio.Lock()
+            self.loop.add_reader(fd, _readable)
+            self._serial[port] = fd
+
+        self.loop.call_soon_threadsafe(_add)
+
+    async def _answer_in_order(self, port: str, pending, on_response: Callable[[bytes], None]):
+        lock = self._port_locks.get(port)
+        if lock is None:
+            return
+        async with lock:
+            try:
+                response = await pending
+            except Exception as e:
+                self.logger.error(f"Error in async device callback for {port}: {e}")
+                return
+            if response and port in self._serial:
+                on_response(response)
+
+    def remove_serial(self, port: str):
+        if not self.running:
+            self._serial.pop(port, None)
+            return
+        if threading.current_thread() is self._thread:
+            self._remove_reader(port)
+            return
+        done = threading.Event()
+
+        def _remove():
+            self._remove_reader(port)
+            done.set()
+
+        self.loop.call_soon_threadsafe(_remove)
+        # Make sure the fd is no longer watched before the caller closes it
+        done.wait(timeout=1.0)
+
+    def _remove_reader(self, port: str):
+        fd = self._serial.pop(port, None)
+        self._port_locks.pop(port, None)
+        if fd is not None:
+            try:
+                self.loop.remove_reader(fd)
+            except (ValueError, OSError):
+                pass
+
+    def is_serial_registered(self, port: str) -> bool:
+        return port in self._serial
+
+    # --- Listeners ---
+
+    def start_server(self, server):
+        """
+        Start a listener (an object with async start()/aclose(), e.g. TcpServer)
+        on the loop and keep track of it so stop() can close it cleanly.
+        """
+        self.run(server.start())
+        self._servers.append(server)
+        return server
+
+    def close_server(self, server, timeout: float = 2.0):
+        if server not in self._servers:
+            return
+        self._servers.remove(server)
+        if self.running:
+            self.run(server.aclose(), timeout)
+
+    # --- Streaming timers ---
+
+    def add_periodic(self, interval: float, fn: Callable[[], None]) -> PeriodicHandle:
+        """
+        Call fn every `interval` seconds on the loop. Used as the stream scheduler
+        for devices in asyncio mode, so streaming needs no thread per device.
+        Deadlines advance from the previous deadline, not from "now", to avoid drift.
+        """
+        self.start()
+        handle = PeriodicHandle(self, interval, fn)
+
+        def _fire(deadline: float):
+            if handle.cancelled:
+                return
+            try:
+                fn()
+            except Exception as e:
+                self.logger.error(f"Error in periodic callback: {e}")
+            next_deadline = deadline + handle.interval
+            now = self.loop.time()
+            if next_deadline <= now:
+                # Fell behind (e.g. loop stalled); skip missed ticks instead of bursting
+                skipped = int((now - next_deadline) // handle.interval) + 1
+                handle.missed += skipped
+                next_deadline += skipped * handle.interval
+            handle._timer = self.loop.call_at(next_deadline, _fire, next_deadline)
+
+        def _schedule():
+            if not handle.cancelled:
+                first = self.loop.time() + interval
+                handle._timer = self.loop.call_at(first, _fire, first)
+
+        self.loop.call_soon_threadsafe(_schedule)
+        return handle
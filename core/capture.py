@@ -0,0 +1,321 @@
+"""
+Binary traffic capture files.
+
+Layout (all little endian):
+
+    file header   "SCAP" | version u16 | reserved u16 | wall clock ns u64 | monotonic ns u64
+    record        timestamp ns u64 (monotonic) | port id u16 | kind u8 | length u32 | payload
+
+kind is 0 for RX, 1 for TX, or PORT_DEF for a port table entry whose payload
+is the port name (UTF-8). A port is defined by such a record before its first
+frame, so a file is self-describing and stays readable after a crash: a reader
+simply stops at the last complete record.
+
+Next to the capture the writer keeps a small sidecar index (<file>.idx) with one
+entry per block of INDEX_STRIDE records: first timestamp, file offset, and a
+bitmask of the port ids in the block. Readers use it to seek to a start time
+and to skip blocks that do not contain the wanted port. Port definitions are
+listed in the index too (offset PORT_ENTRY, pointing at the definition record),
+so a reader knows every port without scanning. A missing or short index is
+rebuilt from the capture by scanning record headers only.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_right
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+MAGIC = b"SCAP"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHHQQ")
+RECORD_HEADER = struct.Struct("<QHBI")
+INDEX_ENTRY = struct.Struct("<QQQ")
+INDEX_STRIDE = 1024
+
+RX, TX, PORT_DEF = 0, 1, 0xFF
+DIRECTIONS = {"RX": RX, "TX": TX}
+DIRECTION_NAMES = {RX: "RX", TX: "TX"}
+OTHER_PORTS_BIT = 63  # Port ids >= 63 share this bit in the index mask
+PORT_ENTRY = 0xFFFFFFFFFFFFFFFF  # Index entry offset marking a port definition
+
+class CaptureRecord(NamedTuple):
+    timestamp_ns: int  # Monotonic clock of the capturing process
+    port: str
+    direction: str
+    data: bytes
+
+def _port_bit(port_id: int) -> int:
+    return 1 << min(port_id, OTHER_PORTS_BIT)
+
+class CaptureWriter:
+    """Appends RX/TX frames to a capture file. Thread-safe; write() is called on I/O threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: BinaryIO = open(path, "wb")
+        self._index: BinaryIO = open(path + ".idx", "wb")
+        self._ports: Dict[str, int] = {}
+        self._offset = FILE_HEADER.size
+        self._block_count = 0
+        self._block_mask = 0
+        self._block_start: Optional[Tuple[int, int]] = None  # (timestamp, offset) of the open block
+        self.frames = 0
+        self.bytes = 0
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, 0, time.time_ns(), time.monotonic_ns()))
+
+    def write(self, port: str, direction: str, data: bytes, timestamp_ns: Optional[int] = None):
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        kind = DIRECTIONS.get(direction, RX)
+        with self._lock:
+            if self._file.closed:
+                return
+            port_id = self._ports.get(port)
+            if port_id is None:
+                port_id = len(self._ports)
+                self._ports[port] = port_id
+                name = port.encode("utf-8")
+                self._index.write(INDEX_ENTRY.pack(port_id, PORT_ENTRY, self._offset))
+                self._append(RECORD_HEADER.pack(timestamp_ns, port_id, PORT_DEF, len(name)) + name)
+            if self._block_start is None:
+                self._block_start = (timestamp_ns, self._offset)
+            self._append(RECORD_HEADER.pack(timestamp_ns, port_id, kind, len(data)))
+            self._append(data)
+            self.frames += 1
+            self.bytes += len(data)
+            self._block_mask |= _port_bit(port_id)
+            self._block_count += 1
+            if self._block_count >= INDEX_STRIDE:
+                self._close_block()
+
+    def _append(self, chunk: bytes):
+        self._file.write(chunk)
+        self._offset += len(chunk)
+
+    def _close_block(self):
+        if self._block_start is not None:
+            timestamp, offset = self._block_start
+            self._index.write(INDEX_ENTRY.pack(timestamp, offset, self._block_mask))
+        self._block_start = None
+        self._block_mask = 0
+        self._block_count = 0
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._index.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._close_block()
+            self._file.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class CaptureReader:
+    """
+    Memory-mapped reader. Nothing is loaded up front except the sidecar index;
+    records() is a generator that decodes headers in place and copies only the
+    payloads of records it yields.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < FILE_HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a capture file")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.start_wall_ns, self.start_monotonic_ns = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a capture file")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"Unsupported capture version {version}")
+        self.size = size
+        self.ports: Dict[int, str] = {}
+        self._index: List[Tuple[int, int, int]] = []
+        self._load_index()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def wall_time_ns(self, timestamp_ns: int) -> int:
+        """Convert a record timestamp to wall clock nanoseconds since the epoch."""
+        return self.start_wall_ns + (timestamp_ns - self.start_monotonic_ns)
+
+    # --- Index ---
+
+    def _load_index(self):
+        entries = []
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % INDEX_ENTRY.size
+            for entry in INDEX_ENTRY.iter_unpack(raw[:usable]):
+                if entry[1] == PORT_ENTRY:
+                    self._read_port_def(entry[2])
+                elif entry[1] < self.size:
+                    entries.append(entry)
+        except OSError:
+            pass
+        # Index the tail the sidecar does not cover (crash, or a writer still running)
+        start = entries[-1][1] if entries else FILE_HEADER.size
+        if entries:
+            entries.pop()
+        entries.extend(self._scan_index(start))
+        self._index = entries
+        self._times = [e[0] for e in entries]
+
+    def _scan_index(self, offset: int) -> List[Tuple[int, int, int]]:
+        """Build index entries from `offset` by walking record headers."""
+        entries = []
+        block_start = None
+        mask = count = 0
+        for record_offset, timestamp, port_id, kind, length in self._headers(offset, self.size):
+            if kind == PORT_DEF:
+                continue
+            if block_start is None:
+                block_start = (timestamp, record_offset)
+            mask |= _port_bit(port_id)
+            count += 1
+            if count >= INDEX_STRIDE:
+                entries.append((block_start[0], block_start[1], mask))
+                block_start, mask, count = None, 0, 0
+        if block_start is not None:
+            entries.append((block_start[0], block_start[1], mask))
+        return entries
+
+    def _read_port_def(self, offset: int):
+        if offset + RECORD_HEADER.size > self.size:
+            return
+        _, port_id, kind, length = RECORD_HEADER.unpack_from(self._map, offset)
+        payload = offset + RECORD_HEADER.size
+        if kind == PORT_DEF and payload + length <= self.size:
+            self.ports[port_id] = bytes(self._map[payload:payload + length]).decode("utf-8", "replace")
+
+    def _headers(self, offset: int, end: int) -> Iterator[Tuple[int, int, int, int, int]]:
+        """Yield (offset, timestamp, port id, kind, length) for complete records, learning port names."""
+        buf = self._map
+        unpack = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        while offset + header_size <= end:
+            timestamp, port_id, kind, length = unpack(buf, offset)
+            payload = offset + header_size
+            if payload + length > self.size:
+                return  # Truncated last record
+            if kind == PORT_DEF:
+                self.ports[port_id] = bytes(buf[payload:payload + length]).decode("utf-8", "replace")
+            yield offset, timestamp, port_id, kind, length
+            offset = payload + length
+
+    # --- Queries ---
+
+    def port_id(self, port: str) -> Optional[int]:
+        for port_id, name in self.ports.items():
+            if name == port:
+                return port_id
+        return None
+
+    def records(self, port: Optional[str] = None, start_ns: Optional[int] = None,
+                end_ns: Optional[int] = None) -> Iterator[CaptureRecord]:
+        """
+        Lazily yield frames in file order.
+        :param port: Only frames of this port
+        :param start_ns: Skip frames before this timestamp (seeks via the index)
+        :param end_ns: Stop at the first frame at or after this timestamp
+        """
+        blocks = self._index
+        first_block = 0
+        if start_ns is not None and blocks:
+            first_block = max(0, bisect_right(self._times, start_ns) - 1)
+
+        want_bit = None
+        if port is not None:
+            want_id = self.port_id(port)
+            want_bit = _port_bit(want_id) if want_id is not None else None
+
+        buf = self._map
+        header_size = RECORD_HEADER.size
+        for i in range(first_block, len(blocks)):
+            block_end = blocks[i + 1][1] if i + 1 < len(blocks) else self.size
+            if want_bit is not None and not blocks[i][2] & want_bit:
+                continue
+            for offset, timestamp, port_id, kind, length in self._headers(blocks[i][1], block_end):
+                if kind == PORT_DEF:
+                    if port is not None and want_bit is None and self.ports.get(port_id) == port:
+                        # The port first appears in this block
+                        want_bit = _port_bit(port_id)
+                    continue
+                if end_ns is not None and timestamp >= end_ns:
+                    return
+                if start_ns is not None and timestamp < start_ns:
+                    continue
+                name = self.ports.get(port_id, f"#{port_id}")
+                if port is not None and name != port:
+                    continue
+                payload = offset + header_size
+                yield CaptureRecord(timestamp, name, DIRECTION_NAMES.get(kind, "RX"), bytes(buf[payload:payload + length]))
+
+    def search(self, needle: bytes, **filters) -> Iterator[CaptureRecord]:
+        """Yield frames whose payload contains `needle`; takes the same filters as records()."""
+        for record in self.records(**filters):
+            if needle in record.data:
+                yield record
+
+# --- Export ---
+
+def export_text(reader: CaptureReader, out: TextIO, **filters) -> int:
+    """Write frames as Comm Monitor style text lines. Returns the number of frames written."""
+    count = 0
+    for record in reader.records(**filters):
+        wall = reader.wall_time_ns(record.timestamp_ns)
+        seconds, nanos = divmod(wall, 1_000_000_000)
+        clock = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+        text = record.data.decode("ascii", errors="replace")
+        out.write(f"[{clock}.{nanos // 1000:06d}] [{record.port}] [{record.direction}] {text} <{record.data.hex().upper()}>\n")
+        count += 1
+    return count
+
+PCAP_HEADER = struct.Struct("<IHHiIII")
+PCAP_RECORD = struct.Struct("<IIII")
+PCAP_MAGIC_NS = 0xA1B23C4D
+LINKTYPE_USER0 = 147
+
+def export_pcap(reader: CaptureReader, out: BinaryIO, **filters) -> int:
+    """
+    Write frames as a nanosecond pcap file with link type USER0. Each packet is
+    a small pseudo header (direction u8: 0 RX / 1 TX, port name length u8, port
+    name) followed by the payload, for a custom Wireshark dissector.
+    Returns the number of frames written.
+    """
+    out.write(PCAP_HEADER.pack(PCAP_MAGIC_NS, 2, 4, 0, 0, 65535, LINKTYPE_USER0))
+    count = 0
+    for record in reader.records(**filters):
+        seconds, nanos = divmod(reader.wall_time_ns(record.timestamp_ns), 1_000_000_000)
+        name = record.port.encode("utf-8")[:255]
+        packet = bytes((DIRECTIONS[record.direction], len(name))) + name + record.data
+        out.write(PCAP_RECORD.pack(seconds, nanos, len(packet), len(packet)))
+        out.write(packet)
+        count += 1
+    return count
@@ -1,37 +1,106 @@
 import threading
 import time
-import socket
 import serial
 import logging
-from typing import Dict, Optional, Callable
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING, Dict, List, Optional, Callable
+from .serial_reactor import SerialReactor
+from .framing import Framer
+from .output_queue import PortOutputQueue
+from .monitor_dispatcher import MonitorDispatcher, DROP_OLDEST
+from .capture import CaptureWriter
+
+if TYPE_CHECKING:
+    # asyncio costs ~30 ms of startup; imported only when an asyncio loop is actually needed
+    from .async_transport import AsyncTransport
+    from .tcp_server import TcpServer
 
 class CommManager:
-    def __init__(self):
+    def __init__(self, io_backend: str = "auto"):
+        """
+        :param io_backend: How serial ports are serviced.
+            'reactor' - all ports multiplexed on one selector thread (POSIX only)
+            'thread'  - one polling thread per port
+            'asyncio' - every port, TCP listener and stream timer on one asyncio loop;
+                        device callbacks may be `async def` coroutines
+            'auto'    - reactor where supported, otherwise thread
+        """
         self.serial_ports: Dict[str, serial.Serial] = {}
-        self.tcp_servers: Dict[int, socket.socket] = {}
+        self.tcp_servers: Dict[int, "TcpServer"] = {}
+        # One ordered output queue per serial port; responses and stream frames both go through it
+        self._out_queues: Dict[str, PortOutputQueue] = {}
+        # Why the last start_serial() of a port failed; cleared when it opens
+        self.open_errors: Dict[str, str] = {}
         self.running = False
         self.logger = logging.getLogger("CommManager")
-        self._monitors: List[Callable[[str, str, bytes], None]] = []
+        # Monitor callbacks run on the dispatcher's threads, never on the I/O path
+        self._monitors = MonitorDispatcher()
+        self._capture: Optional[CaptureWriter] = None
 
-    def add_monitor(self, callback: Callable[[str, str, bytes], None]):
+        if io_backend == "auto":
+            io_backend = "reactor" if SerialReactor.is_supported() else "thread"
+        if io_backend not in ("reactor", "thread", "asyncio"):
+            raise ValueError(f"Unknown io_backend: {io_backend}")
+        if io_backend == "asyncio" and not SerialReactor.is_supported():
+            # Windows COM handles cannot be added as loop readers either
+            raise ValueError("asyncio backend requires a POSIX platform")
+        self.io_backend = io_backend
+        self._reactor: Optional[SerialReactor] = SerialReactor() if io_backend == "reactor" else None
+        self.async_transport: Optional["AsyncTransport"] = None
+        if io_backend == "asyncio":
+            from .async_transport import AsyncTransport
+            self.async_transport = AsyncTransport()
+        # Loop used for TCP listeners when the serial backend is not asyncio (created on demand)
+        self._tcp_transport: Optional["AsyncTransport"] = None
+
+    def add_monitor(self, callback: Callable[[str, str, bytes], None],
+                    policy: str = DROP_OLDEST, capacity: int = 10000):
         """
         Add a monitor callback.
         Callback signature: (port_name, direction, data)
         direction is 'RX' or 'TX'
+        The callback runs on its own delivery thread with a bounded queue.
+        :param policy: What to do when the queue is full: 'drop-oldest', 'drop-newest' or 'block'
+        :param capacity: Queue size in events
         """
-        if callback not in self._monitors:
-            self._monitors.append(callback)
+        self._monitors.subscribe(callback, capacity, policy)
 
     def remove_monitor(self, callback: Callable[[str, str, bytes], None]):
-        if callback in self._monitors:
-            self._monitors.remove(callback)
+        self._monitors.unsubscribe(callback)
+
+    def monitor_stats(self) -> List[dict]:
+        """Per-monitor queue depth, drops and delivery lag; shows which consumer is slow."""
+        return self._monitors.stats()
+
+    def flush_monitors(self, timeout: float = 1.0) -> bool:
+        """Wait until every monitor has received all events published so far."""
+        return self._monitors.wait_idle(timeout)
 
     def _notify_monitors(self, port: str, direction: str, data: bytes):
-        for monitor in self._monitors:
-            try:
-                monitor(port, direction, data)
-            except Exception as e:
-                self.logger.error(f"Error in monitor callback: {e}")
+        capture = self._capture
+        if capture:
+            capture.write(port, direction, data)
+        self._monitors.publish(port, direction, data)
+
+    def start_capture(self, path: str) -> bool:
+        """
+        Record every RX/TX frame on every port (serial and TCP) to a binary
+        capture file; see core.capture for the format and the reader.
+        """
+        self.stop_capture()
+        try:
+            self._capture = CaptureWriter(path)
+        except OSError as e:
+            self.logger.error(f"Failed to start capture {path}: {e}")
+            return False
+        self.logger.info(f"Capturing traffic to {path}")
+        return True
+
+    def stop_capture(self):
+        capture, self._capture = self._capture, None
+        if capture:
+            capture.close()
+            self.logger.info(f"Capture stopped: {capture.frames} frames, {capture.bytes} bytes")
 
     def start_serial(self, port: str, baudrate: int, bytesize: int, parity: str, stopbits: float, callback: Callable[[bytes], bytes]):
         """
@@ -53,33 +122,76 @@ class CommManager:
                 timeout=0.1,
                 dsrdtr=False
             )
-            ser.dtr = True
-            ser.rts = True
+            try:
+                ser.dtr = True
+                ser.rts = True
+            except (OSError, serial.SerialException) as e:
+                # Virtual ports (pty, some null-modem drivers) have no modem control lines
+                self.logger.debug(f"[{port}] DTR/RTS not supported: {e}")
             self.serial_ports[port] = ser
+            self.open_errors.pop(port, None)
+            self._out_queues[port] = PortOutputQueue(
+                port, ser.write, on_flush=lambda batch: self._on_tx(port, batch))
             self.logger.info(f"Opened serial port {port} at {baudrate}, {bytesize} data bits, {parity} parity, {stopbits} stop bits")
             
-            thread = threading.Thread(target=self._serial_loop, args=(port, callback), daemon=True)
-            thread.start()
+            if self._reactor:
+                self._reactor.register(port, ser, lambda: self._service_port(port, ser, callback))
+            elif self.async_transport:
+                self.async_transport.add_serial(
+                    port, ser,
+                    on_data=lambda data: self._on_rx(port, data),
+                    on_response=lambda response: self._send_response(port, ser, response),
+                    callback=callback
+                )
+            else:
+                thread = threading.Thread(target=self._serial_loop, args=(port, callback), daemon=True)
+                thread.start()
             return True
         except Exception as e:
+            self.open_errors[port] = str(e)
             self.logger.error(f"Failed to open serial port {port}: {e}")
             return False
 
+    def _service_port(self, port: str, ser: serial.Serial, callback: Callable[[bytes], bytes]):
+        """
+        Read whatever is waiting on the port, pass it to the device and write the response.
+        Shared by the reactor and the per-port polling loop.
+        """
+        waiting = ser.in_waiting
+        # The reactor only calls us when the fd is readable; a readable port with nothing
+        # waiting is read with a blocking read(1) so hang-ups surface as an exception.
+        data = ser.read(waiting) if waiting > 0 else ser.read(1)
+        if data:
+            self._on_rx(port, data)
+            
+            response = callback(data)
+            if isinstance(response, Awaitable):
+                response.close()
+                self.logger.error(f"[{port}] Device callback is a coroutine; use io_backend='asyncio'")
+                return
+            if response:
+                self._send_response(port, ser, response)
+
+    def _on_rx(self, port: str, data: bytes):
+        self.logger.debug(f"[{port}] RX: {data}")
+        self._notify_monitors(port, "RX", data)
+
+    def _send_response(self, port: str, ser: serial.Serial, response: bytes):
+        queue = self._out_queues.get(port)
+        if queue:
+            queue.put(response)
+
+    def _on_tx(self, port: str, data: bytes):
+        # One notification per write, i.e. per coalesced batch
+        self.logger.debug(f"[{port}] TX: {data}")
+        self._notify_monitors(port, "TX", data)
+
     def _serial_loop(self, port: str, callback: Callable[[bytes], bytes]):
         ser = self.serial_ports.get(port)
         while ser and ser.is_open:
             try:
                 if ser.in_waiting > 0:
-                    data = ser.read(ser.in_waiting)
-                    if data:
-                        self.logger.debug(f"[{port}] RX: {data}")
-                        self._notify_monitors(port, "RX", data)
-                        
-                        response = callback(data)
-                        if response:
-                            ser.write(response)
-                            self.logger.debug(f"[{port}] TX: {response}")
-                            self._notify_monitors(port, "TX", response)
+                    self._service_port(port, ser, callback)
             except Exception as e:
                 self.logger.error(f"Error in serial loop {port}: {e}")
                 # Don't break the loop on transient errors, just log and continue
@@ -87,27 +199,98 @@ class CommManager:
             
             time.sleep(0.01)
 
+    def _get_tcp_transport(self) -> "AsyncTransport":
+        if self.async_transport:
+            return self.async_transport
+        if self._tcp_transport is None:
+            from .async_transport import AsyncTransport
+            self._tcp_transport = AsyncTransport()
+        return self._tcp_transport
+
+    def start_tcp(self, port: int, callback: Callable[[bytes], bytes], host: str = "0.0.0.0",
+                  terminator: Optional[bytes] = None, max_connections: int = 64,
+                  framer_factory: Optional[Callable[[], Optional[Framer]]] = None):
+        """
+        Start a TCP listener for a device. Works with every io_backend; TCP always
+        runs on an asyncio loop (the shared one in asyncio mode).
+        :param port: TCP port to listen on (0 picks a free port, see TcpServer.bound_port)
+        :param callback: Function (or coroutine function) called with received data
+        :param terminator: If given, each client's data is buffered and only whole frames are passed on
+        :param max_connections: Further clients are refused once this many are connected
+        :param framer_factory: Creates a framer per client (see core.framing); takes precedence over terminator
+        """
+        if port in self.tcp_servers:
+            self.logger.error(f"TCP port {port} is already in use by the simulator")
+            return False
+        from .tcp_server import TcpServer
+        name = f"TCP:{port}"
+        server = TcpServer(
+            host, port, callback,
+            on_traffic=lambda direction, data: self._notify_monitors(name, direction, data),
+            terminator=terminator,
+            framer_factory=framer_factory,
+            max_connections=max_connections
+        )
+        try:
+            self._get_tcp_transport().start_server(server)
+            self.tcp_servers[port] = server
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to listen on {host}:{port}: {e}")
+            return False
+
+    def write_tcp(self, port: int, data: bytes):
+        """
+        Send data to every client of a TCP listener (unsolicited, e.g. stream mode).
+        """
+        server = self.tcp_servers.get(port)
+        if not server:
+            return False
+        self._get_tcp_transport().call_soon(server.broadcast, data)
+        return True
+
+    def stop_tcp(self, port: int):
+        """
+        Stop a TCP listener and close all of its client connections.
+        """
+        server = self.tcp_servers.pop(port, None)
+        if not server:
+            return False
+        try:
+            self._get_tcp_transport().close_server(server)
+        except Exception as e:
+            self.logger.error(f"Error closing TCP port {port}: {e}")
+        return True
+
     def write(self, port: str, data: bytes):
         """
-        Send data to a serial port directly (unsolicited).
+        Send data to a serial port (unsolicited, e.g. stream mode). The data is
+        queued behind any pending response, so frames never interleave.
         """
         ser = self.serial_ports.get(port)
-        if ser and ser.is_open:
-            try:
-                ser.write(data)
-                self.logger.debug(f"[{port}] TX (Stream): {data}")
-                self._notify_monitors(port, "TX", data)
-                return True
-            except Exception as e:
-                self.logger.error(f"Error writing to {port}: {e}")
+        queue = self._out_queues.get(port)
+        if ser and ser.is_open and queue:
+            return queue.put(data)
         return False
 
+    def output_stats(self, port: str) -> Optional[dict]:
+        """Write coalescing counters for a serial port (see PortOutputQueue.stats)."""
+        queue = self._out_queues.get(port)
+        return queue.stats() if queue else None
+
     def stop_serial(self, port: str):
         """
         Stop listening on a specific serial port.
         """
         ser = self.serial_ports.get(port)
         if ser and ser.is_open:
+            if self._reactor:
+                self._reactor.unregister(port)
+            if self.async_transport:
+                self.async_transport.remove_serial(port)
+            queue = self._out_queues.pop(port, None)
+            if queue:
+                queue.close()
             try:
                 ser.close()
                 self.logger.info(f"Closed serial port {port}")
@@ -120,8 +303,22 @@ class CommManager:
 
     def stop_all(self):
         self.running = False
+        self.stop_capture()
+        if self._reactor:
+            self._reactor.stop()
+        if self.async_transport:
+            for port in list(self.serial_ports):
+                self.async_transport.remove_serial(port)
+        for queue in self._out_queues.values():
+            queue.close()
+        self._out_queues.clear()
         for port, ser in self.serial_ports.items():
             if ser.is_open:
                 ser.close()
         self.serial_ports.clear()
-        # TODO: Close TCP servers
+        for port in list(self.tcp_servers):
+            self.stop_tcp(port)
+        if self.async_transport:
+            self.async_transport.stop()
+        if self._tcp_transport:
+            self._tcp_transport.stop()
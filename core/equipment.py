@@ -1,7 +1,17 @@
 from abc import ABC, abstractmethod
 import logging
+from collections.abc import Awaitable
+from typing import Optional
+from .framing import Framer, TerminatorFramer
+from .session import current_session
+from .state_schema import StateSchema, Field
 
 class Equipment(ABC):
+    # Fields saved in project files; subclasses extend this with their own settings
+    STATE_SCHEMA = StateSchema(
+        Field("connection_settings", dict),
+    )
+
     def __init__(self, name: str, device_id: str, model: str = ""):
         self.name = name
         self.device_id = device_id
@@ -9,6 +19,10 @@ class Equipment(ABC):
         self.connected = False
         self.logger = logging.getLogger(f"Equipment.{name}")
         self.on_output = None
+        # Called with the device after a STATE_SCHEMA field changed (set by the project autosaver)
+        self.on_state_change = None
+        # Multi-drop bus the device is attached to (set by RS485Bus.attach)
+        self.bus = None
         self.connection_settings = {
             "port": "COM1",
             "baudrate": 9600,
@@ -16,15 +30,85 @@ class Equipment(ABC):
             "parity": "None",
             "stopbits": 1
         }
+        self._framer: Optional[Framer] = None
+        self._session = {}  # client_session() outside a TCP connection
 
     @abstractmethod
     def process_command(self, command: bytes) -> bytes:
         """
         Process an incoming command and return the response.
         If no response is needed, return None or empty bytes.
+        Under CommManager's 'asyncio' backend this may also be an `async def`
+        coroutine; it is awaited on the event loop and answered in order.
         """
         pass
 
+    def create_framer(self) -> Optional[Framer]:
+        """
+        Return a new framer for this device's command protocol, or None to pass
+        received chunks to process_command() unchanged. The default frames on
+        `self.terminator` when the device defines one.
+        """
+        terminator = getattr(self, 'terminator', None)
+        if terminator:
+            return TerminatorFramer(terminator)
+        return None
+
+    def client_session(self) -> dict:
+        """
+        Protocol state of the client being served (e.g. a negotiated PDU size):
+        one dict per TCP connection, otherwise the device's own.
+        """
+        session = current_session.get()
+        return self._session if session is None else session
+
+    def reset_framer(self):
+        """Drop buffered partial input, e.g. after the command protocol changed."""
+        self._framer = None
+
+    def handle_data(self, data: bytes):
+        """
+        Entry point for raw received bytes. Splits them into complete frames,
+        passes each to process_command() and returns all responses joined, so
+        pipelined commands are answered with a single write.
+        If process_command() is a coroutine function, returns a coroutine.
+        """
+        if self._framer is None:
+            self._framer = self.create_framer()
+        if self._framer is None:
+            return self.process_command(data)
+        frames = self._framer.feed(data)
+        if not frames:
+            return None
+        if len(frames) == 1:
+            return self.process_command(frames[0])
+        results = [self.process_command(frame) for frame in frames]
+        if any(isinstance(r, Awaitable) for r in results):
+            return self._join_async(results)
+        return b"".join(r for r in results if r) or None
+
+    @staticmethod
+    async def _join_async(results):
+        responses = []
+        for result in results:
+            if isinstance(result, Awaitable):
+                result = await result
+            if result:
+                responses.append(result)
+        return b"".join(responses) or None
+
+    def state_changed(self):
+        """Report a change of a saved (STATE_SCHEMA) field; mutators call this after applying it."""
+        listener = self.on_state_change
+        if listener is not None:
+            listener(self)
+
+    def address_changed(self):
+        """Call after the ID the device answers to on a multi-drop bus changed, so the bus routes to it."""
+        bus = self.bus
+        if bus is not None:
+            bus.reindex()
+
     def connect(self):
         self.connected = True
         self.logger.info(f"{self.name} connected.")
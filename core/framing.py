@@ -0,0 +1,168 @@
+from abc import ABC, abstractmethod
+import logging
+from typing import List, Optional
+
+class Framer(ABC):
+    """
+    Splits a byte stream into complete command frames.
+
+    Data arrives in whatever chunks the port delivers: half a command, or
+    several pipelined commands in one read. feed() buffers it and returns every
+    frame completed so far; an incomplete tail stays buffered for the next call.
+
+    The buffer is a bytearray with a read offset. Consumed bytes are not removed
+    per frame; the buffer is compacted once the consumed part outgrows the
+    unread part, so a burst of N frames costs one memmove instead of N.
+    """
+
+    def __init__(self, max_buffer: int = 65536):
+        self.max_buffer = max_buffer
+        self.logger = logging.getLogger(type(self).__name__)
+        self._buf = bytearray()
+        self._start = 0
+        self.frames = 0     # Complete frames returned
+        self.discarded = 0  # Bytes thrown away (noise, overflow)
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet part of a complete frame."""
+        return len(self._buf) - self._start
+
+    def reset(self):
+        self._buf.clear()
+        self._start = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buf += data
+        frames = []
+        view = memoryview(self._buf)
+        try:
+            while True:
+                end = self._next_frame_end()
+                if end is None:
+                    break
+                frames.append(bytes(view[self._start:end]))
+                self._start = end
+        finally:
+            view.release()
+        self.frames += len(frames)
+        self._compact()
+        return frames
+
+    def _skip(self, count: int):
+        """Drop `count` unread bytes (noise before a frame start)."""
+        self._start += count
+        self.discarded += count
+
+    def _compact(self):
+        if self._start and self._start >= len(self._buf) - self._start:
+            del self._buf[:self._start]
+            self._start = 0
+        if self.pending > self.max_buffer:
+            self.logger.warning(f"Receive buffer overflow, discarding {self.pending} bytes")
+            self.discarded += self.pending
+            self.reset()
+
+    @abstractmethod
+    def _next_frame_end(self) -> Optional[int]:
+        """
+        Return the buffer index just past the next complete frame starting at
+        self._start, or None if no complete frame is buffered yet.
+        """
+        pass
+
+class TerminatorFramer(Framer):
+    """Frames end with a terminator (e.g. CR LF); the terminator is kept in the frame."""
+
+    def __init__(self, terminator: bytes = b"\r\n", max_buffer: int = 65536):
+        super().__init__(max_buffer)
+        self.terminator = terminator
+
+    def _next_frame_end(self) -> Optional[int]:
+        idx = self._buf.find(self.terminator, self._start)
+        if idx < 0:
+            return None
+        return idx + len(self.terminator)
+
+class StxEtxFramer(Framer):
+    """
+    Frames run from STX to ETX inclusive. Bytes before an STX are line noise and
+    are discarded. `trailer` extra bytes after ETX (e.g. a binary checksum) are
+    included in the frame.
+    """
+
+    def __init__(self, stx: int = 0x02, etx: int = 0x03, trailer: int = 0, max_buffer: int = 65536):
+        super().__init__(max_buffer)
+        self.stx = stx
+        self.etx = etx
+        self.trailer = trailer
+
+    def _next_frame_end(self) -> Optional[int]:
+        begin = self._buf.find(self.stx, self._start)
+        if begin < 0:
+            self._skip(len(self._buf) - self._start)
+            return None
+        if begin > self._start:
+            self._skip(begin - self._start)
+        idx = self._buf.find(self.etx, begin + 1)
+        if idx < 0:
+            return None
+        end = idx + 1 + self.trailer
+        return end if end <= len(self._buf) else None
+
+class LengthFramer(Framer):
+    """
+    Frames whose length is known from the data: either a fixed `size`, or a
+    length field in a header (Modbus TCP MBAP, ISO-on-TCP TPKT).
+
+    :param size: Fixed frame size; when set, the length field arguments are ignored
+    :param length_offset: Offset of the length field in the frame
+    :param length_size: Width of the length field in bytes
+    :param adjust: Added to the length field value to get the whole frame size
+        (e.g. 6 for MBAP, whose length counts the bytes after the length field)
+    :param byteorder: "big" or "little"
+    """
+
+    def __init__(self, size: int = 0, length_offset: int = 0, length_size: int = 2,
+                 adjust: int = 0, byteorder: str = "big", max_buffer: int = 65536):
+        super().__init__(max_buffer)
+        self.size = size
+        self.length_offset = length_offset
+        self.length_size = length_size
+        self.adjust = adjust
+        self.byteorder = byteorder
+
+    def _next_frame_end(self) -> Optional[int]:
+        available = len(self._buf) - self._start
+        if self.size:
+            size = self.size
+        else:
+            header = self.length_offset + self.length_size
+            if available < header:
+                return None
+            field = self._start + self.length_offset
+            size = int.from_bytes(self._buf[field:field + self.length_size], self.byteorder) + self.adjust
+            if size < header:
+                # Corrupt length; resynchronise by dropping everything buffered
+                self._skip(available)
+                return None
+        if available < size:
+            return None
+        return self._start + size
+
+class ByteFramer(Framer):
+    """
+    Single-character commands (e.g. "P", "Z", "T"): every byte is a frame.
+    Bytes in `ignore` (line endings sent by some hosts) are dropped.
+    """
+
+    def __init__(self, ignore: bytes = b"\r\n", max_buffer: int = 65536):
+        super().__init__(max_buffer)
+        self.ignore = ignore
+
+    def _next_frame_end(self) -> Optional[int]:
+        while self._start < len(self._buf) and self._buf[self._start] in self.ignore:
+            self._skip(1)
+        if self._start >= len(self._buf):
+            return None
+        return self._start + 1
@@ -0,0 +1,118 @@
+import logging
+import signal
+import threading
+import time
+from typing import Dict, Optional
+from .simulator import Simulator
+from .project_manager import ProjectManager, ProjectLoadReport
+from devices.registry import register_builtin_devices
+
+class HeadlessRunner:
+    """
+    Runs a saved project without the GUI: loads the .ESPJ file, opens every
+    device's serial port from its saved connection_settings and keeps serving
+    until stop() or SIGINT/SIGTERM. Imports nothing from tkinter, so it starts
+    in milliseconds and works on machines without a display.
+    """
+
+    def __init__(self, project_path: str, io_backend: str = "auto", stats_interval: float = 0.0):
+        """
+        :param project_path: .ESPJ project to load
+        :param io_backend: CommManager backend ('auto', 'reactor', 'thread', 'asyncio')
+        :param stats_interval: Seconds between stats log lines while run() waits; 0 disables
+        """
+        self.project_path = project_path
+        self.stats_interval = stats_interval
+        self.logger = logging.getLogger("Headless")
+        self.simulator = Simulator(io_backend)
+        register_builtin_devices(self.simulator)
+        self.started: Dict[str, str] = {}  # Device name -> port opened for it
+        self.report: Optional[ProjectLoadReport] = None
+        self._stop = threading.Event()
+        self._shut_down = False
+
+    def start(self) -> bool:
+        """
+        Load the project and open every device's port in parallel (see
+        ProjectManager.bulk_load). Devices whose port cannot be opened are
+        logged and skipped. Returns False if the project failed to load.
+        """
+        self.report = ProjectManager().bulk_load(self.simulator, self.project_path, rollback=False)
+        if self.report.errors:
+            return False
+        for result in self.report.devices:
+            if result.ok and result.port:
+                self.started[result.name] = result.port
+            elif not result.ok:
+                self.logger.error(f"{result.name}: failed to open {result.port}: {result.error}")
+        return True
+
+    def stats(self) -> dict:
+        comm = self.simulator.comm_manager
+        devices = {}
+        for name, port in self.started.items():
+            device = self.simulator.devices.get(name)
+            if device is None:
+                continue
+            entry = {"port": port, "output": comm.output_stats(port)}
+            if getattr(device, "is_streaming", False):
+                entry["stream"] = device.stream_stats
+            if hasattr(device, "frame_cache_stats"):
+                entry["frame_cache"] = device.frame_cache_stats
+            devices[name] = entry
+        return {"devices": devices, "monitors": comm.monitor_stats()}
+
+    def log_stats(self):
+        for name, entry in self.stats()["devices"].items():
+            output = entry["output"] or {}
+            line = f"{name} [{entry['port']}] writes={output.get('writes', 0)} bytes={output.get('bytes', 0)}"
+            if "stream" in entry:
+                stream = entry["stream"]
+                line += f" stream sent={stream['sent']} dropped={stream['dropped']} coalesced={stream['coalesced']}"
+            self.logger.info(line)
+
+    def install_signal_handlers(self):
+        """Stop on SIGINT/SIGTERM. Only possible from the main thread."""
+        def handler(signum, frame):
+            self.logger.info(f"Received signal {signum}, shutting down")
+            self._stop.set()
+        signal.signal(signal.SIGINT, handler)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, handler)
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Block until stop() or a signal (or `duration` seconds), dumping stats
+        every stats_interval, then shut everything down.
+        """
+        now = time.monotonic()
+        deadline = now + duration if duration is not None else None
+        next_stats = now + self.stats_interval if self.stats_interval else None
+        try:
+            # Short waits so Ctrl+C is handled promptly on Windows too
+            while not self._stop.wait(0.2):
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                if next_stats is not None and now >= next_stats:
+                    self.log_stats()
+                    next_stats = now + self.stats_interval
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.simulator.stop()
+        self.logger.info("Stopped")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,171 @@
+import threading
+import time
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+MonitorCallback = Callable[[str, str, bytes], None]
+
+# Overflow policies for a subscriber whose queue is full
+DROP_OLDEST = "drop-oldest"  # Discard the oldest queued event to make room (default)
+DROP_NEWEST = "drop-newest"  # Discard the event being published
+BLOCK = "block"              # Wait for room; slows the I/O thread down to the subscriber's pace
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+class MonitorSubscriber:
+    """
+    One monitor callback with its own bounded queue and delivery thread, so a
+    slow subscriber only ever delays (or loses) its own events.
+    """
+
+    def __init__(self, callback: MonitorCallback, capacity: int = 10000, policy: str = DROP_OLDEST):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.callback = callback
+        self.capacity = capacity
+        self.policy = policy
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.logger = logging.getLogger("MonitorDispatcher")
+        self._queue: Deque[Tuple[float, str, str, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._running = True
+        self._busy = False
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_lag = 0.0  # Seconds from publish to delivery of the latest event
+        self.max_lag = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"Monitor:{self.name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, port: str, direction: str, data: bytes):
+        """Queue an event; called on the I/O thread."""
+        event = (time.monotonic(), port, direction, data)
+        with self._cond:
+            if not self._running:
+                return
+            if len(self._queue) >= self.capacity:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while self._running and len(self._queue) >= self.capacity:
+                        self._cond.wait()
+                    if not self._running:
+                        return
+            self._queue.append(event)
+            if len(self._queue) > self.max_depth:
+                self.max_depth = len(self._queue)
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                if not self._running:
+                    return
+                published, port, direction, data = self._queue.popleft()
+                self._busy = True
+                # Wake a publisher blocked on a full queue
+                self._cond.notify_all()
+            try:
+                self.callback(port, direction, data)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Error in monitor callback {self.name}: {e}")
+            lag = time.monotonic() - published
+            self.last_lag = lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+            self.delivered += 1
+
+    def wait_idle(self, timeout: float = 1.0) -> bool:
+        """Wait until every queued event was delivered. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "queued": len(self._queue),
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "lag_ms": self.last_lag * 1000,
+            "max_lag_ms": self.max_lag * 1000,
+        }
+
+class MonitorDispatcher:
+    """
+    Fans monitor events out to subscribers off the I/O path. publish() only
+    appends to each subscriber's queue; callbacks run on the subscribers' own
+    threads, so a slow GUI or file logger no longer adds to response latency.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[MonitorCallback, MonitorSubscriber] = {}
+        self._lock = threading.Lock()
+        # Snapshot iterated by publish(); replaced on subscribe/unsubscribe so publish takes no lock
+        self._active: Tuple[MonitorSubscriber, ...] = ()
+
+    def subscribe(self, callback: MonitorCallback, capacity: int = 10000, policy: str = DROP_OLDEST) -> MonitorSubscriber:
+        with self._lock:
+            subscriber = self._subscribers.get(callback)
+            if subscriber is None:
+                subscriber = MonitorSubscriber(callback, capacity, policy)
+                self._subscribers[callback] = subscriber
+                self._active = tuple(self._subscribers.values())
+            return subscriber
+
+    def unsubscribe(self, callback: MonitorCallback):
+        with self._lock:
+            subscriber = self._subscribers.pop(callback, None)
+            self._active = tuple(self._subscribers.values())
+        if subscriber:
+            subscriber.stop()
+
+    def __contains__(self, callback: MonitorCallback) -> bool:
+        return callback in self._subscribers
+
+    def publish(self, port: str, direction: str, data: bytes):
+        for subscriber in self._active:
+            subscriber.offer(port, direction, data)
+
+    def wait_idle(self, timeout: float = 1.0) -> bool:
+        """Wait until all subscribers have caught up (tests, shutdown)."""
+        deadline = time.monotonic() + timeout
+        return all(s.wait_idle(max(0.0, deadline - time.monotonic())) for s in self._active)
+
+    def stats(self) -> List[dict]:
+        return [s.stats() for s in self._active]
+
+    def stop(self):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+            self._subscribers.clear()
+            self._active = ()
+        for subscriber in subscribers:
+            subscriber.stop()
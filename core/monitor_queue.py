@@ -0,0 +1,61 @@
+import time
+from collections import deque
+from typing import Deque, List, Tuple
+
+# (timestamp, port, direction, data); formatted only when displayed
+MonitorEvent = Tuple[float, str, str, bytes]
+
+class MonitorEventQueue:
+    """
+    Hand-off of monitor events from I/O threads to the UI thread.
+
+    put() is called on the I/O side and only appends raw bytes to a deque
+    (append/popleft are atomic in CPython, so no lock is taken). The UI drains
+    the queue in batches on its own refresh tick. When the UI falls behind and
+    the queue is full, new events are counted as dropped instead of blocking
+    the I/O thread or growing without bound.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._events: Deque[MonitorEvent] = deque()
+        self.dropped = 0        # Events dropped since the last drain()
+        self.total_dropped = 0
+
+    def put(self, port: str, direction: str, data: bytes):
+        if len(self._events) >= self.capacity:
+            self.dropped += 1
+            self.total_dropped += 1
+            return
+        self._events.append((time.time(), port, direction, data))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def drain(self, max_events: int) -> Tuple[List[MonitorEvent], int]:
+        """
+        Take up to max_events events, oldest first.
+        Returns (events, number of events dropped since the previous drain).
+        """
+        events = []
+        popleft = self._events.popleft
+        try:
+            for _ in range(min(max_events, len(self._events))):
+                events.append(popleft())
+        except IndexError:
+            # Concurrent clear()
+            pass
+        dropped, self.dropped = self.dropped, 0
+        return events, dropped
+
+    def clear(self):
+        self._events.clear()
+        self.dropped = 0
+
+def format_monitor_line(event: MonitorEvent) -> str:
+    """One Comm Monitor line: time, port, direction, ASCII text and hex dump."""
+    timestamp, port, direction, data = event
+    clock = time.strftime("%H:%M:%S", time.localtime(timestamp))
+    millis = int((timestamp % 1) * 1000)
+    text_data = data.decode('ascii', errors='replace')
+    return f"[{clock}.{millis:03d}] [{port}] [{direction}] {text_data} <{data.hex().upper()}>\n"
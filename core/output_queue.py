@@ -0,0 +1,81 @@
+import threading
+import logging
+from collections import deque
+from typing import Callable, Deque
+
+class PortOutputQueue:
+    """
+    Ordered output queue for one port, shared by response writes and stream writes.
+
+    There is no writer thread. The first thread to find the queue idle becomes the
+    flusher: it takes everything queued so far, writes it with one call and repeats
+    until the queue is empty. Threads arriving meanwhile only append and return;
+    the flusher writes their data in arrival order. So:
+    - frames never interleave on the wire (only one thread writes at a time)
+    - frames queued while a write is in progress go out together in one write
+    """
+
+    def __init__(self, port: str, write: Callable[[bytes], None], on_flush: Callable[[bytes], None]):
+        """
+        :param write: Writes bytes to the port (e.g. serial.Serial.write)
+        :param on_flush: Called with each batch after it was written (monitors, logging)
+        """
+        self.port = port
+        self._write = write
+        self._on_flush = on_flush
+        self._queue: Deque[bytes] = deque()
+        self._lock = threading.Lock()
+        self._flushing = False
+        self.closed = False
+        self.writes = 0     # write() calls made on the port
+        self.frames = 0     # Frames queued
+        self.bytes = 0
+        self.coalesced = 0  # Frames that shared a write with an earlier frame
+        self.errors = 0
+        self.logger = logging.getLogger(f"PortOutputQueue.{port}")
+
+    def put(self, data: bytes) -> bool:
+        """Queue data for the port. Returns False if the queue is closed."""
+        with self._lock:
+            if self.closed:
+                return False
+            self._queue.append(data)
+            self.frames += 1
+            if self._flushing:
+                return True
+            self._flushing = True
+        self._flush()
+        return True
+
+    def _flush(self):
+        while True:
+            with self._lock:
+                if not self._queue or self.closed:
+                    self._queue.clear()
+                    self._flushing = False
+                    return
+                if len(self._queue) == 1:
+                    batch = self._queue.popleft()
+                else:
+                    batch = b"".join(self._queue)
+                    self.coalesced += len(self._queue) - 1
+                    self._queue.clear()
+            try:
+                self._write(batch)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Error writing to {self.port}: {e}")
+                continue
+            self.writes += 1
+            self.bytes += len(batch)
+            self._on_flush(batch)
+
+    def close(self):
+        """Discard anything still queued and refuse further data."""
+        with self._lock:
+            self.closed = True
+            self._queue.clear()
+
+    def stats(self) -> dict:
+        return {"frames": self.frames, "writes": self.writes, "bytes": self.bytes,
+                "coalesced": self.coalesced, "errors": self.errors}
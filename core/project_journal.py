@@ -0,0 +1,308 @@
+"""
+Append-only change journal next to a project file (<project>.journal).
+
+The project file is a snapshot; the journal holds the edits made since, one
+JSON object per line:
+
+    {"journal": 1, "generation": 3}                                  header
+    {"op": "set", "device": "Scale 1", "state": {"current_weight": 12.5}}
+    {"op": "add", "device": "Scale 2", "model": "...", "device_id": "...", "state": {...}}
+    {"op": "remove", "device": "Scale 2"}
+    {"op": "rename", "device": "Scale 1", "to": "Line 1"}
+
+Records carry absolute values, so replaying them is idempotent. The header's
+generation must match the snapshot's "journal_generation"; a compaction
+writes the snapshot with the next generation and then restarts the journal,
+so a journal left behind by a crash in between is recognised as stale.
+A torn last line (crash mid-append) is ignored.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+JOURNAL_FORMAT = 1
+
+def journal_path(project_path: str) -> str:
+    return project_path + ".journal"
+
+def write_atomic(path: str, data: bytes):
+    """Replace `path` with `data` so readers see either the old or the new file, never a partial one."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable (POSIX)
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def read_journal(path: str) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+    """Return (generation, records); generation is None if there is no usable journal."""
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+    except OSError:
+        return None, []
+    try:
+        header = json.loads(lines[0])
+        generation = int(header["generation"])
+    except (ValueError, KeyError, TypeError):
+        return None, []
+    records = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # Torn write at the end; nothing after it was acknowledged
+            break
+    return generation, records
+
+def apply_journal(project: Dict[str, Any], records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply journal records to a (current format) project dict in place and return it."""
+    devices = project.setdefault("devices", [])
+    by_name = {entry["name"]: entry for entry in devices}
+    for record in records:
+        op, name = record.get("op"), record.get("device")
+        entry = by_name.get(name)
+        if op == "set":
+            if entry is not None:
+                entry.setdefault("state", {}).update(record.get("state", {}))
+        elif op == "add":
+            new_entry = {"name": name, "model": record.get("model"), "device_id": record.get("device_id"),
+                         "state": dict(record.get("state", {}))}
+            if entry is not None:
+                devices[devices.index(entry)] = new_entry
+            else:
+                devices.append(new_entry)
+            by_name[name] = new_entry
+        elif op == "remove":
+            if entry is not None:
+                devices.remove(entry)
+                del by_name[name]
+        elif op == "rename":
+            new_name = record.get("to")
+            if entry is not None and new_name and new_name not in by_name:
+                entry["name"] = new_name
+                by_name[new_name] = by_name.pop(name)
+    return project
+
+class ProjectJournal:
+    """Appends change records to a project's journal file. Thread-safe."""
+
+    def __init__(self, project_path: str, fsync: bool = False):
+        """
+        :param project_path: The .ESPJ file the journal belongs to
+        :param fsync: fsync after every append (survives power loss, not just a crash of the
+            simulator, at the cost of a disk flush per autosave tick)
+        """
+        self.path = journal_path(project_path)
+        self.fsync = fsync
+        self.generation: Optional[int] = None
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self.logger = logging.getLogger("ProjectJournal")
+
+    def open(self, generation: int):
+        """Continue the journal on disk if it belongs to `generation`, otherwise start a new one."""
+        with self._lock:
+            on_disk, records = read_journal(self.path)
+            if on_disk == generation:
+                self._close()
+                self._file = open(self.path, "ab")
+                self.generation = generation
+                self.records = len(records)
+                return
+        self.reset(generation)
+
+    def reset(self, generation: int):
+        """Start an empty journal for snapshot `generation` (after a compaction)."""
+        with self._lock:
+            self._close()
+            header = json.dumps({"journal": JOURNAL_FORMAT, "generation": generation}) + "\n"
+            write_atomic(self.path, header.encode("utf-8"))
+            self._file = open(self.path, "ab")
+            self.generation = generation
+            self.records = 0
+
+    def append(self, records: List[Dict[str, Any]]):
+        """Write records with a single write call; a crash leaves at most the last line torn."""
+        if not records:
+            return
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("journal is not open")
+            self._file.write(data.encode("utf-8"))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records += len(records)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+class ProjectAutosaver:
+    """
+    Journals device changes on a timer. Devices report changes to their saved
+    fields (Equipment.state_changed()); each tick dumps only the devices that
+    reported one and appends the fields that differ from what was journaled
+    last, so an autosave costs O(change), not O(project). Added, removed and
+    renamed devices are found by comparing the device table with the one seen
+    at the last tick, which dumps nothing. After `compact_after` records the
+    project is compacted (rewritten atomically and the journal restarted).
+
+    Readings generated by a running signal (BaseScale.set_reading) are live
+    data and are not journaled; a full save records the weight shown then.
+    Weights set by hand are, at most one record per device per tick.
+    """
+
+    def __init__(self, project_manager, simulator, filepath: str, interval: float = 1.0,
+                 compact_after: int = 5000):
+        self.project_manager = project_manager
+        self.simulator = simulator
+        self.filepath = filepath
+        self.interval = interval
+        self.compact_after = compact_after
+        self.logger = logging.getLogger("ProjectAutosaver")
+        # Devices that reported a change since the last tick, in order (dict as an ordered set)
+        self._dirty: Dict[Any, None] = {}
+        self._dirty_lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        # name -> (device object, model, device_id, last journaled state)
+        self._baseline: Dict[str, Tuple[Any, str, str, Dict[str, Any]]] = {}
+        # Device table as of the last tick (name -> device object)
+        self._devices: Dict[str, Any] = {}
+        self.rebase()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ProjectAutosaver", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        if flush:
+            self.tick()
+        for device in self._devices.values():
+            self._unwatch(device)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                self.logger.error(f"Autosave failed: {e}")
+
+    def _mark_dirty(self, device):
+        with self._dirty_lock:
+            self._dirty[device] = None
+
+    def _watch(self, device):
+        device.on_state_change = self._mark_dirty
+
+    def _unwatch(self, device):
+        if device.on_state_change == self._mark_dirty:
+            device.on_state_change = None
+
+    @staticmethod
+    def _entry(device) -> Tuple[Any, str, str, Dict[str, Any]]:
+        return device, device.model, device.device_id, device.STATE_SCHEMA.dump(device)
+
+    def rebase(self):
+        """Take the current state of every device as journaled (after a full save)."""
+        with self._tick_lock:
+            with self._dirty_lock:
+                self._dirty.clear()
+            self._devices = dict(self.simulator.devices)
+            self._baseline = {name: self._entry(device) for name, device in self._devices.items()}
+            for device in self._devices.values():
+                self._watch(device)
+
+    def diff(self) -> List[Dict[str, Any]]:
+        """Journal records turning the baseline into the current state; updates the baseline."""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {}
+        current = dict(self.simulator.devices)
+        records = []
+        if current != self._devices:
+            records.extend(self._table_changes(current, dirty))
+        for device in dirty:
+            name = device.name
+            old = self._baseline.get(name)
+            if current.get(name) is not device or old is None or old[0] is not device:
+                continue  # Removed, or added this tick with its full state
+            entry = self._entry(device)
+            _, model, device_id, state = entry
+            if old[1] != model or old[2] != device_id:
+                records.append({"op": "add", "device": name, "model": model, "device_id": device_id, "state": state})
+            else:
+                changed = {key: value for key, value in state.items() if old[3].get(key) != value}
+                if changed:
+                    records.append({"op": "set", "device": name, "state": changed})
+            self._baseline[name] = entry
+        return records
+
+    def _table_changes(self, current: Dict[str, Any], dirty: Dict[Any, None]) -> List[Dict[str, Any]]:
+        """Records for devices added, removed or renamed since the last tick."""
+        records = []
+        previous = {id(device): name for name, device in self._devices.items()}
+        baseline, renamed = {}, set()
+        for name, device in current.items():
+            old = self._baseline.get(name)
+            if old is not None and old[0] is device:
+                baseline[name] = old
+                continue
+            old_name = previous.get(id(device))
+            if old_name is not None and old_name not in current:
+                records.append({"op": "rename", "device": old_name, "to": name})
+                renamed.add(old_name)
+                baseline[name] = self._baseline[old_name]
+                dirty[device] = None  # Its fields may have changed too
+            else:
+                baseline[name] = entry = self._entry(device)
+                records.append({"op": "add", "device": name, "model": entry[1], "device_id": entry[2],
+                                "state": entry[3]})
+                dirty.pop(device, None)
+            self._watch(device)
+        for name, device in self._devices.items():
+            if name not in current and name not in renamed:
+                records.append({"op": "remove", "device": name})
+                self._unwatch(device)
+        self._devices = current
+        self._baseline = baseline
+        return records
+
+    def tick(self) -> int:
+        """Journal pending changes now. Returns the number of records written."""
+        with self._tick_lock:
+            records = self.diff()
+            if not records:
+                return 0
+            journal = self.project_manager.journal_for(self.filepath)
+            journal.append(records)
+            compact = journal.records >= self.compact_after
+        if compact:
+            self.logger.info(f"Compacting {self.filepath} after {journal.records} journal records")
+            self.project_manager.save_project(self.simulator, self.filepath)
+        return len(records)
@@ -1,19 +1,72 @@
 import json
 import logging
-from typing import Dict, Any
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, NamedTuple, Optional
 from datetime import datetime
+from .state_schema import PROJECT_FORMAT_VERSION, PARITY_CONVERT, migrate_project
+from .project_journal import (ProjectJournal, ProjectAutosaver, apply_journal, journal_path,
+                              read_journal, write_atomic)
+
+class DeviceLoadResult(NamedTuple):
+    name: str
+    port: Optional[str]
+    ok: bool
+    latency: float  # Seconds to open the port
+    error: str = ""
+
+class ProjectLoadReport:
+    """Outcome of ProjectManager.bulk_load()."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.errors: List[str] = []  # Validation errors; nothing was changed if there are any
+        self.devices: List[DeviceLoadResult] = []
+        self.rolled_back = False
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.rolled_back and all(d.ok for d in self.devices)
+
+    @property
+    def failed(self) -> List[DeviceLoadResult]:
+        return [d for d in self.devices if not d.ok]
+
+    def summary(self) -> str:
+        if self.errors:
+            return f"{self.filepath}: invalid project ({len(self.errors)} errors)"
+        opened = sum(1 for d in self.devices if d.ok)
+        slowest = max((d.latency for d in self.devices), default=0.0)
+        text = (f"{self.filepath}: {opened}/{len(self.devices)} ports opened in {self.elapsed * 1000:.0f} ms "
+                f"(slowest {slowest * 1000:.0f} ms)")
+        if self.rolled_back:
+            text += ", rolled back"
+        return text
 
 class ProjectManager:
     """Handles saving and loading of project files (.ESPJ)"""
     
     def __init__(self):
         self.logger = logging.getLogger("ProjectManager")
-        self.version = "1.0"
+        self.version = PROJECT_FORMAT_VERSION
+        # Snapshot generation of each project file read or written (see core.project_journal)
+        self._generations: Dict[str, int] = {}
+        self._journals: Dict[str, ProjectJournal] = {}
+        self._autosaver: Optional[ProjectAutosaver] = None
+        self._save_lock = threading.Lock()
     
     def save_project(self, simulator, filepath: str) -> bool:
         """
         Save current simulator state to a project file.
         
+        The file is replaced atomically (temp file, fsync, rename), so a crash
+        leaves either the previous or the new project. This also compacts the
+        change journal: the snapshot gets the next generation and the journal
+        starts over.
+        
         Args:
             simulator: Simulator instance
             filepath: Path to save the .ESPJ file
@@ -21,48 +74,45 @@ class ProjectManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            project_data = {
-                "version": self.version,
-                "created": datetime.now().isoformat(),
-                "devices": []
-            }
-            
-            # Serialize each device
-            for name, device in simulator.devices.items():
-                device_data = {
-                    "name": name,
-                    "model": device.model,
-                    "device_id": device.device_id,
-                    "connection_settings": device.connection_settings.copy(),
-                    "current_weight": device.current_weight if hasattr(device, 'current_weight') else 0.0,
-                    "is_stable": device.is_stable if hasattr(device, 'is_stable') else True,
+        key = os.path.abspath(filepath)
+        with self._save_lock:
+            try:
+                generation = self._generation_of(filepath) + 1
+                project_data = {
+                    "version": self.version,
+                    "created": datetime.now().isoformat(),
+                    "journal_generation": generation,
+                    "devices": []
                 }
-                
-                # Add scale-specific settings
-                if hasattr(device, 'current_format'):
-                    device_data["current_format"] = device.current_format
-                if hasattr(device, 'print_mode'):
-                    device_data["print_mode"] = device.print_mode
-                if hasattr(device, 'weight_range'):
-                    device_data["weight_range"] = device.weight_range
-                if hasattr(device, '_current_command_mode'):
-                    device_data["command_mode"] = device._current_command_mode
-                if hasattr(device, '_use_bcc'):
-                    device_data["use_bcc"] = device._use_bcc
-                    
-                project_data["devices"].append(device_data)
             
-            # Write to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, indent=2, ensure_ascii=False)
+                # Serialize each device through its class's state schema
+                for name, device in list(simulator.devices.items()):
+                    project_data["devices"].append({
+                        "name": name,
+                        "model": device.model,
+                        "device_id": device.device_id,
+                        "state": device.STATE_SCHEMA.dump(device),
+                    })
             
-            self.logger.info(f"Project saved to {filepath}")
-            return True
+                # Write to file
+                write_atomic(filepath, json.dumps(project_data, indent=2, ensure_ascii=False).encode('utf-8'))
+                self._generations[key] = generation
             
-        except Exception as e:
-            self.logger.error(f"Failed to save project: {e}")
-            return False
+                # Edits so far are in the snapshot now; the old journal is stale from here on
+                journal = self._journals.get(key)
+                if journal:
+                    journal.reset(generation)
+                elif os.path.exists(journal_path(filepath)):
+                    os.remove(journal_path(filepath))
+                if self._autosaver and os.path.abspath(self._autosaver.filepath) == key:
+                    self._autosaver.rebase()
+            
+                self.logger.info(f"Project saved to {filepath}")
+                return True
+            
+            except Exception as e:
+                self.logger.error(f"Failed to save project: {e}")
+                return False
     
     def load_project(self, simulator, filepath: str) -> bool:
         """
@@ -76,12 +126,7 @@ class ProjectManager:
             True if successful, False otherwise
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                project_data = json.load(f)
-            
-            # Validate version
-            if project_data.get("version") != self.version:
-                self.logger.warning(f"Project version mismatch: {project_data.get('version')} vs {self.version}")
+            project_data = self.read_project(filepath)
             
             # Clear existing devices
             device_names = list(simulator.devices.keys())
@@ -95,38 +140,8 @@ class ProjectManager:
             
             # Recreate devices
             for device_data in project_data.get("devices", []):
-                name = device_data["name"]
-                model = device_data["model"]
-                device_id = device_data["device_id"]
-                
-                # Create device
-                if simulator.create_device(model, name, device_id):
-                    device = simulator.get_device(name)
-                    
-                    # Restore settings
-                    conn_settings = device_data.get("connection_settings", {})
-                    # Convert parity from display format to storage format if needed
-                    parity_convert = {"None": 'N', "Even": 'E', "Odd": 'O', "Mark": 'M', "Space": 'S'}
-                    if "parity" in conn_settings and conn_settings["parity"] in parity_convert:
-                        conn_settings["parity"] = parity_convert[conn_settings["parity"]]
-                    device.connection_settings = conn_settings
-                    
-                    if hasattr(device, 'current_weight'):
-                        device.current_weight = device_data.get("current_weight", 0.0)
-                    if hasattr(device, 'is_stable'):
-                        device.is_stable = device_data.get("is_stable", True)
-                    if hasattr(device, 'current_format') and "current_format" in device_data:
-                        device.current_format = device_data["current_format"]
-                    if hasattr(device, 'print_mode') and "print_mode" in device_data:
-                        device.print_mode = device_data["print_mode"]
-                    if hasattr(device, 'weight_range') and "weight_range" in device_data:
-                        device.weight_range = device_data["weight_range"]
-                    if hasattr(device, 'set_command_mode') and "command_mode" in device_data:
-                        device.set_command_mode(device_data["command_mode"])
-                    if hasattr(device, 'set_use_bcc') and "use_bcc" in device_data:
-                        device.set_use_bcc(device_data["use_bcc"])
-                else:
-                    self.logger.error(f"Failed to create device: {name} ({model})")
+                if not self._restore_device(simulator, device_data):
+                    self.logger.error(f"Failed to create device: {device_data['name']} ({device_data['model']})")
             
             self.logger.info(f"Project loaded from {filepath}")
             return True
@@ -134,3 +149,340 @@ class ProjectManager:
         except Exception as e:
             self.logger.error(f"Failed to load project: {e}")
             return False
+
+    def read_project(self, filepath: str) -> Dict[str, Any]:
+        """
+        Read a project file, upgrade it to the current format version and
+        replay the change journal written since it was saved.
+        
+        Raises:
+            OSError, ValueError: unreadable file, invalid JSON or unknown version
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            project_data = json.load(f)
+        if project_data.get("version") != self.version:
+            self.logger.info(f"Migrating project from version {project_data.get('version')} to {self.version}")
+            project_data = migrate_project(project_data)
+        generation = int(project_data.get("journal_generation", 0))
+        self._generations[os.path.abspath(filepath)] = generation
+        journal_generation, records = read_journal(journal_path(filepath))
+        if journal_generation == generation and records:
+            apply_journal(project_data, records)
+            self.logger.info(f"Recovered {len(records)} unsaved changes from the journal")
+        return project_data
+
+    def _generation_of(self, filepath: str) -> int:
+        key = os.path.abspath(filepath)
+        if key not in self._generations:
+            # Never read or written by us: stay clear of any journal already there
+            journal_generation, _ = read_journal(journal_path(filepath))
+            generation = journal_generation or 0
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    generation = max(generation, int(json.load(f).get("journal_generation", 0)))
+            except (OSError, ValueError):
+                pass
+            self._generations[key] = generation
+        return self._generations[key]
+
+    def journal_for(self, filepath: str) -> ProjectJournal:
+        """The change journal of a project file, opened for appending."""
+        key = os.path.abspath(filepath)
+        journal = self._journals.get(key)
+        if journal is None:
+            journal = ProjectJournal(filepath)
+            journal.open(self._generation_of(filepath))
+            self._journals[key] = journal
+        return journal
+
+    def start_autosave(self, simulator, filepath: str, interval: float = 1.0) -> ProjectAutosaver:
+        """
+        Journal every device change to `filepath`'s journal from now on. The
+        current simulator state is taken as saved: call right after loading or
+        saving the project.
+        """
+        self.stop_autosave()
+        self.journal_for(filepath)
+        self._autosaver = ProjectAutosaver(self, simulator, filepath, interval)
+        self._autosaver.start()
+        return self._autosaver
+
+    def stop_autosave(self):
+        """Write pending changes to the journal and stop autosaving."""
+        autosaver, self._autosaver = self._autosaver, None
+        if autosaver:
+            autosaver.stop()
+            journal = self._journals.pop(os.path.abspath(autosaver.filepath), None)
+            if journal:
+                journal.close()
+
+    def _restore_device(self, simulator, device_data: Dict[str, Any]):
+        """Create one device from its project entry and restore its state. Returns the device or None."""
+        name = device_data["name"]
+        if not simulator.create_device(device_data["model"], name, device_data["device_id"]):
+            return None
+        device = simulator.get_device(name)
+        device.STATE_SCHEMA.load(device, device_data.get("state", {}))
+        return device
+
+    def validate_project(self, simulator, project_data: Dict[str, Any], check_ports: bool = True) -> List[str]:
+        """
+        Check a parsed project before anything is changed.
+        
+        Args:
+            simulator: Simulator instance (provides the registered models)
+            project_data: Project as returned by read_project()
+            check_ports: Reject two devices on the same port unless both are multidrop (only matters when ports are opened)
+        
+        Returns:
+            A list of problems (unknown models, duplicate names or ports, state that does not
+            match the model's schema, bad serial settings); empty if valid
+        """
+        errors = []
+        devices = project_data.get("devices")
+        if not isinstance(devices, list):
+            return ["'devices' is missing or not a list"]
+        names, ports = set(), {}
+        for i, device_data in enumerate(devices):
+            name = device_data.get("name") if isinstance(device_data, dict) else None
+            if not name:
+                errors.append(f"Device #{i + 1}: missing name")
+                continue
+            if name in names:
+                errors.append(f"{name}: duplicate device name")
+            names.add(name)
+            if "device_id" not in device_data:
+                errors.append(f"{name}: missing device_id")
+            state = device_data.get("state")
+            if not isinstance(state, dict):
+                errors.append(f"{name}: missing state")
+                continue
+            model = device_data.get("model")
+            if model not in simulator.device_types:
+                errors.append(f"{name}: unknown model {model!r}")
+            else:
+                try:
+                    schema = simulator.resolve_device_class(model).STATE_SCHEMA
+                    errors.extend(f"{name}: {problem}" for problem in schema.validate(state))
+                except (ImportError, AttributeError) as e:
+                    errors.append(f"{name}: cannot load model {model!r}: {e}")
+            settings = state.get("connection_settings") or {}
+            if check_ports:
+                conflict = self._claim_port(ports, name, settings)
+                if conflict:
+                    errors.append(f"{name}: {conflict}")
+            try:
+                if int(settings.get("baudrate", 9600)) <= 0:
+                    raise ValueError
+                if int(settings.get("bytesize", 8)) not in (5, 6, 7, 8):
+                    raise ValueError
+                if float(settings.get("stopbits", 1)) not in (1, 1.5, 2):
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors.append(f"{name}: invalid serial settings {settings}")
+            parity = settings.get("parity", 'N')
+            if PARITY_CONVERT.get(parity, parity) not in PARITY_CONVERT.values():
+                errors.append(f"{name}: invalid parity {parity!r}")
+        return errors
+
+    def bulk_load(self, simulator, filepath: str, start_comm: bool = True,
+                  max_workers: int = 16, rollback: bool = True) -> ProjectLoadReport:
+        """
+        Load a project and bring all of its ports up at once.
+        
+        The whole file is validated first; on any error nothing is changed.
+        Then the devices are created and every device's serial port is opened
+        on a thread pool, so the per-port open and DTR/RTS latency overlap.
+        
+        Args:
+            simulator: Simulator instance
+            filepath: Path to the .ESPJ file
+            start_comm: Open each device's port from its connection_settings
+            max_workers: Ports opened concurrently
+            rollback: If any port fails to open, close the ones that opened and
+                restore the previous devices (and their ports); otherwise keep
+                the devices that came up
+            
+        Returns:
+            A ProjectLoadReport with per-device success and open latency
+        """
+        report = ProjectLoadReport(filepath)
+        started = time.perf_counter()
+        try:
+            project_data = self.read_project(filepath)
+        except (OSError, ValueError) as e:
+            report.errors.append(f"Failed to read project: {e}")
+            return report
+        # Without rollback a port clash only fails the later device (see _open_devices)
+        report.errors = self.validate_project(simulator, project_data, check_ports=start_comm and rollback)
+        if report.errors:
+            for error in report.errors:
+                self.logger.error(error)
+            return report
+
+        # Take the current devices offline, remembering how to bring them back
+        previous = dict(simulator.devices)
+        previous_state = self._release_devices(simulator)
+        simulator.devices.clear()
+
+        created = []
+        for device_data in project_data["devices"]:
+            try:
+                device = self._restore_device(simulator, device_data)
+                error = "" if device else "failed to create device"
+            except Exception as e:
+                device, error = None, str(e)
+            if device is None:
+                report.devices.append(DeviceLoadResult(device_data["name"], None, False, 0.0, error))
+            else:
+                created.append(device)
+
+        if start_comm:
+            report.devices.extend(self._open_devices(simulator, created, max_workers))
+        else:
+            report.devices.extend(DeviceLoadResult(d.name, self._port_label(d.connection_settings), True, 0.0)
+                                  for d in created)
+
+        if rollback and report.failed:
+            for result in report.devices:
+                if result.ok and result.port and start_comm:
+                    self._stop_device(simulator, simulator.devices.get(result.name), result.port)
+            for device in simulator.devices.values():
+                if getattr(device, 'is_streaming', False):
+                    device.stop_streaming()
+            simulator.devices.clear()
+            simulator.devices.update(previous)
+            self._reopen_devices(simulator, previous_state)
+            report.rolled_back = True
+        elif start_comm:
+            for result in report.devices:
+                if result.ok and result.port:
+                    self._go_online(simulator.devices[result.name])
+
+        report.elapsed = time.perf_counter() - started
+        log = self.logger.warning if report.failed else self.logger.info
+        log(report.summary())
+        return report
+
+    def _open_devices(self, simulator, devices: List, max_workers: int) -> List[DeviceLoadResult]:
+        """
+        Open the devices' ports on a thread pool. A device whose port is already
+        taken by an earlier device fails without touching the port.
+        """
+        ports, to_open, results = {}, [], {}
+        for device in devices:
+            conflict = self._claim_port(ports, device.name, device.connection_settings)
+            if conflict:
+                self.logger.error(f"{device.name}: {conflict}")
+                results[device.name] = DeviceLoadResult(device.name, self._port_label(device.connection_settings),
+                                                        False, 0.0, conflict)
+            else:
+                to_open.append(device)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_open) or 1)),
+                                thread_name_prefix="PortOpen") as pool:
+            for result in pool.map(lambda d: self._open_device_port(simulator, d), to_open):
+                results[result.name] = result
+        return [results[device.name] for device in devices]
+
+    def _claim_port(self, ports: Dict[str, tuple], name: str, settings: Dict[str, Any]) -> Optional[str]:
+        """
+        Record `name` as a user of its port in `ports` (port -> (first user, multidrop)).
+        Returns the problem if the port is already taken; devices marked "multidrop"
+        share their serial port as one RS-485 bus.
+        """
+        port = self._port_label(settings)
+        if not port:
+            return None
+        multidrop = bool(settings.get("multidrop"))
+        if port in ports and not (multidrop and ports[port][1]):
+            return f"port {port} is also used by {ports[port][0]}"
+        ports.setdefault(port, (name, multidrop))
+        return None
+
+    @staticmethod
+    def _port_label(settings: Dict[str, Any]) -> Optional[str]:
+        """'TCP:<n>' for devices served over TCP (connection_settings has "tcp_port"), else the serial port."""
+        if settings.get("tcp_port") is not None:
+            return f"TCP:{settings['tcp_port']}"
+        return settings.get("port")
+
+    def _open_device_port(self, simulator, device) -> DeviceLoadResult:
+        """Open one device's port or TCP listener (runs on the bring-up pool)."""
+        settings = device.connection_settings
+        port = self._port_label(settings)
+        if not port:
+            return DeviceLoadResult(device.name, None, True, 0.0, "no port configured")
+        t0 = time.perf_counter()
+        if "tcp_port" in settings:
+            try:
+                ok = simulator.start_device_tcp(device.name, int(settings["tcp_port"]), settings.get("host", "0.0.0.0"))
+                error = "" if ok else "failed to listen"
+            except Exception as e:
+                ok, error = False, str(e)
+            return DeviceLoadResult(device.name, port, ok, time.perf_counter() - t0, error)
+        try:
+            ok = simulator.start_device_comm(
+                device.name, port,
+                int(settings.get("baudrate", 9600)),
+                int(settings.get("bytesize", 8)),
+                settings.get("parity", 'N'),
+                float(settings.get("stopbits", 1))
+            )
+            error = "" if ok else simulator.comm_manager.open_errors.get(port, "failed to open port")
+        except Exception as e:
+            ok, error = False, str(e)
+        return DeviceLoadResult(device.name, port, ok, time.perf_counter() - t0, error)
+
+    @staticmethod
+    def _go_online(device):
+        device.connect()
+        # Same as starting the port from the UI: the saved print mode takes effect
+        if getattr(device, 'print_mode', None) == "Stream" and hasattr(device, 'start_streaming'):
+            device.start_streaming()
+
+    @staticmethod
+    def _stop_device(simulator, device, port: str):
+        if device is not None:
+            if getattr(device, 'is_streaming', False):
+                device.stop_streaming()
+            device.disconnect()
+        ProjectManager._stop_port(simulator, port)
+
+    @staticmethod
+    def _stop_port(simulator, port: str):
+        if port.startswith("TCP:"):
+            simulator.stop_device_tcp(int(port[4:]))
+        else:
+            simulator.stop_device_comm_by_port(port)
+
+    def _release_devices(self, simulator) -> List[tuple]:
+        """Stop the current devices' streams and ports. Returns (device, port was open, was streaming) for each."""
+        # Taken before stopping anything: the devices of a multi-drop bus share one port
+        comm = simulator.comm_manager
+        open_ports = set(comm.serial_ports) | {f"TCP:{n}" for n in comm.tcp_servers}
+        released, stopped = [], set()
+        for device in simulator.devices.values():
+            port = self._port_label(device.connection_settings)
+            port_open = port in open_ports
+            streaming = getattr(device, 'is_streaming', False)
+            if streaming:
+                device.stop_streaming()
+            if port_open:
+                device.disconnect()
+                if port not in stopped:
+                    self._stop_port(simulator, port)
+                    stopped.add(port)
+            released.append((device, port_open, streaming))
+        return released
+
+    def _reopen_devices(self, simulator, released: List[tuple]):
+        """Undo _release_devices() after a rolled back load."""
+        for device, port_open, streaming in released:
+            if port_open:
+                result = self._open_device_port(simulator, device)
+                if not result.ok:
+                    self.logger.error(f"Rollback: could not reopen {result.port} for {device.name}: {result.error}")
+                    continue
+                device.connect()
+            if streaming:
+                device.start_streaming()
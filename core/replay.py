@@ -0,0 +1,224 @@
+"""
+Replay of recorded traffic (core.capture files).
+
+Replayer plays the host side of a capture (RX frames) into simulated devices
+and diffs every response against the one recorded in the session. Frames are
+fed with the original inter-frame timing, N times faster, or as fast as
+possible (speed=0), which makes a capture both a regression test and a
+throughput benchmark for the device protocol classes.
+
+RecordedDevice goes the other way: it answers a real host with the responses
+recorded from a real device, in the recorded order, and reports where the
+host's commands differ from the recorded ones.
+
+Devices are not reset to the session's weights; set them up (e.g. from the
+project the session was recorded with) before replaying, or expect diffs in
+the weight fields.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from .capture import CaptureReader
+from .equipment import Equipment
+
+class ReplayMismatch(NamedTuple):
+    timestamp_ns: int  # Capture timestamp of the request
+    port: str
+    request: bytes
+    expected: bytes    # Recorded response
+    actual: bytes      # Response produced during replay
+
+class ReplayReport:
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        self.matched = 0
+        self.unsolicited = 0  # Recorded TX frames without a preceding request (streaming)
+        self.skipped_ports: Dict[str, int] = defaultdict(int)  # Frames of ports without a device
+        self.mismatches: List[ReplayMismatch] = []
+        self.elapsed = 0.0
+        self.max_late = 0.0  # Worst delay behind the replay schedule, seconds
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (f"{self.requests} requests, {self.matched} matched, {len(self.mismatches)} mismatched, "
+                f"{self.unsolicited} unsolicited frames, {self.elapsed:.3f}s "
+                f"({self.requests_per_second:,.0f} req/s, max {self.max_late * 1000:.1f} ms late)")
+        if self.skipped_ports:
+            text += ", no device for " + ", ".join(sorted(self.skipped_ports))
+        return text
+
+class ReplayClock:
+    """Maps capture timestamps to wall time: original pace divided by `speed`; speed <= 0 never waits."""
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self._origin: Optional[Tuple[int, float]] = None  # (first capture timestamp, monotonic start)
+        self.max_late = 0.0
+
+    def wait_until(self, timestamp_ns: int):
+        if self.speed <= 0:
+            return
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = (timestamp_ns, now)
+            return
+        first_ns, start = self._origin
+        due = start + (timestamp_ns - first_ns) / 1e9 / self.speed
+        if due > now:
+            time.sleep(due - now)
+        elif now - due > self.max_late:
+            self.max_late = now - due
+
+class Replayer:
+    """
+    Feeds the recorded RX traffic of each port into the device mapped to it and
+    compares the device's answer with the TX bytes recorded after that request
+    (up to the port's next request). TX frames recorded later than
+    `response_window` after a request are stream output and not compared.
+    """
+
+    def __init__(self, devices: Dict[str, Equipment], speed: float = 1.0, response_window: float = 0.5):
+        """
+        :param devices: Capture port name (e.g. 'COM3', 'TCP:5001') -> device
+        :param speed: 1.0 replays in real time, 10.0 ten times faster, 0 as fast as possible
+        :param response_window: Seconds after a request in which recorded TX counts as its response
+        """
+        self.devices = devices
+        self.speed = speed
+        self.response_window_ns = int(response_window * 1e9)
+        self.logger = logging.getLogger("Replayer")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_simulator(cls, simulator, speed: float = 1.0) -> "Replayer":
+        """Map each of the simulator's devices to the serial port in its connection settings."""
+        devices = {d.connection_settings.get("port"): d for d in simulator.devices.values()}
+        return cls(devices, speed)
+
+    def run(self, reader: CaptureReader, start_ns: Optional[int] = None,
+            end_ns: Optional[int] = None) -> ReplayReport:
+        report = ReplayReport()
+        clock = ReplayClock(self.speed)
+        # port -> (request timestamp, request, actual response, recorded response chunks)
+        pending: Dict[str, Tuple[int, bytes, bytes, List[bytes]]] = {}
+        for device in self.devices.values():
+            device.reset_framer()
+
+        started = time.perf_counter()
+        try:
+            for timestamp, port, direction, data in reader.records(start_ns=start_ns, end_ns=end_ns):
+                device = self.devices.get(port)
+                if device is None:
+                    report.skipped_ports[port] += 1
+                    continue
+                if direction == "TX":
+                    if port in pending and timestamp - pending[port][0] <= self.response_window_ns:
+                        pending[port][3].append(data)
+                    else:
+                        report.unsolicited += 1
+                    continue
+                if port in pending:
+                    self._compare(report, port, pending.pop(port))
+                clock.wait_until(timestamp)
+                report.requests += 1
+                pending[port] = (timestamp, data, self._call(device, data), [])
+            for port in list(pending):
+                self._compare(report, port, pending.pop(port))
+        finally:
+            if self._loop:
+                self._loop.close()
+                self._loop = None
+        report.elapsed = time.perf_counter() - started
+        report.max_late = clock.max_late
+        return report
+
+    def _call(self, device: Equipment, data: bytes) -> bytes:
+        result = device.handle_data(data)
+        if inspect.isawaitable(result):
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            result = self._loop.run_until_complete(result)
+        return result or b""
+
+    def _compare(self, report: ReplayReport, port: str, entry: Tuple[int, bytes, bytes, List[bytes]]):
+        timestamp, request, actual, chunks = entry
+        expected = b"".join(chunks)
+        if expected:
+            report.responses += 1
+        if actual == expected:
+            report.matched += 1
+        else:
+            report.mismatches.append(ReplayMismatch(timestamp, port, request, expected, actual))
+            self.logger.debug(f"[{port}] {request!r}: expected {expected!r}, got {actual!r}")
+
+class RecordedDevice(Equipment):
+    """
+    Stands in for a real device using one port of a capture: each host command
+    is answered with the next recorded response, after the recorded response
+    delay divided by `speed` (speed <= 0 answers immediately). Only TX recorded
+    within `response_window` of a command is part of its response. Commands that
+    differ from the recorded ones are collected in `mismatches`; they are still
+    answered, with the recorded response to an identical command if there is one.
+
+    The delay is slept on the I/O thread, so give a recorded device its own
+    port under the 'thread' backend when timing matters.
+    """
+
+    def __init__(self, name: str, device_id: str, reader: CaptureReader, port: str,
+                 speed: float = 1.0, response_window: float = 0.5):
+        super().__init__(name, device_id, model="Recorded")
+        self.speed = speed
+        self.response_window_ns = int(response_window * 1e9)
+        # (request, response, delay from request to first response frame in seconds)
+        self.exchanges: Deque[Tuple[bytes, bytes, float]] = deque()
+        self.by_request: Dict[bytes, bytes] = {}
+        self.mismatches: List[Tuple[bytes, bytes]] = []  # (expected command, received command)
+        self.unanswered: List[bytes] = []
+        self._load(reader, port)
+
+    def _load(self, reader: CaptureReader, port: str):
+        request, request_ns, response, delay = None, 0, [], 0.0
+
+        def finish():
+            if request is not None:
+                self.exchanges.append((request, b"".join(response), delay))
+                self.by_request.setdefault(request, b"".join(response))
+
+        for timestamp, _, direction, data in reader.records(port=port):
+            if direction == "RX":
+                finish()
+                request, request_ns, response, delay = data, timestamp, [], 0.0
+            elif request is not None and timestamp - request_ns <= self.response_window_ns:
+                if not response:
+                    delay = (timestamp - request_ns) / 1e9
+                response.append(data)
+        finish()
+
+    def create_framer(self):
+        # Commands are matched chunk for chunk as recorded
+        return None
+
+    def process_command(self, command: bytes) -> bytes:
+        if not self.exchanges:
+            response = self.by_request.get(command)
+            if response is None:
+                self.unanswered.append(command)
+            return response
+        request, response, delay = self.exchanges.popleft()
+        if command != request:
+            self.mismatches.append((request, command))
+            response = self.by_request.get(command, response)
+        if self.speed > 0 and delay > 0:
+            time.sleep(delay / self.speed)
+        return response or None
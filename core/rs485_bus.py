@@ -0,0 +1,254 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .equipment import Equipment
+from .framing import Framer
+
+STX = 0x02
+
+def leading_address(frame: bytes, width: int = 2) -> Optional[str]:
+    """
+    Address of a command that starts with a `width` character ID, optionally
+    after an STX: "01 RW\\r\\n" and "\\x0201RW..\\x03" (CAS simple / complex mode).
+    """
+    start = 1 if frame[:1] == bytes((STX,)) else 0
+    address = frame[start:start + width]
+    if len(address) < width:
+        return None
+    return address.decode("ascii", "replace")
+
+def device_address(device: Equipment) -> Optional[str]:
+    """
+    The ID a device answers to on a multi-drop bus (`bus_address`, else the CAS
+    `device_id_str`). Devices call address_changed() after changing it.
+    """
+    return getattr(device, "bus_address", None) or getattr(device, "device_id_str", None)
+
+def garble(responses: List[bytes]) -> bytes:
+    """
+    What the master receives when several drivers talk at once: the bus idles
+    high (mark), so a driven 0 wins and the bytes combine as a bitwise AND.
+    """
+    size = max(len(r) for r in responses)
+    combined = (1 << size * 8) - 1
+    for response in responses:
+        combined &= int.from_bytes(response.ljust(size, b"\xff"), "big")
+    return combined.to_bytes(size, "big")
+
+class RS485Bus:
+    """
+    A multi-drop (RS-485 half duplex) bus: several devices on one serial port.
+
+    Every framed command goes to the devices attached under the command's
+    address (an index lookup, not a broadcast to all devices). An answer
+    starts after the addressed device's turnaround delay, occupies the line
+    for its transmission time at the bus baud rate, and is written to the
+    port when its last character would have arrived. Answers never overlap.
+    The simulation shows the problems a polling master has on a real bus:
+    - Address conflict: two devices with the same ID answer together and the
+      master receives a garbled frame.
+    - Line collision: the master transmits while a device is still answering,
+      and that command is lost.
+    - Silence: nobody answers an unknown address.
+    """
+
+    def __init__(self, port: str, turnaround: float = 0.0,
+                 address_of: Callable[[bytes], Optional[str]] = leading_address,
+                 framer_factory: Optional[Callable[[], Optional[Framer]]] = None):
+        """
+        :param port: Serial port the bus is on
+        :param turnaround: Default seconds from the end of a command to the start of the
+            answer (RS-485 transmitter enable plus device processing, typically 1-10 ms)
+        :param address_of: Extracts the address from a framed command
+        :param framer_factory: Frames the command stream; defaults to the first attached device's framer
+        """
+        self.port = port
+        self.turnaround = turnaround
+        self.address_of = address_of
+        self.framer_factory = framer_factory
+        self.logger = logging.getLogger(f"RS485Bus.{port}")
+        self.devices: List[Equipment] = []
+        self._index: Dict[str, List[Equipment]] = {}
+        self._turnaround: Dict[int, float] = {}  # id(device) -> turnaround override
+        self._framer: Optional[Framer] = None
+        self._char_time = 10 / 9600
+        self._busy_until = 0.0  # Monotonic time the line is free again
+        self._lock = threading.Lock()
+        self.output: Optional[Callable[[bytes], None]] = None
+        # Delayed answers: heap of (due, sequence, data), sent by one worker thread
+        self._pending: List[Tuple[float, int, bytes]] = []
+        self._sequence = 0
+        self._wakeup = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.requests = 0
+        self.responses = 0
+        self.unanswered = 0       # Commands for an address no device has
+        self.conflicts = 0        # Commands answered by several devices at once
+        self.line_collisions = 0  # Commands sent while the line was busy (lost)
+
+    # --- Devices ---
+
+    def attach(self, device: Equipment, turnaround: Optional[float] = None):
+        """Put a device on the bus; it answers to device_address(device)."""
+        with self._lock:
+            if device not in self.devices:
+                self.devices.append(device)
+            if turnaround is not None:
+                self._turnaround[id(device)] = turnaround
+            self._reindex()
+        device.on_output = self.send
+        device.bus = self
+
+    def detach(self, device: Equipment):
+        with self._lock:
+            if device in self.devices:
+                self.devices.remove(device)
+            self._turnaround.pop(id(device), None)
+            self._reindex()
+        device.on_output = None
+        if device.bus is self:
+            device.bus = None
+
+    def reindex(self):
+        """Rebuild the address index after a device's ID changed (see Equipment.address_changed)."""
+        with self._lock:
+            self._reindex()
+
+    def _reindex(self):
+        index: Dict[str, List[Equipment]] = {}
+        for device in self.devices:
+            address = device_address(device)
+            if address is not None:
+                index.setdefault(address, []).append(device)
+        self._index = index
+
+    def devices_at(self, address: str) -> List[Equipment]:
+        return list(self._index.get(address, ()))
+
+    # --- Line ---
+
+    def configure_line(self, baudrate: int, bytesize: int = 8, parity: str = "N", stopbits: float = 1):
+        """Set the character time used for line occupancy."""
+        parity_bits = 0 if str(parity) in ("N", "None") else 1
+        self._char_time = (1 + int(bytesize) + parity_bits + float(stopbits)) / int(baudrate)
+
+    def open(self, comm_manager, baudrate: int, bytesize: int = 8, parity: str = "N", stopbits: float = 1) -> bool:
+        """Open the bus's serial port through a CommManager."""
+        self.configure_line(baudrate, bytesize, parity, stopbits)
+        port = self.port
+        self.output = lambda data: comm_manager.write(port, data)
+        return comm_manager.start_serial(port, baudrate, bytesize, parity, stopbits, self.handle_data)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._wakeup.notify_all()
+            devices = list(self.devices)
+        for device in devices:
+            if device.bus is self:
+                device.bus = None
+        if self._worker and self._worker is not threading.current_thread():
+            self._worker.join(timeout=1.0)
+        self._worker = None
+
+    def stats(self) -> dict:
+        return {"devices": len(self.devices), "requests": self.requests, "responses": self.responses,
+                "unanswered": self.unanswered, "conflicts": self.conflicts,
+                "line_collisions": self.line_collisions}
+
+    # --- Traffic ---
+
+    def handle_data(self, data: bytes) -> Optional[bytes]:
+        """
+        Receive callback for the bus port. A command that arrives while an
+        answer is still on the line is lost (line collision). Answers that are
+        due already are returned (written by CommManager); the rest are sent
+        by the worker.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._busy_until:
+                self.line_collisions += 1
+                if self._framer is not None:
+                    self._framer.reset()
+                self.logger.debug(f"Collision: {data!r} sent while the line was busy")
+                return None
+            if self._framer is None:
+                self._framer = self._create_framer()
+            frames = self._framer.feed(data) if self._framer is not None else [data]
+            index = self._index
+        immediate = []
+        for frame in frames:
+            self.requests += 1
+            devices = index.get(self.address_of(frame))
+            if not devices:
+                self.unanswered += 1
+                continue
+            responses = [r for r in (device.process_command(frame) for device in devices) if r]
+            if not responses:
+                self.unanswered += 1
+                continue
+            if len(responses) > 1:
+                self.conflicts += 1
+                response = garble(responses)
+            else:
+                response = responses[0]
+            delay = max(self._turnaround.get(id(device), self.turnaround) for device in devices)
+            if self._schedule(response, now + delay):
+                immediate.append(response)
+        return b"".join(immediate) or None
+
+    def send(self, data: bytes):
+        """Unsolicited output of a device on the bus (e.g. stream mode): goes out when the line is free."""
+        if data and self._schedule(data, time.monotonic()) and self.output:
+            self.output(data)
+
+    def _create_framer(self) -> Optional[Framer]:
+        if self.framer_factory is not None:
+            return self.framer_factory()
+        return self.devices[0].create_framer() if self.devices else None
+
+    def _schedule(self, data: bytes, earliest: float) -> bool:
+        """
+        Book the line for `data` from `earliest` (or when it is free). Returns
+        True if it is complete already and the caller sends it; otherwise the
+        worker sends it when its transmission ends.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(earliest, self._busy_until)
+            self._busy_until = done = start + len(data) * self._char_time
+            self.responses += 1
+            if done <= now and not self._pending:
+                return True
+            self._sequence += 1
+            heapq.heappush(self._pending, (done, self._sequence, data))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=f"RS485Bus.{self.port}", daemon=True)
+                self._worker.start()
+            self._wakeup.notify()
+            return False
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._pending:
+                        wait = self._pending[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._wakeup.wait(wait)
+                    else:
+                        self._wakeup.wait()
+                if self._closed:
+                    return
+                _, _, data = heapq.heappop(self._pending)
+            if self.output:
+                try:
+                    self.output(data)
+                except Exception as e:
+                    self.logger.error(f"Failed to send on {self.port}: {e}")
@@ -0,0 +1,128 @@
+import os
+import selectors
+import socket
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+class SerialReactor:
+    """
+    Multiplexes every open serial port on a single selector thread.
+
+    Instead of one polling thread per port, each port's file descriptor is
+    registered with the platform selector (epoll/kqueue/poll). The reactor
+    thread sleeps until at least one port has bytes waiting and then calls
+    that port's handler, so there is no fixed polling delay on a response.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("SerialReactor")
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._ports: Dict[str, int] = {}  # port name -> fd
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Self-pipe used to wake the selector when ports are added/removed or on stop
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Serial handles can only be selected on POSIX, where pyserial exposes a real fd.
+        On Windows the COM handle is not selectable, so CommManager keeps the thread loop.
+        """
+        return os.name == "posix"
+
+    def register(self, port: str, ser, handler: Callable[[], None]):
+        """
+        Watch a serial port for incoming data.
+        :param port: Port name used as key
+        :param ser: Open serial.Serial instance (must provide fileno())
+        :param handler: Called on the reactor thread whenever the port is readable
+        """
+        fd = ser.fileno()
+        with self._lock:
+            if port in self._ports:
+                self._selector.unregister(self._ports.pop(port))
+            self._selector.register(fd, selectors.EVENT_READ, (port, handler))
+            self._ports[port] = fd
+        self._ensure_running()
+        self._wake()
+
+    def unregister(self, port: str) -> bool:
+        with self._lock:
+            fd = self._ports.pop(port, None)
+            if fd is None:
+                return False
+            try:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+        self._wake()
+        return True
+
+    def is_registered(self, port: str) -> bool:
+        return port in self._ports
+
+    def stop(self):
+        self._running = False
+        self._wake()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        with self._lock:
+            for fd in self._ports.values():
+                try:
+                    self._selector.unregister(fd)
+                except (KeyError, ValueError):
+                    pass
+            self._ports.clear()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="SerialReactor", daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            # Pipe already full means a wakeup is pending anyway
+            pass
+
+    def _run(self):
+        self.logger.info("Serial reactor started")
+        while self._running:
+            try:
+                events = self._selector.select()
+            except OSError as e:
+                # A port may have been closed between unregister and select
+                self.logger.debug(f"Selector error: {e}")
+                continue
+
+            for key, _ in events:
+                if key.data is None:
+                    try:
+                        self._wake_r.recv(4096)
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+
+                port, handler = key.data
+                if self._ports.get(port) != key.fd:
+                    # Unregistered while this batch of events was pending
+                    continue
+                try:
+                    handler()
+                except Exception as e:
+                    # A readable fd that keeps failing would spin the reactor, so drop it
+                    self.logger.error(f"Error servicing {port}, removing from reactor: {e}")
+                    self.unregister(port)
+        self.logger.info("Serial reactor stopped")
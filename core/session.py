@@ -0,0 +1,8 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Protocol state of the client whose data is being handled (one dict per TCP
+# connection). TcpServer sets it in each client's handler task, so concurrent
+# clients of one device never see each other's state. None outside a TCP
+# connection; see Equipment.client_session().
+current_session: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_session", default=None)
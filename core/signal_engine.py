@@ -0,0 +1,370 @@
+"""
+Generated weight signals: drives scales along physical load profiles (filling,
+discharge, bag drops, a truck rolling onto a platform, mixer vibration) with
+settling, creep, drift and noise, and derives stability from a motion band,
+so batching and weighing software can be exercised without anyone at the slider.
+
+SignalEngine computes the readings of all driven scales in blocks of ticks.
+With NumPy installed a block is a few array operations over every channel at
+once; without it the same signals are computed per channel in Python.
+"""
+import bisect
+import logging
+import math
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the engine falls back to per-channel Python math
+    np = None
+
+class SignalProfile:
+    """
+    One scale's load over time, plus the disturbances on top of it.
+
+    The load follows `waypoints`, (seconds, weight) pairs joined by straight
+    lines; two waypoints at the same time are a step (a dropped bag, an axle
+    coming on). Each step overshoots and rings out (settle_*) and is followed
+    by creep toward a slightly higher reading (creep_*).
+    """
+
+    def __init__(self, waypoints: Sequence[Tuple[float, float]], repeat: bool = False,
+                 noise: float = 0.0, vibration: float = 0.0, vibration_hz: float = 0.0,
+                 settle: float = 0.0, settle_hz: float = 2.0, settle_tau: float = 0.3,
+                 creep: float = 0.0, creep_tau: float = 30.0, drift: float = 0.0,
+                 division: float = 0.0, motion_band: Optional[float] = None):
+        """
+        :param waypoints: (time in s, weight) pairs in time order; the load holds the last weight
+        :param repeat: Start over after the last waypoint (cyclic batching)
+        :param noise: Standard deviation of the random noise
+        :param vibration: Amplitude of the periodic vibration (mixers, conveyors)
+        :param vibration_hz: Vibration frequency
+        :param settle: Overshoot after a step, as a fraction of the step
+        :param settle_hz: Frequency the overshoot rings at
+        :param settle_tau: Seconds for the ringing to decay to 1/e
+        :param creep: Creep after a step, as a fraction of the step
+        :param creep_tau: Creep time constant in seconds
+        :param drift: Zero drift in weight per second
+        :param division: Display resolution the reading is rounded to; 0 for none
+        :param motion_band: Largest change within the motion window still reported as
+            stable; defaults to one division
+        """
+        if not waypoints:
+            raise ValueError("a profile needs at least one waypoint")
+        times = [float(t) for t, _ in waypoints]
+        if any(b < a for a, b in zip(times, times[1:])) or times[0] < 0:
+            raise ValueError("waypoint times must be non-negative and in order")
+        self.times = times
+        self.levels = [float(w) for _, w in waypoints]
+        self.repeat = repeat and times[-1] > 0
+        self.noise = noise
+        self.vibration = vibration
+        self.vibration_hz = vibration_hz
+        self.settle = settle if settle_tau > 0 else 0.0
+        self.settle_hz = settle_hz
+        self.settle_tau = settle_tau
+        self.creep = creep if creep_tau > 0 else 0.0
+        self.creep_tau = creep_tau
+        self.drift = drift
+        self.division = float(division)
+        self.motion_band = division if motion_band is None else motion_band
+        # Steps as (time, size)
+        self.steps = [(times[i], self.levels[i] - self.levels[i - 1])
+                      for i in range(1, len(times)) if times[i] == times[i - 1]]
+
+    @property
+    def period(self) -> float:
+        return self.times[-1] if self.repeat else math.inf
+
+    def load_at(self, t: float) -> float:
+        """The load (waypoint line) at `t` seconds into the current cycle."""
+        times = self.times
+        i = bisect.bisect_right(times, t) - 1
+        if i < 0:
+            return self.levels[0]
+        if i >= len(times) - 1:
+            return self.levels[-1]
+        return self.levels[i] + (self.levels[i + 1] - self.levels[i]) * (t - times[i]) / (times[i + 1] - times[i])
+
+# --- Profiles for common weighing processes ---
+
+def filling(target: float, duration: float, hold: float = 5.0, discharge: float = 3.0,
+            start: float = 0.0, **disturbances) -> SignalProfile:
+    """Repeated batch: fill from `start` to `target` over `duration`, hold, discharge, wait."""
+    disturbances.setdefault("noise", abs(target - start) * 2e-4)
+    fill_end = duration
+    discharge_start = fill_end + hold
+    discharge_end = discharge_start + discharge
+    return SignalProfile([(0.0, start), (fill_end, target), (discharge_start, target),
+                          (discharge_end, start), (discharge_end + hold, start)], repeat=True, **disturbances)
+
+def bag_drops(bag_weight: float, count: int, interval: float, **disturbances) -> SignalProfile:
+    """`count` bags dropped `interval` seconds apart, then the load is removed."""
+    disturbances.setdefault("settle", 0.15)
+    disturbances.setdefault("noise", bag_weight * 1e-4)
+    waypoints = [(0.0, 0.0)]
+    for n in range(1, count + 1):
+        waypoints += [(n * interval, (n - 1) * bag_weight), (n * interval, n * bag_weight)]
+    end = (count + 1) * interval
+    waypoints += [(end, count * bag_weight), (end, 0.0), (end + interval, 0.0)]
+    return SignalProfile(waypoints, repeat=True, **disturbances)
+
+def truck(gross: float, axles: int = 2, arrive: float = 2.0, axle_gap: float = 1.5, dwell: float = 20.0,
+          **disturbances) -> SignalProfile:
+    """A truck rolling onto a platform axle by axle, standing for `dwell` seconds and driving off."""
+    disturbances.setdefault("settle", 0.05)
+    disturbances.setdefault("settle_hz", 1.2)
+    disturbances.setdefault("settle_tau", 1.0)
+    disturbances.setdefault("creep", 0.001)
+    disturbances.setdefault("noise", gross * 5e-5)
+    per_axle = gross / axles
+    waypoints = [(0.0, 0.0)]
+    t = arrive
+    for n in range(1, axles + 1):
+        waypoints += [(t, (n - 1) * per_axle), (t, n * per_axle)]
+        t += axle_gap
+    t += dwell
+    for n in range(axles - 1, -1, -1):
+        waypoints += [(t, (n + 1) * per_axle), (t, n * per_axle)]
+        t += axle_gap
+    waypoints.append((t + arrive, 0.0))
+    return SignalProfile(waypoints, repeat=True, **disturbances)
+
+def mixer(level: float, amplitude: float, hz: float = 12.5, **disturbances) -> SignalProfile:
+    """A constant load on a vibrating structure (running mixer or conveyor)."""
+    disturbances.setdefault("noise", amplitude * 0.1)
+    return SignalProfile([(0.0, level)], vibration=amplitude, vibration_hz=hz, **disturbances)
+
+def _column(values) -> "np.ndarray":
+    """Per-channel (or per-step) values as a column, to broadcast against the ticks of a block."""
+    return np.array(values, dtype=float)[:, None]
+
+class _Channel:
+    """A driven scale and where its profile stands."""
+
+    __slots__ = ("scale", "profile", "start", "phase", "history", "published")
+
+    def __init__(self, scale, profile: SignalProfile, start: int, phase: float):
+        self.scale = scale
+        self.profile = profile
+        self.start = start      # Engine tick the profile started at
+        self.phase = phase      # Vibration phase, so scales do not vibrate in step
+        self.history: Optional[List[float]] = None  # Readings before the next block (motion window)
+        self.published: Optional[Tuple[float, bool]] = None
+
+class SignalEngine:
+    """
+    Drives any number of scales along SignalProfiles from one periodic task.
+
+    Readings are computed a block of ticks ahead for all channels together;
+    each tick then only publishes the precomputed column, and only to the
+    scales whose reading or stability changed. Adding or removing a scale
+    recomputes from the current tick.
+    """
+
+    def __init__(self, rate: float = 20.0, block: int = 64, motion_window: float = 0.5,
+                 seed: Optional[int] = None, use_numpy: Optional[bool] = None):
+        """
+        :param rate: Readings per second published to each scale
+        :param block: Ticks computed ahead at once
+        :param motion_window: Seconds of readings the motion band is checked over
+        :param seed: Seed for the noise, for repeatable runs
+        :param use_numpy: Force the NumPy (True) or Python (False) math; default NumPy if installed
+        """
+        if rate <= 0 or block < 1:
+            raise ValueError("rate and block must be positive")
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.block = block
+        self.window = max(1, round(motion_window * rate))
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self.logger = logging.getLogger("SignalEngine")
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed) if self.use_numpy else None
+        self._lock = threading.Lock()
+        self._channels: Dict[int, _Channel] = {}  # id(scale) -> channel
+        self._tick = 0
+        # Current block: channels in row order, readings, stability, motion window rows
+        self._rows: List[_Channel] = []
+        self._weights: List[List[float]] = []
+        self._stable: List[List[bool]] = []
+        self._windows: List[List[float]] = []
+        self._block_start = 0
+        self._task = None
+        self.blocks = 0
+        self.publishes = 0
+
+    # --- Channels ---
+
+    def add(self, scale, profile: SignalProfile):
+        """Drive `scale` along `profile` from the next tick (replaces a previous profile)."""
+        with self._lock:
+            self._settle_history()
+            channel = _Channel(scale, profile, self._tick, self._random.uniform(0, 2 * math.pi))
+            previous = self._channels.get(id(scale))
+            if previous is not None:
+                channel.history = previous.history
+            self._channels[id(scale)] = channel
+            self._rows = []
+
+    def remove(self, scale) -> bool:
+        """Stop driving `scale`; it keeps its last reading."""
+        with self._lock:
+            self._settle_history()
+            removed = self._channels.pop(id(scale), None) is not None
+            self._rows = []
+        return removed
+
+    def profile_of(self, scale) -> Optional[SignalProfile]:
+        channel = self._channels.get(id(scale))
+        return channel.profile if channel else None
+
+    def __len__(self):
+        return len(self._channels)
+
+    # --- Running ---
+
+    def start(self, scheduler):
+        """Tick on a shared timer service (StreamScheduler or AsyncTransport)."""
+        if self._task is None:
+            self._task = scheduler.add_periodic(self.dt, self.tick)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def tick(self):
+        """Publish the next reading of every driven scale."""
+        with self._lock:
+            k = self._tick - self._block_start
+            if not self._rows or k >= len(self._weights[0]):
+                self._compute_block()
+                k = 0
+            rows, weights, stable = self._rows, self._weights, self._stable
+            self._tick += 1
+        for channel, w_row, s_row in zip(rows, weights, stable):
+            reading = (w_row[k], s_row[k])
+            if reading != channel.published:
+                channel.published = reading
+                channel.scale.set_reading(*reading)
+                self.publishes += 1
+
+    def stats(self) -> dict:
+        return {"channels": len(self._channels), "ticks": self._tick, "blocks": self.blocks,
+                "publishes": self.publishes, "numpy": self.use_numpy}
+
+    # --- Block math ---
+
+    def _settle_history(self):
+        """Before the block is dropped mid-way: keep each channel's readings up to the current tick."""
+        if not self._rows:
+            return
+        k = self._tick - self._block_start
+        for channel, window in zip(self._rows, self._windows):
+            channel.history = window[k:k + self.window - 1]
+
+    def _compute_block(self):
+        self._settle_history()
+        rows = list(self._channels.values())
+        self._rows, self._block_start = rows, self._tick
+        if not rows:
+            self._weights = self._stable = self._windows = []
+            return
+        compute = self._numpy_block if self.use_numpy else self._python_block
+        self._weights, self._stable, self._windows = compute(rows, self._tick)
+        self.blocks += 1
+
+    def _python_block(self, rows: List[_Channel], tick: int):
+        weights, stable, windows = [], [], []
+        span = self.window - 1
+        for channel in rows:
+            profile = channel.profile
+            period = profile.period
+            row = []
+            for n in range(tick - channel.start, tick - channel.start + self.block):
+                t = n * self.dt
+                tc = t % period if profile.repeat else t
+                w = profile.load_at(tc) + profile.drift * t
+                for ts, size in profile.steps:
+                    d = tc - ts
+                    if d >= 0:
+                        if profile.settle:
+                            w += size * profile.settle * math.exp(-d / profile.settle_tau) * \
+                                math.cos(2 * math.pi * profile.settle_hz * d)
+                        if profile.creep:
+                            w += size * profile.creep * (1 - math.exp(-d / profile.creep_tau))
+                if profile.vibration:
+                    w += profile.vibration * math.sin(2 * math.pi * profile.vibration_hz * t + channel.phase)
+                if profile.noise:
+                    w += self._random.gauss(0.0, profile.noise)
+                if profile.division > 0:
+                    w = round(w / profile.division) * profile.division
+                row.append(w)
+            history = channel.history if channel.history is not None else [row[0]] * span
+            window = list(history[-span:] if span else []) + row
+            band = profile.motion_band + 1e-9
+            stable.append([max(window[j:j + span + 1]) - min(window[j:j + span + 1]) <= band
+                           for j in range(self.block)])
+            weights.append(row)
+            windows.append(window)
+        return weights, stable, windows
+
+    def _numpy_block(self, rows: List[_Channel], tick: int):
+        profiles = [channel.profile for channel in rows]
+        t = (tick - _column([c.start for c in rows]) + np.arange(self.block)) * self.dt
+        period = _column([p.period for p in profiles])
+        tc = np.where(np.isfinite(period), np.fmod(t, np.where(np.isfinite(period), period, 1.0)), t)
+
+        # Waypoint lines of all channels in one searchsorted: channel i's times are offset by i * stride
+        last = _column([p.times[-1] for p in profiles])
+        stride = float(last.max()) + 1.0
+        counts = np.array([len(p.times) for p in profiles])
+        first = np.concatenate(([0], np.cumsum(counts)[:-1]))[:, None]
+        xp = np.concatenate([np.array(p.times) + i * stride for i, p in enumerate(profiles)])
+        fp = np.concatenate([p.levels for p in profiles])
+        x = np.arange(len(rows))[:, None] * stride + np.minimum(tc, last)
+        lo = np.maximum(np.searchsorted(xp, x, side="right") - 1, first)
+        hi = np.minimum(lo + 1, first + counts[:, None] - 1)
+        gap = xp[hi] - xp[lo]
+        frac = np.clip(np.divide(x - xp[lo], gap, out=np.zeros_like(x), where=gap > 0), 0.0, 1.0)
+        w = fp[lo] + (fp[hi] - fp[lo]) * frac
+
+        # Settling and creep after every step, all steps of all channels at once
+        steps = [(i, ts, size) for i, p in enumerate(profiles) for ts, size in p.steps
+                 if p.settle or p.creep]
+        if steps:
+            ch = np.array([s[0] for s in steps])
+            d = tc[ch] - _column([s[1] for s in steps])
+            active = d >= 0
+            d = np.where(active, d, 0.0)
+            size = _column([s[2] for s in steps])
+            p = [profiles[i] for i in ch]
+            settle = _column([q.settle for q in p]) * np.exp(-d / _column([max(q.settle_tau, 1e-9) for q in p])) * \
+                np.cos(2 * np.pi * _column([q.settle_hz for q in p]) * d)
+            creep = _column([q.creep for q in p]) * (1 - np.exp(-d / _column([max(q.creep_tau, 1e-9) for q in p])))
+            np.add.at(w, ch, np.where(active, size * (settle + creep), 0.0))
+
+        w += _column([p.drift for p in profiles]) * t
+        w += _column([p.vibration for p in profiles]) * \
+            np.sin(2 * np.pi * _column([p.vibration_hz for p in profiles]) * t + _column([c.phase for c in rows]))
+        w += self._rng.standard_normal(w.shape) * _column([p.noise for p in profiles])
+        division = _column([p.division for p in profiles])
+        w = np.where(division > 0, np.round(w / np.where(division > 0, division, 1.0)) * division, w)
+
+        # Motion band over the window, continuing from the readings before this block
+        span = self.window - 1
+        history = np.array([c.history[len(c.history) - span:] if c.history is not None else [w[i, 0]] * span
+                            for i, c in enumerate(rows)], dtype=float).reshape(len(rows), span)
+        window = np.concatenate((history, w), axis=1)
+        moving = np.lib.stride_tricks.sliding_window_view(window, span + 1, axis=1)
+        stable = moving.max(axis=2) - moving.min(axis=2) <= _column([p.motion_band for p in profiles]) + 1e-9
+        return w.tolist(), stable.tolist(), window.tolist()
@@ -1,31 +1,58 @@
-from typing import List, Dict
+import importlib
+import threading
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
 from .equipment import Equipment
 from .comm_manager import CommManager
+from .stream_scheduler import StreamScheduler
+from .rs485_bus import RS485Bus
 import logging
 
+if TYPE_CHECKING:
+    # signal_engine imports NumPy when installed; loaded only once a signal is started
+    from .signal_engine import SignalEngine, SignalProfile
+
 class Simulator:
-    def __init__(self):
+    def __init__(self, io_backend: str = "auto"):
         self.devices: Dict[str, Equipment] = {}
-        self.device_types: Dict[str, tuple] = {} # name -> (class, default_kwargs)
-        self.comm_manager = CommManager()
+        self.device_types: Dict[str, tuple] = {} # name -> (class or "module:Class" path, default_kwargs)
+        self.comm_manager = CommManager(io_backend)
+        # One timer service drives every streaming device; in asyncio mode the
+        # event loop itself plays that role so streams share the port thread.
+        self.stream_scheduler = self.comm_manager.async_transport or StreamScheduler()
         self.logger = logging.getLogger("Simulator")
+        # Multi-drop serial ports: port -> bus shared by the devices with "multidrop" set
+        self.buses: Dict[str, RS485Bus] = {}
+        self._bus_lock = threading.Lock()
+        # Generated weight signals; created on first use, ticks on the stream scheduler
+        self.signal_engine: Optional["SignalEngine"] = None
 
-    def register_device_type(self, type_name: str, device_class: type, **kwargs):
+    def register_device_type(self, type_name: str, device_class: Union[type, str], **kwargs):
         """
         Register a device class that can be instantiated by the user.
         :param type_name: Display name for the device type
-        :param device_class: The class to instantiate
+        :param device_class: The class to instantiate, or its "package.module:ClassName"
+            path; a path is imported on the first create_device() of this type
         :param kwargs: Default arguments to pass to the constructor (excluding name/id)
         """
         self.device_types[type_name] = (device_class, kwargs)
         self.logger.info(f"Registered device type: {type_name}")
 
+    def resolve_device_class(self, type_name: str) -> type:
+        """Return the class registered for `type_name`, importing it if it was registered by path."""
+        cls, defaults = self.device_types[type_name]
+        if isinstance(cls, str):
+            module_name, _, class_name = cls.partition(":")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            self.device_types[type_name] = (cls, defaults)
+        return cls
+
     def create_device(self, type_name: str, name: str, device_id: str) -> bool:
         if type_name not in self.device_types:
             return False
         
-        cls, defaults = self.device_types[type_name]
         try:
+            cls = self.resolve_device_class(type_name)
+            defaults = self.device_types[type_name][1]
             # Merge defaults with specific name/id
             # Assuming constructor signature is (name, device_id, **kwargs) or similar
             # But our BaseScale is (name, device_id). Some might have extra args.
@@ -51,7 +78,9 @@ class Simulator:
             # Preserve settings if possible
             settings = old_device.connection_settings
             
-            # Remove old
+            # Remove old (and its stream timer, which the shared scheduler would keep firing)
+            if getattr(old_device, 'is_streaming', False):
+                old_device.stop_streaming()
             self.devices.pop(old_name)
             
             # Create new
@@ -80,6 +109,11 @@ class Simulator:
         return True
 
     def add_device(self, device: Equipment):
+        if hasattr(device, 'stream_scheduler'):
+            device.stream_scheduler = self.stream_scheduler
+        if hasattr(device, 'peers'):
+            # Devices that serve other devices (gateways) look them up by name
+            device.peers = self.devices
         self.devices[device.name] = device
         self.logger.info(f"Added device: {device.name}")
 
@@ -92,9 +126,12 @@ class Simulator:
             self.logger.error(f"Device {device_name} not found")
             return False
 
-        # Callback for serial data
+        if device.connection_settings.get("multidrop"):
+            return self._attach_to_bus(device, port, baudrate, bytesize, parity, stopbits)
+
+        # Callback for serial data; the device frames it and answers pipelined commands together
         def on_data_received(data: bytes) -> bytes:
-            return device.process_command(data)
+            return device.handle_data(data)
 
         # Callback for streaming data
         def on_device_output(data: bytes):
@@ -102,8 +139,96 @@ class Simulator:
         
         device.on_output = on_device_output
 
+        # Keep the device's settings in line with the port actually opened; stream pacing depends on them
+        device.connection_settings.update({
+            "port": port,
+            "baudrate": baudrate,
+            "bytesize": bytesize,
+            "parity": parity,
+            "stopbits": stopbits
+        })
+        device.state_changed()
+        if hasattr(device, 'update_stream_pacing'):
+            device.update_stream_pacing()
+
         return self.comm_manager.start_serial(port, baudrate, bytesize, parity, stopbits, on_data_received)
 
+    def start_bus(self, port: str, device_names: List[str], baudrate: int = 9600, bytesize: int = 8,
+                  parity: str = 'N', stopbits: float = 1, turnaround: float = 0.0) -> bool:
+        """
+        Put several devices on one multi-drop (RS-485) port. Each command is
+        answered by the device whose bus address it carries.
+        :param turnaround: Seconds from the end of a command to the start of each answer
+        """
+        for name in device_names:
+            device = self.get_device(name)
+            if not device:
+                self.logger.error(f"Device {name} not found")
+                return False
+            device.connection_settings.update({"multidrop": True, "turnaround": turnaround})
+            device.state_changed()
+        return all([self.start_device_comm(name, port, baudrate, bytesize, parity, stopbits) for name in device_names])
+
+    def _attach_to_bus(self, device: Equipment, port: str, baudrate: int, bytesize: int, parity: str, stopbits: float):
+        device.connection_settings.update({
+            "port": port,
+            "baudrate": baudrate,
+            "bytesize": bytesize,
+            "parity": parity,
+            "stopbits": stopbits
+        })
+        device.state_changed()
+        # Devices of one project come up concurrently; the first one opens the port
+        with self._bus_lock:
+            bus = self.buses.get(port)
+            if bus is None:
+                bus = RS485Bus(port)
+                bus.attach(device, device.connection_settings.get("turnaround"))
+                if not bus.open(self.comm_manager, baudrate, bytesize, parity, stopbits):
+                    bus.close()
+                    return False
+                self.buses[port] = bus
+            else:
+                bus.attach(device, device.connection_settings.get("turnaround"))
+        if hasattr(device, 'update_stream_pacing'):
+            device.update_stream_pacing()
+        self.logger.info(f"{device.name} on multi-drop bus {port} ({len(bus.devices)} devices)")
+        return True
+
+    def start_device_tcp(self, device_name: str, tcp_port: int, host: str = "0.0.0.0"):
+        device = self.get_device(device_name)
+        if not device:
+            self.logger.error(f"Device {device_name} not found")
+            return False
+
+        def on_frame_received(frame: bytes) -> bytes:
+            return device.process_command(frame)
+
+        def on_device_output(data: bytes):
+            self.comm_manager.write_tcp(tcp_port, data)
+
+        device.on_output = on_device_output
+
+        # Frame per connection so fragments from different clients never mix in the device
+        return self.comm_manager.start_tcp(tcp_port, on_frame_received, host, framer_factory=device.create_framer)
+
+    def start_signal(self, device_name: str, profile: "SignalProfile") -> bool:
+        """Drive a scale's weight and stability along a generated profile instead of the slider."""
+        device = self.get_device(device_name)
+        if not device or not hasattr(device, 'set_reading'):
+            self.logger.error(f"{device_name} is not a scale")
+            return False
+        if self.signal_engine is None:
+            from .signal_engine import SignalEngine
+            self.signal_engine = SignalEngine()
+        self.signal_engine.add(device, profile)
+        self.signal_engine.start(self.stream_scheduler)
+        return True
+
+    def stop_signal(self, device_name: str) -> bool:
+        device = self.get_device(device_name)
+        return bool(device and self.signal_engine and self.signal_engine.remove(device))
+
     def stop_device_comm(self, device_name: str):
         # We need to find which port this device is using.
         # Currently Simulator doesn't track device->port mapping explicitly, 
@@ -114,7 +239,25 @@ class Simulator:
         pass 
 
     def stop_device_comm_by_port(self, port: str):
+        with self._bus_lock:
+            bus = self.buses.pop(port, None)
+        if bus is not None:
+            bus.close()
         return self.comm_manager.stop_serial(port)
 
+    def stop_device_tcp(self, tcp_port: int):
+        return self.comm_manager.stop_tcp(tcp_port)
+
     def stop(self):
+        if self.signal_engine is not None:
+            self.signal_engine.stop()
+        for device in self.devices.values():
+            if getattr(device, 'is_streaming', False):
+                device.stop_streaming()
+        if isinstance(self.stream_scheduler, StreamScheduler):
+            self.stream_scheduler.stop()
+        with self._bus_lock:
+            buses, self.buses = list(self.buses.values()), {}
+        for bus in buses:
+            bus.close()
         self.comm_manager.stop_all()
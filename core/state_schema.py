@@ -0,0 +1,132 @@
+"""
+Declarative device state for project files.
+
+Each Equipment subclass declares STATE_SCHEMA, the fields that are saved and
+restored, usually by extending its parent's schema. ProjectManager serializes
+any device through its schema, so a new model only declares its own fields.
+
+Project files carry a format version; MIGRATIONS upgrade older files step by
+step to PROJECT_FORMAT_VERSION before they are validated and loaded.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+class Field:
+    """One persisted value of a device."""
+    __slots__ = ("name", "type", "get", "set", "choices", "nullable")
+
+    def __init__(self, name: str, type: Union[type, Tuple[type, ...]], get: Optional[str] = None,
+                 set: Optional[str] = None, choices: Optional[Tuple[Any, ...]] = None, nullable: bool = False):
+        """
+        :param name: Key in the project file
+        :param type: Expected type; float fields also accept ints
+        :param get: Attribute read when saving (defaults to `name`)
+        :param set: Method called with the value when loading; without one the attribute is assigned
+        :param choices: Allowed values
+        :param nullable: None is allowed and means "keep the device default" when loading
+        """
+        self.name = name
+        self.type = (int, float) if type is float else type
+        self.get = get or name
+        self.set = set
+        self.choices = choices
+        self.nullable = nullable
+
+    def check(self, value) -> Optional[str]:
+        """Return why `value` is not acceptable, or None."""
+        if value is None:
+            return None if self.nullable else "must not be empty"
+        # bool is an int subclass; never accept it for numeric fields (or the reverse)
+        if isinstance(value, bool) != (self.type is bool) or not isinstance(value, self.type):
+            expected = self.type.__name__ if isinstance(self.type, type) else "number"
+            return f"expected {expected}, got {value!r}"
+        if self.choices is not None and value not in self.choices:
+            return f"{value!r} is not one of {', '.join(map(str, self.choices))}"
+        return None
+
+class StateSchema:
+    """Ordered set of fields; fields are restored in declaration order."""
+    __slots__ = ("fields", "_names")
+
+    def __init__(self, *fields: Field):
+        self.fields: Tuple[Field, ...] = fields
+        self._names = {f.name for f in fields}
+
+    def extend(self, *fields: Field) -> "StateSchema":
+        """New schema with `fields` appended; a field with an existing name replaces it in place."""
+        replaced = {f.name: f for f in fields}
+        merged = [replaced.pop(f.name, f) for f in self.fields]
+        merged.extend(f for f in fields if f.name in replaced)
+        return StateSchema(*merged)
+
+    @property
+    def names(self) -> List[str]:
+        return [f.name for f in self.fields]
+
+    def dump(self, device) -> Dict[str, Any]:
+        state = {}
+        for field in self.fields:
+            value = getattr(device, field.get, None)
+            state[field.name] = value.copy() if isinstance(value, dict) else value
+        return state
+
+    def validate(self, state: Dict[str, Any]) -> List[str]:
+        """Check every present field in one pass. Unknown keys are ignored."""
+        errors = []
+        for field in self.fields:
+            if field.name in state:
+                problem = field.check(state[field.name])
+                if problem:
+                    errors.append(f"{field.name}: {problem}")
+        return errors
+
+    def load(self, device, state: Dict[str, Any]):
+        """Apply the fields present in `state`; missing or None values keep the device defaults."""
+        for field in self.fields:
+            value = state.get(field.name)
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                value = dict(value)
+            if field.set:
+                getattr(device, field.set)(value)
+            else:
+                setattr(device, field.get, value)
+
+# --- Project file migrations ---
+
+PROJECT_FORMAT_VERSION = "2.0"
+
+PARITY_CONVERT = {"None": 'N', "Even": 'E', "Odd": 'O', "Mark": 'M', "Space": 'S'}
+
+def _migrate_1_0(project: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    1.0 stored each device's settings flat next to name/model/device_id, with
+    the parity sometimes in display form ("None"). 2.0 nests them in "state".
+    """
+    devices = []
+    for entry in project.get("devices", []):
+        entry = dict(entry)
+        device = {key: entry.pop(key) for key in ("name", "model", "device_id") if key in entry}
+        settings = dict(entry.get("connection_settings") or {})
+        if settings.get("parity") in PARITY_CONVERT:
+            settings["parity"] = PARITY_CONVERT[settings["parity"]]
+        entry["connection_settings"] = settings
+        device["state"] = entry
+        devices.append(device)
+    return dict(project, version="2.0", devices=devices)
+
+# version -> function upgrading a project of that version by one step
+MIGRATIONS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "1.0": _migrate_1_0,
+}
+
+def migrate_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Upgrade a parsed project file to PROJECT_FORMAT_VERSION."""
+    version = project.get("version", "1.0")
+    while version != PROJECT_FORMAT_VERSION:
+        migrate = MIGRATIONS.get(version)
+        if migrate is None:
+            raise ValueError(f"Unsupported project version {version}")
+        project = migrate(project)
+        version = project["version"]
+    return project
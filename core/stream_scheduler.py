@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+from typing import Callable, List, Optional, Tuple
+
+class ScheduledTask:
+    """Handle returned by StreamScheduler.add_periodic; cancel() stops further calls."""
+
+    __slots__ = ("interval", "fn", "deadline", "cancelled", "ticks", "missed", "max_lateness")
+
+    def __init__(self, interval: float, fn: Callable[[], None], deadline: float):
+        self.interval = interval
+        self.fn = fn
+        self.deadline = deadline
+        self.cancelled = False
+        self.ticks = 0          # Times fn was called
+        self.missed = 0         # Ticks skipped because the scheduler fell a whole period behind
+        self.max_lateness = 0.0 # Worst observed delay between deadline and call, in seconds
+
+    def cancel(self):
+        self.cancelled = True
+
+class StreamScheduler:
+    """
+    Fires every periodic task (stream-mode scales) from a single thread.
+
+    Tasks sit in a heap ordered by their next deadline. After each call the
+    next deadline is the previous deadline plus the interval, not "now" plus
+    the interval, so the rate does not drift over a long run. If the thread
+    falls more than a whole period behind, missed ticks are counted and
+    skipped rather than fired in a burst.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("StreamScheduler")
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add_periodic(self, interval: float, fn: Callable[[], None]) -> ScheduledTask:
+        """
+        Call fn every `interval` seconds until the returned task is cancelled.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        task = ScheduledTask(interval, fn, time.monotonic() + interval)
+        with self._cond:
+            heapq.heappush(self._heap, (task.deadline, next(self._seq), task))
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="StreamScheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return task
+
+    def task_count(self) -> int:
+        with self._cond:
+            return sum(1 for _, _, task in self._heap if not task.cancelled)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    # Drop cancelled tasks lazily from the top of the heap
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if not self._running:
+                    return
+                _, _, task = heapq.heappop(self._heap)
+
+            now = time.monotonic()
+            lateness = now - task.deadline
+            if lateness > task.max_lateness:
+                task.max_lateness = lateness
+            try:
+                task.fn()
+            except Exception as e:
+                self.logger.error(f"Error in scheduled task: {e}")
+            task.ticks += 1
+
+            if task.cancelled:
+                continue
+            next_deadline = task.deadline + task.interval
+            now = time.monotonic()
+            if next_deadline <= now:
+                skipped = int((now - next_deadline) // task.interval) + 1
+                task.missed += skipped
+                next_deadline += skipped * task.interval
+            task.deadline = next_deadline
+            with self._cond:
+                if self._running:
+                    heapq.heappush(self._heap, (next_deadline, next(self._seq), task))
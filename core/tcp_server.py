@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional, Set
+from .async_transport import DeviceCallback, resolve_response
+from .framing import Framer, TerminatorFramer
+from .session import current_session
+
+class TcpConnection:
+    """State for one client: its own framer (receive buffer), protocol session and traffic counters."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, framer: Optional[Framer] = None):
+        self.reader = reader
+        self.writer = writer
+        peer = writer.get_extra_info("peername")
+        self.peer = f"{peer[0]}:{peer[1]}" if peer else "?"
+        self.framer = framer
+        # Per-client device protocol state (Equipment.client_session())
+        self.session: Dict[str, Any] = {}
+        self.bytes_rx = 0
+        self.bytes_tx = 0
+        self.dropped_frames = 0
+
+    @property
+    def write_backlog(self) -> int:
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if transport else 0
+
+class TcpServer:
+    """
+    TCP listener that binds one device to a port and serves any number of clients.
+
+    Each connection gets its own framer from framer_factory, so fragments from
+    different clients never mix inside the device and only whole frames are passed
+    to the device callback. Responses to pipelined frames are sent in one write.
+    A plain terminator may be given instead of a factory.
+
+    Backpressure:
+    - Replies are written with drain(), and the next chunk is read only after the
+      reply is out, so a client that stops reading is throttled by TCP itself.
+    - Unsolicited stream frames (broadcast) are dropped for a client whose send
+      backlog exceeds write_high_water, instead of stalling the event loop.
+    - An incomplete frame larger than max_buffer is discarded, whichever framer
+      the factory creates.
+    """
+
+    def __init__(self, host: str, port: int, callback: DeviceCallback,
+                 on_traffic: Callable[[str, bytes], None],
+                 terminator: Optional[bytes] = None,
+                 framer_factory: Optional[Callable[[], Optional[Framer]]] = None,
+                 max_connections: int = 64,
+                 max_buffer: int = 65536,
+                 write_high_water: int = 65536):
+        self.host = host
+        self.port = port
+        self.callback = callback
+        self.on_traffic = on_traffic
+        self.terminator = terminator
+        if framer_factory is None and terminator:
+            framer_factory = lambda: TerminatorFramer(terminator, max_buffer)
+        self.framer_factory = framer_factory
+        self.max_connections = max_connections
+        self.max_buffer = max_buffer
+        self.write_high_water = write_high_water
+        self.logger = logging.getLogger(f"TcpServer.{port}")
+        self.connections: Set[TcpConnection] = set()
+        self.total_connections = 0
+        self.rejected_connections = 0
+        # Cumulative over all connections, closed ones included (TcpConnection keeps per-client counts)
+        self.bytes_rx = 0
+        self.bytes_tx = 0
+        self.dropped_frames = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def bound_port(self) -> int:
+        """Actual listening port (differs from `port` when 0 was requested)."""
+        if self._server and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.logger.info(f"Listening on {self.host}:{self.bound_port}")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self.connections) >= self.max_connections:
+            self.rejected_connections += 1
+            self.logger.warning(f"Connection limit ({self.max_connections}) reached, rejecting client")
+            writer.close()
+            return
+
+        framer = self.framer_factory() if self.framer_factory else None
+        if framer is not None:
+            framer.max_buffer = self.max_buffer
+        conn = TcpConnection(reader, writer, framer)
+        # This handler is the client's own task: the device callbacks below see its session
+        current_session.set(conn.session)
+        writer.transport.set_write_buffer_limits(high=self.write_high_water)
+        self.connections.add(conn)
+        self.total_connections += 1
+        self._tasks.add(asyncio.current_task())
+        self.logger.info(f"Client connected: {conn.peer}")
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                conn.bytes_rx += len(data)
+                self.bytes_rx += len(data)
+                self.on_traffic("RX", data)
+
+                frames = conn.framer.feed(data) if conn.framer else [data]
+                responses = []
+                for frame in frames:
+                    response = await resolve_response(self.callback(frame))
+                    if response:
+                        responses.append(response)
+                if responses:
+                    response = b"".join(responses)
+                    writer.write(response)
+                    await writer.drain()
+                    conn.bytes_tx += len(response)
+                    self.bytes_tx += len(response)
+                    self.on_traffic("TX", response)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self.logger.error(f"Error serving {conn.peer}: {e}")
+        finally:
+            self.connections.discard(conn)
+            self._tasks.discard(asyncio.current_task())
+            writer.close()
+            self.logger.info(f"Client disconnected: {conn.peer}")
+
+    def broadcast(self, data: bytes):
+        """Send unsolicited data (stream frames) to every client. Must run on the loop."""
+        sent = False
+        for conn in list(self.connections):
+            if conn.write_backlog > self.write_high_water:
+                conn.dropped_frames += 1
+                self.dropped_frames += 1
+                continue
+            conn.writer.write(data)
+            conn.bytes_tx += len(data)
+            self.bytes_tx += len(data)
+            sent = True
+        if sent:
+            self.on_traffic("TX", data)
+
+    async def aclose(self):
+        """Stop accepting, close every client connection and wait for their handlers."""
+        if self._server:
+            self._server.close()
+        for conn in list(self.connections):
+            conn.writer.close()
+        tasks = [t for t in self._tasks if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1.0)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        if self._server:
+            await self._server.wait_closed()
+            self._server = None
+        self.logger.info(f"Stopped listening on port {self.bound_port}")
+
+    def stats(self) -> dict:
+        return {
+            "port": self.bound_port,
+            "active": len(self.connections),
+            "total": self.total_connections,
+            "rejected": self.rejected_connections,
+            "bytes_rx": self.bytes_rx,
+            "bytes_tx": self.bytes_tx,
+            "dropped_frames": self.dropped_frames,
+        }
@@ -0,0 +1,285 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# (timestamp, port, direction, data)
+TrafficRecord = Tuple[float, str, str, bytes]
+
+DIRECTIONS = ("RX", "TX")
+
+class TrafficBuffer:
+    """
+    Ring buffer of raw monitor traffic, sized for hours of history.
+
+    Records are numbered with an ever-increasing sequence number. Per-record
+    fields live in typed arrays (23 bytes per record) and payloads in one
+    bytearray used as a ring, so millions of frames cost no per-record Python
+    objects. The oldest records are evicted when either the record capacity or
+    the payload capacity is exhausted. Storage grows on demand up to the limits.
+
+    Payload offsets are "virtual" (they only grow); the physical position is
+    offset % data_capacity. A payload never wraps around the end of the ring,
+    so every payload is one contiguous slice and search can run bytes.find()
+    over whole runs of records.
+    """
+
+    def __init__(self, capacity: int = 2_000_000, data_capacity: int = 64 * 1024 * 1024):
+        self.capacity = capacity
+        self.data_capacity = data_capacity
+        self._lock = threading.Lock()
+        self._ports: List[str] = []
+        self._port_index: Dict[str, int] = {}
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._time = array('d')
+            self._port = array('H')
+            self._dir = array('B')
+            self._offset = array('Q')
+            self._length = array('I')
+            self._data = bytearray()
+            self._first = 0     # Oldest live sequence number
+            self._end = 0       # Next sequence number
+            self._data_end = 0  # Virtual offset just past the newest payload
+
+    # --- Writing ---
+
+    def port_id(self, port: str) -> int:
+        index = self._port_index.get(port)
+        if index is None:
+            index = len(self._ports)
+            self._ports.append(port)
+            self._port_index[port] = index
+        return index
+
+    def append(self, timestamp: float, port: str, direction: str, data: bytes) -> int:
+        """Store one record and return its sequence number."""
+        cap = self.data_capacity
+        if len(data) > cap:
+            data = data[-cap:]
+        n = len(data)
+        with self._lock:
+            start = self._data_end
+            if start % cap + n > cap:
+                # Would wrap: start the payload at the beginning of the ring
+                start += cap - start % cap
+            # Evict records whose payload would be overwritten, or beyond the record capacity
+            while self._first < self._end and (
+                    self._end - self._first >= self.capacity
+                    or self._offset[self._first % self.capacity] < start + n - cap):
+                self._first += 1
+
+            phys = start % cap
+            self._data[phys:phys + n] = data
+            seq = self._end
+            slot = seq % self.capacity
+            fields = (timestamp, self.port_id(port), DIRECTIONS.index(direction) if direction in DIRECTIONS else 0, start, n)
+            if slot == len(self._time):
+                self._time.append(fields[0])
+                self._port.append(fields[1])
+                self._dir.append(fields[2])
+                self._offset.append(fields[3])
+                self._length.append(fields[4])
+            else:
+                self._time[slot], self._port[slot], self._dir[slot], self._offset[slot], self._length[slot] = fields
+            self._end = seq + 1
+            self._data_end = start + n
+            return seq
+
+    # --- Reading ---
+
+    @property
+    def first_seq(self) -> int:
+        return self._first
+
+    @property
+    def end_seq(self) -> int:
+        """One past the newest sequence number."""
+        return self._end
+
+    def __len__(self) -> int:
+        return self._end - self._first
+
+    @property
+    def ports(self) -> List[str]:
+        return list(self._ports)
+
+    def port_of(self, seq: int) -> str:
+        return self._ports[self._port[seq % self.capacity]]
+
+    def get(self, seq: int) -> TrafficRecord:
+        with self._lock:
+            if not self._first <= seq < self._end:
+                raise IndexError(f"record {seq} is not in the buffer")
+            slot = seq % self.capacity
+            phys = self._offset[slot] % self.data_capacity
+            data = bytes(self._data[phys:phys + self._length[slot]])
+            return (self._time[slot], self._ports[self._port[slot]], DIRECTIONS[self._dir[slot]], data)
+
+    def matches_port(self, seq: int, port_id: Optional[int]) -> bool:
+        return port_id is None or self._port[seq % self.capacity] == port_id
+
+    def data_bytes(self) -> int:
+        """Payload bytes currently held."""
+        if self._first == self._end:
+            return 0
+        return self._data_end - self._offset[self._first % self.capacity]
+
+    # --- Search ---
+
+    def _seq_for_offset(self, lo: int, hi: int, virt: int) -> int:
+        """Last sequence number in [lo, hi) whose payload starts at or before `virt`."""
+        offsets, cap = self._offset, self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if offsets[mid % cap] <= virt:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def search(self, needle: bytes, start: int, backwards: bool = False,
+               port: Optional[str] = None) -> Optional[int]:
+        """
+        Find the next record (from `start` inclusive, in either direction) whose
+        payload contains `needle`. Runs bytes.find over contiguous runs of
+        payloads instead of visiting records one by one.
+        :param port: Only records of this port match
+        """
+        if not needle:
+            return None
+        with self._lock:
+            port_id = self._port_index.get(port) if port is not None else None
+            if port is not None and port_id is None:
+                return None
+            if backwards:
+                return self._search_backwards(needle, min(start, self._end - 1), port_id)
+            return self._search_forwards(needle, max(start, self._first), port_id)
+
+    def _search_forwards(self, needle: bytes, seq: int, port_id: Optional[int]) -> Optional[int]:
+        cap, data_cap = self.capacity, self.data_capacity
+        offsets, lengths = self._offset, self._length
+        while seq < self._end:
+            lap = offsets[seq % cap] // data_cap
+            # Records of one lap of the ring are contiguous in memory
+            last = self._seq_for_offset(seq, self._end, (lap + 1) * data_cap - 1)
+            base = lap * data_cap
+            pos = offsets[seq % cap] - base
+            region_end = offsets[last % cap] + lengths[last % cap] - base
+            while True:
+                found = self._data.find(needle, pos, region_end)
+                if found < 0:
+                    break
+                rec = self._seq_for_offset(seq, last + 1, base + found)
+                rec_end = offsets[rec % cap] + lengths[rec % cap] - base
+                if found + len(needle) <= rec_end and self.matches_port(rec, port_id):
+                    return rec
+                # Crosses into the next record, or wrong port: continue after this record
+                pos = rec_end
+            seq = last + 1
+        return None
+
+    def _search_backwards(self, needle: bytes, seq: int, port_id: Optional[int]) -> Optional[int]:
+        cap, data_cap = self.capacity, self.data_capacity
+        offsets, lengths = self._offset, self._length
+        while seq >= self._first:
+            lap = offsets[seq % cap] // data_cap
+            base = lap * data_cap
+            # First record of this lap
+            lo, hi = self._first, seq
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if offsets[mid % cap] < base:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            first = lo
+            region_start = offsets[first % cap] - base
+            end = offsets[seq % cap] + lengths[seq % cap] - base
+            while True:
+                found = self._data.rfind(needle, region_start, end)
+                if found < 0:
+                    break
+                rec = self._seq_for_offset(first, seq + 1, base + found)
+                rec_start = offsets[rec % cap] - base
+                rec_end = rec_start + lengths[rec % cap]
+                if found + len(needle) <= rec_end and self.matches_port(rec, port_id):
+                    return rec
+                if found + len(needle) > rec_end:
+                    # Spans two records: only matches ending inside `rec` remain possible
+                    end = rec_end
+                else:
+                    # Wrong port: skip the rest of this record
+                    end = rec_start + len(needle) - 1
+                    if end <= region_start:
+                        break
+            seq = first - 1
+        return None
+
+class TrafficView:
+    """
+    Row index over a TrafficBuffer for a virtualized list: maps visible row
+    numbers to sequence numbers, optionally for one port only. Only the rows on
+    screen are ever formatted.
+    """
+
+    def __init__(self, buffer: TrafficBuffer):
+        self.buffer = buffer
+        self.port: Optional[str] = None
+        self._rows = array('Q')  # Matching sequence numbers, only used with a port filter
+        self._scanned = 0        # Sequence numbers below this were already scanned
+
+    def set_port(self, port: Optional[str]):
+        self.port = port
+        self._rows = array('Q')
+        self._scanned = self.buffer.first_seq
+        self.refresh()
+
+    def refresh(self):
+        """Pick up new records and forget evicted ones."""
+        buffer = self.buffer
+        first = buffer.first_seq
+        if self.port is None:
+            self._scanned = buffer.end_seq
+            return
+        if self._rows and self._rows[0] < first:
+            del self._rows[:bisect_left(self._rows, first)]
+        port_id = buffer._port_index.get(self.port)
+        end = buffer.end_seq
+        if port_id is not None:
+            for seq in range(max(self._scanned, first), end):
+                if buffer.matches_port(seq, port_id):
+                    self._rows.append(seq)
+        self._scanned = end
+
+    @property
+    def row_count(self) -> int:
+        if self.port is None:
+            return len(self.buffer)
+        return len(self._rows)
+
+    def seq_at(self, row: int) -> int:
+        if self.port is None:
+            return self.buffer.first_seq + row
+        return self._rows[row]
+
+    def row_of(self, seq: int) -> int:
+        """Row showing `seq`, or the row of the next record after it."""
+        if self.port is None:
+            return seq - self.buffer.first_seq
+        return bisect_left(self._rows, seq)
+
+    def rows(self, start: int, count: int) -> List[Tuple[int, TrafficRecord]]:
+        """(sequence number, record) for up to `count` rows from `start`."""
+        end = min(start + count, self.row_count)
+        result = []
+        for row in range(max(start, 0), end):
+            seq = self.seq_at(row)
+            try:
+                result.append((seq, self.buffer.get(seq)))
+            except IndexError:
+                # Evicted since the last refresh()
+                continue
+        return result
@@ -0,0 +1,339 @@
+import struct
+from typing import Dict, Optional, Tuple
+from core.equipment import Equipment
+from core.framing import Framer, LengthFramer
+from core.state_schema import Field
+
+TRANSPORT_TCP, TRANSPORT_RTU = "TCP", "RTU"
+
+# Register map of every unit (input registers 0-13, holding registers 0-23).
+# Floats and 32-bit integers are big endian, high word first.
+#   0-1  gross weight (float)       6-7  gross weight (int32, x 10^decimals)   12  status bits
+#   2-3  net weight (float)         8-9  net weight (int32)                    13  state version (change counter)
+#   4-5  tare (float)              10-11 tare (int32)
+# Holding registers only:
+#   20   command (write 1 = tare, 2 = zero, 3 = clear tare; reads 0)
+#   22-23 preset tare (float)
+MEASUREMENT = struct.Struct(">fffiiiHH")
+INPUT_REGISTERS = MEASUREMENT.size // 2
+HOLDING_TAIL = struct.Struct(">12xHxxf")  # Reserved 14-19, command 20, reserved 21, preset tare 22-23
+HOLDING_REGISTERS = 24
+REG_STATUS = 12
+REG_COMMAND = 20
+REG_PRESET_TARE = 22
+COMMAND_TARE, COMMAND_ZERO, COMMAND_CLEAR_TARE = 1, 2, 3
+
+# Status register bits (also served as discrete inputs 0-15)
+STATUS_STABLE = 0x0001
+STATUS_NET = 0x0002      # Tare active or net display selected
+STATUS_ZERO = 0x0004     # Gross weight is zero
+STATUS_OVERLOAD = 0x0008  # Above weight_range["max"]
+STATUS_UNDERLOAD = 0x0010  # Below weight_range["min"]
+STATUS_STREAMING = 0x0020
+
+INT32_MIN, INT32_MAX = -0x80000000, 0x7FFFFFFF
+
+# Function codes
+FC_READ_DISCRETE_INPUTS = 0x02
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_READ_INPUT_REGISTERS = 0x04
+FC_WRITE_SINGLE_REGISTER = 0x06
+FC_WRITE_MULTIPLE_REGISTERS = 0x10
+
+# Exception codes
+EX_ILLEGAL_FUNCTION = 0x01
+EX_ILLEGAL_ADDRESS = 0x02
+EX_ILLEGAL_VALUE = 0x03
+EX_GATEWAY_NO_RESPONSE = 0x0B  # Unit ID not mapped to a device (Modbus TCP)
+
+MBAP = struct.Struct(">HHHB")  # transaction, protocol (0), length of unit ID + PDU, unit ID
+REQUEST = struct.Struct(">BHH")  # function, address, count / value
+
+def _crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+CRC_TABLE = _crc_table()
+
+def crc16(data) -> bytes:
+    """Modbus RTU CRC, low byte first as sent on the wire."""
+    crc = 0xFFFF
+    table = CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc.to_bytes(2, "little")
+
+def _scaled(value: float, factor: int) -> int:
+    return max(INT32_MIN, min(INT32_MAX, round(value * factor)))
+
+def image_key(scale) -> tuple:
+    """
+    Everything a register image depends on: the scale snapshot plus the
+    status inputs kept outside it (streaming, the over/underload range).
+    """
+    weight_range = getattr(scale, "weight_range", None) or {}
+    return (scale.state, bool(getattr(scale, "is_streaming", False)),
+            weight_range.get("min"), weight_range.get("max"))
+
+def build_register_image(scale, decimals: int) -> Tuple[tuple, bytes]:
+    """(image_key, holding register image) of a scale; the input registers are its first INPUT_REGISTERS."""
+    # Read the inputs once; the image is tagged with them (see BaseScale.current_frame)
+    key = image_key(scale)
+    state, streaming, low, high = key
+    net = state.weight - state.tare
+    status = 0
+    if state.stable:
+        status |= STATUS_STABLE
+    if state.tare or state.net:
+        status |= STATUS_NET
+    if state.weight == 0:
+        status |= STATUS_ZERO
+    if high is not None and state.weight > high:
+        status |= STATUS_OVERLOAD
+    if low is not None and state.weight < low:
+        status |= STATUS_UNDERLOAD
+    if streaming:
+        status |= STATUS_STREAMING
+    factor = 10 ** decimals
+    image = MEASUREMENT.pack(state.weight, net, state.tare,
+                             _scaled(state.weight, factor), _scaled(net, factor), _scaled(state.tare, factor),
+                             status, state.version & 0xFFFF) + HOLDING_TAIL.pack(0, state.tare)
+    return key, image
+
+class RtuFramer(Framer):
+    """
+    Modbus RTU requests, sized by function code (the bus has no delimiters and
+    inter-frame gaps are not visible through the port). A frame whose CRC does
+    not match is shifted by one byte until a valid frame lines up again.
+    """
+    FIXED_SIZE = {0x01: 8, 0x02: 8, 0x03: 8, 0x04: 8, 0x05: 8, 0x06: 8}
+
+    def _next_frame_end(self) -> Optional[int]:
+        while True:
+            available = len(self._buf) - self._start
+            if available < 4:
+                return None
+            function = self._buf[self._start + 1]
+            if function in (0x0F, 0x10):
+                if available < 7:
+                    return None
+                size = 9 + self._buf[self._start + 6]
+            else:
+                size = self.FIXED_SIZE.get(function)
+                if size is None:
+                    self._skip(1)
+                    continue
+            if available < size:
+                return None
+            end = self._start + size
+            if crc16(self._buf[self._start:end - 2]) == self._buf[end - 2:end]:
+                return end
+            self._skip(1)
+
+class ModbusGateway(Equipment):
+    """
+    Modbus RTU / Modbus TCP server exposing scales as register maps, so PLCs
+    can read indicators over Modbus instead of the vendor protocol.
+
+    Each unit ID maps to a scale by device name (`units`); one gateway serves
+    any number of units on one bus or listener. A unit's register image is
+    packed once per scale snapshot, so it is rebuilt when the scale's state
+    changes and every read, of any length, is a slice of the packed bytes.
+    """
+
+    def __init__(self, name: str, device_id: str, transport: str = TRANSPORT_TCP, tcp_port: int = 502,
+                 decimals: int = 3):
+        """
+        :param transport: TRANSPORT_TCP (MBAP over TCP) or TRANSPORT_RTU (serial)
+        :param decimals: Decimal places kept in the scaled int32 registers (3: kg -> g)
+        """
+        super().__init__(name, device_id)
+        if transport not in (TRANSPORT_TCP, TRANSPORT_RTU):
+            raise ValueError(f"Unknown Modbus transport {transport}")
+        self.transport = transport
+        self.decimals = decimals
+        if transport == TRANSPORT_TCP:
+            self.connection_settings = {"tcp_port": tcp_port, "host": "0.0.0.0"}
+        self.units: Dict[int, str] = {}  # Unit ID -> device name
+        self.peers: Optional[Dict[str, Equipment]] = None  # Set by Simulator.add_device
+        # Unit ID -> (scale, image_key the image was built for, image)
+        self._images: Dict[int, Tuple[Equipment, tuple, bytes]] = {}
+        self.requests = 0
+        self.image_builds = 0
+
+    STATE_SCHEMA = Equipment.STATE_SCHEMA.extend(
+        Field("transport", str, choices=(TRANSPORT_TCP, TRANSPORT_RTU), set="set_transport"),
+        Field("decimals", int, set="set_decimals"),
+        Field("unit_map", dict, set="set_unit_map"),
+    )
+
+    def set_transport(self, transport: str):
+        self.transport = transport
+        self.reset_framer()
+        self.state_changed()
+
+    def set_decimals(self, decimals: int):
+        self.decimals = decimals
+        self._images.clear()
+        self.state_changed()
+
+    @property
+    def unit_map(self) -> Dict[str, str]:
+        """Unit ID -> device name, as saved in projects (JSON keys are strings)."""
+        return {str(unit): name for unit, name in self.units.items()}
+
+    def set_unit_map(self, mapping: Dict):
+        self.units = {int(unit): name for unit, name in mapping.items()}
+        self._images.clear()
+        self.state_changed()
+
+    def map_unit(self, unit_id: int, device_name: str):
+        if not 1 <= unit_id <= 247:
+            raise ValueError(f"Unit ID {unit_id} is outside 1..247")
+        self.units[unit_id] = device_name
+        self._images.pop(unit_id, None)
+        self.state_changed()
+
+    def unmap_unit(self, unit_id: int):
+        self.units.pop(unit_id, None)
+        self._images.pop(unit_id, None)
+        self.state_changed()
+
+    @property
+    def image_stats(self) -> dict:
+        return {"requests": self.requests, "builds": self.image_builds}
+
+    def _scale(self, unit_id: int):
+        name = self.units.get(unit_id)
+        if name is None or self.peers is None:
+            return None
+        device = self.peers.get(name)
+        return device if hasattr(device, "state") else None
+
+    def register_image(self, unit_id: int) -> Optional[bytes]:
+        """Holding register image of a unit, rebuilt only if its image_key changed since the last request."""
+        scale = self._scale(unit_id)
+        if scale is None:
+            return None
+        cached = self._images.get(unit_id)
+        if cached is not None and cached[0] is scale:
+            key = image_key(scale)
+            # The snapshot by identity (cheap), the few inputs outside it by value
+            if cached[1][0] is key[0] and cached[1][1:] == key[1:]:
+                return cached[2]
+        self.image_builds += 1
+        key, image = build_register_image(scale, self.decimals)
+        self._images[unit_id] = (scale, key, image)
+        return image
+
+    # --- Protocol ---
+
+    def create_framer(self) -> Optional[Framer]:
+        if self.transport == TRANSPORT_TCP:
+            # MBAP length at offset 4 counts the unit ID and the PDU
+            return LengthFramer(length_offset=4, length_size=2, adjust=6)
+        return RtuFramer()
+
+    def process_command(self, command: bytes) -> bytes:
+        self.requests += 1
+        if self.transport == TRANSPORT_TCP:
+            if len(command) < MBAP.size + 1:
+                return None
+            transaction, protocol, _, unit_id = MBAP.unpack_from(command)
+            if protocol != 0:
+                return None
+            pdu = self._handle(unit_id, command[MBAP.size:])
+            if pdu is None:
+                pdu = bytes((command[MBAP.size] | 0x80, EX_GATEWAY_NO_RESPONSE))
+            return MBAP.pack(transaction, 0, len(pdu) + 1, unit_id) + pdu
+
+        # RTU: the framer has checked the CRC
+        unit_id, pdu = command[0], command[1:-2]
+        if unit_id == 0:
+            # Broadcast: writes go to every unit, nobody answers
+            if pdu[0] in (FC_WRITE_SINGLE_REGISTER, FC_WRITE_MULTIPLE_REGISTERS):
+                for unit in list(self.units):
+                    self._handle(unit, pdu)
+            return None
+        pdu = self._handle(unit_id, pdu)
+        if pdu is None:
+            # No such slave on the bus: silence, the master times out
+            return None
+        frame = bytes((unit_id,)) + pdu
+        return frame + crc16(frame)
+
+    def _handle(self, unit_id: int, pdu: bytes) -> Optional[bytes]:
+        """Response PDU (or exception PDU) for a unit; None if the unit is not mapped."""
+        image = self.register_image(unit_id)
+        if image is None:
+            return None
+        function = pdu[0]
+        if len(pdu) < REQUEST.size:
+            return bytes((function | 0x80, EX_ILLEGAL_VALUE))
+        _, address, count = REQUEST.unpack_from(pdu)
+        if function in (FC_READ_HOLDING_REGISTERS, FC_READ_INPUT_REGISTERS):
+            size = HOLDING_REGISTERS if function == FC_READ_HOLDING_REGISTERS else INPUT_REGISTERS
+            if not 1 <= count <= 125:
+                return bytes((function | 0x80, EX_ILLEGAL_VALUE))
+            if address + count > size:
+                return bytes((function | 0x80, EX_ILLEGAL_ADDRESS))
+            return bytes((function, count * 2)) + image[address * 2:(address + count) * 2]
+        if function == FC_READ_DISCRETE_INPUTS:
+            if not 1 <= count <= 2000:
+                return bytes((function | 0x80, EX_ILLEGAL_VALUE))
+            if address + count > 16:
+                return bytes((function | 0x80, EX_ILLEGAL_ADDRESS))
+            status = int.from_bytes(image[REG_STATUS * 2:REG_STATUS * 2 + 2], "big")
+            bits = (status >> address) & ((1 << count) - 1)
+            size = (count + 7) // 8
+            return bytes((function, size)) + bits.to_bytes(size, "little")
+        if function == FC_WRITE_SINGLE_REGISTER:
+            error = self._write(unit_id, address, pdu[3:5])
+            return bytes((function | 0x80, error)) if error else bytes(pdu[:5])
+        if function == FC_WRITE_MULTIPLE_REGISTERS:
+            if not 1 <= count <= 123 or len(pdu) < 6 + count * 2 or pdu[5] != count * 2:
+                return bytes((function | 0x80, EX_ILLEGAL_VALUE))
+            error = self._write(unit_id, address, pdu[6:6 + count * 2])
+            return bytes((function | 0x80, error)) if error else bytes(pdu[:5])
+        return bytes((function | 0x80, EX_ILLEGAL_FUNCTION))
+
+    def _write(self, unit_id: int, address: int, data: bytes) -> int:
+        """Apply a register write to the unit's scale. Returns an exception code, 0 on success."""
+        scale = self._scale(unit_id)
+        end = address + len(data) // 2
+        if address == REG_COMMAND and end == REG_COMMAND + 1:
+            command = int.from_bytes(data, "big")
+            if command == COMMAND_TARE:
+                scale.tare()
+            elif command == COMMAND_ZERO:
+                scale.zero()
+            elif command == COMMAND_CLEAR_TARE:
+                scale.set_tare(0.0)
+            else:
+                return EX_ILLEGAL_VALUE
+            return 0
+        if address == REG_PRESET_TARE and end == REG_PRESET_TARE + 2:
+            scale.set_tare(struct.unpack(">f", data)[0])
+            return 0
+        return EX_ILLEGAL_ADDRESS
+
+# --- Client side requests (tests, benchmarks, scripted pollers) ---
+
+def build_tcp_request(unit_id: int, function: int, address: int, count: int, transaction: int = 1,
+                      data: bytes = b"") -> bytes:
+    """Modbus TCP request; for FC16 `data` holds the register values (byte count is added)."""
+    pdu = REQUEST.pack(function, address, count)
+    if function == FC_WRITE_MULTIPLE_REGISTERS:
+        pdu += bytes((len(data),)) + data
+    return MBAP.pack(transaction, 0, len(pdu) + 1, unit_id) + pdu
+
+def build_rtu_request(unit_id: int, function: int, address: int, count: int, data: bytes = b"") -> bytes:
+    frame = bytes((unit_id,)) + REQUEST.pack(function, address, count)
+    if function == FC_WRITE_MULTIPLE_REGISTERS:
+        frame += bytes((len(data),)) + data
+    return frame + crc16(frame)
@@ -0,0 +1,429 @@
+import struct
+from typing import Dict, Optional, Tuple
+from core.equipment import Equipment
+from core.framing import Framer, LengthFramer
+from core.state_schema import Field
+from .memory import MemoryArea
+
+PROTOCOL_3E = "3E"              # MC protocol 3E frame, binary, TCP
+PROTOCOL_3E_ASCII = "3E-ASCII"  # MC protocol 3E frame, ASCII, TCP
+PROTOCOL_1E = "1E"              # MC protocol 1E frame (A compatible), binary, TCP
+PROTOCOL_FX = "FX"              # FX programming port protocol, serial
+PROTOCOLS = (PROTOCOL_3E, PROTOCOL_3E_ASCII, PROTOCOL_1E, PROTOCOL_FX)
+
+WORD_DEVICES = ("D", "W")
+# Device -> 3E binary device code
+DEVICE_CODES = {"X": 0x9C, "Y": 0x9D, "M": 0x90, "D": 0xA8, "W": 0xB4}
+DEVICE_BY_CODE = {code: device for device, code in DEVICE_CODES.items()}
+HEX_DEVICES = ("X", "Y", "W")  # Numbered in hexadecimal (X/Y are octal on the FX series)
+
+# Points per device of each series; devices a series does not have are left out
+SERIES_POINTS = {
+    "FX2N": {"X": 256, "Y": 256, "M": 3072, "D": 8000},
+    "FX3G": {"X": 256, "Y": 256, "M": 7680, "D": 8000},
+    "FX3U": {"X": 256, "Y": 256, "M": 7680, "D": 8000},
+    "Q": {"X": 8192, "Y": 8192, "M": 8192, "D": 12288, "W": 8192},
+}
+
+# --- MC protocol ---
+
+HEADER_3E = struct.Struct("<HBBHBHH")  # subheader, network, PC, module I/O, station, data length, timer / end code
+HEADER_3E_ASCII = 22                   # Characters up to and including the monitoring timer
+SUBHEADER_3E_REQUEST, SUBHEADER_3E_RESPONSE = 0x0050, 0x00D0
+COMMAND_3E = struct.Struct("<HH")      # command, subcommand
+DEVICE_3E = struct.Struct("<IH")       # head device (3 bytes) + device code, points
+CMD_BATCH_READ, CMD_BATCH_WRITE = 0x0401, 0x1401
+SUB_WORD, SUB_BIT = 0x0000, 0x0001
+MAX_WORD_POINTS, MAX_BIT_POINTS = 960, 7168
+
+HEADER_1E = struct.Struct("<BBHIBBBx")  # subheader, PC, timer, head device, ' ', device letter, points, 0x00
+# 1E subheader -> (command, subcommand)
+COMMANDS_1E = {0x00: (CMD_BATCH_READ, SUB_BIT), 0x01: (CMD_BATCH_READ, SUB_WORD),
+               0x02: (CMD_BATCH_WRITE, SUB_BIT), 0x03: (CMD_BATCH_WRITE, SUB_WORD)}
+
+END_OK = 0x0000
+END_ASCII = 0xC050    # ASCII data that is not hexadecimal
+END_POINTS = 0xC051   # Number of points out of range
+END_RANGE = 0xC056    # Head device + points beyond the device range
+END_COMMAND = 0xC059  # Command or subcommand not supported
+END_DEVICE = 0xC05C   # Device does not exist or cannot be accessed in this unit
+END_LENGTH = 0xC061   # Request data length does not match
+# 3E end code -> 1E end code
+END_CODES_1E = {END_ASCII: 0x54, END_POINTS: 0x57, END_RANGE: 0x58, END_COMMAND: 0x50,
+                END_DEVICE: 0x56, END_LENGTH: 0x57}
+
+# --- FX programming port ---
+
+FX_STX, FX_ETX, FX_ENQ = 0x02, 0x03, 0x05
+FX_ACK, FX_NAK = b"\x06", b"\x15"
+# Byte addresses of the read ('0') / write ('1') commands: (device, base, bytes or None for the whole area)
+FX_BYTE_MAP = (("X", 0x0080, 32), ("Y", 0x00A0, 32), ("M", 0x0100, 128), ("D", 0x1000, None))
+# Bit addresses of force ON ('7') / force OFF ('8'): (device, base, points)
+FX_BIT_MAP = (("X", 0x0400, 256), ("Y", 0x0500, 256), ("M", 0x0800, 1024))
+
+class McError(Exception):
+    """A request the PLC answers with an abnormal end code."""
+
+    def __init__(self, end_code: int):
+        super().__init__(f"end code 0x{end_code:04X}")
+        self.end_code = end_code
+
+class MC3EAsciiFramer(Framer):
+    """3E ASCII frames: the request data length is 4 hex digits at offset 14."""
+
+    def _next_frame_end(self) -> Optional[int]:
+        available = len(self._buf) - self._start
+        if available < 18:
+            return None
+        try:
+            size = 18 + int(self._buf[self._start + 14:self._start + 18], 16)
+        except ValueError:
+            self._skip(available)
+            return None
+        return self._start + size if available >= size else None
+
+class MC1EFramer(Framer):
+    """1E frames have no length field; batch writes carry data sized by the point count."""
+
+    def _next_frame_end(self) -> Optional[int]:
+        available = len(self._buf) - self._start
+        if available < HEADER_1E.size:
+            return None
+        subheader = self._buf[self._start]
+        points = self._buf[self._start + 10] or 256
+        size = HEADER_1E.size
+        if subheader == 0x02:
+            size += (points + 1) // 2
+        elif subheader == 0x03:
+            size += points * 2
+        return self._start + size if available >= size else None
+
+class FxFramer(Framer):
+    """FX programming port: a lone ENQ, or STX ... ETX followed by a 2 character sum check."""
+
+    def _next_frame_end(self) -> Optional[int]:
+        end = len(self._buf)
+        while self._start < end:
+            first = self._buf[self._start]
+            if first == FX_ENQ:
+                return self._start + 1
+            if first == FX_STX:
+                etx = self._buf.find(FX_ETX, self._start + 1)
+                if etx < 0 or etx + 3 > end:
+                    return None
+                return etx + 3
+            self._skip(1)
+        return None
+
+def _swap16(data) -> bytearray:
+    """Swap the bytes of every 16-bit word (device memory is little endian, ASCII frames are not)."""
+    out = bytearray(len(data))
+    out[0::2] = data[1::2]
+    out[1::2] = data[0::2]
+    return out
+
+def fx_sum(data: bytes) -> bytes:
+    return f"{sum(data) & 0xFF:02X}".encode("ascii")
+
+class MelsecPLC(Equipment):
+    """
+    Mitsubishi MELSEC PLC (FX2N / FX3G / FX3U / Q series).
+
+    Speaks the MC protocol over TCP (3E binary or ASCII, 1E binary) or the FX
+    programming port protocol over serial, depending on `protocol`. Serves
+    batch read / batch write of the X, Y, M, D and W devices.
+
+    Each device is one little endian MemoryArea: D and W hold two bytes per
+    point, X, Y and M eight points per byte. Word reads and writes are a
+    single slice of that memory; bit-unit access converts all points at once
+    through an integer, never point by point.
+    """
+
+    def __init__(self, name: str, device_id: str, series: str = "Q", protocol: str = PROTOCOL_3E,
+                 tcp_port: int = 5000):
+        """
+        :param series: Key of SERIES_POINTS; sets the device ranges
+        :param protocol: One of PROTOCOLS
+        :param tcp_port: Listening port for the MC protocol (ignored for the FX serial protocol)
+        """
+        super().__init__(name, device_id)
+        if series not in SERIES_POINTS:
+            raise ValueError(f"Unknown MELSEC series {series}")
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown MELSEC protocol {protocol}")
+        self.series = series
+        self.protocol = protocol
+        self.memory: Dict[str, MemoryArea] = {}
+        for device, points in SERIES_POINTS[series].items():
+            size = points * 2 if device in WORD_DEVICES else (points + 7) // 8
+            self.memory[device] = MemoryArea(device, size, byteorder="little")
+        if protocol == PROTOCOL_FX:
+            # Programming port default: 9600 bps, 7 data bits, even parity, 1 stop bit
+            self.connection_settings.update({"bytesize": 7, "parity": "E"})
+        else:
+            self.connection_settings = {"tcp_port": tcp_port, "host": "0.0.0.0"}
+        self.requests = 0
+
+    STATE_SCHEMA = Equipment.STATE_SCHEMA.extend(
+        Field("protocol", str, choices=PROTOCOLS, set="set_protocol"),
+    )
+
+    def set_protocol(self, protocol: str):
+        self.protocol = protocol
+        self.reset_framer()
+        self.state_changed()
+
+    # --- Device memory ---
+
+    def _area(self, device: str) -> MemoryArea:
+        area = self.memory.get(device)
+        if area is None:
+            raise McError(END_DEVICE)
+        return area
+
+    def get_word(self, device: str, number: int) -> int:
+        return self._area(device).get_word(number * 2)
+
+    def set_word(self, device: str, number: int, value: int):
+        self._area(device).set_word(number * 2, value)
+
+    def get_bit(self, device: str, number: int) -> bool:
+        return self._area(device).get_bit(number >> 3, number & 7)
+
+    def set_bit(self, device: str, number: int, value: bool):
+        self._area(device).set_bit(number >> 3, number & 7, value)
+
+    def read_words(self, device: str, head: int, points: int):
+        """`points` words from `head` as little endian bytes (a memoryview when no shifting is needed)."""
+        area = self._area(device)
+        if device in WORD_DEVICES or head & 7 == 0:
+            start = head * 2 if device in WORD_DEVICES else head >> 3
+            if not area.contains(start, points * 2):
+                raise McError(END_RANGE)
+            return area.view[start:start + points * 2]
+        # Bit device from an unaligned head: 16 points per word
+        try:
+            return area.read_bits(head, points * 16).to_bytes(points * 2, "little")
+        except IndexError:
+            raise McError(END_RANGE)
+
+    def write_words(self, device: str, head: int, data):
+        area = self._area(device)
+        if device in WORD_DEVICES or head & 7 == 0:
+            start = head * 2 if device in WORD_DEVICES else head >> 3
+            if not area.contains(start, len(data)):
+                raise McError(END_RANGE)
+            area.data[start:start + len(data)] = data
+            return
+        try:
+            area.write_bits(head, len(data) * 8, int.from_bytes(data, "little"))
+        except IndexError:
+            raise McError(END_RANGE)
+
+    def read_bits(self, device: str, head: int, points: int) -> str:
+        """One character per point, '0' or '1'."""
+        if device in WORD_DEVICES:
+            raise McError(END_DEVICE)
+        try:
+            value = self._area(device).read_bits(head, points)
+        except IndexError:
+            raise McError(END_RANGE)
+        return format(value, f"0{points}b")[::-1]
+
+    def write_bits(self, device: str, head: int, points: str):
+        if device in WORD_DEVICES:
+            raise McError(END_DEVICE)
+        if points.strip("01"):
+            raise McError(END_ASCII)
+        try:
+            self._area(device).write_bits(head, len(points), int(points[::-1], 2))
+        except IndexError:
+            raise McError(END_RANGE)
+
+    # --- Protocol ---
+
+    def create_framer(self) -> Optional[Framer]:
+        if self.protocol == PROTOCOL_3E:
+            # Request data length (little endian) at offset 7 counts the bytes after it
+            return LengthFramer(length_offset=7, length_size=2, adjust=9, byteorder="little")
+        if self.protocol == PROTOCOL_3E_ASCII:
+            return MC3EAsciiFramer()
+        if self.protocol == PROTOCOL_1E:
+            return MC1EFramer()
+        return FxFramer()
+
+    def process_command(self, command: bytes) -> bytes:
+        self.requests += 1
+        if self.protocol == PROTOCOL_3E:
+            return self._process_3e(command)
+        if self.protocol == PROTOCOL_3E_ASCII:
+            return self._process_3e_ascii(command)
+        if self.protocol == PROTOCOL_1E:
+            return self._process_1e(command)
+        return self._process_fx(command)
+
+    def _batch(self, command: int, subcommand: int, device: str, head: int, points: int,
+               payload, ascii: bool) -> bytes:
+        """Execute a batch read / write; returns the response data (empty for writes)."""
+        if command not in (CMD_BATCH_READ, CMD_BATCH_WRITE) or subcommand not in (SUB_WORD, SUB_BIT):
+            raise McError(END_COMMAND)
+        words = subcommand == SUB_WORD
+        if not 0 < points <= (MAX_WORD_POINTS if words else MAX_BIT_POINTS):
+            raise McError(END_POINTS)
+        if command == CMD_BATCH_READ:
+            if words:
+                data = self.read_words(device, head, points)
+                return _swap16(data).hex().upper().encode("ascii") if ascii else bytes(data)
+            bits = self.read_bits(device, head, points)
+            if ascii:
+                return bits.encode("ascii")
+            # Binary: one point per nibble, first point in the high nibble
+            return bytes.fromhex(bits + "0" if points & 1 else bits)
+        if words:
+            if len(payload) != points * (4 if ascii else 2):
+                raise McError(END_LENGTH)
+            if ascii:
+                try:
+                    payload = _swap16(bytes.fromhex(payload.decode("ascii")))
+                except ValueError:
+                    raise McError(END_ASCII)
+            self.write_words(device, head, payload)
+        else:
+            if len(payload) != (points if ascii else (points + 1) // 2):
+                raise McError(END_LENGTH)
+            bits = payload.decode("ascii", "replace") if ascii else payload.hex()[:points]
+            self.write_bits(device, head, bits)
+        return b""
+
+    def _process_3e(self, frame: bytes) -> bytes:
+        if len(frame) < HEADER_3E.size + COMMAND_3E.size or HEADER_3E.unpack_from(frame)[0] != SUBHEADER_3E_REQUEST:
+            self.logger.warning(f"Not a 3E request: {frame[:16].hex()}")
+            return None
+        route = frame[2:7]  # Network, PC, module I/O, station; echoed in the response
+        command, subcommand = COMMAND_3E.unpack_from(frame, HEADER_3E.size)
+        try:
+            if len(frame) < 21:
+                raise McError(END_LENGTH)
+            spec, points = DEVICE_3E.unpack_from(frame, 15)
+            device = DEVICE_BY_CODE.get(spec >> 24)
+            if device is None:
+                raise McError(END_DEVICE)
+            data = self._batch(command, subcommand, device, spec & 0xFFFFFF, points, frame[21:], False)
+        except McError as e:
+            # Error information: the failed request's route and command
+            info = route + frame[11:15]
+            return struct.pack("<H", SUBHEADER_3E_RESPONSE) + route + struct.pack("<HH", 2 + len(info), e.end_code) + info
+        return struct.pack("<H", SUBHEADER_3E_RESPONSE) + route + struct.pack("<HH", 2 + len(data), END_OK) + data
+
+    def _process_3e_ascii(self, frame: bytes) -> bytes:
+        if len(frame) < HEADER_3E_ASCII + 8 or frame[:4] != b"5000":
+            self.logger.warning(f"Not a 3E ASCII request: {frame[:30]!r}")
+            return None
+        route = frame[4:14]
+        try:
+            if len(frame) < 40:
+                raise McError(END_LENGTH)
+            command = int(frame[22:26], 16)
+            subcommand = int(frame[26:30], 16)
+            device = frame[30:31].decode("ascii", "replace")
+            if frame[31:32] != b"*" or device not in DEVICE_CODES:
+                raise McError(END_DEVICE)
+            base = 10
+            if device in HEX_DEVICES:
+                base = 8 if device != "W" and self.series.startswith("FX") else 16
+            head = int(frame[32:38], base)
+            points = int(frame[38:42], 16)
+            data = self._batch(command, subcommand, device, head, points, frame[42:], True)
+            end_code = END_OK
+        except ValueError:
+            end_code, data = END_ASCII, b""
+        except McError as e:
+            end_code, data = e.end_code, b""
+        if end_code != END_OK:
+            data = route + frame[22:30]
+        return b"D000" + route + f"{4 + len(data):04X}{end_code:04X}".encode("ascii") + data
+
+    def _process_1e(self, frame: bytes) -> bytes:
+        if len(frame) < HEADER_1E.size:
+            return None
+        subheader, _, _, head, space, letter, points = HEADER_1E.unpack_from(frame)
+        try:
+            if subheader not in COMMANDS_1E:
+                raise McError(END_COMMAND)
+            device = chr(letter)
+            if space != 0x20 or device not in DEVICE_CODES:
+                raise McError(END_DEVICE)
+            command, subcommand = COMMANDS_1E[subheader]
+            data = self._batch(command, subcommand, device, head, points or 256, frame[HEADER_1E.size:], False)
+        except McError as e:
+            return bytes((subheader | 0x80, END_CODES_1E.get(e.end_code, 0x50)))
+        return bytes((subheader | 0x80, 0x00)) + data
+
+    # --- FX programming port ---
+
+    def _fx_byte_area(self, address: int, count: int) -> Tuple[MemoryArea, int]:
+        for device, base, size in FX_BYTE_MAP:
+            area = self.memory.get(device)
+            if area is None:
+                continue
+            limit = min(size, len(area)) if size is not None else len(area)
+            if base <= address and address + count <= base + limit:
+                return area, address - base
+        raise IndexError(f"address 0x{address:04X}+{count} is not mapped")
+
+    def _fx_bit(self, address: int) -> Tuple[MemoryArea, int]:
+        for device, base, points in FX_BIT_MAP:
+            if base <= address < base + points and device in self.memory:
+                return self.memory[device], address - base
+        raise IndexError(f"bit address 0x{address:04X} is not mapped")
+
+    def _process_fx(self, frame: bytes) -> bytes:
+        if frame == bytes((FX_ENQ,)):
+            return FX_ACK
+        if len(frame) < 5 or frame[0] != FX_STX or frame[-3] != FX_ETX or fx_sum(frame[1:-2]) != frame[-2:]:
+            self.logger.warning(f"Bad FX frame: {frame!r}")
+            return FX_NAK
+        command, text = frame[1:2], frame[2:-3]
+        try:
+            if command == b"0":
+                address, count = int(text[0:4], 16), int(text[4:6], 16)
+                area, offset = self._fx_byte_area(address, count)
+                payload = area.view[offset:offset + count].hex().upper().encode("ascii") + bytes((FX_ETX,))
+                return bytes((FX_STX,)) + payload + fx_sum(payload)
+            if command == b"1":
+                address, count = int(text[0:4], 16), int(text[4:6], 16)
+                data = bytes.fromhex(text[6:].decode("ascii"))
+                if len(data) != count:
+                    return FX_NAK
+                area, offset = self._fx_byte_area(address, count)
+                area.data[offset:offset + count] = data
+                return FX_ACK
+            if command in (b"7", b"8"):
+                # Force ON / OFF; the bit address is sent low byte first
+                area, bit = self._fx_bit(int(text[2:4] + text[0:2], 16))
+                area.set_bit(bit >> 3, bit & 7, command == b"7")
+                return FX_ACK
+        except (ValueError, IndexError) as e:
+            self.logger.warning(f"FX request {frame!r} rejected: {e}")
+            return FX_NAK
+        return FX_NAK
+
+# --- Client side requests (tests, benchmarks, scripted pollers) ---
+
+def build_3e_request(command: int, subcommand: int, device: str, head: int, points: int, data: bytes = b"") -> bytes:
+    """3E binary request to network 0, PC 0xFF, own station, monitoring timer 1 s."""
+    body = COMMAND_3E.pack(command, subcommand) + DEVICE_3E.pack(DEVICE_CODES[device] << 24 | head, points) + data
+    return HEADER_3E.pack(SUBHEADER_3E_REQUEST, 0, 0xFF, 0x03FF, 0, 2 + len(body), 4) + body
+
+def build_3e_ascii_request(command: int, subcommand: int, device: str, head: int, points: int,
+                           data: bytes = b"", base: int = 10) -> bytes:
+    number = {8: f"{head:06o}", 16: f"{head:06X}"}.get(base, f"{head:06d}")
+    body = f"0004{command:04X}{subcommand:04X}{device}*{number}{points:04X}".encode("ascii") + data
+    return b"500000FF03FF00" + f"{len(body):04X}".encode("ascii") + body
+
+def build_1e_request(subheader: int, device: str, head: int, points: int, data: bytes = b"") -> bytes:
+    return HEADER_1E.pack(subheader, 0xFF, 4, head, 0x20, ord(device), points & 0xFF) + data
+
+def build_fx_request(command: str, text: str) -> bytes:
+    payload = (command + text).encode("ascii") + bytes((FX_ETX,))
+    return bytes((FX_STX,)) + payload + fx_sum(payload)
@@ -0,0 +1,113 @@
+import struct
+from typing import Union
+
+class MemoryArea:
+    """
+    One contiguous, byte-addressed PLC memory area (process image, flags, a
+    data block, ...). The bytes live in a single bytearray that is never
+    resized, so read() can hand out memoryview slices: request handlers copy
+    the data once, into the response, and never per item.
+
+    Typed accessors use the PLC's byte order (big endian for Siemens and
+    Modbus, little endian for MELSEC).
+    """
+    __slots__ = ("name", "data", "view", "byteorder", "_i16", "_u16", "_i32", "_u32", "_f32")
+
+    def __init__(self, name: str, size: int, byteorder: str = "big"):
+        self.name = name
+        self.data = bytearray(size)
+        self.view = memoryview(self.data)
+        self.byteorder = byteorder
+        prefix = ">" if byteorder == "big" else "<"
+        self._i16 = struct.Struct(prefix + "h")
+        self._u16 = struct.Struct(prefix + "H")
+        self._i32 = struct.Struct(prefix + "i")
+        self._u32 = struct.Struct(prefix + "I")
+        self._f32 = struct.Struct(prefix + "f")
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def contains(self, start: int, length: int) -> bool:
+        return 0 <= start and length >= 0 and start + length <= len(self.data)
+
+    def read(self, start: int, length: int) -> memoryview:
+        """Zero-copy view of `length` bytes at `start`. Raises IndexError outside the area."""
+        if not self.contains(start, length):
+            raise IndexError(f"{self.name}: {start}+{length} is outside 0..{len(self.data)}")
+        return self.view[start:start + length]
+
+    def write(self, start: int, data: Union[bytes, bytearray, memoryview]):
+        if not self.contains(start, len(data)):
+            raise IndexError(f"{self.name}: {start}+{len(data)} is outside 0..{len(self.data)}")
+        self.data[start:start + len(data)] = data
+
+    def clear(self):
+        self.view[:] = bytes(len(self.data))
+
+    # --- Bits ---
+
+    def get_bit(self, byte: int, bit: int) -> bool:
+        return bool(self.data[byte] >> bit & 1)
+
+    def set_bit(self, byte: int, bit: int, value: bool):
+        if value:
+            self.data[byte] |= 1 << bit
+        else:
+            self.data[byte] &= ~(1 << bit) & 0xFF
+
+    def read_bits(self, start: int, count: int) -> int:
+        """`count` bits from bit address `start` (LSB first) as one integer, bit 0 = first point."""
+        first, last = start >> 3, (start + count + 7) >> 3
+        if count <= 0 or not self.contains(first, last - first):
+            raise IndexError(f"{self.name}: bits {start}+{count} are outside 0..{len(self.data) * 8}")
+        return int.from_bytes(self.data[first:last], "little") >> (start & 7) & ((1 << count) - 1)
+
+    def write_bits(self, start: int, count: int, value: int):
+        """Store the low `count` bits of `value` from bit address `start`, in one slice assignment."""
+        first, last = start >> 3, (start + count + 7) >> 3
+        if count <= 0 or not self.contains(first, last - first):
+            raise IndexError(f"{self.name}: bits {start}+{count} are outside 0..{len(self.data) * 8}")
+        shift = start & 7
+        mask = ((1 << count) - 1) << shift
+        current = int.from_bytes(self.data[first:last], "little")
+        merged = current & ~mask | (value << shift) & mask
+        self.data[first:last] = merged.to_bytes(last - first, "little")
+
+    # --- Typed values ---
+
+    def get_byte(self, offset: int) -> int:
+        return self.data[offset]
+
+    def set_byte(self, offset: int, value: int):
+        self.data[offset] = value & 0xFF
+
+    def get_int(self, offset: int) -> int:
+        return self._i16.unpack_from(self.data, offset)[0]
+
+    def set_int(self, offset: int, value: int):
+        self._i16.pack_into(self.data, offset, value)
+
+    def get_word(self, offset: int) -> int:
+        return self._u16.unpack_from(self.data, offset)[0]
+
+    def set_word(self, offset: int, value: int):
+        self._u16.pack_into(self.data, offset, value & 0xFFFF)
+
+    def get_dint(self, offset: int) -> int:
+        return self._i32.unpack_from(self.data, offset)[0]
+
+    def set_dint(self, offset: int, value: int):
+        self._i32.pack_into(self.data, offset, value)
+
+    def get_dword(self, offset: int) -> int:
+        return self._u32.unpack_from(self.data, offset)[0]
+
+    def set_dword(self, offset: int, value: int):
+        self._u32.pack_into(self.data, offset, value & 0xFFFFFFFF)
+
+    def get_real(self, offset: int) -> float:
+        return self._f32.unpack_from(self.data, offset)[0]
+
+    def set_real(self, offset: int, value: float):
+        self._f32.pack_into(self.data, offset, value)
@@ -0,0 +1,331 @@
+import struct
+from typing import Dict, List, Optional, Tuple
+from core.equipment import Equipment
+from core.framing import LengthFramer
+from core.state_schema import Field
+from .memory import MemoryArea
+
+# ISO-on-TCP (RFC 1006): TPKT header, then a COTP header, then the S7comm PDU
+TPKT = struct.Struct(">BBH")           # version 3, reserved, total length
+COTP_DT_HEADER = b"\x02\xf0\x80"       # length 2, DT data, last data unit
+COTP_CR, COTP_CC, COTP_DT = 0xE0, 0xD0, 0xF0
+
+S7_PROTOCOL_ID = 0x32
+ROSCTR_JOB, ROSCTR_ACK_DATA = 0x01, 0x03
+JOB_HEADER = struct.Struct(">BBHHHH")     # id, rosctr, reserved, pdu ref, param length, data length
+ACK_HEADER = struct.Struct(">BBHHHHBB")   # ... + error class, error code
+SETUP_PARAMS = struct.Struct(">BBHHH")    # function, reserved, max AmQ calling, max AmQ called, PDU size
+ITEM_SPEC = struct.Struct(">BBBBHHBBH")   # 0x12, spec length, syntax id, transport size, count, DB, area, 24-bit bit address
+ITEM_HEADER = struct.Struct(">BBH")       # return code / reserved, data transport size, length
+
+FUNC_SETUP, FUNC_READ, FUNC_WRITE = 0xF0, 0x04, 0x05
+AREA_I, AREA_Q, AREA_M, AREA_DB = 0x81, 0x82, 0x83, 0x84
+
+# Transport size in a request item -> element size in bytes (BIT is handled separately)
+TS_BIT, TS_REAL = 0x01, 0x08
+ELEMENT_SIZE = {0x02: 1, 0x03: 1, 0x04: 2, 0x05: 2, 0x06: 4, 0x07: 4, 0x08: 4}
+
+# Data transport sizes in response / write data; the first three count the length in bits
+DTS_BIT, DTS_BYTE, DTS_INT, DTS_REAL, DTS_OCTET = 0x03, 0x04, 0x05, 0x07, 0x09
+DTS_BITS = (DTS_BIT, DTS_BYTE, DTS_INT)
+DTS_FOR_TS = {0x05: DTS_INT, 0x07: DTS_INT, TS_REAL: DTS_REAL}
+
+# Item return codes
+RC_OK = 0xFF
+RC_ADDRESS = 0x05            # Address out of range
+RC_TYPE = 0x06               # Data type not supported
+RC_TYPE_INCONSISTENT = 0x07  # Data type / length inconsistent
+RC_NO_OBJECT = 0x0A          # Object (e.g. data block) does not exist
+
+ERROR_FUNCTION_NOT_SUPPORTED = 0x8104
+ERROR_PDU_SIZE = 0x8500  # Job or its answer larger than the negotiated PDU
+
+class S7PLC(Equipment):
+    """
+    Siemens S7 PLC (S7-1200 / S7-1500) speaking S7comm over ISO-on-TCP,
+    served through CommManager's TCP listeners (Simulator.start_device_tcp,
+    port 102 by default).
+
+    Handles the COTP connection request, S7 setup communication (PDU size
+    negotiation, per client connection) and Read Var / Write Var jobs on the
+    DB, M, I and Q areas. A job or answer larger than the negotiated PDU is
+    refused with error 0x8500, as a CPU does.
+    Every area is one MemoryArea (a fixed bytearray); read items are answered
+    with memoryview slices of it that are copied once, into the response.
+    """
+
+    STATE_SCHEMA = Equipment.STATE_SCHEMA.extend(
+        Field("pdu_size", int),
+        Field("data_blocks", dict, set="set_data_blocks"),
+    )
+
+    def __init__(self, name: str, device_id: str, pdu_size: int = 480,
+                 data_blocks: Optional[Dict[int, int]] = None, area_size: int = 1024):
+        """
+        :param pdu_size: Largest PDU accepted in setup communication (S7-1200: 240, S7-1500: 960)
+        :param data_blocks: DB number -> size in bytes (default: DB1 with 1024 bytes)
+        :param area_size: Size of the I, Q and M areas in bytes
+        """
+        super().__init__(name, device_id)
+        self.pdu_size = pdu_size
+        self.connection_settings = {"tcp_port": 102, "host": "0.0.0.0"}
+        self.inputs = MemoryArea("I", area_size)
+        self.outputs = MemoryArea("Q", area_size)
+        self.flags = MemoryArea("M", area_size)
+        self._areas = {AREA_I: self.inputs, AREA_Q: self.outputs, AREA_M: self.flags}
+        self.dbs: Dict[int, MemoryArea] = {}
+        self.set_data_blocks(data_blocks or {1: 1024})
+        self.reads = 0
+        self.writes = 0
+
+    # --- Memory ---
+
+    def add_db(self, number: int, size: int) -> MemoryArea:
+        db = MemoryArea(f"DB{number}", size)
+        self.dbs[number] = db
+        self.state_changed()
+        return db
+
+    def db(self, number: int) -> MemoryArea:
+        return self.dbs[number]
+
+    @property
+    def data_blocks(self) -> Dict[str, int]:
+        """DB number -> size, as saved in projects (JSON keys are strings)."""
+        return {str(number): len(db) for number, db in self.dbs.items()}
+
+    def set_data_blocks(self, sizes: Dict):
+        """Create the data blocks. Existing blocks keep their contents if their size is unchanged."""
+        dbs = {}
+        for number, size in sizes.items():
+            number, size = int(number), int(size)
+            current = self.dbs.get(number)
+            dbs[number] = current if current is not None and len(current) == size else MemoryArea(f"DB{number}", size)
+        self.dbs = dbs
+        self.state_changed()
+
+    def _area(self, area: int, db_number: int) -> Optional[MemoryArea]:
+        if area == AREA_DB:
+            return self.dbs.get(db_number)
+        return self._areas.get(area)
+
+    # --- Protocol ---
+
+    def create_framer(self):
+        # TPKT: 2-byte big endian length of the whole packet at offset 2
+        return LengthFramer(length_offset=2, length_size=2)
+
+    def process_command(self, command: bytes) -> bytes:
+        """Handle one TPKT packet."""
+        if len(command) < 7 or command[0] != 3:
+            self.logger.warning(f"Not a TPKT packet: {command[:8].hex()}")
+            return None
+        cotp_type = command[5]
+        if cotp_type == COTP_CR:
+            return self._connection_confirm(command)
+        if cotp_type == COTP_DT:
+            return self._handle_s7(command, 5 + command[4])
+        self.logger.debug(f"Ignoring COTP PDU type 0x{cotp_type:02X}")
+        return None
+
+    def _connection_confirm(self, frame: bytes) -> bytes:
+        li = frame[4]
+        src_ref = frame[8:10]
+        params = frame[11:5 + li]  # TSAP and TPDU size parameters, echoed back
+        cc = bytes((li, COTP_CC)) + src_ref + b"\x00\x01\x00" + params
+        return TPKT.pack(3, 0, 4 + len(cc)) + cc
+
+    def _ack(self, pdu_ref: int, params: bytes, data: List, data_len: int, error: int = 0) -> bytes:
+        total = 4 + len(COTP_DT_HEADER) + ACK_HEADER.size + len(params) + data_len
+        header = TPKT.pack(3, 0, total) + COTP_DT_HEADER + ACK_HEADER.pack(
+            S7_PROTOCOL_ID, ROSCTR_ACK_DATA, 0, pdu_ref, len(params), data_len, error >> 8, error & 0xFF)
+        return b"".join([header, params, *data])
+
+    @property
+    def negotiated_pdu(self) -> int:
+        """PDU size agreed with the client being served (pdu_size until it sends setup communication)."""
+        return self.client_session().get("s7_pdu", self.pdu_size)
+
+    def _handle_s7(self, frame: bytes, offset: int) -> bytes:
+        if len(frame) < offset + JOB_HEADER.size or frame[offset] != S7_PROTOCOL_ID:
+            return None
+        _, rosctr, _, pdu_ref, param_len, data_len = JOB_HEADER.unpack_from(frame, offset)
+        params = offset + JOB_HEADER.size
+        if rosctr != ROSCTR_JOB or param_len == 0:
+            # Userdata (SZL, clock, ...) is not simulated
+            self.logger.debug(f"Ignoring S7 PDU with ROSCTR {rosctr}")
+            return None
+        function = frame[params]
+        if function in (FUNC_READ, FUNC_WRITE) and len(frame) - offset > self.negotiated_pdu:
+            return self._ack(pdu_ref, bytes((function, 0)), [], 0, ERROR_PDU_SIZE)
+        try:
+            if function == FUNC_READ:
+                return self._read_var(frame, params, pdu_ref)
+            if function == FUNC_WRITE:
+                return self._write_var(frame, params, params + param_len, pdu_ref)
+            if function == FUNC_SETUP:
+                return self._setup_communication(frame, params, pdu_ref)
+        except struct.error as e:
+            self.logger.warning(f"Malformed S7 request: {e}")
+            return None
+        self.logger.debug(f"Unsupported S7 function 0x{function:02X}")
+        return self._ack(pdu_ref, bytes((function, 0)), [], 0, ERROR_FUNCTION_NOT_SUPPORTED)
+
+    def _setup_communication(self, frame: bytes, params: int, pdu_ref: int) -> bytes:
+        _, _, calling, called, requested = SETUP_PARAMS.unpack_from(frame, params)
+        pdu = self.client_session()["s7_pdu"] = min(requested, self.pdu_size)
+        return self._ack(pdu_ref, SETUP_PARAMS.pack(FUNC_SETUP, 0, calling, called, pdu), [], 0)
+
+    def _items(self, frame: bytes, params: int):
+        """Yield (transport size, count, DB, area, bit address) for each request item."""
+        start = params + 2
+        end = start + frame[params + 1] * ITEM_SPEC.size
+        if end > len(frame):
+            raise struct.error("item list is truncated")
+        for _, _, _, ts, count, db_number, area, address_high, address in ITEM_SPEC.iter_unpack(memoryview(frame)[start:end]):
+            yield ts, count, db_number, area, address_high << 16 | address
+
+    def _read_item(self, ts: int, count: int, db_number: int, area: int, address: int) -> Tuple[int, int, int, object]:
+        """(return code, data transport size, length field, data) for one read item."""
+        memory = self._area(area, db_number)
+        if memory is None:
+            return RC_NO_OBJECT, 0, 0, b""
+        if ts == TS_BIT:
+            byte = address >> 3
+            if count != 1:
+                return RC_TYPE_INCONSISTENT, 0, 0, b""
+            if not memory.contains(byte, 1):
+                return RC_ADDRESS, 0, 0, b""
+            return RC_OK, DTS_BIT, 1, b"\x01" if memory.get_bit(byte, address & 7) else b"\x00"
+        size = ELEMENT_SIZE.get(ts)
+        if size is None:
+            return RC_TYPE, 0, 0, b""
+        length = count * size
+        start = address >> 3
+        if not memory.contains(start, length):
+            return RC_ADDRESS, 0, 0, b""
+        dts = DTS_FOR_TS.get(ts, DTS_BYTE)
+        return RC_OK, dts, length * 8 if dts in DTS_BITS else length, memory.view[start:start + length]
+
+    def _read_var(self, frame: bytes, params: int, pdu_ref: int) -> bytes:
+        count = frame[params + 1]
+        data = []
+        data_len = 0
+        pack_header = ITEM_HEADER.pack
+        for i, (ts, n, db_number, area, address) in enumerate(self._items(frame, params)):
+            rc, dts, length, payload = self._read_item(ts, n, db_number, area, address)
+            data.append(pack_header(rc, dts, length))
+            data.append(payload)
+            size = len(payload)
+            data_len += 4 + size
+            # Items are word aligned, except after the last one
+            if size & 1 and i < count - 1:
+                data.append(b"\x00")
+                data_len += 1
+        if ACK_HEADER.size + 2 + data_len > self.negotiated_pdu:
+            return self._ack(pdu_ref, bytes((FUNC_READ, 0)), [], 0, ERROR_PDU_SIZE)
+        self.reads += 1
+        return self._ack(pdu_ref, bytes((FUNC_READ, count)), data, data_len)
+
+    def _write_item(self, ts: int, count: int, db_number: int, area: int, address: int, payload) -> int:
+        memory = self._area(area, db_number)
+        if memory is None:
+            return RC_NO_OBJECT
+        if ts == TS_BIT:
+            byte = address >> 3
+            if count != 1 or len(payload) != 1:
+                return RC_TYPE_INCONSISTENT
+            if not memory.contains(byte, 1):
+                return RC_ADDRESS
+            memory.set_bit(byte, address & 7, payload[0] & 1)
+            return RC_OK
+        size = ELEMENT_SIZE.get(ts)
+        if size is None:
+            return RC_TYPE
+        if len(payload) != count * size:
+            return RC_TYPE_INCONSISTENT
+        start = address >> 3
+        if not memory.contains(start, len(payload)):
+            return RC_ADDRESS
+        memory.data[start:start + len(payload)] = payload
+        return RC_OK
+
+    def _write_var(self, frame: bytes, params: int, data_pos: int, pdu_ref: int) -> bytes:
+        count = frame[params + 1]
+        view = memoryview(frame)
+        codes = bytearray()
+        for i, (ts, n, db_number, area, address) in enumerate(self._items(frame, params)):
+            _, dts, length = ITEM_HEADER.unpack_from(frame, data_pos)
+            data_pos += ITEM_HEADER.size
+            size = (length + 7) // 8 if dts in DTS_BITS else length
+            payload = view[data_pos:data_pos + size]
+            data_pos += size
+            if size & 1 and i < count - 1:
+                data_pos += 1
+            codes.append(self._write_item(ts, n, db_number, area, address, payload))
+        self.writes += 1
+        return self._ack(pdu_ref, bytes((FUNC_WRITE, count)), [bytes(codes)], len(codes))
+
+# --- Client side requests (tests, benchmarks, scripted pollers) ---
+
+def _tpkt_dt(s7: bytes) -> bytes:
+    return TPKT.pack(3, 0, 4 + len(COTP_DT_HEADER) + len(s7)) + COTP_DT_HEADER + s7
+
+def _job(pdu_ref: int, params: bytes, data: bytes = b"") -> bytes:
+    return _tpkt_dt(JOB_HEADER.pack(S7_PROTOCOL_ID, ROSCTR_JOB, 0, pdu_ref, len(params), len(data)) + params + data)
+
+def _item_spec(area: int, db_number: int, start: int, length: int, ts: int, bit: int = 0) -> bytes:
+    address = start * 8 + bit
+    return ITEM_SPEC.pack(0x12, 0x0A, 0x10, ts, length, db_number, area, address >> 16, address & 0xFFFF)
+
+def build_connect_request(rack: int = 0, slot: int = 1) -> bytes:
+    """COTP connection request with the TSAPs the S7 drivers use."""
+    params = b"\xc1\x02\x01\x00" + bytes((0xC2, 2, 0x01, rack * 32 + slot)) + b"\xc0\x01\x0a"
+    cr = bytes((6 + len(params), COTP_CR)) + b"\x00\x00\x00\x01\x00" + params
+    return TPKT.pack(3, 0, 4 + len(cr)) + cr
+
+def build_setup_request(pdu_size: int = 480, pdu_ref: int = 0) -> bytes:
+    return _job(pdu_ref, SETUP_PARAMS.pack(FUNC_SETUP, 0, 1, 1, pdu_size))
+
+def build_read_request(items: List[Tuple[int, int, int, int]], pdu_ref: int = 1, ts: int = 0x02) -> bytes:
+    """
+    Read Var job.
+    :param items: (area, DB number, start byte, count) per item; count is in `ts` elements
+    :param ts: Transport size of every item (0x02 bytes, 0x04 words, 0x08 reals)
+    """
+    params = bytes((FUNC_READ, len(items))) + b"".join(_item_spec(a, db, s, n, ts) for a, db, s, n in items)
+    return _job(pdu_ref, params)
+
+def build_bit_request(area: int, db_number: int, start: int, bit: int, value: Optional[bool] = None,
+                      pdu_ref: int = 1) -> bytes:
+    """Read (value None) or write a single bit."""
+    spec = _item_spec(area, db_number, start, 1, TS_BIT, bit)
+    if value is None:
+        return _job(pdu_ref, bytes((FUNC_READ, 1)) + spec)
+    return _job(pdu_ref, bytes((FUNC_WRITE, 1)) + spec, ITEM_HEADER.pack(0, DTS_BIT, 1) + bytes((int(value),)))
+
+def build_write_request(items: List[Tuple[int, int, int, bytes]], pdu_ref: int = 1) -> bytes:
+    """Write Var job writing bytes; items are (area, DB number, start byte, data)."""
+    params = bytes((FUNC_WRITE, len(items))) + b"".join(_item_spec(a, db, s, len(d), 0x02) for a, db, s, d in items)
+    parts = []
+    for i, (_, _, _, data) in enumerate(items):
+        parts.append(ITEM_HEADER.pack(0, DTS_BYTE, len(data) * 8) + bytes(data))
+        if len(data) & 1 and i < len(items) - 1:
+            parts.append(b"\x00")
+    return _job(pdu_ref, params, b"".join(parts))
+
+def parse_read_response(frame: bytes) -> List[Tuple[int, bytes]]:
+    """(return code, data) per item of a Read Var Ack_Data."""
+    offset = 5 + frame[4]
+    param_len = ACK_HEADER.unpack_from(frame, offset)[4]
+    params = offset + ACK_HEADER.size
+    pos = params + param_len
+    count = frame[params + 1]
+    items = []
+    for i in range(count):
+        rc, dts, length = ITEM_HEADER.unpack_from(frame, pos)
+        pos += ITEM_HEADER.size
+        size = (length + 7) // 8 if dts in DTS_BITS else length
+        items.append((rc, bytes(frame[pos:pos + size])))
+        pos += size + (size & 1 and i < count - 1)
+    return items
@@ -0,0 +1,36 @@
+"""
+Built-in device types as a manifest of import paths. Nothing here imports a
+device module: Simulator imports a class on the first create_device() of its
+type, so startup cost does not grow with the number of supported models.
+
+New models are added as one line: ("Display name", "package.module:ClassName", {kwargs}).
+"""
+
+# (type name shown in the UI and saved in projects, "module:Class", default constructor kwargs)
+BUILTIN_DEVICE_TYPES = [
+    ("AND AD-4401", "devices.scales.and_scale:ANDScale", {}),
+    ("AND CB Series", "devices.scales.and_scale:ANDScale", {"model": "CB"}),
+    ("CAS CI-600A", "devices.scales.cas_ci600a:CasCI600A", {}),
+    ("AND GP Series", "devices.scales.and_gp_scale:ANDGPScale", {}),
+    ("Sartorius BP", "devices.scales.sartorius_bp_scale:SartoriusBPScale", {}),
+    ("Sartorius CPA", "devices.scales.sartorius_cpa_scale:SartoriusCPAScale", {}),
+    ("AND AD-4401 (New)", "devices.scales.and_ad4401_scale:ANDAD4401Scale", {}), # Renamed to distinguish from existing generic AND
+    ("CAS NT-301A", "devices.scales.cas_nt301a_scale:CasNT301AScale", {}),
+    ("CAS NT-302A", "devices.scales.cas_nt302a_scale:CasNT302AScale", {}),
+    ("CAS EC-D", "devices.scales.cas_ed_h_scale:CasEdHScale", {}),
+    ("CAS ED-H", "devices.scales.cas_ed_h_scale:CasEdHScale", {}),
+    ("Siemens S7-1200", "devices.plc.s7_plc:S7PLC", {"pdu_size": 240}),
+    ("Siemens S7-1500", "devices.plc.s7_plc:S7PLC", {"pdu_size": 960}),
+    ("Mitsubishi FX2N", "devices.plc.melsec_plc:MelsecPLC", {"series": "FX2N", "protocol": "FX"}),
+    ("Mitsubishi FX3G", "devices.plc.melsec_plc:MelsecPLC", {"series": "FX3G", "protocol": "FX"}),
+    ("Mitsubishi FX3U", "devices.plc.melsec_plc:MelsecPLC", {"series": "FX3U", "protocol": "FX"}),
+    ("Mitsubishi FX3U-ENET", "devices.plc.melsec_plc:MelsecPLC", {"series": "FX3U", "protocol": "1E"}),
+    ("MELSEC Q", "devices.plc.melsec_plc:MelsecPLC", {"series": "Q", "protocol": "3E"}),
+    ("Modbus Gateway (TCP)", "devices.gateway.modbus_gateway:ModbusGateway", {"transport": "TCP"}),
+    ("Modbus Gateway (RTU)", "devices.gateway.modbus_gateway:ModbusGateway", {"transport": "RTU"}),
+]
+
+def register_builtin_devices(simulator):
+    """Register every built-in device type with a Simulator (GUI and headless share this list)."""
+    for type_name, class_path, kwargs in BUILTIN_DEVICE_TYPES:
+        simulator.register_device_type(type_name, class_path, **kwargs)
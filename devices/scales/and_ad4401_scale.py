@@ -1,13 +1,27 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# A&D standard format (18 bytes): [Header1(2)][,][Header2(2)][,][Data(8)][Unit(2)][CR][LF]
+# Unit is right aligned: "kg", " g", " t", "  " (no unit)
+STANDARD_FORMAT = PacketTemplate(
+    Text("header1", 2), Lit(","), Text("header2", 2), Lit(","),
+    Num("data", 8, "+08.2f", fallbacks=("+8.1f",)), Text("unit", 2, align=">"), Lit("\r\n"))
+
 class ANDAD4401Scale(BaseScale):
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
         self.terminator = b'\r\n'
         self.unit = "kg"
-        self.tare_weight = 0.0
-        self.mode = "GROSS" # GROSS or NET
+
+    @property
+    def mode(self) -> str:
+        """GROSS or NET; kept in the state snapshot as `net`."""
+        return "NET" if self.state.net else "GROSS"
+
+    def set_mode(self, mode: str):
+        """Switch between GROSS and NET display (MG/MN commands)."""
+        self._publish(net=(mode == "NET"))
 
     def process_command(self, command: bytes) -> bytes:
         """
@@ -26,24 +40,21 @@ class ANDAD4401Scale(BaseScale):
 
         # Command Mode
         if cmd_str == 'RW': # Request Weight
-            return self._build_weight_response()
+            return self.current_frame()
         elif cmd_str == 'MZ': # Make Zero
-            self.set_weight(0.0)
-            self.tare_weight = 0.0
+            self.zero()
             return self._build_echo(cmd_str)
         elif cmd_str == 'MT': # Make Tare
-            self.tare_weight = self.current_weight
-            self.mode = "NET"
+            self.tare(net=True)
             return self._build_echo(cmd_str)
         elif cmd_str == 'CT': # Clear Tare
-            self.tare_weight = 0.0
-            self.mode = "GROSS"
+            self._publish(tare=0.0, net=False)
             return self._build_echo(cmd_str)
         elif cmd_str == 'MG': # Make Gross
-            self.mode = "GROSS"
+            self.set_mode("GROSS")
             return self._build_echo(cmd_str)
         elif cmd_str == 'MN': # Make Net
-            self.mode = "NET"
+            self.set_mode("NET")
             return self._build_echo(cmd_str)
         
         # Unknown command
@@ -55,37 +66,26 @@ class ANDAD4401Scale(BaseScale):
         # Header1: ST, US, OL
         # Header2: GS (Gross), NT (Net), TR (Tare)
         
+        state = self.state
+
         # Determine Header1
-        if self.current_weight > 999999:
-            header1 = "OL"
-        elif self.is_stable:
-            header1 = "ST"
+        if state.weight > 999999:
+            header1 = b"OL"
+        elif state.stable:
+            header1 = b"ST"
         else:
-            header1 = "US"
+            header1 = b"US"
 
         # Determine Header2 and Value
-        if self.mode == "NET":
-            header2 = "NT"
-            val = self.current_weight - self.tare_weight
+        if state.net:
+            header2 = b"NT"
+            val = state.weight - state.tare
         else:
-            header2 = "GS"
-            val = self.current_weight
-
-        # Data: 8 chars including sign and dot
-        # e.g. "+00123.4" (8 chars) or "+12345.6"
-        # Manual example: "+0012345" (no dot?) or "+00123.45"
-        # Let's assume standard float formatting to 8 chars
-        # If val is 123.45 -> "+0123.45"
-        
-        data_str = f"{val:+08.2f}" # 8 chars? "+123.45" is 7. "+0123.45" is 8.
-        if len(data_str) > 8:
-             data_str = f"{val:+8.1f}" # Fallback
-        
-        # Unit: 2 chars
-        unit_str = self.unit[:2].ljust(2) # "kg"
+            header2 = b"GS"
+            val = state.weight
 
-        response = f"{header1},{header2},{data_str}{unit_str}"
-        return response.encode('ascii') + self.terminator
+        # Data: 8 chars including sign and dot, e.g. "+0123.45"
+        return STANDARD_FORMAT.encode(header1, header2, val, self.unit_bytes)
 
     def _build_echo(self, cmd: str) -> bytes:
         return cmd.encode('ascii') + self.terminator
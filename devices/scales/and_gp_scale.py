@@ -1,6 +1,15 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# A&D GP standard format (17 bytes): [Header(2)][,][Data(9)][Unit(3)][CR][LF]
+WEIGHT_FORMAT = PacketTemplate(
+    Text("header", 2), Lit(","), Num("data", 9, "+09.3f", fallbacks=("+9.1f",)),
+    Text("unit", 3, align=">"), Lit("\r\n"))
+
+# Unit field per manual: "kg_" / "_g_"; anything else right aligned
+UNIT_FIELDS = {"kg": b"kg ", "g": b" g "}
+
 class ANDGPScale(BaseScale):
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
@@ -25,14 +34,14 @@ class ANDGPScale(BaseScale):
 
         # Data Query Commands
         if cmd_str == 'Q' or cmd_str == 'SI': # Immediate Query
-            return self._build_weight_response()
+            return self.current_frame()
         elif cmd_str == 'S': # Stable Query
             # In a real device, this waits for stability. 
             # Here we simulate immediate response if stable, or nothing/wait if unstable?
             # For simplicity in simulator, we return immediately but mark as unstable if needed,
             # or better: only return if stable.
             if self.is_stable:
-                return self._build_weight_response()
+                return self.current_frame()
             else:
                 return None # Ignore or wait (simulator logic usually simplifies this)
         
@@ -51,7 +60,7 @@ class ANDGPScale(BaseScale):
             return self._build_ack()
         elif cmd_str == 'PRT':
             # Print command
-            return self._build_weight_response()
+            return self.current_frame()
         
         # Unknown command
         return self._build_error("E01")
@@ -60,34 +69,19 @@ class ANDGPScale(BaseScale):
         # A&D Standard Format
         # [Header(2)][,][Data(9)][Unit(3)][Terminator(2)]
         # Header: ST (Stable), US (Unstable), OL (Overload)
-        # Data: 9 chars including sign, right aligned
-        # Unit: 3 chars (e.g., ' kg', '  g')
+        # Data: 9 chars including sign, right aligned, e.g. "+0012.345"
+        # Unit: 3 chars (e.g., 'kg ', ' g ')
 
-        if self.current_weight > 999999: # Simple overload check
-            header = "OL"
-        elif self.is_stable:
-            header = "ST"
+        state = self.state
+        if state.weight > 999999: # Simple overload check
+            header = b"OL"
+        elif state.stable:
+            header = b"ST"
         else:
-            header = "US"
-
-        # Format weight: 9 chars, e.g., "+0012.345"
-        # Assuming 3 decimal places for kg/g usually, but depends on capacity.
-        # Let's use generic formatting.
-        weight_val = self.current_weight
-        data_str = f"{weight_val:+09.3f}" # +0012.345 (9 chars)
-        if len(data_str) > 9:
-             data_str = f"{weight_val:+9.1f}" # Fallback for larger numbers
-        
-        # Unit formatting (3 chars)
-        unit_str = self.unit.rjust(3) # " kg" or "  g"
-        if self.unit == "kg":
-            unit_str = "kg " # A&D manual says "kg_" (space at end?) or "kg"
-            # Manual says: "kg_" : kilogram. Let's try "kg "
-        elif self.unit == "g":
-            unit_str = " g " # " g_"
+            header = b"US"
 
-        response = f"{header},{data_str}{unit_str}"
-        return response.encode('ascii') + self.terminator
+        unit = UNIT_FIELDS.get(self.unit) or self.unit_bytes
+        return WEIGHT_FORMAT.encode(header, state.weight, unit)
 
     def _build_ack(self) -> bytes:
         # <AK> (06h)
@@ -1,6 +1,12 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# Format: ST,GS,+00123.4kg (A&D standard format, 18 bytes)
+STANDARD_FORMAT = PacketTemplate(
+    Text("header1", 2), Lit(","), Text("header2", 2), Lit(","),
+    Num("data", 8, "+08.1f"), Text("unit", 2, align=">"), Lit("\r\n"))
+
 class ANDScale(BaseScale):
     def __init__(self, name: str, device_id: str, model: str = "AD-4401"):
         super().__init__(name, device_id)
@@ -18,7 +24,7 @@ class ANDScale(BaseScale):
         self.logger.debug(f"Received command: {cmd_str}")
 
         if cmd_str == 'Q' or cmd_str == 'RW':
-            return self._build_weight_response()
+            return self.current_frame()
         elif cmd_str == 'Z':
             self.set_weight(0.0)
             return None # Z usually doesn't return data immediately in some modes, or returns ACK
@@ -30,15 +36,13 @@ class ANDScale(BaseScale):
         # ST: Stable, US: Unstable
         # GS: Gross Weight, NT: Net Weight
         
-        header1 = "ST" if self.is_stable else "US"
-        header2 = "GS" # Assuming Gross weight for now
+        state = self.state
+        header1 = b"ST" if state.stable else b"US"
+        header2 = b"GS" # Assuming Gross weight for now
         
-        # Format weight to 7 chars (including sign and dot), e.g., "+00123.4"
         # AD-4401 manual usually specifies:
         # <HEADER1>,<HEADER2>,<DATA>(8 digits including sign/dot),<UNIT>
-        # Example: ST,GS,+00123.4kg
-        
-        weight_str = f"{self.current_weight:+08.1f}" # +00123.4 (8 chars)
-        
-        response = f"{header1},{header2},{weight_str}{self.unit}"
-        return response.encode('ascii') + self.terminator
+        return STANDARD_FORMAT.encode(header1, header2, state.weight, self.unit_bytes)
+
+    def _get_current_weight_data(self) -> bytes:
+        return self._build_weight_response()
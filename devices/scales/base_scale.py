@@ -1,34 +1,161 @@
 from core.equipment import Equipment
+from .scale_state import ScaleState
+from core.state_schema import Field
 import threading
 import time
 from typing import Callable, Optional
 
 class BaseScale(Equipment):
+    MIN_STREAM_RATE = 1.0   # Hz
+    MAX_STREAM_RATE = 100.0 # Hz, fast indicators stream at 50-100 Hz
+
+    # Restored in this order, through the mutators so cached frames are invalidated.
+    # print_mode is assigned rather than set_print_mode(): streaming starts with the port.
+    STATE_SCHEMA = Equipment.STATE_SCHEMA.extend(
+        Field("current_weight", float, set="set_weight"),
+        Field("is_stable", bool, set="set_stable"),
+        Field("current_format", str, set="set_format", nullable=True),
+        Field("print_mode", str, choices=("Command", "Stream")),
+        Field("weight_range", dict),
+        Field("stream_rate", float, set="set_stream_rate"),
+    )
+
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
-        self.current_weight = 0.0
-        self.is_stable = True
+        # Current snapshot; replaced as a whole by the mutators, never modified.
+        # Writers serialise on _state_lock, readers just read `state`.
+        self.state = ScaleState()
+        self._state_lock = threading.Lock()
+        # Cached response frame as (snapshot it was built for, bytes); see current_frame()
+        self._frame_cache = (None, None)
+        self.frame_cache_hits = 0
+        self.frame_cache_misses = 0
         self.unit = "kg"
         self.print_mode = "Command" # Command or Stream
         self.current_format = None
         self.weight_range = {"min": -100, "max": 1000}  # Default slider range
         self._streaming = False
+        self.stream_rate = 3.0 # Hz, requested; see effective_stream_rate() for the paced value
+        self._stream_interval = 1.0 / self.stream_rate
+        self._line_busy_until = 0.0
+        self._stream_sent = 0
+        self._stream_dropped = 0
+        self._stream_missed_base = 0 # Missed ticks carried over from previous stream timers
         self._stream_thread: Optional[threading.Thread] = None
+        self._stream_handle = None
         self.on_output: Optional[Callable[[bytes], None]] = None
+        # Shared timer service (provides add_periodic(interval, fn) -> handle with cancel()).
+        # Set by Simulator; without one, streaming falls back to a thread per device.
+        self.stream_scheduler = None
+
+    @property
+    def unit(self) -> str:
+        return self._unit
+
+    @unit.setter
+    def unit(self, unit: str):
+        self._unit = unit
+        # Pre-encoded for the packet templates, which take text fields as bytes
+        self.unit_bytes = unit.encode('ascii')
+        self.invalidate_frame()
+
+    def _publish(self, **changes) -> ScaleState:
+        """Swap in a new snapshot with `changes` applied."""
+        with self._state_lock:
+            self.state = self.state.replace(**changes)
+            return self.state
+
+    def invalidate_frame(self):
+        """
+        Mark the cached response frame stale. Call after a change outside the
+        snapshot that affects the frame (format, unit, ...).
+        """
+        self._publish()
+
+    def current_frame(self) -> bytes:
+        """
+        Current weight frame, rebuilt only when the scale state changed since the
+        last call. Polls and stream ticks both go through here.
+        """
+        state = self.state
+        cached_state, frame = self._frame_cache
+        if cached_state is state:
+            self.frame_cache_hits += 1
+            return frame
+        self.frame_cache_misses += 1
+        # Tag the frame with the snapshot read before building: if the state
+        # changes mid-build, the entry is already stale and the next call rebuilds it.
+        frame = self._get_current_weight_data()
+        self._frame_cache = (state, frame)
+        return frame
+
+    @property
+    def frame_cache_stats(self) -> dict:
+        return {"hits": self.frame_cache_hits, "misses": self.frame_cache_misses}
+
+    # Read-only views of the current snapshot, kept for existing callers.
+    # Builders should read self.state once instead of several of these.
+    @property
+    def current_weight(self) -> float:
+        return self.state.weight
+
+    @property
+    def is_stable(self) -> bool:
+        return self.state.stable
+
+    @property
+    def tare_weight(self) -> float:
+        return self.state.tare
 
     def set_weight(self, weight: float):
-        self.current_weight = weight
-        self.logger.info(f"Weight set to {self.current_weight} {self.unit}")
+        state = self._publish(weight=weight)
+        self.logger.info(f"Weight set to {state.weight} {self.unit}")
+        self.state_changed()
 
     def set_stable(self, stable: bool):
-        self.is_stable = stable
-        self.logger.info(f"Stability set to {self.is_stable}")
+        state = self._publish(stable=stable)
+        self.logger.info(f"Stability set to {state.stable}")
+        self.state_changed()
+
+    def set_reading(self, weight: float, stable: bool):
+        """
+        Weight and stability in one snapshot, without a log line (for generated
+        signals). Live readings are not reported through state_changed().
+        """
+        self._publish(weight=weight, stable=stable)
+
+    def set_tare(self, tare: float):
+        """Set the tare weight. 0.0 clears it."""
+        state = self._publish(tare=tare)
+        self.logger.info(f"Tare set to {state.tare} {self.unit}")
+
+    def tare(self, **changes):
+        """Tare command: take the current weight as tare in one atomic update."""
+        with self._state_lock:
+            state = self.state
+            self.state = state = state.replace(tare=state.weight, **changes)
+        self.logger.info(f"Tare set to {state.tare} {self.unit}")
+
+    def zero(self, **changes):
+        """Zero command: clear weight and tare together, so no frame shows only one of them."""
+        state = self._publish(weight=0.0, tare=0.0, **changes)
+        self.logger.info(f"Zeroed (version {state.version})")
 
     def get_weight_str(self, format_str: str) -> str:
         """
         Helper to format weight string based on protocol requirements.
         """
-        return format_str.format(weight=self.current_weight, unit=self.unit)
+        return format_str.format(weight=self.state.weight, unit=self.unit)
+
+    @property
+    def weight_range(self) -> dict:
+        """Slider range {"min": ..., "max": ...}; assign a new dict to change it."""
+        return self._weight_range
+
+    @weight_range.setter
+    def weight_range(self, weight_range: dict):
+        self._weight_range = weight_range
+        self.state_changed()
 
     @property
     def available_formats(self):
@@ -36,42 +163,126 @@ class BaseScale(Equipment):
 
     def set_format(self, format_name: str):
         self.current_format = format_name
+        self.invalidate_frame()
         self.logger.info(f"Format set to {format_name}")
+        self.state_changed()
 
     def set_print_mode(self, mode: str):
         if mode in ["Command", "Stream"]:
             self.print_mode = mode
             self.logger.info(f"Print mode set to {mode}")
+            self.state_changed()
             if mode == "Stream":
                 self.start_streaming()
             else:
                 self.stop_streaming()
 
+    @property
+    def is_streaming(self) -> bool:
+        return self._streaming
+
+    def set_stream_rate(self, rate: float):
+        """Set the requested stream rate in Hz (clamped to MIN/MAX_STREAM_RATE)."""
+        rate = max(self.MIN_STREAM_RATE, min(self.MAX_STREAM_RATE, float(rate)))
+        self.stream_rate = rate
+        self.logger.info(f"Stream rate set to {rate} Hz")
+        self.update_stream_pacing()
+        self.state_changed()
+
+    def update_stream_pacing(self):
+        """Re-arm a running stream after the rate or serial settings changed."""
+        if self._streaming:
+            self.stop_streaming()
+            self.start_streaming()
+
+    def bits_per_char(self) -> float:
+        """Bits on the wire per character: start bit + data bits + parity bit + stop bits."""
+        settings = self.connection_settings
+        parity = str(settings.get("parity", "N"))
+        parity_bits = 0 if parity in ("N", "None") else 1
+        return 1 + int(settings.get("bytesize", 8)) + parity_bits + float(settings.get("stopbits", 1))
+
+    def frame_time(self, length: int) -> float:
+        """Seconds needed to transmit `length` characters at the configured baud rate."""
+        baudrate = float(self.connection_settings.get("baudrate", 9600))
+        return length * self.bits_per_char() / baudrate
+
+    def max_stream_rate(self) -> float:
+        """
+        Highest frame rate the serial line can carry for the current frame length,
+        e.g. a 22 byte frame at 2400 baud 8N1 is 220 bits -> about 10.9 Hz.
+        """
+        frame = self.current_frame()
+        if not frame:
+            return self.MAX_STREAM_RATE
+        return 1.0 / self.frame_time(len(frame))
+
+    def effective_stream_rate(self) -> float:
+        """Requested rate capped by what the line can carry."""
+        return max(min(self.stream_rate, self.max_stream_rate(), self.MAX_STREAM_RATE), 0.1)
+
+    @property
+    def stream_stats(self) -> dict:
+        """
+        sent:      frames handed to the port
+        dropped:   frames skipped because the previous frame was still on the wire
+        coalesced: ticks merged because the scheduler fell a whole period behind
+        """
+        missed = self._stream_missed_base
+        if self._stream_handle is not None:
+            missed += getattr(self._stream_handle, "missed", 0)
+        return {"sent": self._stream_sent, "dropped": self._stream_dropped, "coalesced": missed}
+
     def start_streaming(self):
         if self._streaming:
             return
         self._streaming = True
-        self._stream_thread = threading.Thread(target=self._streaming_loop, daemon=True)
-        self._stream_thread.start()
+        rate = self.effective_stream_rate()
+        if rate < self.stream_rate:
+            self.logger.warning(f"Stream rate capped to {rate:.1f} Hz by serial line speed")
+        self._stream_interval = 1.0 / rate
+        if self.stream_scheduler:
+            self._stream_handle = self.stream_scheduler.add_periodic(self._stream_interval, self._stream_tick)
+        else:
+            self._stream_thread = threading.Thread(target=self._streaming_loop, daemon=True)
+            self._stream_thread.start()
         self.logger.info("Started streaming mode")
 
     def stop_streaming(self):
         self._streaming = False
+        self._line_busy_until = 0.0
+        if self._stream_handle:
+            self._stream_handle.cancel()
+            self._stream_missed_base += getattr(self._stream_handle, "missed", 0)
+            self._stream_handle = None
         if self._stream_thread:
             self._stream_thread.join(timeout=1.0)
             self._stream_thread = None
         self.logger.info("Stopped streaming mode")
 
+    def _stream_tick(self):
+        """Send one stream frame. Called by the streaming thread or the shared scheduler."""
+        try:
+            if self.on_output:
+                data = self.current_frame()
+                if data:
+                    # Model the UART: frames queue behind each other at line speed. Allow one
+                    # frame of backlog for timer jitter; beyond that the link is saturated.
+                    now = time.monotonic()
+                    tx_time = self.frame_time(len(data))
+                    if self._line_busy_until - now > tx_time:
+                        self._stream_dropped += 1
+                        return
+                    self._line_busy_until = max(now, self._line_busy_until) + tx_time
+                    self.on_output(data)
+                    self._stream_sent += 1
+        except Exception as e:
+            self.logger.error(f"Error in streaming loop: {e}")
+
     def _streaming_loop(self):
         while self._streaming:
-            try:
-                if self.on_output:
-                    data = self._get_current_weight_data()
-                    if data:
-                        self.on_output(data)
-            except Exception as e:
-                self.logger.error(f"Error in streaming loop: {e}")
-            time.sleep(0.333) # 3Hz update rate
+            self._stream_tick()
+            time.sleep(self._stream_interval)
 
     def _get_current_weight_data(self) -> bytes:
         """
@@ -1,12 +1,23 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# Format 1 (22 bytes): HDR1(2),.,HDR2(2),.,ID(1),LAMP(1),.,DATA(8),SPACE(1),UNIT(2),CRLF(2)
+FORMAT_1 = PacketTemplate(
+    Text("header1", 2), Lit("."), Text("header2", 2), Lit(".1"), Text("lamp", 1), Lit("."),
+    Num("data", 8, "8.1f"), Lit(" "), Text("unit", 2), Lit("\r\n"))
+# Format 2 (10 bytes): DATA(8),CRLF(2)
+FORMAT_2 = PacketTemplate(Num("data", 8, "8.1f"), Lit("\r\n"))
+# Format 3 (18 bytes): HDR1(2),.,HDR2(2),.,DATA(8),UNIT(2),CRLF(2)
+FORMAT_3 = PacketTemplate(
+    Text("header1", 2), Lit("."), Text("header2", 2), Lit("."),
+    Num("data", 8, "8.1f"), Text("unit", 2), Lit("\r\n"))
+
 class CasCI600A(BaseScale):
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
         self.terminator = b'\r\n'
         self._current_format = "Format 1"
-        self.tare_weight = 0.0
         self._buffer = b""
 
     @property
@@ -47,13 +58,12 @@ class CasCI600A(BaseScale):
             cmd = cmd_str[-2:]
             
             if cmd == 'RW':
-                responses.append(self._build_weight_response())
+                responses.append(self.current_frame())
             elif cmd == 'MZ':
-                self.set_weight(0.0)
-                self.tare_weight = 0.0
+                self.zero()
                 responses.append(self._build_simple_response(cmd_str))
             elif cmd == 'MT':
-                self.tare_weight = self.current_weight
+                self.tare()
                 responses.append(self._build_simple_response(cmd_str))
             else:
                 responses.append(b'?' + self.terminator)
@@ -65,55 +75,28 @@ class CasCI600A(BaseScale):
         return original_cmd.encode('ascii') + self.terminator
 
     def _build_weight_response(self) -> bytes:
-        gross_weight = self.current_weight
-        net_weight = gross_weight - self.tare_weight
+        state = self.state
+        gross_weight = state.weight
+        net_weight = gross_weight - state.tare
         
         # Status
         # US: Unstable, ST: Stable, OL: Overload
-        status = "ST" if self.is_stable else "US"
+        status = b"ST" if state.stable else b"US"
         if gross_weight > 999999: # Simple overload check
-            status = "OL"
+            status = b"OL"
             
         # Weight Type
         # GS: Gross, NT: Net
-        weight_type = "NT" if self.tare_weight > 0 else "GS"
-        val_to_send = net_weight if weight_type == "NT" else gross_weight
+        weight_type = b"NT" if state.tare > 0 else b"GS"
+        val_to_send = net_weight if weight_type == b"NT" else gross_weight
         
-        # Format 1 (22 bytes)
-        # HDR1(2),.,HDR2(2),.,ID(1),LAMP(1),.,DATA(8),SPACE(1),UNIT(2),CRLF(2)
         if self._current_format == "Format 1":
-            # Lamp status byte (simulated)
-            # Bt6(Stable), Bt0(Zero)
-            lamp = 0
-            if self.is_stable: lamp |= (1 << 6)
-            if val_to_send == 0: lamp |= (1 << 0)
-            if self.tare_weight > 0: lamp |= (1 << 1) # Tare active
-            
-            lamp_char = chr(0x30 + (lamp & 0x0F)) # Just a placeholder logic to make it printable if needed, or raw byte?
-            # Protocol says "1 byte". Usually in ASCII protocols this is a character.
-            # Let's use a fixed char '0' for simplicity unless specified.
-            lamp_char = '0' 
-
-            # Data: 8 bytes including sign and decimal
-            # e.g. " 1234.5 " or "+0123.45"
-            # CAS usually uses space padding for numbers.
-            data_str = f"{val_to_send:8.1f}"[-8:] 
-            
-            resp = f"{status}.{weight_type}.1{lamp_char}.{data_str} {self.unit}"
-            return resp.encode('ascii') + self.terminator
-
-        # Format 2 (10 bytes)
-        # DATA(8),CRLF(2)
+            # Lamp status byte: fixed '0', lamp bits are not simulated
+            return FORMAT_1.encode(status, weight_type, b"0", val_to_send, self.unit_bytes)
         elif self._current_format == "Format 2":
-            data_str = f"{val_to_send:8.1f}"[-8:]
-            return data_str.encode('ascii') + self.terminator
-
-        # Format 3 (18 bytes)
-        # HDR1(2),.,HDR2(2),.,DATA(8),UNIT(2),CRLF(2)
+            return FORMAT_2.encode(val_to_send)
         elif self._current_format == "Format 3":
-            data_str = f"{val_to_send:8.1f}"[-8:]
-            resp = f"{status}.{weight_type}.{data_str}{self.unit}"
-            return resp.encode('ascii') + self.terminator
+            return FORMAT_3.encode(status, weight_type, val_to_send, self.unit_bytes)
 
         return b'?' + self.terminator
 
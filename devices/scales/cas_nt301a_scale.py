@@ -1,12 +1,30 @@
 from .base_scale import BaseScale
+from core.framing import StxEtxFramer, TerminatorFramer
+from core.state_schema import Field
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# CAS indicator stream/command formats (shared with NT-302A)
+# Format 1 (18 bytes): [Header1(2)][,][Header2(2)][,][Data(8)][Unit(2)][CR][LF]
+FORMAT_1 = PacketTemplate(
+    Text("header1", 2), Lit(","), Text("header2", 2), Lit(","),
+    Num("data", 8, "+08.1f", fallbacks=("+8.0f",)), Text("unit", 2), Lit("\r\n"))
+# Format 2 (22 bytes): [Header1(2)][,][Header2(2)][,][ID(1)][Lamp(1)][,][Data(8)][Space(1)][Unit(2)][CR][LF]
+FORMAT_2 = PacketTemplate(
+    Text("header1", 2), Lit(","), Text("header2", 2), Lit(","), Text("id", 1), Text("lamp", 1), Lit(","),
+    Num("data", 8, "+08.1f", fallbacks=("+8.0f",)), Lit(" "), Text("unit", 2), Lit("\r\n"))
+
 class CasNT301AScale(BaseScale):
+    STATE_SCHEMA = BaseScale.STATE_SCHEMA.extend(
+        Field("command_mode", str, set="set_command_mode", choices=("Simple", "Complex")),
+        Field("use_bcc", bool, set="set_use_bcc"),
+        Field("device_id_str", str, set="set_device_id_str"),
+    )
+
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
         self.terminator = b'\r\n'
         self.unit = "kg"
-        self.tare_weight = 0.0
         self._current_format = "Format 1" # Default 18 bytes
         self.device_id_str = "01" # Default Device ID "01"
         self._current_command_mode = "Simple"
@@ -27,14 +45,41 @@ class CasNT301AScale(BaseScale):
         else:
             self.logger.warning(f"Invalid format: {format_name}")
 
+    @property
+    def command_mode(self) -> str:
+        return self._current_command_mode
+
+    @property
+    def use_bcc(self) -> bool:
+        return self._use_bcc
+
     def set_command_mode(self, mode: str):
         if mode in self.available_command_modes:
             self._current_command_mode = mode
+            self.reset_framer()
             self.logger.info(f"Command mode set to {mode}")
+            self.state_changed()
 
     def set_use_bcc(self, use_bcc: bool):
         self._use_bcc = use_bcc
         self.logger.info(f"Use BCC set to {use_bcc}")
+        self.state_changed()
+
+    def set_device_id_str(self, id_str: str):
+        """Set the 2-digit ID the scale answers to (several scales can share a multi-drop line)."""
+        if len(id_str) != 2 or not id_str.isdigit():
+            self.logger.warning(f"Invalid device ID: {id_str}")
+            return
+        self.device_id_str = id_str
+        self.invalidate_frame()  # Format 2 frames carry the ID
+        self.address_changed()
+        self.state_changed()
+
+    def create_framer(self):
+        # Complex mode frames are STX ... ETX, simple mode commands end with CR LF
+        if self._current_command_mode == "Complex":
+            return StxEtxFramer()
+        return TerminatorFramer(self.terminator)
 
     def process_command(self, command: bytes) -> bytes:
         """
@@ -64,13 +109,12 @@ class CasNT301AScale(BaseScale):
             cmd_body = cmd_str[3:] # "RW", "MZ", "MT"
             
             if cmd_body == 'RW':
-                return self._build_weight_response()
+                return self.current_frame()
             elif cmd_body == 'MZ':
-                self.set_weight(0.0)
-                self.tare_weight = 0.0
+                self.zero()
                 return self._build_echo(cmd_str)
             elif cmd_body == 'MT':
-                self.tare_weight = self.current_weight
+                self.tare()
                 return self._build_echo(cmd_str)
             elif cmd_body.startswith('PN'): # PN 00
                 return self._build_echo(cmd_str)
@@ -131,14 +175,13 @@ class CasNT301AScale(BaseScale):
             if cmd_str.startswith('RCWT'): # Current Weight Request
                 return self._build_complex_response(cmd_str, is_weight=True)
             elif cmd_str.startswith('WZER'): # Zero
-                self.set_weight(0.0)
-                self.tare_weight = 0.0
+                self.zero()
                 return self._build_complex_response(cmd_str, ack=True)
             elif cmd_str.startswith('WTAR'): # Tare
-                self.tare_weight = self.current_weight
+                self.tare()
                 return self._build_complex_response(cmd_str, ack=True)
             elif cmd_str.startswith('WTRS'): # Tare Reset
-                self.tare_weight = 0.0
+                self.set_tare(0.0)
                 return self._build_complex_response(cmd_str, ack=True)
                 
         except Exception as e:
@@ -154,6 +197,7 @@ class CasNT301AScale(BaseScale):
         # Total 23 bytes (without BCC)
         
         # Construct payload components
+        state = self.state
         id_str = self.device_id_str # 2 chars
         cmd_str = cmd_name[:4] # 4 chars
         
@@ -161,20 +205,20 @@ class CasNT301AScale(BaseScale):
         
         if is_weight:
             # Status 1
-            if self.current_weight > 999999:
+            if state.weight > 999999:
                 stat1 = "OL"
-            elif self.is_stable:
+            elif state.stable:
                 stat1 = "ST"
             else:
                 stat1 = "US"
                 
             # Status 2
-            if self.tare_weight > 0:
+            if state.tare > 0:
                 stat2 = "NT"
-                val = self.current_weight - self.tare_weight
+                val = state.weight - state.tare
             else:
                 stat2 = "GS"
-                val = self.current_weight
+                val = state.weight
                 
             # Sign
             sign = "+" if val >= 0 else "-"
@@ -223,50 +267,33 @@ class CasNT301AScale(BaseScale):
         return bytes(response_bytes)
 
     def _build_weight_response(self) -> bytes:
-        # Format 1 (18 Bytes): [Header1(2)][,][Header2(2)][,][Data(8)][Unit(2)][CR][LF]
-        # Format 2 (22 Bytes): [Header1(2)][,][Header2(2)][,][Lamp(1)][Data(8)][Space(1)][Unit(2)][CR][LF]
+        state = self.state
 
         # Header1
-        if self.current_weight > 999999:
-            header1 = "OL"
-        elif self.is_stable:
-            header1 = "ST"
+        if state.weight > 999999:
+            header1 = b"OL"
+        elif state.stable:
+            header1 = b"ST"
         else:
-            header1 = "US"
+            header1 = b"US"
 
         # Header2
-        if self.tare_weight > 0:
-            header2 = "NT"
-            val = self.current_weight - self.tare_weight
+        if state.tare > 0:
+            header2 = b"NT"
+            val = state.weight - state.tare
         else:
-            header2 = "GS"
-            val = self.current_weight
-
-        # Data: 8 chars including sign and dot
-        # e.g. "+00123.4"
-        data_str = f"{val:+08.1f}" # 8 chars
-        if len(data_str) > 8:
-             data_str = f"{val:+8.0f}" # Fallback
+            header2 = b"GS"
+            val = state.weight
 
-        # Unit: 2 chars
-        unit_str = self.unit[:2].ljust(2) # "kg"
+        unit = self.unit_bytes
 
         if self._current_format == "Format 1":
-            # [Header1(2)][,][Header2(2)][,][Data(8)][Unit(2)]
-            response = f"{header1},{header2},{data_str}{unit_str}"
-            return response.encode('ascii') + self.terminator
+            return FORMAT_1.encode(header1, header2, val, unit)
 
         elif self._current_format == "Format 2":
-            # [Header1(2)][,][Header2(2)][,][Lamp(1)][Data(8)][Space(1)][Unit(2)]
-            # Lamp: 1 byte. 
-            # bit6: Stable(1), bit0: Zero(1), bit1: Tare(1) ...
-            # Let's use '0' (0x30) as base and add bits? 
-            # Protocol says "Lamp(1)". Usually ASCII char representing status.
-            # Let's simulate a simple status char '0' or specific bits if needed.
-            # For now, fixed '0'.
-            lamp = '0'
-            response = f"{header1},{header2},{lamp}{data_str} {unit_str}"
-            return response.encode('ascii') + self.terminator
+            # Device number is a single character (F34); lamp bits are not simulated, fixed '0'
+            dev_no = self.device_id_str[-1:].encode('ascii')
+            return FORMAT_2.encode(header1, header2, dev_no, b"0", val, unit)
 
         return None
 
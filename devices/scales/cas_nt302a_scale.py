@@ -1,12 +1,17 @@
 from .base_scale import BaseScale
+from .cas_nt301a_scale import FORMAT_1, FORMAT_2
+from core.state_schema import Field
 import logging
 
 class CasNT302AScale(BaseScale):
+    STATE_SCHEMA = BaseScale.STATE_SCHEMA.extend(
+        Field("device_id_str", str, set="set_device_id_str"),
+    )
+
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
         self.terminator = b'\r\n'
         self.unit = "kg"
-        self.tare_weight = 0.0
         self._current_format = "Format 1" # Default 18 bytes
         self.device_id_str = "01" # Default Device ID
 
@@ -21,6 +26,16 @@ class CasNT302AScale(BaseScale):
         else:
             self.logger.warning(f"Invalid format: {format_name}")
 
+    def set_device_id_str(self, id_str: str):
+        """Set the 2-digit device ID matched against commands (e.g. "07" for "07 RW")."""
+        if len(id_str) != 2 or not id_str.isdigit():
+            self.logger.warning(f"Invalid device ID: {id_str}")
+            return
+        self.device_id_str = id_str
+        self.invalidate_frame()  # Format 2 frames carry the ID
+        self.address_changed()
+        self.state_changed()
+
     def process_command(self, command: bytes) -> bytes:
         """
         Handle CAS NT-302A commands.
@@ -41,54 +56,45 @@ class CasNT302AScale(BaseScale):
             cmd_body = cmd_str[3:] # "RW", "MZ", "MT"
             
             if cmd_body == 'RW':
-                return self._build_weight_response()
+                return self.current_frame()
             elif cmd_body == 'MZ':
-                self.set_weight(0.0)
-                self.tare_weight = 0.0
+                self.zero()
                 return self._build_echo(cmd_str)
             elif cmd_body == 'MT':
-                self.tare_weight = self.current_weight
+                self.tare()
                 return self._build_echo(cmd_str)
         
         return None
 
     def _build_weight_response(self) -> bytes:
-        # Format 1 (18 Bytes): [Header1(2)][,][Header2(2)][,][Data(8)][Unit(2)][CR][LF]
-        # Format 2 (22 Bytes): [Header1(2)][,][Header2(2)][,][Lamp(1)][Data(8)][Space(1)][Unit(2)][CR][LF]
+        # Same CAS formats as NT-301A (Format 1: 18 bytes, Format 2: 22 bytes)
+
+        state = self.state
 
         # Header1
-        if self.current_weight > 999999:
-            header1 = "OL"
-        elif self.is_stable:
-            header1 = "ST"
+        if state.weight > 999999:
+            header1 = b"OL"
+        elif state.stable:
+            header1 = b"ST"
         else:
-            header1 = "US"
+            header1 = b"US"
 
         # Header2
-        if self.tare_weight > 0:
-            header2 = "NT"
-            val = self.current_weight - self.tare_weight
+        if state.tare > 0:
+            header2 = b"NT"
+            val = state.weight - state.tare
         else:
-            header2 = "GS"
-            val = self.current_weight
-
-        # Data: 8 chars including sign and dot
-        # e.g. "+00123.4"
-        data_str = f"{val:+08.1f}" # 8 chars
-        if len(data_str) > 8:
-             data_str = f"{val:+8.0f}" # Fallback
+            header2 = b"GS"
+            val = state.weight
 
-        # Unit: 2 chars
-        unit_str = self.unit[:2].ljust(2) # "kg"
+        unit = self.unit_bytes
 
         if self._current_format == "Format 1":
-            response = f"{header1},{header2},{data_str}{unit_str}"
-            return response.encode('ascii') + self.terminator
+            return FORMAT_1.encode(header1, header2, val, unit)
 
         elif self._current_format == "Format 2":
-            lamp = '0' # Placeholder
-            response = f"{header1},{header2},{lamp}{data_str} {unit_str}"
-            return response.encode('ascii') + self.terminator
+            dev_no = self.device_id_str[-1:].encode('ascii')
+            return FORMAT_2.encode(header1, header2, dev_no, b"0", val, unit) # Lamp: placeholder
 
         return None
 
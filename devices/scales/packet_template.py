@@ -0,0 +1,136 @@
+"""
+Fixed-width packet templates for scale response frames.
+
+Each model declares its frame layout once as a sequence of fields:
+
+    FORMAT_1 = PacketTemplate(
+        Text("header1", 2), Lit(","), Text("header2", 2), Lit(","),
+        Num("data", 8, "+08.1f", fallbacks=("+8.0f",)),
+        Text("unit", 2), Lit("\\r\\n"))
+
+and encodes frames with FORMAT_1.encode(b"ST", b"GS", 123.4, b"kg").
+
+The layout is compiled into a single bytes %-format, so a normal frame is one
+formatting call with no str->bytes encode. Every field is formatted to at least
+its width, so a frame of the expected total length has every field exact.
+If a value does not fit its width
+(overlong number, unit of the wrong length) the frame is rebuilt field by field:
+numbers try their fallback specs and then saturate at the largest value that
+fits (sign kept), text is padded or clipped. Every frame a template returns is exactly `length` bytes,
+which is the number to check against the manual.
+"""
+from typing import Sequence, Tuple, Union
+
+class Lit:
+    """Constant bytes (separators, fixed characters, terminator)."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Union[str, bytes]):
+        self.value = value.encode('ascii') if isinstance(value, str) else bytes(value)
+
+    @property
+    def width(self) -> int:
+        return len(self.value)
+
+class Text:
+    """
+    Fixed-width text field (header, unit, ID). Values are passed as bytes and
+    space padded: align "<" pads on the right, ">" on the left.
+    """
+    __slots__ = ("name", "width", "align")
+
+    def __init__(self, name: str, width: int, align: str = "<"):
+        self.name = name
+        self.width = width
+        self.align = align
+
+    @property
+    def spec(self) -> str:
+        return f"{'-' if self.align == '<' else ''}{self.width}b"
+
+    def fit(self, value) -> bytes:
+        if isinstance(value, str):
+            value = value.encode('ascii')
+        if len(value) >= self.width:
+            return value[:self.width]
+        if self.align == ">":
+            return value.rjust(self.width)
+        return value.ljust(self.width)
+
+class Num:
+    """
+    Fixed-width number field using a printf-style spec, e.g. "+08.1f" or "8.1f".
+    :param fallbacks: Specs tried in order when the value does not fit `width`;
+        after them the spec is tried without decimals before the text is clipped
+    """
+    __slots__ = ("name", "width", "spec", "fallbacks")
+
+    def __init__(self, name: str, width: int, spec: str, fallbacks: Sequence[str] = ()):
+        self.name = name
+        self.width = width
+        self.spec = spec
+        self.fallbacks = tuple(fallbacks) + (spec.split(".")[0] + ".0f",)
+
+    def fit(self, value) -> bytes:
+        text = ("%" + self.spec) % value
+        for spec in self.fallbacks:
+            if len(text) <= self.width:
+                break
+            text = ("%" + spec) % value
+        if len(text) > self.width:
+            # Still too long: saturate at the largest value the field can show, keeping the sign.
+            # Dropping the leading characters instead would send a wrong weight that still parses.
+            signed = value < 0 or "+" in self.spec or " " in self.spec
+            limit = 10 ** (self.width - signed) - 1
+            text = ("%" + self.fallbacks[-1]) % (-limit if value < 0 else limit)
+        return text.rjust(self.width).encode('ascii')
+
+class PacketTemplate:
+    """A compiled fixed-length frame layout. See module docstring."""
+
+    def __init__(self, *fields: Union[Lit, Text, Num]):
+        self.fields: Tuple = fields
+        self.value_fields = tuple(f for f in fields if not isinstance(f, Lit))
+        self.length = sum(f.width for f in fields)
+
+        parts = []
+        for f in fields:
+            if isinstance(f, Lit):
+                parts.append(f.value.replace(b"%", b"%%"))
+            else:
+                parts.append(b"%" + f.spec.encode('ascii'))
+        self._format = b"".join(parts)
+        self.encode = self._compile()
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        return tuple(f.name for f in self.value_fields)
+
+    def _compile(self):
+        """
+        Build encode(*values) -> bytes. Values are given in field order
+        (Text as bytes, Num as numbers). A closure over locals avoids attribute
+        lookups on the hot path.
+        """
+        fmt = self._format
+        length = self.length
+        encode_fitted = self._encode_fitted
+
+        def encode(*values) -> bytes:
+            try:
+                frame = fmt % values
+                if len(frame) == length:
+                    return frame
+            except TypeError:
+                # e.g. a str passed for a Text field
+                pass
+            return encode_fitted(values)
+
+        return encode
+
+    def _encode_fitted(self, values) -> bytes:
+        out = []
+        it = iter(values)
+        for f in self.fields:
+            out.append(f.value if isinstance(f, Lit) else f.fit(next(it)))
+        return b"".join(out)
@@ -1,6 +1,17 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# 16 characters: [Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
+# e.g. "+    72.55 g  " - leading zeros are output as spaces
+FORMAT_16 = PacketTemplate(
+    Text("sign", 1), Lit(" "), Num("data", 8, "8.2f", fallbacks=("8.1f",)), Lit(" "),
+    Text("unit", 3), Lit("\r\n"))
+# 22 characters: the 16 character block preceded by a 6 character ID code
+FORMAT_22 = PacketTemplate(
+    Text("id", 6), Text("sign", 1), Lit(" "), Num("data", 8, "8.2f", fallbacks=("8.1f",)), Lit(" "),
+    Text("unit", 3), Lit("\r\n"))
+
 class SartoriusBPScale(BaseScale):
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
@@ -46,7 +57,7 @@ class SartoriusBPScale(BaseScale):
             cmd_char = cmd_str[1]
             
             if cmd_char == 'P': # Print
-                return self._build_weight_response()
+                return self.current_frame()
             elif cmd_char == 'T': # Tare / Zero
                 self.set_weight(0.0)
                 return None # Usually no immediate response, or maybe just weight output if auto-print?
@@ -60,10 +71,11 @@ class SartoriusBPScale(BaseScale):
 
     def _build_weight_response(self) -> bytes:
         # Sartorius BP Format
-        # Format 1 (16 chars): [Sign(1)][Data(10)][Unit(3)][CR][LF]
-        # Format 2 (22 chars): [ID(6)][Sign(1)][Data(10)][Unit(3)][CR][LF]
+        # Format 1 (16 chars): [Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
+        # Format 2 (22 chars): [ID(6)][Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
         
-        if self.current_weight > 999999: # Overload
+        state = self.state
+        if state.weight > 999999: # Overload
             # Special code for overload
             # 16 Byte: "        High   " (14 chars + CR LF)
             base_resp = "        High  "
@@ -73,29 +85,16 @@ class SartoriusBPScale(BaseScale):
             return base_resp.encode('ascii') + self.terminator
 
         # Sign
-        sign = "+" if self.current_weight >= 0 else "-"
-        if self.current_weight == 0: sign = " " # Or +? Manual example shows +
-
-        # Data (10 chars)
-        # e.g. "    123.45"
-        weight_val = abs(self.current_weight)
-        data_str = f"{weight_val:10.2f}" # 10 chars, 2 decimals
-        if len(data_str) > 10:
-             data_str = f"{weight_val:10.1f}"
+        sign = b"+" if state.weight >= 0 else b"-"
+        if state.weight == 0: sign = b" " # Or +? Manual example shows +
 
-        # Unit (3 chars)
-        unit_str = self.unit.ljust(3) # "g  "
+        weight_val = abs(state.weight)
+        unit = self.unit_bytes
 
-        # Construct Base Response (14 chars)
-        base_resp = f"{sign}{data_str}{unit_str}"
-        
         if self._current_format == "22 Byte":
-            # Add ID (6 chars)
             # ID: "N     " (Net?) or "Stat  "
-            id_str = "N     "
-            base_resp = f"{id_str}{base_resp}"
-
-        return base_resp.encode('ascii') + self.terminator
+            return FORMAT_22.encode(b"N     ", sign, weight_val, unit)
+        return FORMAT_16.encode(sign, weight_val, unit)
 
     def _get_current_weight_data(self) -> bytes:
         return self._build_weight_response()
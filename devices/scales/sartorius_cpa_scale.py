@@ -1,6 +1,18 @@
 from .base_scale import BaseScale
+from .packet_template import PacketTemplate, Lit, Text, Num
 import logging
 
+# Format 1 (16 chars): [Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
+FORMAT_1 = PacketTemplate(
+    Text("sign", 1), Lit(" "), Num("data", 8, "8.2f", fallbacks=("8.1f",)), Lit(" "),
+    Text("unit", 3), Lit("\r\n"))
+# Format 2 (22 chars): [ID(6)] + Format 1
+FORMAT_2 = PacketTemplate(
+    Text("id", 6), Text("sign", 1), Lit(" "), Num("data", 8, "8.2f", fallbacks=("8.1f",)), Lit(" "),
+    Text("unit", 3), Lit("\r\n"))
+# Overload special code, padded to the 16 character frame
+OVERLOAD_FORMAT = PacketTemplate(Text("code", 14), Lit("\r\n"))
+
 class SartoriusCPAScale(BaseScale):
     def __init__(self, name: str, device_id: str):
         super().__init__(name, device_id)
@@ -42,7 +54,7 @@ class SartoriusCPAScale(BaseScale):
             cmd_char = cmd_str[1]
             
             if cmd_char == 'P': # Print
-                return self._build_weight_response()
+                return self.current_frame()
             elif cmd_char == 'T': # Tare / Zero
                 self.set_weight(0.0)
                 return None
@@ -59,38 +71,24 @@ class SartoriusCPAScale(BaseScale):
         # Format 1 (16 chars): [Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
         # Format 2 (22 chars): [ID(6)][Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)][CR][LF]
         
+        state = self.state
+
         # Check for Overload
-        if self.current_weight > 999999:
+        if state.weight > 999999:
             # Special code: "Stat H" (Overload)
-            # Format 1: "Stat H  " ? Manual says "Stat H"
-            # Let's assume standard error text fitting the length
-            return b"Stat H         \r\n"
+            return OVERLOAD_FORMAT.encode(b"Stat H")
 
         # Sign
-        sign = "+" if self.current_weight >= 0 else "-"
+        sign = b"+" if state.weight >= 0 else b"-"
         
-        # Data (8 chars)
-        # e.g. "  123.45"
-        weight_val = abs(self.current_weight)
-        data_str = f"{weight_val:8.2f}" # 8 chars
-        if len(data_str) > 8:
-             data_str = f"{weight_val:8.1f}"
-
-        # Unit (3 chars)
-        unit_str = self.unit.ljust(3) # "g  "
+        weight_val = abs(state.weight)
+        unit = self.unit_bytes
 
-        # Construct Response
-        # Format 1: [Sign(1)][Space(1)][Data(8)][Space(1)][Unit(3)] = 14 chars + CR LF = 16
-        base_resp = f"{sign} {data_str} {unit_str}"
-        
         if self._current_format == "Format 2":
-            # Add ID (6 chars)
             # ID: "N     " (Net?) or "Stat  "
             # Let's use "N     " for normal weight
-            id_str = "N     "
-            base_resp = f"{id_str}{base_resp}"
-
-        return base_resp.encode('ascii') + self.terminator
+            return FORMAT_2.encode(b"N     ", sign, weight_val, unit)
+        return FORMAT_1.encode(sign, weight_val, unit)
 
     def _get_current_weight_data(self) -> bytes:
         return self._build_weight_response()
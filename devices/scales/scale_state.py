@@ -0,0 +1,48 @@
+class ScaleState:
+    """
+    Immutable snapshot of the values a scale reports.
+
+    BaseScale holds the current snapshot in `state` and replaces it as a whole on
+    every change. Readers (response builders on serial, TCP and stream threads)
+    read `state` once and use that object throughout, so they never take a lock
+    and never see half of a multi-field update such as tare or zero.
+    """
+
+    __slots__ = ("weight", "stable", "tare", "net", "version")
+
+    def __init__(self, weight: float = 0.0, stable: bool = True, tare: float = 0.0,
+                 net: bool = False, version: int = 0):
+        """
+        :param net: Net display selected explicitly (models with a GROSS/NET switch)
+        :param version: Increases with every published snapshot
+        """
+        set_ = object.__setattr__
+        set_(self, "weight", weight)
+        set_(self, "stable", stable)
+        set_(self, "tare", tare)
+        set_(self, "net", net)
+        set_(self, "version", version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScaleState is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("ScaleState is immutable")
+
+    def replace(self, **changes) -> "ScaleState":
+        """Return a new snapshot with `changes` applied and the next version number."""
+        return ScaleState(
+            changes.get("weight", self.weight),
+            changes.get("stable", self.stable),
+            changes.get("tare", self.tare),
+            changes.get("net", self.net),
+            self.version + 1,
+        )
+
+    @property
+    def net_weight(self) -> float:
+        return self.weight - self.tare
+
+    def __repr__(self):
+        return (f"ScaleState(weight={self.weight}, stable={self.stable}, tare={self.tare}, "
+                f"net={self.net}, version={self.version})")
@@ -0,0 +1,40 @@
+"""
+Run a project without the GUI (CI runners, rack-mounted test PCs).
+
+Usage: python headless.py "SAC 견비중 시스템.ESPJ" [--backend reactor] [--stats 10] [--capture session.scap]
+Stops on Ctrl+C / SIGTERM, or after --duration seconds.
+"""
+import sys
+import os
+import argparse
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.headless import HeadlessRunner
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a simulator project without the GUI")
+    parser.add_argument("project", help=".ESPJ project file")
+    parser.add_argument("--backend", default="auto", choices=["auto", "reactor", "thread", "asyncio"])
+    parser.add_argument("--stats", type=float, default=0.0, metavar="SECONDS", help="Log port/stream stats periodically")
+    parser.add_argument("--duration", type=float, default=None, metavar="SECONDS", help="Stop after this long")
+    parser.add_argument("--capture", default=None, metavar="FILE", help="Record all traffic to a capture file")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    runner = HeadlessRunner(args.project, io_backend=args.backend, stats_interval=args.stats)
+    if args.capture:
+        runner.simulator.comm_manager.start_capture(args.capture)
+    if not runner.start():
+        runner.shutdown()
+        return 1
+    runner.install_signal_handlers()
+    runner.run(args.duration)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import time
+import select
+import socket
+import asyncio
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.serial_reactor import SerialReactor
+from core.equipment import Equipment
+from devices.scales.cas_ci600a import CasCI600A
+
+class SlowAsyncDevice(Equipment):
+    """Answers 'A' slowly and 'B' immediately, to check responses stay in request order."""
+
+    async def process_command(self, command: bytes) -> bytes:
+        if command.startswith(b"A"):
+            await asyncio.sleep(0.05)
+        return command.upper()
+
+def read_bytes(fd, count, timeout=1.0):
+    buf = b""
+    deadline = time.time() + timeout
+    while len(buf) < count and time.time() < deadline:
+        ready, _, _ = select.select([fd], [], [], 0.05)
+        if ready:
+            buf += os.read(fd, 1024)
+    return buf
+
+@unittest.skipUnless(SerialReactor.is_supported(), "pty pairs need POSIX")
+class TestAsyncTransport(unittest.TestCase):
+    def setUp(self):
+        import pty
+        self.sim = Simulator(io_backend="asyncio")
+        self.master, self.slave = pty.openpty()
+        self.path = os.ttyname(self.slave)
+
+    def tearDown(self):
+        self.sim.stop()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def test_async_callback_answers_in_order(self):
+        self.sim.add_device(SlowAsyncDevice("Async", "ASYNC_01"))
+        self.assertTrue(self.sim.start_device_comm("Async", self.path))
+        time.sleep(0.05)
+
+        os.write(self.master, b"a")
+        time.sleep(0.01)
+        os.write(self.master, b"b")
+        self.assertEqual(read_bytes(self.master, 2), b"AB")
+
+    def test_sync_device_on_loop(self):
+        scale = CasCI600A("Scale", "SCALE_01")
+        scale.set_weight(42.0)
+        self.sim.add_device(scale)
+        self.assertTrue(self.sim.start_device_comm("Scale", self.path))
+        time.sleep(0.05)
+
+        os.write(self.master, b"01RW\r\n")
+        self.assertIn(b"    42.0", read_bytes(self.master, 22))
+
+    def test_tcp_listener(self):
+        self.sim.add_device(SlowAsyncDevice("Async", "ASYNC_01"))
+        self.assertTrue(self.sim.start_device_tcp("Async", 0, host="127.0.0.1"))
+        port = self.sim.comm_manager.tcp_servers[0].bound_port
+
+        with socket.create_connection(("127.0.0.1", port), timeout=1.0) as client:
+            client.sendall(b"abc")
+            self.assertEqual(client.recv(16), b"ABC")
+
+    def test_streaming_uses_loop_timer(self):
+        scale = CasCI600A("Scale", "SCALE_01")
+        self.sim.add_device(scale)
+        frames = []
+        scale.on_output = frames.append
+
+        self.sim.comm_manager.async_transport.start()
+        before = threading.active_count()
+        scale.set_print_mode("Stream")
+        time.sleep(0.8)
+        scale.set_print_mode("Command")
+
+        self.assertEqual(threading.active_count(), before)
+        self.assertGreaterEqual(len(frames), 2)
+
+if __name__ == '__main__':
+    unittest.main()
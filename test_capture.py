@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import io
+import struct
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core import capture
+from core.capture import CaptureWriter, CaptureReader, export_text, export_pcap, INDEX_STRIDE
+from core.comm_manager import CommManager
+
+class TestCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "soak.scap")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, count, ports=("COM1", "COM2")):
+        with CaptureWriter(self.path) as writer:
+            for i in range(count):
+                port = ports[i % len(ports)]
+                writer.write(port, "RX" if i % 2 else "TX", b"frame %d\r\n" % i, timestamp_ns=1000 + i)
+
+    def test_round_trip(self):
+        self._write(10)
+        with CaptureReader(self.path) as reader:
+            records = list(reader.records())
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[3], (1003, "COM2", "RX", b"frame 3\r\n"))
+
+    def test_port_and_time_filters_use_index(self):
+        count = INDEX_STRIDE * 5
+        self._write(count, ports=("COM1", "COM2", "COM3"))
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(len(reader._index), 5)
+            com3 = list(reader.records(port="COM3"))
+            self.assertEqual(len(com3), count // 3)
+            window = list(reader.records(start_ns=1000 + 3000, end_ns=1000 + 3010))
+            self.assertEqual([r.timestamp_ns for r in window], list(range(4000, 4010)))
+            hits = list(reader.search(b"frame 4242\r"))
+            self.assertEqual([r.timestamp_ns for r in hits], [5242])
+
+    def test_port_only_in_later_blocks_is_skipped_efficiently(self):
+        with CaptureWriter(self.path) as writer:
+            for i in range(INDEX_STRIDE * 3):
+                writer.write("COM1", "RX", b"x", timestamp_ns=i)
+            writer.write("TCP:502", "TX", b"late", timestamp_ns=10**6)
+        with CaptureReader(self.path) as reader:
+            self.assertEqual([r.data for r in reader.records(port="TCP:502")], [b"late"])
+            self.assertEqual(list(reader.records(port="COM9")), [])
+
+    def test_missing_index_and_truncated_tail(self):
+        self._write(INDEX_STRIDE * 2 + 10)
+        os.remove(self.path + ".idx")
+        # Simulate a crash in the middle of the last record
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(sum(1 for _ in reader.records()), INDEX_STRIDE * 2 + 9)
+            self.assertEqual(set(reader.ports.values()), {"COM1", "COM2"})
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a capture file at all....")
+        with self.assertRaises(ValueError):
+            CaptureReader(self.path)
+
+    def test_export_text_and_pcap(self):
+        self._write(4)
+        with CaptureReader(self.path) as reader:
+            out = io.StringIO()
+            self.assertEqual(export_text(reader, out, port="COM1"), 2)
+            self.assertIn("[COM1] [TX] frame 0", out.getvalue())
+
+            pcap = io.BytesIO()
+            self.assertEqual(export_pcap(reader, pcap), 4)
+        raw = pcap.getvalue()
+        magic, major, minor, _, _, snaplen, linktype = capture.PCAP_HEADER.unpack_from(raw, 0)
+        self.assertEqual((magic, major, minor, linktype), (0xA1B23C4D, 2, 4, 147))
+        _, _, incl, orig = capture.PCAP_RECORD.unpack_from(raw, capture.PCAP_HEADER.size)
+        packet = raw[capture.PCAP_HEADER.size + capture.PCAP_RECORD.size:][:incl]
+        self.assertEqual(packet, b"\x01\x04COM1frame 0\r\n")
+
+    def test_comm_manager_captures_monitor_traffic(self):
+        comm = CommManager(io_backend="thread")
+        self.assertTrue(comm.start_capture(self.path))
+        comm._notify_monitors("COM1", "RX", b"01RW\r\n")
+        comm._notify_monitors("TCP:9000", "TX", b"ST\r\n")
+        comm.stop_all()
+        with CaptureReader(self.path) as reader:
+            self.assertEqual([(r.port, r.direction, r.data) for r in reader.records()],
+                             [("COM1", "RX", b"01RW\r\n"), ("TCP:9000", "TX", b"ST\r\n")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.equipment import Equipment
+from core.simulator import Simulator
+from devices.registry import BUILTIN_DEVICE_TYPES, register_builtin_devices
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+class TestDeviceRegistry(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator(io_backend="thread")
+        register_builtin_devices(self.sim)
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def test_every_builtin_type_resolves(self):
+        for type_name, _, _ in BUILTIN_DEVICE_TYPES:
+            cls = self.sim.resolve_device_class(type_name)
+            self.assertTrue(issubclass(cls, Equipment), type_name)
+
+    def test_create_device_imports_on_demand(self):
+        self.assertTrue(self.sim.create_device("AND CB Series", "CB", "CB_01"))
+        device = self.sim.get_device("CB")
+        self.assertEqual(device.model, "AND CB Series")
+        # The resolved class replaces the path
+        self.assertIs(self.sim.device_types["AND CB Series"][0], type(device))
+
+    def test_bad_path_fails_cleanly(self):
+        self.sim.register_device_type("Broken", "devices.scales.nope:Missing")
+        self.assertFalse(self.sim.create_device("Broken", "X", "X"))
+        self.assertNotIn("X", self.sim.devices)
+
+    def test_registration_imports_no_device_modules(self):
+        code = ("import sys; from core.simulator import Simulator; from devices.registry import register_builtin_devices; "
+                "sim = Simulator('thread'); register_builtin_devices(sim); "
+                "print(sorted(m for m in sys.modules if m.startswith('devices.scales') or m in ('asyncio', 'inspect')))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from devices.scales.cas_ci600a import CasCI600A
+from devices.scales.and_ad4401_scale import ANDAD4401Scale
+
+class TestFrameCache(unittest.TestCase):
+    def setUp(self):
+        self.scale = CasCI600A("Test Scale", "TEST_01")
+        self.scale.set_weight(123.4)
+
+    def test_repeated_polls_hit_cache(self):
+        first = self.scale.process_command(b"01RW\r\n")
+        for _ in range(9):
+            self.assertEqual(self.scale.process_command(b"01RW\r\n"), first)
+        self.assertEqual(self.scale.frame_cache_stats, {"hits": 9, "misses": 1})
+
+    def test_stream_and_poll_share_cache(self):
+        self.scale.current_frame()
+        self.assertIs(self.scale.current_frame(), self.scale.process_command(b"01RW\r\n"))
+        self.assertEqual(self.scale.frame_cache_misses, 1)
+
+    def test_mutators_invalidate(self):
+        frame = self.scale.current_frame()
+        self.scale.set_weight(50.0)
+        self.assertIn(b"    50.0", self.scale.current_frame())
+        self.scale.set_stable(False)
+        self.assertTrue(self.scale.current_frame().startswith(b"US"))
+        self.scale.set_format("Format 2")
+        self.assertEqual(self.scale.current_frame(), b"    50.0\r\n")
+        self.assertEqual(self.scale.frame_cache_misses, 4)
+        self.assertNotEqual(frame, self.scale.current_frame())
+
+    def test_tare_command_invalidates(self):
+        self.scale.current_frame()
+        self.scale.process_command(b"01MT\r\n")
+        self.assertIn(b".NT.", self.scale.current_frame())
+        self.scale.process_command(b"01MZ\r\n")
+        self.assertIn(b".GS.", self.scale.current_frame())
+
+    def test_unit_change_invalidates(self):
+        self.scale.current_frame()
+        self.scale.unit = "lb"
+        self.assertTrue(self.scale.current_frame().endswith(b"lb\r\n"))
+
+    def test_mode_change_invalidates(self):
+        scale = ANDAD4401Scale("AD", "AD_01")
+        scale.set_weight(10.0)
+        scale.process_command(b"MT")
+        scale.set_weight(15.0)
+        self.assertTrue(scale.process_command(b"RW").startswith(b"ST,NT,+0005.00"))
+        scale.process_command(b"MG")
+        self.assertTrue(scale.process_command(b"RW").startswith(b"ST,GS,+0015.00"))
+
+if __name__ == '__main__':
+    unittest.main()
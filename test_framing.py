@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.framing import Framer, TerminatorFramer, StxEtxFramer, LengthFramer, ByteFramer
+from devices.scales.and_gp_scale import ANDGPScale
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+from devices.scales.cas_ed_h_scale import CasEdHScale
+
+class TestFramers(unittest.TestCase):
+    def test_terminator_fragments(self):
+        framer = TerminatorFramer(b"\r\n")
+        self.assertEqual(framer.feed(b"01"), [])
+        self.assertEqual(framer.feed(b"RW\r"), [])
+        self.assertEqual(framer.feed(b"\n01M"), [b"01RW\r\n"])
+        self.assertEqual(framer.pending, 3)
+        self.assertEqual(framer.feed(b"Z\r\n"), [b"01MZ\r\n"])
+        self.assertEqual(framer.pending, 0)
+
+    def test_terminator_pipelined(self):
+        framer = TerminatorFramer(b"\r\n")
+        self.assertEqual(framer.feed(b"Q\r\nZ\r\nQ\r\nS"), [b"Q\r\n", b"Z\r\n", b"Q\r\n"])
+        self.assertEqual(framer.pending, 1)
+        self.assertEqual(framer.frames, 3)
+
+    def test_overflow_discards(self):
+        framer = TerminatorFramer(b"\r\n", max_buffer=8)
+        framer.feed(b"0123456789")
+        self.assertEqual(framer.pending, 0)
+        self.assertEqual(framer.discarded, 10)
+        self.assertEqual(framer.feed(b"Q\r\n"), [b"Q\r\n"])
+
+    def test_stx_etx_skips_noise(self):
+        framer = StxEtxFramer()
+        self.assertEqual(framer.feed(b"xx\x0201RC"), [])
+        self.assertEqual(framer.feed(b"WT\x03\x02A\x03"), [b"\x0201RCWT\x03", b"\x02A\x03"])
+        self.assertEqual(framer.discarded, 2)
+
+    def test_stx_etx_trailer(self):
+        framer = StxEtxFramer(trailer=1)
+        self.assertEqual(framer.feed(b"\x02AB\x03"), [])
+        self.assertEqual(framer.feed(b"\x7f"), [b"\x02AB\x03\x7f"])
+
+    def test_fixed_length(self):
+        framer = LengthFramer(size=4)
+        self.assertEqual(framer.feed(b"abcdefghi"), [b"abcd", b"efgh"])
+        self.assertEqual(framer.pending, 1)
+
+    def test_length_field(self):
+        # MBAP-style header: length at offset 4 counts the bytes after it
+        framer = LengthFramer(length_offset=4, length_size=2, adjust=6)
+        frame = b"\x00\x01\x00\x00\x00\x03\x01\x03\x00"
+        self.assertEqual(framer.feed(frame[:5]), [])
+        self.assertEqual(framer.feed(frame[5:] + frame), [frame, frame])
+
+    def test_byte_framer(self):
+        framer = ByteFramer()
+        self.assertEqual(framer.feed(b"P\r\nZT"), [b"P", b"Z", b"T"])
+
+    def test_framer_without_frame_end_cannot_be_created(self):
+        class Incomplete(Framer):
+            pass
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+class TestDeviceFraming(unittest.TestCase):
+    def test_fragmented_command(self):
+        scale = ANDGPScale("GP", "GP_01")
+        scale.set_weight(1.5)
+        self.assertIsNone(scale.handle_data(b"Q"))
+        self.assertTrue(scale.handle_data(b"\r\n").startswith(b"ST,"))
+
+    def test_pipelined_commands_answered_in_one_batch(self):
+        scale = ANDGPScale("GP", "GP_01")
+        scale.set_weight(1.5)
+        resp = scale.handle_data(b"Q\r\nQ\r\nZ\r\n")
+        frame = scale.current_frame()
+        self.assertEqual(resp, b"ST,+0001.500kg \r\n" * 2 + b"\x06\r\n")
+        self.assertIn(b"+0000.000", frame)
+
+    def test_nt301a_complex_mode_uses_stx_etx(self):
+        scale = CasNT301AScale("NT", "NT_01")
+        scale.set_command_mode("Complex")
+        scale.set_use_bcc(False)
+        scale.set_weight(12.0)
+        self.assertIsNone(scale.handle_data(b"\x0201RC"))
+        resp = scale.handle_data(b"WT\x03")
+        self.assertTrue(resp.startswith(b"\x0201RCWT"))
+
+    def test_ed_h_single_character_commands(self):
+        scale = CasEdHScale("ED", "ED_01")
+        scale.set_weight(5.0)
+        resp = scale.handle_data(b"PP")
+        self.assertEqual(resp, scale.current_frame() * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import pty
+import json
+import time
+import select
+import tempfile
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.headless import HeadlessRunner
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+@unittest.skipUnless(hasattr(pty, "openpty") and os.name == "posix", "needs pty")
+class TestHeadless(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.master, self.slave = pty.openpty()
+        self.project = os.path.join(self.tmp.name, "test.ESPJ")
+        device = {
+            "name": "Scale", "model": "CAS CI-600A", "device_id": "01",
+            "connection_settings": {"port": os.ttyname(self.slave), "baudrate": 9600,
+                                    "bytesize": 8, "parity": "None", "stopbits": 1.0},
+            "current_weight": 12.5, "is_stable": True, "print_mode": "Command",
+        }
+        missing = dict(device, name="Missing", connection_settings={"port": "/dev/does-not-exist"})
+        with open(self.project, "w", encoding="utf-8") as f:
+            json.dump({"version": "1.0", "devices": [device, missing]}, f)
+
+    def tearDown(self):
+        os.close(self.master)
+        os.close(self.slave)
+        self.tmp.cleanup()
+
+    def test_serves_project_devices(self):
+        with HeadlessRunner(self.project) as runner:
+            self.assertTrue(runner.start())
+            self.assertEqual(list(runner.started), ["Scale"])
+            os.write(self.master, b"01RW\r\n")
+            reply = b""
+            deadline = time.monotonic() + 2.0
+            while not reply.endswith(b"\r\n") and time.monotonic() < deadline:
+                if select.select([self.master], [], [], 0.1)[0]:
+                    reply += os.read(self.master, 1024)
+            self.assertIn(b"12.5", reply)
+            stats = runner.stats()["devices"]["Scale"]
+            self.assertEqual(stats["output"]["frames"], 1)
+
+    def test_shared_port_skips_second_device(self):
+        with open(self.project, encoding="utf-8") as f:
+            project = json.load(f)
+        project["devices"][1] = dict(project["devices"][0], name="Twin", device_id="02")
+        with open(self.project, "w", encoding="utf-8") as f:
+            json.dump(project, f)
+        with HeadlessRunner(self.project) as runner:
+            self.assertTrue(runner.start())
+            self.assertEqual(list(runner.started), ["Scale"])
+            twin = [r for r in runner.report.devices if r.name == "Twin"][0]
+            self.assertFalse(twin.ok)
+            self.assertIn("also used by Scale", twin.error)
+
+    def test_run_stops_after_duration(self):
+        runner = HeadlessRunner(self.project, stats_interval=0.05)
+        self.assertTrue(runner.start())
+        started = time.monotonic()
+        runner.run(duration=0.3)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(runner.simulator.comm_manager.serial_ports, {})
+
+    def test_missing_project(self):
+        with HeadlessRunner(os.path.join(self.tmp.name, "nope.ESPJ")) as runner:
+            self.assertFalse(runner.start())
+
+    def test_no_gui_imports(self):
+        code = "import sys, headless; print(sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter', 'ui')))"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
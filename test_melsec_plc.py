@@ -0,0 +1,183 @@
+import unittest
+import sys
+import os
+import pty
+import time
+import select
+import socket
+import struct
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.plc.memory import MemoryArea
+from devices.plc.melsec_plc import (
+    MelsecPLC, CMD_BATCH_READ, CMD_BATCH_WRITE, SUB_WORD, SUB_BIT, END_RANGE, END_POINTS, END_DEVICE,
+    build_3e_request, build_3e_ascii_request, build_1e_request, build_fx_request, fx_sum,
+)
+
+def end_code_3e(response):
+    return struct.unpack_from("<H", response, 9)[0]
+
+class TestMemoryBits(unittest.TestCase):
+    def test_unaligned_bit_ranges(self):
+        area = MemoryArea("M", 4, byteorder="little")
+        area.write_bits(5, 10, 0b1000000001)
+        self.assertEqual(area.read_bits(5, 10), 0b1000000001)
+        self.assertTrue(area.get_bit(0, 5))
+        self.assertTrue(area.get_bit(1, 6))
+        self.assertEqual(area.read_bits(0, 32), 1 << 5 | 1 << 14)
+        with self.assertRaises(IndexError):
+            area.read_bits(30, 3)
+
+class TestMC3E(unittest.TestCase):
+    def setUp(self):
+        self.plc = MelsecPLC("Q", "Q_01", series="Q")
+
+    def test_word_read_write(self):
+        data = b"".join(struct.pack("<H", i) for i in range(960))
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_WRITE, SUB_WORD, "D", 1000, 960, data))
+        self.assertEqual(end_code_3e(response), 0)
+        self.assertEqual(self.plc.get_word("D", 1959), 959)
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "D", 1000, 960))
+        self.assertEqual(end_code_3e(response), 0)
+        self.assertEqual(struct.unpack_from("<H", response, 7)[0], 2 + 1920)
+        self.assertEqual(response[11:], data)
+
+    def test_bit_units(self):
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_WRITE, SUB_BIT, "M", 13, 3, b"\x10\x10"))
+        self.assertEqual(end_code_3e(response), 0)
+        self.assertEqual([self.plc.get_bit("M", n) for n in (13, 14, 15)], [True, False, True])
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_BIT, "M", 12, 4))
+        self.assertEqual(response[11:], b"\x01\x01")
+
+    def test_bit_device_in_word_units(self):
+        self.plc.set_bit("X", 0x10, True)
+        self.plc.set_bit("X", 0x1F, True)
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "X", 0x10, 1))
+        self.assertEqual(response[11:], b"\x01\x80")
+        # Unaligned head shifts the points
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "X", 0x0F, 1))
+        self.assertEqual(response[11:], b"\x02\x00")
+        self.plc.process_command(build_3e_request(CMD_BATCH_WRITE, SUB_WORD, "Y", 3, 1, b"\xff\xff"))
+        self.assertEqual(self.plc.memory["Y"].read_bits(0, 24), 0xFFFF << 3)
+
+    def test_errors(self):
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "D", 12280, 10))
+        self.assertEqual(end_code_3e(response), END_RANGE)
+        self.assertEqual(len(response), 11 + 9)  # Error information follows the end code
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "D", 0, 961))
+        self.assertEqual(end_code_3e(response), END_POINTS)
+        response = self.plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_BIT, "D", 0, 1))
+        self.assertEqual(end_code_3e(response), END_DEVICE)
+
+    def test_fx_has_no_w(self):
+        plc = MelsecPLC("FX", "FX_01", series="FX3U", protocol="3E")
+        response = plc.process_command(build_3e_request(CMD_BATCH_READ, SUB_WORD, "W", 0, 1))
+        self.assertEqual(end_code_3e(response), END_DEVICE)
+
+    def test_pipelined_requests_are_framed(self):
+        self.plc.set_word("D", 0, 7)
+        request = build_3e_request(CMD_BATCH_READ, SUB_WORD, "D", 0, 1)
+        responses = self.plc.handle_data(request + request[:5])
+        self.assertEqual(responses[-2:], b"\x07\x00")
+        self.assertEqual(self.plc.handle_data(request[5:])[-2:], b"\x07\x00")
+
+class TestMC3EAscii(unittest.TestCase):
+    def setUp(self):
+        self.plc = MelsecPLC("Q", "Q_01", series="Q", protocol="3E-ASCII")
+
+    def test_word_read_write(self):
+        response = self.plc.handle_data(build_3e_ascii_request(CMD_BATCH_WRITE, SUB_WORD, "D", 100, 2, b"1234ABCD"))
+        self.assertEqual(response, b"D00000FF03FF0000040000")
+        self.assertEqual(self.plc.get_word("D", 101), 0xABCD)
+        response = self.plc.handle_data(build_3e_ascii_request(CMD_BATCH_READ, SUB_WORD, "D", 100, 2))
+        self.assertEqual(response, b"D00000FF03FF00000C00001234ABCD")
+
+    def test_bits_and_hex_numbering(self):
+        self.plc.set_bit("X", 0x1A, True)
+        response = self.plc.handle_data(build_3e_ascii_request(CMD_BATCH_READ, SUB_BIT, "X", 0x18, 4, base=16))
+        self.assertTrue(response.endswith(b"00000010"))
+        self.plc.handle_data(build_3e_ascii_request(CMD_BATCH_WRITE, SUB_BIT, "M", 5, 2, b"11"))
+        self.assertTrue(self.plc.get_bit("M", 6))
+
+    def test_error_response(self):
+        response = self.plc.handle_data(build_3e_ascii_request(CMD_BATCH_READ, SUB_WORD, "D", 99999, 2))
+        self.assertEqual(response[18:22], b"C056")
+
+class TestMC1E(unittest.TestCase):
+    def test_read_write(self):
+        plc = MelsecPLC("FX", "FX_01", series="FX3U", protocol="1E")
+        response = plc.handle_data(build_1e_request(0x03, "D", 10, 2, b"\x01\x00\x02\x00"))
+        self.assertEqual(response, b"\x83\x00")
+        response = plc.handle_data(build_1e_request(0x01, "D", 10, 2))
+        self.assertEqual(response, b"\x81\x00\x01\x00\x02\x00")
+        response = plc.handle_data(build_1e_request(0x02, "Y", 0, 3, b"\x10\x10"))
+        self.assertEqual(response, b"\x82\x00")
+        self.assertEqual(plc.handle_data(build_1e_request(0x00, "Y", 0, 3)), b"\x80\x00\x10\x10")
+        self.assertEqual(plc.handle_data(build_1e_request(0x01, "D", 7999, 2)), b"\x81\x58")
+
+class TestFxProgrammingPort(unittest.TestCase):
+    def setUp(self):
+        self.plc = MelsecPLC("FX", "FX_01", series="FX3U", protocol="FX")
+
+    def test_settings(self):
+        self.assertEqual((self.plc.connection_settings["bytesize"], self.plc.connection_settings["parity"]), (7, "E"))
+
+    def test_read_write_d(self):
+        self.plc.set_word("D", 0, 0x1234)
+        self.assertEqual(self.plc.handle_data(build_fx_request("0", "100002")), b"\x023412\x03" + fx_sum(b"3412\x03"))
+        self.assertEqual(self.plc.handle_data(build_fx_request("1", "10020255AA")), b"\x06")
+        self.assertEqual(self.plc.get_word("D", 1), 0xAA55)
+
+    def test_force_and_enq(self):
+        self.assertEqual(self.plc.handle_data(b"\x05"), b"\x06")
+        self.assertEqual(self.plc.handle_data(build_fx_request("7", "0508")), b"\x06")  # M5 (0x0805)
+        self.assertTrue(self.plc.get_bit("M", 5))
+        self.assertEqual(self.plc.handle_data(build_fx_request("8", "0508")), b"\x06")
+        self.assertFalse(self.plc.get_bit("M", 5))
+
+    def test_bad_sum_and_address(self):
+        request = bytearray(build_fx_request("0", "100002"))
+        request[-1] ^= 1
+        self.assertEqual(self.plc.handle_data(bytes(request)), b"\x15")
+        self.assertEqual(self.plc.handle_data(build_fx_request("0", "F00002")), b"\x15")
+
+    @unittest.skipUnless(os.name == "posix", "needs pty")
+    def test_over_serial(self):
+        sim = Simulator(io_backend="reactor")
+        master, slave = pty.openpty()
+        try:
+            sim.add_device(self.plc)
+            self.plc.set_word("D", 10, 0x0102)
+            self.assertTrue(sim.start_device_comm("FX", os.ttyname(slave), 9600, 7, "E", 1))
+            os.write(master, build_fx_request("0", "101402"))
+            reply, deadline = b"", time.monotonic() + 2.0
+            while len(reply) < 8 and time.monotonic() < deadline:
+                if select.select([master], [], [], 0.1)[0]:
+                    reply += os.read(master, 64)
+            self.assertEqual(reply[:6], b"\x020201\x03")
+        finally:
+            sim.stop()
+            os.close(master)
+            os.close(slave)
+
+class TestMCOverTcp(unittest.TestCase):
+    def test_session(self):
+        sim = Simulator(io_backend="thread")
+        plc = MelsecPLC("Q", "Q_01")
+        sim.add_device(plc)
+        try:
+            self.assertTrue(sim.start_device_tcp("Q", 0, host="127.0.0.1"))
+            port = sim.comm_manager.tcp_servers[0].bound_port
+            with socket.create_connection(("127.0.0.1", port), timeout=1.0) as client:
+                client.sendall(build_3e_request(CMD_BATCH_WRITE, SUB_WORD, "D", 0, 1, b"\x2a\x00"))
+                self.assertEqual(client.recv(64)[9:11], b"\x00\x00")
+                client.sendall(build_3e_request(CMD_BATCH_READ, SUB_WORD, "D", 0, 1))
+                self.assertEqual(client.recv(64)[11:], b"\x2a\x00")
+        finally:
+            sim.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import sys
+import os
+import pty
+import time
+import select
+import socket
+import struct
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.scales.cas_ci600a import CasCI600A
+from devices.gateway.modbus_gateway import (
+    ModbusGateway, TRANSPORT_RTU, FC_READ_HOLDING_REGISTERS, FC_READ_INPUT_REGISTERS, FC_READ_DISCRETE_INPUTS,
+    FC_WRITE_SINGLE_REGISTER, FC_WRITE_MULTIPLE_REGISTERS, STATUS_STABLE, STATUS_NET, STATUS_OVERLOAD,
+    STATUS_STREAMING, REG_COMMAND, REG_PRESET_TARE, COMMAND_TARE, COMMAND_ZERO, EX_ILLEGAL_ADDRESS,
+    EX_GATEWAY_NO_RESPONSE, build_tcp_request, build_rtu_request, crc16,
+)
+
+class TestModbusGateway(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator(io_backend="thread")
+        self.gateway = ModbusGateway("GW", "GW_01")
+        self.sim.add_device(self.gateway)
+        for unit in range(1, 201):
+            scale = CasCI600A(f"Scale {unit}", f"SCALE_{unit}")
+            scale.set_weight(unit * 1.5)
+            self.sim.add_device(scale)
+            self.gateway.map_unit(unit, scale.name)
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def read(self, unit, function, address, count):
+        response = self.gateway.handle_data(build_tcp_request(unit, function, address, count, transaction=unit))
+        self.assertEqual(struct.unpack_from(">H", response)[0], unit)
+        return response[7:]
+
+    def test_measurement_registers(self):
+        scale = self.sim.get_device("Scale 10")
+        scale.set_tare(5.0)
+        pdu = self.read(10, FC_READ_INPUT_REGISTERS, 0, 14)
+        self.assertEqual(pdu[:2], b"\x04\x1c")
+        gross, net, tare, gross_i, net_i, tare_i, status, _ = struct.unpack(">fffiiiHH", pdu[2:])
+        self.assertEqual((gross, net, tare), (15.0, 10.0, 5.0))
+        self.assertEqual((gross_i, net_i, tare_i), (15000, 10000, 5000))
+        self.assertEqual(status, STATUS_STABLE | STATUS_NET)
+
+    def test_image_rebuilt_only_on_state_change(self):
+        for _ in range(5):
+            self.read(1, FC_READ_HOLDING_REGISTERS, 0, 24)
+        self.assertEqual(self.gateway.image_builds, 1)
+        self.sim.get_device("Scale 1").set_weight(2000.0)
+        pdu = self.read(1, FC_READ_HOLDING_REGISTERS, 12, 1)
+        self.assertEqual(self.gateway.image_builds, 2)
+        self.assertTrue(struct.unpack(">H", pdu[2:])[0] & STATUS_OVERLOAD)
+
+    def test_status_follows_range_and_streaming(self):
+        def status():
+            return struct.unpack(">H", self.read(2, FC_READ_HOLDING_REGISTERS, 12, 1)[2:])[0]
+        scale = self.sim.get_device("Scale 2")
+        scale.set_weight(500.0)
+        self.assertEqual(status(), STATUS_STABLE)
+        # Neither change publishes a new snapshot; the cached image must still be rebuilt
+        scale.weight_range = {"min": 0, "max": 100}
+        self.assertEqual(status(), STATUS_STABLE | STATUS_OVERLOAD)
+        scale.start_streaming()
+        try:
+            self.assertEqual(status(), STATUS_STABLE | STATUS_OVERLOAD | STATUS_STREAMING)
+        finally:
+            scale.stop_streaming()
+        self.assertEqual(status(), STATUS_STABLE | STATUS_OVERLOAD)
+        self.assertEqual(self.gateway.image_builds, 4)
+
+    def test_discrete_inputs(self):
+        self.sim.get_device("Scale 3").set_stable(False)
+        self.assertEqual(self.read(3, FC_READ_DISCRETE_INPUTS, 0, 3), b"\x02\x01\x00")
+        self.assertEqual(self.read(4, FC_READ_DISCRETE_INPUTS, 0, 1), b"\x02\x01\x01")
+
+    def test_exceptions(self):
+        self.assertEqual(self.read(1, FC_READ_INPUT_REGISTERS, 10, 10), bytes((0x84, EX_ILLEGAL_ADDRESS)))
+        self.assertEqual(self.read(201, FC_READ_INPUT_REGISTERS, 0, 1), bytes((0x84, EX_GATEWAY_NO_RESPONSE)))
+        self.assertEqual(self.read(1, 0x2B, 0, 0)[0], 0xAB)
+
+    def test_commands(self):
+        scale = self.sim.get_device("Scale 2")
+        response = self.gateway.handle_data(build_tcp_request(2, FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_TARE))
+        self.assertEqual(response[7:], struct.pack(">BHH", FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_TARE))
+        self.assertEqual(scale.tare_weight, 3.0)
+        self.gateway.handle_data(build_tcp_request(2, FC_WRITE_MULTIPLE_REGISTERS, REG_PRESET_TARE, 2,
+                                                   data=struct.pack(">f", 1.25)))
+        self.assertEqual(scale.tare_weight, 1.25)
+        self.gateway.handle_data(build_tcp_request(2, FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_ZERO))
+        self.assertEqual((scale.current_weight, scale.tare_weight), (0.0, 0.0))
+        response = self.gateway.handle_data(build_tcp_request(2, FC_WRITE_SINGLE_REGISTER, 0, 1))
+        self.assertEqual(response[7:], bytes((0x86, EX_ILLEGAL_ADDRESS)))
+
+    def test_unit_map_round_trip(self):
+        state = ModbusGateway.STATE_SCHEMA.dump(self.gateway)
+        self.assertEqual(state["unit_map"]["7"], "Scale 7")
+        other = ModbusGateway("GW2", "GW_02")
+        ModbusGateway.STATE_SCHEMA.load(other, state)
+        self.assertEqual(other.units[7], "Scale 7")
+
+    def test_rtu(self):
+        self.gateway.set_transport(TRANSPORT_RTU)
+        request = build_rtu_request(5, FC_READ_HOLDING_REGISTERS, 0, 2)
+        # Noise before the frame and the frame split across reads
+        self.assertIsNone(self.gateway.handle_data(b"\xff\x00" + request[:3]))
+        response = self.gateway.handle_data(request[3:])
+        self.assertEqual(response[-2:], crc16(response[:-2]))
+        self.assertEqual(response[:3], b"\x05\x03\x04")
+        self.assertEqual(struct.unpack(">f", response[3:7])[0], 7.5)
+        # Unmapped unit: silence
+        self.assertIsNone(self.gateway.handle_data(build_rtu_request(250, FC_READ_HOLDING_REGISTERS, 0, 2)))
+        # Broadcast write reaches every unit without a reply
+        self.assertIsNone(self.gateway.handle_data(build_rtu_request(0, FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_TARE)))
+        self.assertEqual(self.sim.get_device("Scale 200").tare_weight, 300.0)
+
+    def test_tcp_listener(self):
+        self.assertTrue(self.sim.start_device_tcp("GW", 0, host="127.0.0.1"))
+        port = self.sim.comm_manager.tcp_servers[0].bound_port
+        with socket.create_connection(("127.0.0.1", port), timeout=1.0) as client:
+            client.sendall(build_tcp_request(9, FC_READ_INPUT_REGISTERS, 0, 2, transaction=77))
+            response = client.recv(256)
+        self.assertEqual(response[:7], struct.pack(">HHHB", 77, 0, 7, 9))
+        self.assertEqual(struct.unpack(">f", response[9:13])[0], 13.5)
+
+    def test_command_and_preset_tare_registers_over_tcp(self):
+        self.assertTrue(self.sim.start_device_tcp("GW", 0, host="127.0.0.1"))
+        port = self.sim.comm_manager.tcp_servers[0].bound_port
+        scale = self.sim.get_device("Scale 6")
+        with socket.create_connection(("127.0.0.1", port), timeout=1.0) as client:
+            client.sendall(build_tcp_request(6, FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_TARE, transaction=1))
+            self.assertEqual(client.recv(256)[7:], struct.pack(">BHH", FC_WRITE_SINGLE_REGISTER, REG_COMMAND, COMMAND_TARE))
+            self.assertEqual(scale.tare_weight, 9.0)
+            client.sendall(build_tcp_request(6, FC_WRITE_MULTIPLE_REGISTERS, REG_PRESET_TARE, 2, transaction=2,
+                                             data=struct.pack(">f", 2.5)))
+            self.assertEqual(client.recv(256)[7:], struct.pack(">BHH", FC_WRITE_MULTIPLE_REGISTERS, REG_PRESET_TARE, 2))
+            client.sendall(build_tcp_request(6, FC_READ_HOLDING_REGISTERS, REG_COMMAND, 4, transaction=3))
+            response = client.recv(256)
+        self.assertEqual(response[7:9], b"\x03\x08")
+        command, _, tare = struct.unpack(">HHf", response[9:])
+        self.assertEqual((command, tare), (0, 2.5))
+        self.assertEqual(scale.tare_weight, 2.5)
+
+    @unittest.skipUnless(os.name == "posix", "needs pty")
+    def test_rtu_over_serial(self):
+        gateway = ModbusGateway("RTU", "RTU_01", transport=TRANSPORT_RTU)
+        gateway.map_unit(1, "Scale 1")
+        sim = Simulator(io_backend="reactor")
+        sim.devices.update(self.sim.devices)
+        sim.add_device(gateway)
+        master, slave = pty.openpty()
+        try:
+            self.assertTrue(sim.start_device_comm("RTU", os.ttyname(slave), 19200, 8, "N", 1))
+            os.write(master, build_rtu_request(1, FC_READ_INPUT_REGISTERS, 0, 2))
+            reply, deadline = b"", time.monotonic() + 2.0
+            while len(reply) < 9 and time.monotonic() < deadline:
+                if select.select([master], [], [], 0.1)[0]:
+                    reply += os.read(master, 64)
+            self.assertEqual(reply[:3], b"\x01\x04\x04")
+            self.assertEqual(struct.unpack(">f", reply[3:7])[0], 1.5)
+        finally:
+            sim.comm_manager.stop_all()
+            os.close(master)
+            os.close(slave)
+
+if __name__ == '__main__':
+    unittest.main()
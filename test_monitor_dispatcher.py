@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.monitor_dispatcher import MonitorDispatcher, DROP_OLDEST, DROP_NEWEST, BLOCK
+from core.comm_manager import CommManager
+
+class TestMonitorDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = MonitorDispatcher()
+
+    def tearDown(self):
+        self.dispatcher.stop()
+
+    def test_delivers_in_order_off_thread(self):
+        events = []
+        threads = set()
+
+        def monitor(port, direction, data):
+            threads.add(threading.current_thread())
+            events.append(data)
+
+        self.dispatcher.subscribe(monitor)
+        for i in range(100):
+            self.dispatcher.publish("COM1", "RX", bytes([i]))
+        self.assertTrue(self.dispatcher.wait_idle())
+        self.assertEqual(events, [bytes([i]) for i in range(100)])
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def _slow_subscriber(self, policy):
+        gate = threading.Event()
+        events = []
+
+        def monitor(port, direction, data):
+            gate.wait()
+            events.append(data)
+
+        subscriber = self.dispatcher.subscribe(monitor, capacity=3, policy=policy)
+        return gate, events, subscriber
+
+    def test_slow_subscriber_does_not_block_publisher(self):
+        gate, events, subscriber = self._slow_subscriber(DROP_OLDEST)
+        start = time.monotonic()
+        for i in range(1000):
+            self.dispatcher.publish("COM1", "TX", b"%d" % i)
+        self.assertLess(time.monotonic() - start, 0.5)
+        gate.set()
+        self.assertTrue(self.dispatcher.wait_idle())
+        # The first event was already taken by the blocked callback; the newest three survive
+        self.assertEqual(events[-3:], [b"997", b"998", b"999"])
+        self.assertEqual(subscriber.stats()["dropped"], 1000 - len(events))
+
+    def test_drop_newest(self):
+        gate, events, subscriber = self._slow_subscriber(DROP_NEWEST)
+        for i in range(10):
+            self.dispatcher.publish("COM1", "TX", b"%d" % i)
+        gate.set()
+        self.assertTrue(self.dispatcher.wait_idle())
+        self.assertEqual(events[:2], [b"0", b"1"])
+        self.assertEqual(len(events) + subscriber.dropped, 10)
+
+    def test_block_loses_nothing(self):
+        gate, events, subscriber = self._slow_subscriber(BLOCK)
+        threading.Timer(0.1, gate.set).start()
+        start = time.monotonic()
+        for i in range(10):
+            self.dispatcher.publish("COM1", "TX", b"%d" % i)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertTrue(self.dispatcher.wait_idle())
+        self.assertEqual(events, [b"%d" % i for i in range(10)])
+        self.assertEqual(subscriber.dropped, 0)
+
+    def test_lag_metrics_identify_slow_consumer(self):
+        self.dispatcher.subscribe(lambda *args: time.sleep(0.01))
+        self.dispatcher.subscribe(lambda *args: None)
+        for _ in range(5):
+            self.dispatcher.publish("COM1", "RX", b"x")
+        self.assertTrue(self.dispatcher.wait_idle())
+        slow, fast = self.dispatcher.stats()
+        self.assertGreater(slow["max_lag_ms"], fast["max_lag_ms"])
+
+    def test_callback_error_is_contained(self):
+        def broken(*args):
+            raise RuntimeError("boom")
+        subscriber = self.dispatcher.subscribe(broken)
+        self.dispatcher.publish("COM1", "RX", b"x")
+        self.assertTrue(self.dispatcher.wait_idle())
+        self.assertEqual(subscriber.errors, 1)
+
+class TestCommManagerMonitors(unittest.TestCase):
+    def test_add_remove_monitor(self):
+        comm = CommManager(io_backend="thread")
+        events = []
+        monitor = lambda port, direction, data: events.append(data)
+        comm.add_monitor(monitor)
+        comm._notify_monitors("COM1", "RX", b"A")
+        self.assertTrue(comm.flush_monitors())
+        comm.remove_monitor(monitor)
+        comm._notify_monitors("COM1", "RX", b"B")
+        self.assertEqual(events, [b"A"])
+        self.assertEqual(comm.monitor_stats(), [])
+
+if __name__ == '__main__':
+    unittest.main()
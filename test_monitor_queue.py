@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.monitor_queue import MonitorEventQueue, format_monitor_line
+
+class TestMonitorEventQueue(unittest.TestCase):
+    def test_drain_in_batches(self):
+        queue = MonitorEventQueue()
+        for i in range(10):
+            queue.put("COM1", "RX", bytes([0x30 + i]))
+        events, dropped = queue.drain(4)
+        self.assertEqual([e[3] for e in events], [b"0", b"1", b"2", b"3"])
+        self.assertEqual(dropped, 0)
+        self.assertEqual(len(queue), 6)
+
+    def test_overflow_counts_dropped(self):
+        queue = MonitorEventQueue(capacity=3)
+        for i in range(5):
+            queue.put("COM1", "TX", b"x")
+        events, dropped = queue.drain(10)
+        self.assertEqual((len(events), dropped), (3, 2))
+        # Dropped count is reported once
+        self.assertEqual(queue.drain(10), ([], 0))
+        self.assertEqual(queue.total_dropped, 2)
+
+    def test_concurrent_producers(self):
+        queue = MonitorEventQueue(capacity=100000)
+
+        def produce():
+            for _ in range(5000):
+                queue.put("COM1", "RX", b"data")
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for t in threads:
+            t.start()
+        drained = 0
+        while any(t.is_alive() for t in threads) or len(queue):
+            events, _ = queue.drain(1000)
+            drained += len(events)
+        for t in threads:
+            t.join()
+        self.assertEqual(drained, 20000)
+
+    def test_format_line(self):
+        line = format_monitor_line((0.25, "COM2", "TX", b"A\x01"))
+        self.assertTrue(line.startswith("["))
+        self.assertIn(".250] [COM2] [TX] A\x01 <4101>", line)
+        self.assertTrue(line.endswith("\n"))
+
+if __name__ == '__main__':
+    unittest.main()
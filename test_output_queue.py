@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.output_queue import PortOutputQueue
+
+class SlowPort:
+    """Records writes and detects two writes overlapping."""
+
+    def __init__(self, delay=0.002):
+        self.delay = delay
+        self.writes = []
+        self.active = 0
+        self.overlaps = 0
+
+    def write(self, data):
+        self.active += 1
+        if self.active > 1:
+            self.overlaps += 1
+        time.sleep(self.delay)
+        self.writes.append(data)
+        self.active -= 1
+
+class TestPortOutputQueue(unittest.TestCase):
+    def test_single_frame_written_immediately(self):
+        port = SlowPort(0)
+        flushed = []
+        queue = PortOutputQueue("P", port.write, flushed.append)
+        self.assertTrue(queue.put(b"A\r\n"))
+        self.assertEqual(port.writes, [b"A\r\n"])
+        self.assertEqual(flushed, [b"A\r\n"])
+
+    def test_concurrent_writers_never_interleave(self):
+        port = SlowPort()
+        flushed = []
+        queue = PortOutputQueue("P", port.write, flushed.append)
+
+        def writer(tag):
+            for i in range(50):
+                queue.put(f"{tag}{i:02d}\r\n".encode('ascii'))
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in "ABCD"]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(port.overlaps, 0)
+        stream = b"".join(port.writes)
+        frames = stream.split(b"\r\n")[:-1]
+        self.assertEqual(len(frames), 200)
+        # Each writer's frames stay in order and whole
+        for tag in "ABCD":
+            own = [f for f in frames if f.startswith(tag.encode())]
+            self.assertEqual(own, [f"{tag}{i:02d}".encode() for i in range(50)])
+        # Frames queued during a slow write were coalesced
+        self.assertLess(len(port.writes), 200)
+        self.assertEqual(queue.stats()["coalesced"], 200 - len(port.writes))
+        self.assertEqual(flushed, port.writes)
+
+    def test_write_error_is_counted(self):
+        def broken(data):
+            raise OSError("gone")
+        queue = PortOutputQueue("P", broken, lambda batch: None)
+        queue.put(b"A")
+        self.assertEqual(queue.stats()["errors"], 1)
+        self.assertEqual(queue.stats()["writes"], 0)
+
+    def test_closed_queue_refuses_data(self):
+        port = SlowPort(0)
+        queue = PortOutputQueue("P", port.write, lambda batch: None)
+        queue.close()
+        self.assertFalse(queue.put(b"A"))
+        self.assertEqual(port.writes, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from devices.scales.packet_template import PacketTemplate, Lit, Text, Num
+from devices.scales.cas_ci600a import CasCI600A
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+from devices.scales.cas_ed_h_scale import CasEdHScale
+from devices.scales.and_gp_scale import ANDGPScale
+from devices.scales.and_ad4401_scale import ANDAD4401Scale
+from devices.scales.sartorius_bp_scale import SartoriusBPScale
+
+class TestPacketTemplate(unittest.TestCase):
+    def setUp(self):
+        self.template = PacketTemplate(
+            Text("header", 2), Lit(","),
+            Num("data", 8, "+08.1f"),
+            Text("unit", 2, align=">"), Lit("\r\n"))
+
+    def test_length(self):
+        self.assertEqual(self.template.length, 15)
+        self.assertEqual(self.template.field_names, ("header", "data", "unit"))
+
+    def test_encode(self):
+        self.assertEqual(self.template.encode(b"ST", 12.3, b"kg"), b"ST,+00012.3kg\r\n")
+
+    def test_short_text_is_padded(self):
+        self.assertEqual(self.template.encode(b"ST", 12.3, b"g"), b"ST,+00012.3 g\r\n")
+
+    def test_long_text_is_clipped(self):
+        self.assertEqual(self.template.encode(b"ST", 12.3, b"lbs"), b"ST,+00012.3lb\r\n")
+
+    def test_str_values_are_accepted(self):
+        self.assertEqual(self.template.encode("ST", 12.3, "kg"), b"ST,+00012.3kg\r\n")
+
+    def test_overlong_number_drops_decimals(self):
+        self.assertEqual(self.template.encode(b"OL", -1234567.8, b"kg"), b"OL,-1234568kg\r\n")
+
+    def test_number_still_too_long_keeps_length(self):
+        frame = self.template.encode(b"OL", 123456789.0, b"kg")
+        self.assertEqual(len(frame), self.template.length)
+
+    def test_number_still_too_long_saturates_with_sign(self):
+        self.assertEqual(self.template.encode(b"OL", 123456789.0, b"kg"), b"OL,+9999999kg\r\n")
+        self.assertEqual(self.template.encode(b"OL", -123456789.0, b"kg"), b"OL,-9999999kg\r\n")
+        unsigned = PacketTemplate(Num("data", 6, "6.1f"))
+        self.assertEqual(unsigned.encode(12345678.9), b"999999")
+        self.assertEqual(unsigned.encode(-12345678.9), b"-99999")
+
+    def test_literal_percent(self):
+        template = PacketTemplate(Num("data", 5, "5.1f"), Lit("%"))
+        self.assertEqual(template.encode(12.5), b" 12.5%")
+
+class TestScaleFrameLengths(unittest.TestCase):
+    """Frame lengths from the manuals, including overload values."""
+
+    def _check(self, scale, expected_len, formats=(None,)):
+        for fmt in formats:
+            if fmt:
+                scale.set_format(fmt)
+            for weight in (0.0, -12.5, 1234.5, 99999999.0):
+                scale.set_weight(weight)
+                frame = scale._get_current_weight_data()
+                self.assertEqual(len(frame), expected_len[fmt], (fmt, weight, frame))
+
+    def test_overload_keeps_sign(self):
+        nt301a = CasNT301AScale("S", "S1")
+        nt301a.set_weight(-12345678.9)
+        self.assertIn(b"-9999999", nt301a._get_current_weight_data())
+        ed_h = CasEdHScale("S", "S1")
+        ed_h.set_weight(12345678.9)
+        self.assertIn(b"+9999999", ed_h._get_current_weight_data())
+
+    def test_cas_ci600a(self):
+        self._check(CasCI600A("S", "S1"),
+                    {"Format 1": 22, "Format 2": 10, "Format 3": 18},
+                    ("Format 1", "Format 2", "Format 3"))
+
+    def test_cas_nt301a(self):
+        self._check(CasNT301AScale("S", "S1"), {"Format 1": 18, "Format 2": 22},
+                    ("Format 1", "Format 2"))
+
+    def test_cas_ed_h(self):
+        self._check(CasEdHScale("S", "S1"), {None: 20})
+
+    def test_and_gp(self):
+        self._check(ANDGPScale("S", "S1"), {None: 17})
+
+    def test_and_ad4401(self):
+        self._check(ANDAD4401Scale("S", "S1"), {None: 18})
+
+    def test_sartorius_bp(self):
+        self._check(SartoriusBPScale("S", "S1"), {"16 Byte": 16, "22 Byte": 22},
+                    ("16 Byte", "22 Byte"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import sys
+import os
+import pty
+import json
+import time
+import select
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.project_manager import ProjectManager
+from devices.registry import register_builtin_devices
+
+def device_entry(name, port, **extra):
+    entry = {
+        "name": name, "model": "CAS CI-600A", "device_id": name,
+        "connection_settings": {"port": port, "baudrate": 9600, "bytesize": 8, "parity": "None", "stopbits": 1.0},
+        "current_weight": 1.5, "is_stable": True, "print_mode": "Command",
+    }
+    entry.update(extra)
+    return entry
+
+@unittest.skipUnless(os.name == "posix", "needs pty")
+class TestProjectBulkLoad(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ptys = [pty.openpty() for _ in range(40)]
+        self.ports = [os.ttyname(slave) for _, slave in self.ptys]
+        self.sim = Simulator(io_backend="reactor")
+        register_builtin_devices(self.sim)
+        self.pm = ProjectManager()
+
+    def tearDown(self):
+        self.sim.stop()
+        for master, slave in self.ptys:
+            os.close(master)
+            os.close(slave)
+        self.tmp.cleanup()
+
+    def write_project(self, devices, name="line.ESPJ"):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": "1.0", "devices": devices}, f)
+        return path
+
+    def test_opens_all_ports(self):
+        path = self.write_project([device_entry(f"Scale {i}", port) for i, port in enumerate(self.ports)])
+        report = self.pm.bulk_load(self.sim, path)
+        self.assertTrue(report.ok, report.summary())
+        self.assertEqual(len(report.devices), 40)
+        self.assertEqual(set(self.sim.comm_manager.serial_ports), set(self.ports))
+        self.assertTrue(all(self.sim.get_device(f"Scale {i}").connected for i in range(40)))
+        self.assertLess(report.elapsed, 1.0)
+
+    def test_validation_changes_nothing(self):
+        devices = [device_entry("A", self.ports[0]), device_entry("B", self.ports[0]),
+                   device_entry("C", self.ports[1], model="No Such Scale")]
+        report = self.pm.bulk_load(self.sim, self.write_project(devices))
+        self.assertFalse(report.ok)
+        self.assertEqual(len(report.errors), 2)
+        self.assertEqual(self.sim.devices, {})
+        self.assertEqual(self.sim.comm_manager.serial_ports, {})
+
+    def test_partial_failure_rolls_back(self):
+        first = self.write_project([device_entry("Old", self.ports[0])], "old.ESPJ")
+        self.assertTrue(self.pm.bulk_load(self.sim, first).ok)
+        old_device = self.sim.get_device("Old")
+
+        devices = [device_entry(f"New {i}", port) for i, port in enumerate(self.ports[:5])]
+        devices.append(device_entry("Broken", "/dev/does-not-exist"))
+        report = self.pm.bulk_load(self.sim, self.write_project(devices))
+        self.assertTrue(report.rolled_back)
+        self.assertEqual([d.name for d in report.failed], ["Broken"])
+        self.assertTrue(report.failed[0].error)
+        # Previous project is back, with its port open again
+        self.assertEqual(list(self.sim.devices), ["Old"])
+        self.assertIs(self.sim.get_device("Old"), old_device)
+        self.assertEqual(list(self.sim.comm_manager.serial_ports), [self.ports[0]])
+
+    def test_rollback_restores_whole_multidrop_bus(self):
+        settings = {"port": self.ports[0], "baudrate": 9600, "bytesize": 8, "parity": "None", "stopbits": 1.0,
+                    "multidrop": True}
+        group = [device_entry(f"Node {n}", self.ports[0], model="CAS NT-301A", device_id_str=f"{n:02d}",
+                              connection_settings=settings) for n in range(1, 4)]
+        self.assertTrue(self.pm.bulk_load(self.sim, self.write_project(group, "bus.ESPJ")).ok)
+        self.assertEqual(len(self.sim.buses[self.ports[0]].devices), 3)
+
+        broken = [device_entry("New", self.ports[1]), device_entry("Broken", "/dev/does-not-exist")]
+        report = self.pm.bulk_load(self.sim, self.write_project(broken))
+        self.assertTrue(report.rolled_back)
+        self.assertEqual(len(self.sim.buses[self.ports[0]].devices), 3)
+        self.assertTrue(all(self.sim.get_device(f"Node {n}").connected for n in range(1, 4)))
+        self.assertEqual(list(self.sim.comm_manager.serial_ports), [self.ports[0]])
+
+    def test_without_rollback_keeps_working_devices(self):
+        devices = [device_entry("Good", self.ports[0]), device_entry("Broken", "/dev/does-not-exist")]
+        report = self.pm.bulk_load(self.sim, self.write_project(devices), rollback=False)
+        self.assertFalse(report.rolled_back)
+        self.assertEqual(sorted(self.sim.devices), ["Broken", "Good"])
+        self.assertEqual(list(self.sim.comm_manager.serial_ports), [self.ports[0]])
+
+    def test_shared_port_without_rollback_fails_later_device(self):
+        devices = [device_entry("A", self.ports[0]), device_entry("B", self.ports[0]), device_entry("C", self.ports[1])]
+        report = self.pm.bulk_load(self.sim, self.write_project(devices), rollback=False)
+        self.assertEqual(report.errors, [])
+        self.assertEqual([(r.name, r.ok) for r in report.devices], [("A", True), ("B", False), ("C", True)])
+        self.assertEqual(report.devices[1].error, f"port {self.ports[0]} is also used by A")
+        self.assertEqual(sorted(self.sim.comm_manager.serial_ports), sorted(self.ports[:2]))
+
+    def test_tcp_device_listens(self):
+        plc = {"name": "PLC", "model": "Siemens S7-1200", "device_id": "PLC",
+               "connection_settings": {"tcp_port": 0, "host": "127.0.0.1"}, "data_blocks": {"1": 64}}
+        report = self.pm.bulk_load(self.sim, self.write_project([device_entry("Scale", self.ports[0]), plc]))
+        self.assertTrue(report.ok, report.summary())
+        self.assertEqual(sorted(r.port for r in report.devices), sorted(["TCP:0", self.ports[0]]))
+        self.assertIn(0, self.sim.comm_manager.tcp_servers)
+        self.assertEqual(self.sim.get_device("PLC").data_blocks, {"1": 64})
+
+    def test_multidrop_group_shares_port(self):
+        settings = {"port": self.ports[0], "baudrate": 38400, "bytesize": 8, "parity": "None", "stopbits": 1.0,
+                    "multidrop": True}
+        scales = [device_entry(f"Node {n}", self.ports[0], model="CAS NT-301A", device_id_str=f"{n:02d}",
+                               connection_settings=settings, current_weight=float(n)) for n in range(1, 9)]
+        report = self.pm.bulk_load(self.sim, self.write_project(scales))
+        self.assertTrue(report.ok, report.summary())
+        self.assertEqual(list(self.sim.comm_manager.serial_ports), [self.ports[0]])
+        self.assertEqual(len(self.sim.buses[self.ports[0]].devices), 8)
+        master = self.ptys[0][0]
+        os.write(master, b"07 RW\r\n")
+        reply, deadline = b"", time.monotonic() + 2.0
+        while not reply.endswith(b"\r\n") and time.monotonic() < deadline:
+            if select.select([master], [], [], 0.1)[0]:
+                reply += os.read(master, 64)
+        self.assertIn(b"+00007.0", reply)
+        # Without the flag the shared port is rejected
+        settings.pop("multidrop")
+        self.assertFalse(self.pm.bulk_load(self.sim, self.write_project(scales, "plain.ESPJ")).ok)
+
+if __name__ == '__main__':
+    unittest.main()
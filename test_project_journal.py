@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.project_manager import ProjectManager
+from core.project_journal import ProjectAutosaver, ProjectJournal, journal_path, read_journal
+from devices.registry import register_builtin_devices
+
+def new_simulator():
+    sim = Simulator(io_backend="thread")
+    register_builtin_devices(sim)
+    return sim
+
+class TestProjectJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "line.ESPJ")
+        self.sim = new_simulator()
+        for i in range(3):
+            self.sim.create_device("CAS CI-600A", f"Scale {i}", f"S{i}")
+        self.pm = ProjectManager()
+        self.assertTrue(self.pm.save_project(self.sim, self.path))
+
+    def tearDown(self):
+        self.pm.stop_autosave()
+        self.sim.stop()
+        self.tmp.cleanup()
+
+    def reload(self):
+        sim = new_simulator()
+        self.assertTrue(ProjectManager().load_project(sim, self.path))
+        return sim
+
+    def test_save_is_atomic_and_compacts(self):
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["journal_generation"], 1)
+        self.assertTrue(self.pm.save_project(self.sim, self.path))
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["journal_generation"], 2)
+
+    def test_autosave_journals_only_changes(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        self.assertEqual(autosaver.tick(), 0)
+        self.sim.get_device("Scale 1").set_weight(42.0)
+        self.sim.get_device("Scale 2").weight_range = {"min": 0, "max": 50}
+        self.assertEqual(autosaver.tick(), 2)
+        _, records = read_journal(journal_path(self.path))
+        self.assertEqual(records, [
+            {"op": "set", "device": "Scale 1", "state": {"current_weight": 42.0}},
+            {"op": "set", "device": "Scale 2", "state": {"weight_range": {"min": 0, "max": 50}}},
+        ])
+
+    def test_autosave_dumps_only_changed_devices(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        dumps = []
+        for device in self.sim.devices.values():
+            schema = device.STATE_SCHEMA
+            device.STATE_SCHEMA = type("CountingSchema", (), {
+                "dump": lambda _, d, schema=schema: dumps.append(d.name) or schema.dump(d)})()
+        self.assertEqual(autosaver.tick(), 0)
+        for weight in (1.0, 2.0, 3.0):
+            self.sim.get_device("Scale 1").set_weight(weight)
+        self.assertEqual(autosaver.tick(), 1)
+        self.assertEqual(dumps, ["Scale 1"])
+        _, records = read_journal(journal_path(self.path))
+        self.assertEqual(records, [{"op": "set", "device": "Scale 1", "state": {"current_weight": 3.0}}])
+
+    def test_generated_readings_are_not_journaled(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        for i in range(100):
+            self.sim.get_device("Scale 0").set_reading(float(i), i % 2 == 0)
+        self.assertEqual(autosaver.tick(), 0)
+
+    def test_renamed_device_changes_are_journaled(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        self.sim.update_device("Scale 0", "Line 1", "CAS CI-600A")
+        self.sim.get_device("Line 1").set_stable(False)
+        autosaver.tick()
+        _, records = read_journal(journal_path(self.path))
+        self.assertEqual(records, [
+            {"op": "rename", "device": "Scale 0", "to": "Line 1"},
+            {"op": "set", "device": "Line 1", "state": {"is_stable": False}},
+        ])
+        autosaver.stop(flush=False)
+        self.assertIsNone(self.sim.get_device("Line 1").on_state_change)
+
+    def test_unsaved_changes_survive_a_crash(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        self.sim.get_device("Scale 0").set_weight(7.5)
+        self.sim.create_device("CAS NT-301A", "New", "N1")
+        self.sim.update_device("Scale 2", "Renamed", "CAS CI-600A")
+        self.sim.devices.pop("Scale 1")
+        autosaver.tick()
+        # No save_project(): the snapshot on disk is still the original one
+        recovered = self.reload()
+        self.assertEqual(sorted(recovered.devices), ["New", "Renamed", "Scale 0"])
+        self.assertEqual(recovered.get_device("Scale 0").current_weight, 7.5)
+        recovered.stop()
+
+    def test_torn_tail_is_ignored(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path)
+        self.sim.get_device("Scale 0").set_weight(1.25)
+        autosaver.tick()
+        with open(journal_path(self.path), "ab") as f:
+            f.write(b'{"op": "set", "device": "Scale 0", "state": {"current_we')
+        recovered = self.reload()
+        self.assertEqual(recovered.get_device("Scale 0").current_weight, 1.25)
+        recovered.stop()
+
+    def test_stale_journal_is_not_replayed(self):
+        # Crash between writing the new snapshot and restarting the journal
+        journal = ProjectJournal(self.path)
+        journal.reset(0)
+        journal.append([{"op": "remove", "device": "Scale 0"}])
+        journal.close()
+        recovered = self.reload()
+        self.assertIn("Scale 0", recovered.devices)
+        recovered.stop()
+
+    def test_compaction_after_many_records(self):
+        autosaver = ProjectAutosaver(self.pm, self.sim, self.path, compact_after=3)
+        for weight in (1.0, 2.0, 3.0):
+            self.sim.get_device("Scale 0").set_weight(weight)
+            autosaver.tick()
+        generation, records = read_journal(journal_path(self.path))
+        self.assertEqual((generation, records), (2, []))
+        recovered = self.reload()
+        self.assertEqual(recovered.get_device("Scale 0").current_weight, 3.0)
+        recovered.stop()
+
+    def test_start_and_stop_autosave(self):
+        self.pm.start_autosave(self.sim, self.path, interval=60)
+        self.sim.get_device("Scale 0").set_weight(9.0)
+        self.pm.stop_autosave()  # Flushes pending changes
+        recovered = self.reload()
+        self.assertEqual(recovered.get_device("Scale 0").current_weight, 9.0)
+        recovered.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.capture import CaptureWriter, CaptureReader
+from core.replay import Replayer, RecordedDevice
+from devices.scales.cas_ci600a import CasCI600A
+
+POLL = b"01RW\r\n"
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.scap")
+        # Record a session against a real protocol class
+        scale = CasCI600A("Recorded", "01")
+        scale.set_weight(12.5)
+        with CaptureWriter(self.path) as writer:
+            t = 0
+            for command in (POLL, b"01MZ\r\n", POLL):
+                writer.write("COM1", "RX", command, timestamp_ns=t)
+                writer.write("COM1", "TX", scale.handle_data(command), timestamp_ns=t + 1_000_000)
+                t += 20_000_000
+            # Stream output long after the last response
+            writer.write("COM1", "TX", b"unsolicited\r\n", timestamp_ns=t + 1_000_000_000)
+            writer.write("COM9", "RX", POLL, timestamp_ns=t + 1_000_000_001)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_matches_same_state(self):
+        scale = CasCI600A("Replay", "01")
+        scale.set_weight(12.5)
+        with CaptureReader(self.path) as reader:
+            report = Replayer({"COM1": scale}, speed=0).run(reader)
+        self.assertTrue(report.ok, report.mismatches)
+        self.assertEqual((report.requests, report.matched), (3, 3))
+        self.assertEqual(report.unsolicited, 1)
+        self.assertEqual(dict(report.skipped_ports), {"COM9": 1})
+
+    def test_replay_reports_diffs(self):
+        scale = CasCI600A("Replay", "01")
+        scale.set_weight(99.0)
+        with CaptureReader(self.path) as reader:
+            report = Replayer({"COM1": scale}, speed=0).run(reader)
+        self.assertFalse(report.ok)
+        first = report.mismatches[0]
+        self.assertEqual(first.request, POLL)
+        self.assertNotEqual(first.expected, first.actual)
+
+    def test_timing_is_scaled(self):
+        scale = CasCI600A("Replay", "01")
+        with CaptureReader(self.path) as reader:
+            started = time.perf_counter()
+            Replayer({"COM1": scale}, speed=2.0).run(reader)
+            elapsed = time.perf_counter() - started
+        # Requests are 20 ms apart: 40 ms recorded, 20 ms at 2x
+        self.assertGreaterEqual(elapsed, 0.018)
+        self.assertLess(elapsed, 0.5)
+
+    def test_recorded_device_answers_host(self):
+        with CaptureReader(self.path) as reader:
+            device = RecordedDevice("Playback", "01", reader, "COM1", speed=0)
+        self.assertEqual(len(device.exchanges), 3)
+        expected = device.exchanges[0][1]
+        self.assertEqual(device.handle_data(POLL), expected)
+        # A different command than recorded is reported but still answered
+        device.handle_data(b"01RW\r\n")
+        self.assertEqual(device.mismatches, [(b"01MZ\r\n", POLL)])
+
+if __name__ == '__main__':
+    unittest.main()
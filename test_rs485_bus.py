@@ -0,0 +1,149 @@
+import unittest
+import sys
+import os
+import pty
+import time
+import select
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.rs485_bus import RS485Bus, garble, leading_address
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+from devices.scales.cas_nt302a_scale import CasNT302AScale
+
+def make_scale(n, cls=CasNT301AScale):
+    scale = cls(f"Node {n}", f"NODE_{n}")
+    scale.set_device_id_str(f"{n:02d}")
+    scale.set_weight(float(n))
+    return scale
+
+class TestRS485Bus(unittest.TestCase):
+    def setUp(self):
+        self.bus = RS485Bus("BUS")
+        self.bus.configure_line(115200)
+        self.sent = []
+        self.bus.output = self.sent.append
+        self.scales = [make_scale(n) for n in range(1, 33)]
+        for scale in self.scales:
+            self.bus.attach(scale)
+
+    def tearDown(self):
+        self.bus.close()
+
+    def poll(self, command, timeout=1.0):
+        """Send a command and return everything the bus answers with."""
+        immediate = self.bus.handle_data(command)
+        deadline = time.monotonic() + timeout
+        while immediate is None and not self.sent and time.monotonic() < deadline:
+            time.sleep(0.001)
+        time.sleep(0.005)
+        return (immediate or b"") + b"".join(self.sent)
+
+    def test_leading_address(self):
+        self.assertEqual(leading_address(b"07 RW\r\n"), "07")
+        self.assertEqual(leading_address(b"\x0212RCWT\x03"), "12")
+        self.assertIsNone(leading_address(b"\x021"))
+
+    def test_dispatch_by_address(self):
+        self.assertIn(b"+00017.0", self.poll(b"17 RW\r\n"))
+        self.assertEqual(self.bus.devices_at("17"), [self.scales[16]])
+        self.assertEqual(self.bus.stats()["responses"], 1)
+
+    def test_unknown_address_is_silent(self):
+        self.assertEqual(self.poll(b"99 RW\r\n", timeout=0.05), b"")
+        self.assertEqual(self.bus.unanswered, 1)
+
+    def test_duplicate_address_garbles(self):
+        twin = make_scale(5)
+        twin.set_weight(123.4)
+        self.bus.attach(twin)
+        reply = self.poll(b"05 RW\r\n")
+        self.assertEqual(self.bus.conflicts, 1)
+        self.assertEqual(reply, garble([self.scales[4].current_frame(), twin.current_frame()]))
+        self.assertNotIn(reply, (self.scales[4].current_frame(), twin.current_frame()))
+
+    def test_reindex_after_id_change(self):
+        self.scales[0].set_device_id_str("40")
+        self.bus.reindex()
+        self.assertEqual(self.poll(b"01 RW\r\n", timeout=0.05), b"")
+        self.assertIn(b"+00001.0", self.poll(b"40 RW\r\n"))
+
+    def test_id_change_reaches_the_bus(self):
+        self.scales[1].set_device_id_str("41")
+        self.assertEqual(self.poll(b"02 RW\r\n", timeout=0.05), b"")
+        self.assertIn(b"+00002.0", self.poll(b"41 RW\r\n"))
+        self.bus.detach(self.scales[1])
+        self.assertIsNone(self.scales[1].bus)
+        self.scales[1].set_device_id_str("02")
+        self.assertEqual(self.bus.devices_at("02"), [])
+
+    def test_turnaround_delays_answer(self):
+        self.bus.detach(self.scales[2])
+        self.bus.attach(self.scales[2], turnaround=0.05)
+        t0 = time.monotonic()
+        self.assertIsNone(self.bus.handle_data(b"03 RW\r\n"))
+        while not self.sent and time.monotonic() - t0 < 1.0:
+            time.sleep(0.001)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.05)
+        self.assertIn(b"+00003.0", self.sent[0])
+
+    def test_master_talking_over_answer_collides(self):
+        self.bus.turnaround = 0.05
+        self.assertIsNone(self.bus.handle_data(b"01 RW\r\n"))
+        # The master does not wait for node 01's answer
+        self.assertIsNone(self.bus.handle_data(b"02 RW\r\n"))
+        time.sleep(0.1)
+        self.assertEqual(self.bus.line_collisions, 1)
+        self.assertEqual(len(self.sent), 1)
+        self.assertIn(b"+00001.0", self.sent[0])
+
+    def test_answers_never_overlap(self):
+        # Two commands in one chunk: the second answer waits for the first to finish
+        self.bus.configure_line(9600)
+        t0 = time.monotonic()
+        self.bus.handle_data(b"01 RW\r\n02 RW\r\n")
+        while len(self.sent) < 2 and time.monotonic() - t0 < 1.0:
+            time.sleep(0.001)
+        frame_time = len(self.scales[0].current_frame()) * 10 / 9600
+        self.assertGreaterEqual(time.monotonic() - t0, 2 * frame_time)
+        self.assertEqual(len(self.sent), 2)
+
+@unittest.skipUnless(os.name == "posix", "needs pty")
+class TestRS485BusSerial(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator(io_backend="reactor")
+        self.master, self.slave = pty.openpty()
+        self.port = os.ttyname(self.slave)
+
+    def tearDown(self):
+        self.sim.stop()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def request(self, command):
+        os.write(self.master, command)
+        reply, deadline = b"", time.monotonic() + 2.0
+        while not reply.endswith(b"\r\n") and time.monotonic() < deadline:
+            if select.select([self.master], [], [], 0.1)[0]:
+                reply += os.read(self.master, 64)
+        return reply
+
+    def test_32_nodes_on_one_port(self):
+        names = []
+        for n in range(1, 33):
+            scale = make_scale(n, CasNT302AScale if n % 2 else CasNT301AScale)
+            self.sim.add_device(scale)
+            names.append(scale.name)
+        self.assertTrue(self.sim.start_bus(self.port, names, baudrate=115200))
+        self.assertEqual(list(self.sim.comm_manager.serial_ports), [self.port])
+        for n in (1, 2, 31, 32):
+            self.assertIn(f"+000{n:02d}.0".encode(), self.request(f"{n:02d} RW\r\n".encode()))
+        bus = self.sim.buses[self.port]
+        self.assertEqual(bus.stats()["responses"], 4)
+        self.sim.stop_device_comm_by_port(self.port)
+        self.assertEqual(self.sim.buses, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import sys
+import os
+import socket
+import struct
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.plc.memory import MemoryArea
+from devices.plc.s7_plc import (
+    S7PLC, AREA_DB, AREA_M, AREA_I, AREA_Q, RC_OK, RC_ADDRESS, RC_NO_OBJECT,
+    build_connect_request, build_setup_request, build_read_request, build_write_request,
+    build_bit_request, parse_read_response, ACK_HEADER,
+)
+
+class TpktReader:
+    def __init__(self, sock, timeout=1.0):
+        self.sock = sock
+        self.sock.settimeout(timeout)
+        self.buf = b""
+
+    def next(self):
+        while len(self.buf) < 4 or len(self.buf) < struct.unpack_from(">H", self.buf, 2)[0]:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                break
+            self.buf += chunk
+        size = struct.unpack_from(">H", self.buf, 2)[0]
+        frame, self.buf = self.buf[:size], self.buf[size:]
+        return frame
+
+class TestMemoryArea(unittest.TestCase):
+    def test_typed_access_and_views(self):
+        area = MemoryArea("DB1", 16)
+        area.set_int(0, -2)
+        area.set_real(2, 1.5)
+        area.set_bit(6, 3, True)
+        self.assertEqual(area.get_int(0), -2)
+        self.assertEqual(area.get_real(2), 1.5)
+        self.assertTrue(area.get_bit(6, 3))
+        view = area.read(0, 2)
+        area.set_int(0, 7)
+        self.assertEqual(bytes(view), b"\x00\x07")  # A view, not a copy
+        with self.assertRaises(IndexError):
+            area.read(10, 8)
+
+    def test_little_endian(self):
+        area = MemoryArea("D", 4, byteorder="little")
+        area.set_word(0, 0x1234)
+        self.assertEqual(bytes(area.data[:2]), b"\x34\x12")
+
+class TestS7PLC(unittest.TestCase):
+    def setUp(self):
+        self.plc = S7PLC("PLC", "PLC_01", pdu_size=480, data_blocks={1: 256, 2: 16})
+
+    def test_connection_confirm(self):
+        cc = self.plc.process_command(build_connect_request(rack=0, slot=1))
+        self.assertEqual(cc[0], 3)
+        self.assertEqual(struct.unpack_from(">H", cc, 2)[0], len(cc))
+        self.assertEqual(cc[5], 0xD0)
+        self.assertEqual(cc[8:10], b"\x00\x01")  # Our source ref becomes the destination ref
+        self.assertIn(b"\xc2\x02\x01\x01", cc)  # TSAPs echoed
+
+    def test_setup_negotiates_pdu(self):
+        ack = self.plc.process_command(build_setup_request(960))
+        self.assertEqual(struct.unpack_from(">H", ack, len(ack) - 2)[0], 480)
+        self.assertEqual(self.plc.negotiated_pdu, 480)
+        ack = self.plc.process_command(build_setup_request(240))
+        self.assertEqual(struct.unpack_from(">H", ack, len(ack) - 2)[0], 240)
+
+    def test_multi_item_read(self):
+        db1 = self.plc.db(1)
+        db1.set_real(0, 12.5)
+        db1.set_int(4, -100)
+        self.plc.flags.set_byte(10, 0x5A)
+        self.plc.inputs.set_word(0, 0xBEEF)
+        request = build_read_request([(AREA_DB, 1, 0, 4), (AREA_DB, 1, 4, 2), (AREA_M, 0, 10, 1),
+                                      (AREA_I, 0, 0, 2), (AREA_Q, 0, 0, 3)], pdu_ref=7)
+        ack = self.plc.process_command(request)
+        self.assertEqual(struct.unpack_from(">H", ack, 2)[0], len(ack))
+        header = ACK_HEADER.unpack_from(ack, 7)
+        self.assertEqual((header[1], header[3], header[6], header[7]), (3, 7, 0, 0))
+        items = parse_read_response(ack)
+        self.assertEqual([rc for rc, _ in items], [RC_OK] * 5)
+        self.assertEqual(struct.unpack(">f", items[0][1])[0], 12.5)
+        self.assertEqual(struct.unpack(">h", items[1][1])[0], -100)
+        self.assertEqual(items[2][1], b"\x5a")
+        self.assertEqual(items[3][1], b"\xbe\xef")
+        self.assertEqual(items[4][1], b"\x00\x00\x00")
+
+    def test_read_errors_per_item(self):
+        ack = self.plc.process_command(build_read_request([(AREA_DB, 2, 14, 4), (AREA_DB, 9, 0, 1), (AREA_DB, 1, 0, 2)]))
+        items = parse_read_response(ack)
+        self.assertEqual([rc for rc, _ in items], [RC_ADDRESS, RC_NO_OBJECT, RC_OK])
+
+    def test_write_then_read(self):
+        ack = self.plc.process_command(build_write_request([(AREA_DB, 1, 100, b"\x01\x02\x03"),
+                                                           (AREA_M, 0, 0, b"\xff\xee"),
+                                                           (AREA_DB, 2, 15, b"\x00\x00")]))
+        self.assertEqual(ack[-3:], bytes((RC_OK, RC_OK, RC_ADDRESS)))
+        self.assertEqual(bytes(self.plc.db(1).data[100:103]), b"\x01\x02\x03")
+        self.assertEqual(self.plc.flags.get_word(0), 0xFFEE)
+        self.assertEqual(self.plc.writes, 1)
+
+    def test_bit_access(self):
+        ack = self.plc.process_command(build_bit_request(AREA_Q, 0, 2, 5, True))
+        self.assertEqual(ack[-1], RC_OK)
+        self.assertEqual(self.plc.outputs.get_byte(2), 0x20)
+        items = parse_read_response(self.plc.process_command(build_bit_request(AREA_Q, 0, 2, 5)))
+        self.assertEqual(items, [(RC_OK, b"\x01")])
+        items = parse_read_response(self.plc.process_command(build_bit_request(AREA_Q, 0, 2, 4)))
+        self.assertEqual(items, [(RC_OK, b"\x00")])
+
+    def test_oversized_jobs_are_refused(self):
+        self.plc.process_command(build_setup_request(240))
+        # The answer (12 + 2 + 4 + 230 bytes) would not fit into 240
+        ack = self.plc.process_command(build_read_request([(AREA_DB, 1, 0, 230)]))
+        header = ACK_HEADER.unpack_from(ack, 7)
+        self.assertEqual((header[6], header[7]), (0x85, 0x00))
+        self.assertEqual(self.plc.reads, 0)
+        # The request itself: 20 items of 12 bytes
+        ack = self.plc.process_command(build_read_request([(AREA_DB, 1, i, 1) for i in range(20)]))
+        self.assertEqual(ACK_HEADER.unpack_from(ack, 7)[6:], (0x85, 0x00))
+        ack = self.plc.process_command(build_write_request([(AREA_DB, 1, 0, bytes(230))]))
+        self.assertEqual(ACK_HEADER.unpack_from(ack, 7)[6:], (0x85, 0x00))
+        self.assertEqual(self.plc.writes, 0)
+        self.assertEqual(len(parse_read_response(self.plc.process_command(
+            build_read_request([(AREA_DB, 1, 0, 200)])))[0][1]), 200)
+
+    def test_unknown_function_reports_error(self):
+        request = bytearray(build_setup_request())
+        request[17] = 0x1D  # Function: start upload
+        ack = self.plc.process_command(bytes(request))
+        header = ACK_HEADER.unpack_from(ack, 7)
+        self.assertEqual((header[6], header[7]), (0x81, 0x04))
+
+    def test_data_blocks_round_trip_schema(self):
+        self.plc.db(2).set_byte(0, 9)
+        state = S7PLC.STATE_SCHEMA.dump(self.plc)
+        self.assertEqual(state["data_blocks"], {"1": 256, "2": 16})
+        self.assertEqual(S7PLC.STATE_SCHEMA.validate(state), [])
+        state["data_blocks"] = {"2": 16, "5": 64}
+        S7PLC.STATE_SCHEMA.load(self.plc, state)
+        self.assertEqual(sorted(self.plc.dbs), [2, 5])
+        self.assertEqual(self.plc.db(2).get_byte(0), 9)  # Same size keeps the contents
+
+class TestS7OverTcp(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator(io_backend="thread")
+        self.plc = S7PLC("PLC", "PLC_01")
+        self.sim.add_device(self.plc)
+        self.assertTrue(self.sim.start_device_tcp("PLC", 0, host="127.0.0.1"))
+        port = self.sim.comm_manager.tcp_servers[0].bound_port
+        self.client = socket.create_connection(("127.0.0.1", port), timeout=1.0)
+        self.reader = TpktReader(self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.sim.stop()
+
+    def test_session(self):
+        self.plc.db(1).set_dint(8, 123456)
+        self.client.sendall(build_connect_request())
+        self.assertEqual(self.reader.next()[5], 0xD0)
+        self.client.sendall(build_setup_request(480))
+        self.reader.next()
+        # Two requests in one segment are framed by the TPKT length
+        self.client.sendall(build_write_request([(AREA_DB, 1, 0, b"\x11\x22")], pdu_ref=2) +
+                            build_read_request([(AREA_DB, 1, 0, 2), (AREA_DB, 1, 8, 4)], pdu_ref=3))
+        self.reader.next()
+        items = parse_read_response(self.reader.next())
+        self.assertEqual(items, [(RC_OK, b"\x11\x22"), (RC_OK, (123456).to_bytes(4, "big"))])
+
+    def test_pdu_is_negotiated_per_connection(self):
+        port = self.sim.comm_manager.tcp_servers[0].bound_port
+        small = socket.create_connection(("127.0.0.1", port), timeout=1.0)
+        try:
+            small_reader = TpktReader(small)
+            for client, reader, pdu in ((self.client, self.reader, 960), (small, small_reader, 240)):
+                client.sendall(build_connect_request())
+                reader.next()
+                client.sendall(build_setup_request(pdu))
+                reader.next()
+            request = build_read_request([(AREA_DB, 1, 0, 300)])
+            small.sendall(request)
+            self.assertEqual(ACK_HEADER.unpack_from(small_reader.next(), 7)[6:], (0x85, 0x00))
+            # The other client negotiated 480 (the PLC's limit) and still gets its answer
+            self.client.sendall(request)
+            self.assertEqual(parse_read_response(self.reader.next()), [(RC_OK, bytes(300))])
+        finally:
+            small.close()
+
+if __name__ == '__main__':
+    unittest.main()
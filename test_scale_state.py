@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from devices.scales.scale_state import ScaleState
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+from devices.scales.and_ad4401_scale import ANDAD4401Scale
+
+class TestScaleState(unittest.TestCase):
+    def test_immutable(self):
+        state = ScaleState(weight=1.0)
+        with self.assertRaises(AttributeError):
+            state.weight = 2.0
+        with self.assertRaises(AttributeError):
+            state.extra = 1
+
+    def test_replace_bumps_version(self):
+        state = ScaleState(weight=1.0, tare=0.5)
+        new = state.replace(weight=3.0)
+        self.assertEqual((new.weight, new.tare, new.version), (3.0, 0.5, 1))
+        self.assertEqual(state.weight, 1.0)
+        self.assertEqual(new.net_weight, 2.5)
+
+class TestScaleSnapshots(unittest.TestCase):
+    def test_mutators_publish_new_snapshot(self):
+        scale = CasNT301AScale("NT", "NT_01")
+        before = scale.state
+        scale.set_weight(10.0)
+        self.assertIsNot(scale.state, before)
+        self.assertEqual(before.weight, 0.0)
+        self.assertEqual(scale.current_weight, 10.0)
+
+    def test_tare_and_zero_are_single_updates(self):
+        scale = CasNT301AScale("NT", "NT_01")
+        scale.set_weight(10.0)
+        version = scale.state.version
+        scale.tare()
+        self.assertEqual((scale.state.tare, scale.state.version), (10.0, version + 1))
+        scale.zero()
+        self.assertEqual((scale.state.weight, scale.state.tare, scale.state.version), (0.0, 0.0, version + 2))
+
+    def test_ad4401_mode_lives_in_snapshot(self):
+        scale = ANDAD4401Scale("AD", "AD_01")
+        scale.set_weight(8.0)
+        scale.process_command(b"MT")
+        self.assertEqual(scale.mode, "NET")
+        self.assertEqual(scale.state.tare, 8.0)
+        scale.process_command(b"CT")
+        self.assertEqual((scale.mode, scale.state.tare), ("GROSS", 0.0))
+
+    def test_readers_never_see_torn_updates(self):
+        scale = CasNT301AScale("NT", "NT_01")
+        scale.logger.disabled = True
+        stop = threading.Event()
+        torn = []
+        scale._publish(weight=10.0, tare=0.0)
+
+        def writer():
+            w = 0.0
+            while not stop.is_set():
+                w += 1.0
+                # Net stays 10.0 in every published snapshot
+                scale._publish(weight=w + 10.0, tare=w)
+
+        def reader():
+            for _ in range(20000):
+                frame = scale.current_frame()
+                if b"+00010.0" not in frame:
+                    torn.append(frame)
+
+        t = threading.Thread(target=writer)
+        t.start()
+        try:
+            reader()
+        finally:
+            stop.set()
+            t.join()
+        self.assertEqual(torn, [])
+
+if __name__ == '__main__':
+    unittest.main()
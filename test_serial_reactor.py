@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import time
+import select
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.comm_manager import CommManager
+from core.serial_reactor import SerialReactor
+from devices.scales.cas_ci600a import CasCI600A
+
+def read_until(fd, terminator=b"\r\n", timeout=1.0):
+    buf = b""
+    deadline = time.time() + timeout
+    while terminator not in buf and time.time() < deadline:
+        ready, _, _ = select.select([fd], [], [], 0.05)
+        if ready:
+            buf += os.read(fd, 1024)
+    return buf
+
+@unittest.skipUnless(SerialReactor.is_supported(), "pty pairs need POSIX")
+class TestSerialReactor(unittest.TestCase):
+    def setUp(self):
+        import pty
+        self.comm = CommManager(io_backend="reactor")
+        self.pairs = []
+        for _ in range(3):
+            master, slave = pty.openpty()
+            self.pairs.append((master, slave, os.ttyname(slave)))
+
+    def tearDown(self):
+        self.comm.stop_all()
+        for master, slave, _ in self.pairs:
+            os.close(master)
+            os.close(slave)
+
+    def _start(self, index, weight):
+        scale = CasCI600A(f"Scale {index}", f"SCALE_{index}")
+        scale.set_weight(weight)
+        path = self.pairs[index][2]
+        self.assertTrue(self.comm.start_serial(path, 9600, 8, 'N', 1, scale.process_command))
+        return path
+
+    def test_single_reactor_thread_serves_all_ports(self):
+        before = threading.active_count()
+        for i in range(3):
+            self._start(i, 100.0 + i)
+        # One reactor thread for all ports, not one per port
+        self.assertEqual(threading.active_count(), before + 1)
+
+        for i in range(3):
+            master = self.pairs[i][0]
+            os.write(master, b"01RW\r\n")
+            resp = read_until(master)
+            self.assertIn(f"{100.0 + i:8.1f}".encode('ascii'), resp)
+
+    def test_monitors_see_rx_and_tx(self):
+        events = []
+        self.comm.add_monitor(lambda port, direction, data: events.append((direction, data)))
+        self._start(0, 5.0)
+        master = self.pairs[0][0]
+        os.write(master, b"01RW\r\n")
+        read_until(master)
+        # TX is reported right after the write, so it may land just after the reply
+        deadline = time.time() + 1.0
+        while len(events) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(events[0], ("RX", b"01RW\r\n"))
+        self.assertEqual(events[1][0], "TX")
+
+    def test_stop_serial_unregisters_port(self):
+        path = self._start(0, 1.0)
+        self.assertTrue(self.comm._reactor.is_registered(path))
+        self.assertTrue(self.comm.stop_serial(path))
+        self.assertFalse(self.comm._reactor.is_registered(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import time
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.signal_engine import SignalEngine, SignalProfile, filling, bag_drops, truck, mixer, np
+from devices.scales.cas_ci600a import CasCI600A
+
+def run(engine, scale, ticks):
+    readings = []
+    for _ in range(ticks):
+        engine.tick()
+        readings.append((scale.current_weight, scale.is_stable))
+    return readings
+
+class TestSignalEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = SignalEngine(rate=10.0, block=16, seed=7, use_numpy=False)
+        self.scale = CasCI600A("Scale", "SCALE_01")
+
+    def test_profile_load(self):
+        profile = SignalProfile([(0, 0), (2, 100), (4, 100), (4, 150)])
+        self.assertEqual(profile.load_at(1.0), 50.0)
+        self.assertEqual(profile.load_at(4.0), 150.0)
+        self.assertEqual(profile.load_at(9.0), 150.0)
+        self.assertEqual(profile.steps, [(4.0, 50.0)])
+        with self.assertRaises(ValueError):
+            SignalProfile([(2, 0), (1, 5)])
+
+    def test_filling_cycle_and_stability(self):
+        self.engine.add(self.scale, filling(500.0, duration=4.0, hold=3.0, discharge=2.0, noise=0.0, division=0.5))
+        readings = run(self.engine, self.scale, 150)
+        self.assertEqual(readings[20], (250.0, False))  # Filling
+        self.assertEqual(readings[40], (500.0, False))  # Just full, still within the motion window
+        self.assertEqual(readings[60], (500.0, True))   # Holding
+        self.assertEqual(readings[80], (250.0, False))  # Discharging
+        self.assertEqual(readings[110], (0.0, True))
+        self.assertEqual(readings[120 + 20], readings[20])  # Next batch (12 s cycle)
+        self.assertEqual(max(w for w, _ in readings), 500.0)
+
+    def test_truck_settles_and_creeps(self):
+        self.engine.add(self.scale, truck(20000.0, arrive=1.0, axle_gap=1.0, dwell=60.0, noise=0.0, division=10))
+        readings = run(self.engine, self.scale, 600)
+        self.assertGreater(max(w for w, _ in readings[30:40]), 20000.0)  # Overshoot after the rear axle
+        self.assertEqual(readings[100], (20000.0, True))
+        self.assertEqual(readings[590], (20020.0, True))                  # Creep
+        self.assertTrue(all(isinstance(w, float) for w, _ in readings))
+
+    def test_bag_drops_step_by_bag(self):
+        self.engine.add(self.scale, bag_drops(25.0, count=3, interval=5.0, settle=0.0, noise=0.0))
+        readings = run(self.engine, self.scale, 210)
+        self.assertEqual([readings[n][0] for n in (49, 50, 100, 150, 199, 200)], [0.0, 25.0, 50.0, 75.0, 75.0, 0.0])
+
+    def test_mixer_vibration_is_never_stable(self):
+        self.engine.add(self.scale, mixer(1200.0, amplitude=3.0, hz=1.3, division=0.5))
+        readings = run(self.engine, self.scale, 100)
+        self.assertFalse(any(stable for _, stable in readings[10:]))
+        self.assertAlmostEqual(sum(w for w, _ in readings) / len(readings), 1200.0, delta=1.0)
+
+    def test_publishes_only_changes(self):
+        self.engine.add(self.scale, SignalProfile([(0, 42.0)]))
+        version = self.scale.state.version
+        run(self.engine, self.scale, 50)
+        self.assertEqual(self.engine.publishes, 1)
+        self.assertEqual(self.scale.state.version, version + 1)
+        self.assertEqual(self.engine.stats()["blocks"], 4)
+
+    def test_add_and_remove_mid_block(self):
+        other = CasCI600A("Other", "SCALE_02")
+        self.engine.add(self.scale, SignalProfile([(0, 0), (10, 100)]))
+        run(self.engine, self.scale, 5)
+        self.engine.add(other, SignalProfile([(0, 7.0)]))
+        run(self.engine, self.scale, 5)
+        self.assertEqual(self.scale.current_weight, 9.0)
+        self.assertEqual(other.current_weight, 7.0)
+        self.assertTrue(self.engine.remove(self.scale))
+        run(self.engine, other, 5)
+        self.assertEqual(self.scale.current_weight, 9.0)
+        self.assertEqual(len(self.engine), 1)
+
+    @unittest.skipIf(np is None, "needs numpy")
+    def test_numpy_matches_python(self):
+        profiles = [truck(15000.0, division=5, noise=0.0), filling(800.0, 6.0, noise=0.0),
+                    bag_drops(20.0, 4, 2.0, noise=0.0, creep=0.01), SignalProfile([(0, 3.0)], drift=0.01)]
+        results = []
+        for use_numpy in (False, True):
+            engine = SignalEngine(rate=20.0, block=32, seed=3, use_numpy=use_numpy)
+            scales = [CasCI600A(f"S{n}", f"S{n}") for n in range(len(profiles))]
+            for scale, profile in zip(scales, profiles):
+                engine.add(scale, profile)
+            readings = []
+            for _ in range(1000):
+                engine.tick()
+                readings.append([(s.current_weight, s.is_stable) for s in scales])
+            results.append(readings)
+        for python_row, numpy_row in zip(*results):
+            for (pw, ps), (nw, ns) in zip(python_row, numpy_row):
+                self.assertAlmostEqual(pw, nw, places=6)
+                self.assertEqual(ps, ns)
+
+    def test_simulator_does_not_load_engine_until_used(self):
+        code = ("import sys; from core.simulator import Simulator; Simulator('thread'); "
+                "print(sorted(m for m in sys.modules if m in ('numpy', 'core.signal_engine')))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_simulator_drives_scale(self):
+        sim = Simulator(io_backend="thread")
+        sim.add_device(self.scale)
+        try:
+            self.assertTrue(sim.start_signal("Scale", SignalProfile([(0, 0), (1, 100)])))
+            time.sleep(0.3)
+            self.assertGreater(self.scale.current_weight, 0.0)
+            self.assertTrue(sim.stop_signal("Scale"))
+            weight = self.scale.current_weight
+            time.sleep(0.1)
+            self.assertEqual(self.scale.current_weight, weight)
+        finally:
+            sim.stop()
+        self.assertFalse(sim.signal_engine.running)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import glob
+import json
+import time
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.project_manager import ProjectManager
+from core.state_schema import StateSchema, Field, migrate_project, PROJECT_FORMAT_VERSION
+from devices.registry import register_builtin_devices
+from devices.scales.base_scale import BaseScale
+from devices.scales.cas_nt301a_scale import CasNT301AScale
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+class TestStateSchema(unittest.TestCase):
+    def test_field_checks(self):
+        weight = Field("current_weight", float)
+        self.assertIsNone(weight.check(1))
+        self.assertIsNone(weight.check(1.5))
+        self.assertIsNotNone(weight.check(True))
+        self.assertIsNotNone(weight.check("1.5"))
+        self.assertIsNotNone(Field("use_bcc", bool).check(1))
+        mode = Field("print_mode", str, choices=("Command", "Stream"))
+        self.assertIn("not one of", mode.check("Burst"))
+        self.assertIsNone(Field("current_format", str, nullable=True).check(None))
+
+    def test_extend_replaces_in_place(self):
+        base = StateSchema(Field("a", int), Field("b", int))
+        child = base.extend(Field("a", float), Field("c", str))
+        self.assertEqual(child.names, ["a", "b", "c"])
+        self.assertIsNotNone(base.fields[0].check(1.5))
+        self.assertIsNone(child.fields[0].check(1.5))
+
+    def test_subclass_round_trip(self):
+        scale = CasNT301AScale("NT", "01")
+        scale.set_weight(42.5)
+        scale.set_format("Format 2")
+        scale.set_command_mode("Complex")
+        scale.set_use_bcc(False)
+        state = scale.STATE_SCHEMA.dump(scale)
+        self.assertEqual(state["command_mode"], "Complex")
+        self.assertNotIn("_use_bcc", state)
+
+        restored = CasNT301AScale("NT", "01")
+        restored.STATE_SCHEMA.load(restored, json.loads(json.dumps(state)))
+        self.assertEqual(restored.STATE_SCHEMA.dump(restored), state)
+        self.assertIn(b"42.5", restored.current_frame())
+        # Base scales do not carry the NT-301A fields
+        self.assertNotIn("command_mode", BaseScale.STATE_SCHEMA.names)
+
+    def test_migrates_flat_1_0_entries(self):
+        project = {"version": "1.0", "devices": [{
+            "name": "A", "model": "CAS NT-301A", "device_id": "A",
+            "connection_settings": {"port": "COM1", "parity": "Even"},
+            "current_weight": 3.0, "command_mode": "Complex", "use_bcc": False}]}
+        migrated = migrate_project(project)
+        self.assertEqual(migrated["version"], PROJECT_FORMAT_VERSION)
+        device = migrated["devices"][0]
+        self.assertEqual(set(device), {"name", "model", "device_id", "state"})
+        self.assertEqual(device["state"]["connection_settings"]["parity"], "E")
+        self.assertEqual(device["state"]["command_mode"], "Complex")
+        with self.assertRaises(ValueError):
+            migrate_project({"version": "0.1", "devices": []})
+
+class TestSchemaProjects(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sim = Simulator(io_backend="thread")
+        register_builtin_devices(self.sim)
+        self.pm = ProjectManager()
+
+    def tearDown(self):
+        self.sim.stop()
+        self.tmp.cleanup()
+
+    def test_shipped_1_0_projects_still_load(self):
+        for path in glob.glob(os.path.join(ROOT, "*.ESPJ")):
+            report = self.pm.bulk_load(self.sim, path, start_comm=False)
+            self.assertTrue(report.ok, (path, report.errors))
+            self.assertTrue(self.sim.devices)
+
+    def test_validation_uses_model_schema(self):
+        path = os.path.join(self.tmp.name, "bad.ESPJ")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": PROJECT_FORMAT_VERSION, "devices": [
+                {"name": "A", "model": "CAS NT-301A", "device_id": "A",
+                 "state": {"print_mode": "Burst", "use_bcc": "yes"}}]}, f)
+        report = self.pm.bulk_load(self.sim, path, start_comm=False)
+        self.assertEqual(len(report.errors), 2)
+        self.assertEqual(self.sim.devices, {})
+
+    def test_thousands_of_devices_round_trip(self):
+        models = ["CAS CI-600A", "CAS NT-301A", "AND GP Series", "Sartorius BP"]
+        for i in range(2000):
+            self.sim.create_device(models[i % len(models)], f"Scale {i}", f"S{i}")
+            self.sim.get_device(f"Scale {i}").set_weight(i / 10)
+        path = os.path.join(self.tmp.name, "generated.ESPJ")
+        started = time.perf_counter()
+        self.assertTrue(self.pm.save_project(self.sim, path))
+        loaded = Simulator(io_backend="thread")
+        register_builtin_devices(loaded)
+        report = self.pm.bulk_load(loaded, path, start_comm=False)
+        elapsed = time.perf_counter() - started
+        self.assertTrue(report.ok, report.errors[:3])
+        self.assertEqual(len(loaded.devices), 2000)
+        self.assertEqual(loaded.get_device("Scale 1999").current_weight, 199.9)
+        self.assertLess(elapsed, 10.0)
+        loaded.stop()
+
+if __name__ == '__main__':
+    unittest.main()
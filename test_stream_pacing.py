@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.project_manager import ProjectManager
+from devices.scales.cas_ci600a import CasCI600A
+
+class TestStreamPacing(unittest.TestCase):
+    def setUp(self):
+        self.scale = CasCI600A("Scale", "SCALE_01")
+        self.scale.set_format("Format 1") # 22 byte frame
+
+    def test_line_capacity_from_serial_settings(self):
+        self.scale.connection_settings.update({"baudrate": 2400, "bytesize": 8, "parity": "N", "stopbits": 1})
+        # 22 bytes * 10 bits = 220 bits per frame
+        self.assertAlmostEqual(self.scale.max_stream_rate(), 2400 / 220, places=3)
+
+        self.scale.connection_settings.update({"bytesize": 7, "parity": "E", "stopbits": 2})
+        # 1 start + 7 data + 1 parity + 2 stop = 11 bits per char
+        self.assertAlmostEqual(self.scale.max_stream_rate(), 2400 / 242, places=3)
+
+    def test_effective_rate_is_capped(self):
+        self.scale.connection_settings["baudrate"] = 2400
+        self.scale.set_stream_rate(50)
+        self.assertEqual(self.scale.stream_rate, 50)
+        self.assertLess(self.scale.effective_stream_rate(), 11)
+
+        self.scale.connection_settings["baudrate"] = 115200
+        self.assertEqual(self.scale.effective_stream_rate(), 50)
+
+    def test_rate_survives_restart(self):
+        # Changing the rate re-arms a running stream; the new rate must stick
+        self.scale.start_streaming()
+        try:
+            self.scale.set_stream_rate(20)
+        finally:
+            self.scale.stop_streaming()
+        self.assertEqual(self.scale.stream_rate, 20)
+        self.assertAlmostEqual(self.scale._stream_interval, 1 / 20)
+
+    def test_saturated_line_drops_frames(self):
+        self.scale.connection_settings["baudrate"] = 2400
+        frames = []
+        self.scale.on_output = frames.append
+        # Three ticks back to back: one on the wire, one queued, the third overruns
+        for _ in range(3):
+            self.scale._stream_tick()
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(self.scale.stream_stats["sent"], 2)
+        self.assertEqual(self.scale.stream_stats["dropped"], 1)
+
+    def test_stream_rate_saved_in_project(self):
+        sim = Simulator(io_backend="thread")
+        sim.register_device_type("CAS CI-600A", CasCI600A)
+        sim.create_device("CAS CI-600A", "Scale", "SCALE_01")
+        sim.get_device("Scale").set_stream_rate(25)
+
+        path = os.path.join(tempfile.mkdtemp(), "rate.ESPJ")
+        pm = ProjectManager()
+        self.assertTrue(pm.save_project(sim, path))
+
+        loaded = Simulator(io_backend="thread")
+        loaded.register_device_type("CAS CI-600A", CasCI600A)
+        self.assertTrue(pm.load_project(loaded, path))
+        self.assertEqual(loaded.get_device("Scale").stream_rate, 25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from core.stream_scheduler import StreamScheduler
+from devices.scales.cas_ci600a import CasCI600A
+
+class TestStreamScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = StreamScheduler()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_rate_is_drift_corrected(self):
+        calls = []
+        task = self.scheduler.add_periodic(0.02, lambda: calls.append(time.monotonic()))
+        start = task.deadline - 0.02
+        time.sleep(1.0)
+        task.cancel()
+        # 50 Hz for one second: deadlines advance from the previous deadline, so no drift
+        self.assertAlmostEqual(len(calls), 50, delta=2)
+        self.assertAlmostEqual(task.deadline - start, 0.02 * (task.ticks + task.missed + 1), places=6)
+
+    def test_cancel_stops_calls(self):
+        calls = []
+        task = self.scheduler.add_periodic(0.01, lambda: calls.append(1))
+        time.sleep(0.1)
+        task.cancel()
+        count = len(calls)
+        time.sleep(0.1)
+        self.assertLessEqual(len(calls), count + 1)
+
+    def test_slow_task_skips_missed_ticks(self):
+        task = self.scheduler.add_periodic(0.01, lambda: time.sleep(0.035))
+        time.sleep(0.5)
+        task.cancel()
+        self.assertGreater(task.missed, 0)
+        # Ticks are skipped, not replayed in a burst
+        self.assertLess(task.ticks, 20)
+
+    def test_single_thread_for_many_tasks(self):
+        before = threading.active_count()
+        tasks = [self.scheduler.add_periodic(0.05, lambda: None) for _ in range(100)]
+        self.assertEqual(threading.active_count(), before + 1)
+        self.assertEqual(self.scheduler.task_count(), 100)
+        for task in tasks:
+            task.cancel()
+
+class TestSimulatorStreaming(unittest.TestCase):
+    def test_simulator_scales_share_scheduler(self):
+        sim = Simulator(io_backend="thread")
+        try:
+            frames = []
+            for i in range(5):
+                scale = CasCI600A(f"Scale {i}", f"SCALE_{i}")
+                sim.add_device(scale)
+                self.assertIs(scale.stream_scheduler, sim.stream_scheduler)
+                scale.on_output = frames.append
+                scale.set_stream_rate(20)
+                scale.set_print_mode("Stream")
+            time.sleep(0.5)
+            self.assertGreaterEqual(len(frames), 5 * 8)
+        finally:
+            sim.stop()
+
+    def test_stream_rate_is_clamped(self):
+        scale = CasCI600A("Scale", "SCALE_01")
+        scale.set_stream_rate(500)
+        self.assertEqual(scale.stream_rate, scale.MAX_STREAM_RATE)
+        scale.set_stream_rate(0.1)
+        self.assertEqual(scale.stream_rate, scale.MIN_STREAM_RATE)
+
+if __name__ == '__main__':
+    unittest.main()
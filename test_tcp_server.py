@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import time
+import socket
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulator import Simulator
+from devices.scales.cas_ci600a import CasCI600A
+
+def recv_until(sock, terminator=b"\r\n", timeout=1.0):
+    sock.settimeout(timeout)
+    buf = b""
+    while terminator not in buf:
+        chunk = sock.recv(1024)
+        if not chunk:
+            break
+        buf += chunk
+    return buf
+
+class TestTcpServer(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator(io_backend="thread")
+        self.scale = CasCI600A("Scale", "SCALE_01")
+        self.scale.set_weight(77.0)
+        self.sim.add_device(self.scale)
+        self.assertTrue(self.sim.start_device_tcp("Scale", 0, host="127.0.0.1"))
+        self.server = self.sim.comm_manager.tcp_servers[0]
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.sim.stop()
+
+    def _connect(self):
+        client = socket.create_connection(("127.0.0.1", self.server.bound_port), timeout=1.0)
+        self.clients.append(client)
+        return client
+
+    def test_many_clients_per_device(self):
+        clients = [self._connect() for _ in range(40)]
+        for client in clients:
+            client.sendall(b"01RW\r\n")
+        for client in clients:
+            self.assertIn(b"    77.0", recv_until(client))
+        self.assertEqual(self.server.stats()["active"], 40)
+
+    def test_fragments_are_buffered_per_connection(self):
+        a = self._connect()
+        b = self._connect()
+        # Interleave fragments from two clients; each must see exactly one whole reply
+        a.sendall(b"01")
+        time.sleep(0.02)
+        b.sendall(b"01R")
+        time.sleep(0.02)
+        a.sendall(b"RW\r\n")
+        self.assertTrue(recv_until(a).startswith(b"ST.GS."))
+        b.sendall(b"W\r\n")
+        self.assertTrue(recv_until(b).startswith(b"ST.GS."))
+
+    def test_connection_limit(self):
+        self.server.max_connections = 1
+        first = self._connect()
+        first.sendall(b"01RW\r\n")
+        recv_until(first)
+        second = self._connect()
+        self.assertEqual(recv_until(second), b"")
+        self.assertEqual(self.server.rejected_connections, 1)
+
+    def test_stream_output_reaches_all_clients(self):
+        a = self._connect()
+        b = self._connect()
+        a.sendall(b"01RW\r\n")
+        b.sendall(b"01RW\r\n")
+        recv_until(a)
+        recv_until(b)
+        self.scale.on_output(b"STREAM\r\n")
+        self.assertEqual(recv_until(a), b"STREAM\r\n")
+        self.assertEqual(recv_until(b), b"STREAM\r\n")
+
+    def test_stats_survive_disconnects(self):
+        client = self._connect()
+        client.sendall(b"01RW\r\n")
+        reply = recv_until(client)
+        client.close()
+        deadline = time.monotonic() + 1.0
+        while self.server.stats()["active"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = self.server.stats()
+        self.assertEqual((stats["active"], stats["total"]), (0, 1))
+        self.assertEqual((stats["bytes_rx"], stats["bytes_tx"]), (6, len(reply)))
+
+    def test_device_framers_get_the_buffer_limit(self):
+        self.server.max_buffer = 16
+        client = self._connect()
+        client.sendall(b"01RW\r\n")
+        recv_until(client)
+        conn = next(iter(self.server.connections))
+        self.assertEqual(conn.framer.max_buffer, 16)
+
+    def test_stop_closes_clients(self):
+        client = self._connect()
+        client.sendall(b"01RW\r\n")
+        recv_until(client)
+        self.assertTrue(self.sim.stop_device_tcp(0))
+        self.assertEqual(recv_until(client), b"")
+        self.assertNotIn(0, self.sim.comm_manager.tcp_servers)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.traffic_buffer import TrafficBuffer, TrafficView
+
+class TestTrafficBuffer(unittest.TestCase):
+    def test_append_and_get(self):
+        buf = TrafficBuffer()
+        seq = buf.append(1.5, "COM1", "RX", b"01RW\r\n")
+        self.assertEqual(buf.get(seq), (1.5, "COM1", "RX", b"01RW\r\n"))
+        self.assertEqual(len(buf), 1)
+
+    def test_record_capacity_evicts_oldest(self):
+        buf = TrafficBuffer(capacity=4)
+        for i in range(10):
+            buf.append(float(i), "COM1", "TX", b"%d" % i)
+        self.assertEqual((buf.first_seq, buf.end_seq, len(buf)), (6, 10, 4))
+        self.assertEqual(buf.get(6)[3], b"6")
+        with self.assertRaises(IndexError):
+            buf.get(5)
+
+    def test_data_capacity_wraps_without_splitting_payloads(self):
+        buf = TrafficBuffer(capacity=1000, data_capacity=32)
+        for i in range(20):
+            buf.append(float(i), "COM1", "RX", b"frame%02d\r\n" % i)  # 9 bytes
+        # At most three 9-byte payloads fit in 32 bytes
+        self.assertLessEqual(len(buf), 3)
+        for seq in range(buf.first_seq, buf.end_seq):
+            self.assertEqual(buf.get(seq)[3], b"frame%02d\r\n" % seq)
+
+    def test_search_forwards_and_backwards(self):
+        buf = TrafficBuffer(capacity=1000, data_capacity=64)
+        for i in range(50):
+            buf.append(float(i), "COM1" if i % 2 else "COM2", "RX", b"ID%02d;" % i)
+        first = buf.first_seq
+        self.assertEqual(buf.search(b"ID45", first), 45)
+        self.assertEqual(buf.search(b"ID45", 46), None)
+        self.assertEqual(buf.search(b"ID4", 49, backwards=True), 49)
+        self.assertEqual(buf.search(b"ID4", 44, backwards=True), 44)
+        # Match spanning two records is not a match
+        self.assertIsNone(buf.search(b";ID", first))
+        self.assertIsNone(buf.search(b";ID", buf.end_seq - 1, backwards=True))
+        # Port filter
+        self.assertEqual(buf.search(b"ID4", 40, port="COM1"), 41)
+        self.assertEqual(buf.search(b"ID4", 49, backwards=True, port="COM2"), 48)
+
+    def test_search_across_laps(self):
+        buf = TrafficBuffer(capacity=1000, data_capacity=40)
+        for i in range(12):
+            buf.append(float(i), "COM1", "RX", b"abc%02d" % i)
+        for seq in range(buf.first_seq, buf.end_seq):
+            self.assertEqual(buf.search(b"abc%02d" % seq, buf.first_seq), seq)
+            self.assertEqual(buf.search(b"abc%02d" % seq, buf.end_seq - 1, backwards=True), seq)
+
+class TestTrafficView(unittest.TestCase):
+    def test_unfiltered_rows(self):
+        buf = TrafficBuffer(capacity=5)
+        view = TrafficView(buf)
+        for i in range(8):
+            buf.append(float(i), "COM1", "RX", b"x")
+        view.refresh()
+        self.assertEqual(view.row_count, 5)
+        self.assertEqual(view.seq_at(0), 3)
+        self.assertEqual([seq for seq, _ in view.rows(3, 10)], [6, 7])
+
+    def test_port_filter(self):
+        buf = TrafficBuffer(capacity=6)
+        view = TrafficView(buf)
+        for i in range(4):
+            buf.append(float(i), "COM%d" % (i % 2), "RX", b"x")
+        view.set_port("COM1")
+        self.assertEqual([view.seq_at(r) for r in range(view.row_count)], [1, 3])
+        for i in range(4, 10):
+            buf.append(float(i), "COM%d" % (i % 2), "RX", b"x")
+        view.refresh()
+        self.assertEqual([view.seq_at(r) for r in range(view.row_count)], [5, 7, 9])
+        self.assertEqual(view.row_of(6), 1)
+
+if __name__ == '__main__':
+    unittest.main()
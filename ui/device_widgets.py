@@ -98,6 +98,18 @@ class ScaleControlWidget(ttk.Frame):
         self.mode_combo.pack(side=tk.LEFT, padx=5, pady=5)
         self.mode_combo.bind("<<ComboboxSelected>>", self._on_mode_change)
 
+        # Stream Rate
+        ttk.Label(format_frame, text="Rate(Hz):").pack(side=tk.LEFT, padx=5)
+        self.rate_var = tk.DoubleVar(value=self.scale.stream_rate)
+        self.rate_spin = ttk.Spinbox(format_frame, from_=self.scale.MIN_STREAM_RATE, to=self.scale.MAX_STREAM_RATE,
+                                     increment=1, textvariable=self.rate_var, width=5, command=self._on_rate_change)
+        self.rate_spin.pack(side=tk.LEFT, padx=5, pady=5)
+        self.rate_spin.bind("<Return>", self._on_rate_change)
+        self.rate_spin.bind("<FocusOut>", self._on_rate_change)
+        self.rate_cap_label = ttk.Label(format_frame, text="")
+        self.rate_cap_label.pack(side=tk.LEFT, padx=2)
+        self._update_rate_cap()
+
         # Connection Info
         conn_frame = ttk.LabelFrame(self, text="Connection Settings")
         conn_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -110,7 +122,7 @@ class ScaleControlWidget(ttk.Frame):
         self.port_entry.bind("<FocusOut>", self._save_conn_settings)
 
         ttk.Label(conn_frame, text="Baud:").grid(row=0, column=2, padx=5, pady=5)
-        self.baud_combo = ttk.Combobox(conn_frame, values=[9600, 19200, 38400, 57600, 115200], width=7)
+        self.baud_combo = ttk.Combobox(conn_frame, values=[2400, 4800, 9600, 19200, 38400, 57600, 115200], width=7)
         self.baud_combo.set(self.scale.connection_settings.get("baudrate", 9600))
         self.baud_combo.grid(row=0, column=3, padx=5, pady=5)
         self.baud_combo.bind("<<ComboboxSelected>>", self._save_conn_settings)
@@ -191,6 +203,24 @@ class ScaleControlWidget(ttk.Frame):
     def _on_mode_change(self, event):
         self.scale.set_print_mode(self.mode_combo.get())
 
+    def _on_rate_change(self, event=None):
+        try:
+            rate = float(self.rate_var.get())
+        except (ValueError, tk.TclError):
+            return
+        if rate != self.scale.stream_rate:
+            self.scale.set_stream_rate(rate)
+            self.rate_var.set(self.scale.stream_rate)
+        self._update_rate_cap()
+
+    def _update_rate_cap(self):
+        # Show the line-speed limit so users see why a fast stream is paced down
+        cap = self.scale.max_stream_rate()
+        if cap < self.scale.stream_rate:
+            self.rate_cap_label.configure(text=f"(max {cap:.1f} @ {self.scale.connection_settings.get('baudrate')})")
+        else:
+            self.rate_cap_label.configure(text="")
+
     def get_serial_params(self):
         parity_map = {"None": 'N', "Even": 'E', "Odd": 'O', "Mark": 'M', "Space": 'S'}
         return {
@@ -239,10 +269,14 @@ class ScaleControlWidget(ttk.Frame):
 
     def _save_conn_settings(self, event=None):
         parity_map = {"None": 'N', "Even": 'E', "Odd": 'O', "Mark": 'M', "Space": 'S'}
-        self.scale.connection_settings = {
+        # Update in place: keys the form does not edit (multidrop, turnaround, tcp_port) must survive
+        self.scale.connection_settings.update({
             "port": self.port_entry.get(),
             "baudrate": int(self.baud_combo.get()),
             "bytesize": int(self.data_combo.get()),
             "parity": parity_map.get(self.parity_combo.get(), 'N'),
             "stopbits": float(self.stop_combo.get())
-        }
+        })
+        self.scale.state_changed()
+        self.scale.update_stream_pacing()
+        self._update_rate_cap()
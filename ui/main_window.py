@@ -260,6 +260,8 @@ class MainWindow(tk.Tk):
         if filepath:
             # Stop all active communications before loading new project
             self.simulator.comm_manager.stop_all()
+            # Replacing the devices must not be journaled into the previous project
+            self.project_manager.stop_autosave()
             
             # Clear current UI widget
             if self.current_widget:
@@ -273,6 +275,7 @@ class MainWindow(tk.Tk):
             
             if self.project_manager.load_project(self.simulator, filepath):
                 self.current_project_file = filepath
+                self.project_manager.start_autosave(self.simulator, filepath)
                 self._populate_device_list()
                 self._update_title()
                 messagebox.showinfo("성공", "프로젝트를 불러왔습니다.")
@@ -301,6 +304,7 @@ class MainWindow(tk.Tk):
         if filepath:
             if self.project_manager.save_project(self.simulator, filepath):
                 self.current_project_file = filepath
+                self.project_manager.start_autosave(self.simulator, filepath)
                 self._update_title()
                 messagebox.showinfo("성공", "프로젝트를 저장했습니다.")
             else:
@@ -309,6 +313,7 @@ class MainWindow(tk.Tk):
     def _exit_app(self):
         """Exit application"""
         if messagebox.askokcancel("종료", "프로그램을 종료하시겠습니까?"):
+            self.project_manager.stop_autosave()
             self.simulator.comm_manager.stop_all()
             self.destroy()
     
@@ -1,13 +1,30 @@
 import tkinter as tk
 from tkinter import ttk
-import datetime
+import tkinter.font as tkfont
+from core.monitor_queue import MonitorEventQueue, format_monitor_line
+from core.traffic_buffer import TrafficBuffer, TrafficView
 
 class MonitorWidget(ttk.Frame):
+    """
+    Comm Monitor. Traffic is kept in a TrafficBuffer (raw records, millions of
+    frames); the Text widget only ever holds the rows currently on screen, which
+    are re-rendered when the view scrolls, the filter changes or new data
+    arrives while following the tail.
+    """
+    REFRESH_MS = 100  # UI refresh tick
+    MAX_BATCH = 5000  # Events moved into the buffer per tick at most; the rest wait in the queue
+
     def __init__(self, parent):
         super().__init__(parent)
         self.filtered_port = None  # None means show all
+        self.events = MonitorEventQueue()
+        self.buffer = TrafficBuffer()
+        self.view = TrafficView(self.buffer)
+        self.top_row = 0           # First row on screen
+        self.match_seq = None      # Record highlighted by the last search
+        self.dropped = 0
         self._setup_ui()
-        self.max_lines = 1000
+        self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
 
     def _setup_ui(self):
         # Toolbar
@@ -18,60 +35,164 @@ class MonitorWidget(ttk.Frame):
         self.clear_btn.pack(side=tk.LEFT)
 
         self.autoscroll_var = tk.BooleanVar(value=True)
-        self.autoscroll_check = ttk.Checkbutton(self.toolbar, text="Auto Scroll", variable=self.autoscroll_var)
+        self.autoscroll_check = ttk.Checkbutton(self.toolbar, text="Auto Scroll", variable=self.autoscroll_var,
+                                                command=self._on_autoscroll)
         self.autoscroll_check.pack(side=tk.LEFT, padx=10)
 
-        # Log Area
-        self.log_text = tk.Text(self, height=10, state='disabled', font=("Consolas", 9))
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=self.scrollbar.set)
+        ttk.Label(self.toolbar, text="Find:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.toolbar, textvariable=self.search_var, width=20)
+        self.search_entry.pack(side=tk.LEFT, padx=2)
+        self.search_entry.bind("<Return>", lambda e: self.find(backwards=False))
+        self.search_entry.bind("<Shift-Return>", lambda e: self.find(backwards=True))
+        ttk.Button(self.toolbar, text="▲", width=2, command=lambda: self.find(backwards=True)).pack(side=tk.LEFT)
+        ttk.Button(self.toolbar, text="▼", width=2, command=lambda: self.find(backwards=False)).pack(side=tk.LEFT)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self.toolbar, textvariable=self.status_var).pack(side=tk.RIGHT)
+
+        # Log Area: holds only the visible rows
+        self.font = tkfont.Font(family="Consolas", size=9)
+        self.log_text = tk.Text(self, height=10, state='disabled', font=self.font, wrap='none')
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
 
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
+        self.log_text.bind("<MouseWheel>", lambda e: self._scroll_rows(-3 if e.delta > 0 else 3))
+        self.log_text.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.log_text.bind("<Button-5>", lambda e: self._scroll_rows(3))
+        self.log_text.bind("<Configure>", lambda e: self.render())
+
         # Tags for coloring
         self.log_text.tag_config("RX", foreground="green")
         self.log_text.tag_config("TX", foreground="blue")
         self.log_text.tag_config("ERROR", foreground="red")
+        self.log_text.tag_config("MATCH", background="yellow")
 
     def add_log(self, port: str, direction: str, data: bytes):
-        # Filter by port if set
-        if self.filtered_port and port != self.filtered_port:
-            return
-            
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        
-        # Format data
+        """
+        Monitor callback; called from I/O threads. Only queues the raw event,
+        formatting and Tk work happen in batches on the refresh tick.
+        """
+        self.events.put(port, direction, data)
+
+    def _refresh(self):
         try:
-            # Try to decode as ASCII for display, replace non-printable
-            text_data = data.decode('ascii', errors='replace')
-            # Also show hex if needed, but for now let's stick to a clean format
-            # Maybe "HEX [ASCII]"
-            hex_data = data.hex().upper()
-            display_text = f"[{timestamp}] [{port}] [{direction}] {text_data} <{hex_data}>\n"
-        except Exception:
-            display_text = f"[{timestamp}] [{port}] [{direction}] <BINARY: {data.hex().upper()}>\n"
-
-        def _update_ui():
-            self.log_text.configure(state='normal')
-            self.log_text.insert(tk.END, display_text, direction)
-            
-            # Limit lines
-            if float(self.log_text.index('end-1c')) > self.max_lines:
-                self.log_text.delete('1.0', '2.0')
-
-            if self.autoscroll_var.get():
-                self.log_text.see(tk.END)
-                
-            self.log_text.configure(state='disabled')
-
-        self.after(0, _update_ui)
+            self.flush()
+        finally:
+            self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
+
+    def flush(self):
+        """Move queued events into the traffic buffer and redraw if the tail is shown."""
+        events, dropped = self.events.drain(self.MAX_BATCH)
+        if not events and not dropped:
+            return
+        self.dropped += dropped
+        append = self.buffer.append
+        for event in events:
+            append(*event)
+        self.view.refresh()
+        if self.autoscroll_var.get():
+            self.top_row = max(0, self.view.row_count - self.visible_rows())
+        self.render()
+
+    # --- Virtual view ---
+
+    def visible_rows(self) -> int:
+        height = self.log_text.winfo_height()
+        if height <= 1:
+            # Not mapped yet
+            return int(self.log_text.cget('height'))
+        return max(1, height // self.font.metrics('linespace'))
+
+    def render(self):
+        """Format and show only the rows on screen."""
+        rows = self.visible_rows()
+        total = self.view.row_count
+        self.top_row = max(0, min(self.top_row, total - rows))
+
+        # insert() takes alternating text, tags arguments
+        chunks = []
+        for seq, record in self.view.rows(self.top_row, rows):
+            tags = (record[2], "MATCH") if seq == self.match_seq else record[2]
+            chunks += [format_monitor_line(record), tags]
 
-    def clear_log(self):
         self.log_text.configure(state='normal')
         self.log_text.delete('1.0', tk.END)
+        if chunks:
+            self.log_text.insert(tk.END, *chunks)
         self.log_text.configure(state='disabled')
 
+        if total:
+            self.scrollbar.set(self.top_row / total, min(1.0, (self.top_row + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        status = f"{len(self.buffer):,} frames"
+        if self.dropped:
+            status += f", {self.dropped:,} dropped"
+        self.status_var.set(status)
+
+    def _scroll_rows(self, delta: int):
+        self.top_row += delta
+        # Follow the tail again only when scrolled back to the bottom
+        self.autoscroll_var.set(self.top_row + self.visible_rows() >= self.view.row_count)
+        self.render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top_row = int(float(amount) * self.view.row_count)
+            self.autoscroll_var.set(self.top_row + self.visible_rows() >= self.view.row_count)
+            self.render()
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self._scroll_rows(int(amount) * step)
+
+    def _on_autoscroll(self):
+        if self.autoscroll_var.get():
+            self.top_row = max(0, self.view.row_count - self.visible_rows())
+            self.render()
+
+    # --- Search / filter ---
+
+    def find(self, backwards: bool = False):
+        """Jump to the next record (after the current match or the top row) containing the search text."""
+        text = self.search_var.get()
+        if not text:
+            return
+        needle = text.encode('ascii', errors='replace')
+        if self.match_seq is not None and self.match_seq >= self.buffer.first_seq:
+            start = self.match_seq - 1 if backwards else self.match_seq + 1
+        else:
+            start = self.view.seq_at(self.top_row) if self.view.row_count else self.buffer.first_seq
+        seq = self.buffer.search(needle, start, backwards=backwards, port=self.filtered_port)
+        if seq is None:
+            self.status_var.set(f"'{text}' not found")
+            return
+        self.match_seq = seq
+        self.autoscroll_var.set(False)
+        self.top_row = max(0, self.view.row_of(seq) - self.visible_rows() // 2)
+        self.render()
+
+    def clear_log(self):
+        self.events.clear()
+        self.buffer.clear()
+        self.view.set_port(self.filtered_port)
+        self.match_seq = None
+        self.dropped = 0
+        self.top_row = 0
+        self.render()
+
     def set_filter(self, port: str = None):
         """Set port filter. None means show all ports."""
         self.filtered_port = port
+        self.view.set_port(port)
+        if self.autoscroll_var.get():
+            self.top_row = max(0, self.view.row_count - self.visible_rows())
+        self.render()
+
+    def destroy(self):
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
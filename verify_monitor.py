@@ -17,6 +17,8 @@ class TestMonitor(unittest.TestCase):
     def test_monitor_receives_data(self):
         # Simulate RX data
         self.comm._notify_monitors("COM1", "RX", b"Hello")
+        self.comm.flush_monitors()
+        self.monitor.flush()
         
         # Check text widget content
         content = self.monitor.log_text.get("1.0", tk.END)
@@ -26,6 +28,8 @@ class TestMonitor(unittest.TestCase):
     def test_monitor_receives_binary_data(self):
         # Simulate Binary RX data
         self.comm._notify_monitors("COM2", "TX", b"\x01\x02\xFF")
+        self.comm.flush_monitors()
+        self.monitor.flush()
         
         # Check text widget content
         content = self.monitor.log_text.get("1.0", tk.END)